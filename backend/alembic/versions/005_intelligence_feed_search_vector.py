@@ -0,0 +1,89 @@
+"""Maintained multilingual search_vector for intelligence feed text search
+
+Revision ID: 005
+Revises: db8bb6b6488f
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = 'db8bb6b6488f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('africa_intelligence_feed', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Text search config for a detected_language code; 'arabic' only ships
+    # with PostgreSQL 13+, so fall back to 'simple' where it is missing
+    op.execute("""
+        CREATE OR REPLACE FUNCTION intelligence_search_config(lang TEXT)
+        RETURNS regconfig
+        LANGUAGE sql STABLE
+        AS $$
+            SELECT COALESCE(
+                (SELECT cfgname::regconfig FROM pg_ts_config
+                  WHERE cfgname = CASE lower(left(COALESCE(lang, 'en'), 2))
+                      WHEN 'en' THEN 'english'
+                      WHEN 'fr' THEN 'french'
+                      WHEN 'pt' THEN 'portuguese'
+                      WHEN 'ar' THEN 'arabic'
+                  END),
+                'simple'::regconfig
+            )
+        $$;
+    """)
+
+    # Title weighs A, description B, eligibility criteria (kept in raw_data) C
+    op.execute("""
+        CREATE OR REPLACE FUNCTION africa_intelligence_feed_search_vector_update()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            cfg regconfig := intelligence_search_config(NEW.detected_language);
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector(cfg, COALESCE(NEW.title, '')), 'A') ||
+                setweight(to_tsvector(cfg, COALESCE(NEW.description, '')), 'B') ||
+                setweight(to_tsvector(cfg, COALESCE(NEW.raw_data->>'eligibility_criteria', '')), 'C');
+            RETURN NEW;
+        END
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_africa_intelligence_feed_search_vector
+        BEFORE INSERT OR UPDATE OF title, description, raw_data, detected_language
+        ON africa_intelligence_feed
+        FOR EACH ROW EXECUTE FUNCTION africa_intelligence_feed_search_vector_update()
+    """)
+
+    # Backfill existing rows through the trigger
+    op.execute("UPDATE africa_intelligence_feed SET title = title")
+
+    # Replace the English-only expression index from 004 with one on the column
+    op.execute("DROP INDEX IF EXISTS idx_africa_intelligence_feed_search_vector")
+    op.execute("""
+        CREATE INDEX idx_africa_intelligence_feed_search_vector
+        ON africa_intelligence_feed USING gin(search_vector)
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_africa_intelligence_feed_search_vector")
+    op.execute("DROP TRIGGER IF EXISTS trg_africa_intelligence_feed_search_vector ON africa_intelligence_feed")
+    op.execute("DROP FUNCTION IF EXISTS africa_intelligence_feed_search_vector_update()")
+    op.execute("DROP FUNCTION IF EXISTS intelligence_search_config(TEXT)")
+    op.drop_column('africa_intelligence_feed', 'search_vector')
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_search_vector
+        ON africa_intelligence_feed USING gin(to_tsvector('english', title || ' ' || COALESCE(description, '')))
+    """)
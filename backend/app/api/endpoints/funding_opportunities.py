@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 import logging
@@ -11,6 +12,11 @@ from app.schemas.funding import (
     GrantFundingSpecific, InvestmentFundingSpecific, FundingAnnouncementCardResponse
 )
 from app.services.funding_intelligence.vector_intelligence import FundingIntelligenceVectorDB
+from app.services.search_cache import get_search_cache
+from app.utils.pagination import (
+    InvalidCursorError, compute_etag, decode_cursor, etag_matches, keyset_filter, page_of
+)
+from app.utils.serialization import serialize_json
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -27,6 +33,103 @@ except Exception as e:
 # Core Intelligence Item Endpoints (from funding.py)
 #
 
+# Embedded relations of the feed list (PostgREST resource embedding)
+FUNDING_TYPE_EMBED = 'funding_types!fk_africa_intelligence_feed_funding_type_id'
+ORGANIZATION_EMBED = 'organizations!africa_intelligence_feed_organization_id_fkey'
+AI_DOMAIN_EMBED = 'ai_domains!intelligence_item_ai_domains'
+
+# Columns each /feed view selects instead of '*' plus full relations
+FEED_VIEW_COLUMNS = {
+    'card': [
+        'id', 'title', 'description', 'organization_name', 'source_url', 'application_url',
+        'deadline', 'status', 'currency', 'funding_type', 'total_funding_pool',
+        'min_amount_per_project', 'max_amount_per_project', 'exact_amount_per_project',
+        'created_at'
+    ],
+    'compact': ['id', 'title', 'deadline', 'status', 'currency', 'source_url', 'created_at'],
+}
+
+# Relation fields each /feed view embeds, and those its filters need
+FEED_VIEW_EMBEDS = {
+    'card': {FUNDING_TYPE_EMBED: ['name', 'category'], ORGANIZATION_EMBED: ['name'], AI_DOMAIN_EMBED: ['name']},
+    'compact': {},
+}
+FEED_FILTER_EMBEDS = {FUNDING_TYPE_EMBED: ['category', 'requires_equity'], AI_DOMAIN_EMBED: ['name']}
+
+
+def _apply_feed_filters(query, status, min_amount, max_amount, deadline_after, deadline_before,
+                        organization_id, ai_domain, funding_type, requires_equity):
+    """Apply the intelligence feed list filters to a Supabase query"""
+    if status:
+        query = query.filter('status', 'eq', status)
+    if min_amount:
+        query = query.or_(f'amount_exact.gte.{min_amount},amount_min.gte.{min_amount},total_funding_pool.gte.{min_amount}')
+    if max_amount:
+        query = query.or_(f'amount_exact.lte.{max_amount},amount_max.lte.{max_amount},total_funding_pool.lte.{max_amount}')
+    if deadline_after:
+        query = query.filter('deadline', 'gte', deadline_after.isoformat())
+    if deadline_before:
+        query = query.filter('deadline', 'lte', deadline_before.isoformat())
+    if organization_id:
+        query = query.filter('organization_id', 'eq', organization_id)
+    if funding_type:
+        query = query.filter('funding_types.category', 'eq', funding_type)
+    if requires_equity is not None:
+        query = query.filter('funding_types.requires_equity', 'eq', requires_equity)
+    if ai_domain:
+        query = query.filter('ai_domains.name', 'ilike', f'%{ai_domain}%')
+    return query
+
+
+def _feed_columns(view: str, funding_type: Optional[str], requires_equity: Optional[bool],
+                  ai_domain: Optional[str]) -> str:
+    """
+    Select list for a /feed view, embedding any relation a filter needs
+
+    Filtered relations are embedded with !inner in every view; PostgREST
+    otherwise applies the filter to the embedded rows only and returns
+    every parent row.
+    """
+    filtered = set()
+    if funding_type or requires_equity is not None:
+        filtered.add(FUNDING_TYPE_EMBED)
+    if ai_domain:
+        filtered.add(AI_DOMAIN_EMBED)
+
+    embeds = {embed: list(fields) for embed, fields in FEED_VIEW_EMBEDS[view].items()}
+    for embed in FEED_FILTER_EMBEDS:
+        if embed in filtered:
+            fields = embeds.setdefault(embed, [])
+            fields.extend(field for field in FEED_FILTER_EMBEDS[embed] if field not in fields)
+
+    columns = list(FEED_VIEW_COLUMNS[view])
+    for embed, fields in embeds.items():
+        columns.append(f"{embed}{'!inner' if embed in filtered else ''}({','.join(fields)})")
+    return ','.join(columns)
+
+
+def _shape_feed_row(row: dict, view: str) -> dict:
+    """Flatten the embedded relations of a projected feed row"""
+    if view != 'card':
+        row.pop('funding_types', None)
+        row.pop('ai_domains', None)
+        return row
+
+    funding_type_data = row.pop('funding_types', None) or {}
+    organization_data = row.pop('organizations', None) or {}
+    ai_domain_names = [domain.get('name') for domain in row.pop('ai_domains', None) or [] if domain.get('name')]
+    funding_category = funding_type_data.get('category', 'other')
+
+    row['organization'] = organization_data.get('name') or row.get('organization_name') or 'Unknown'
+    row['sector'] = ai_domain_names[0] if ai_domain_names else 'Other'
+    row['ai_domains'] = ai_domain_names
+    row['funding_type_name'] = funding_type_data.get('name')
+    row['funding_category'] = funding_category
+    row['is_grant'] = funding_category == 'grant'
+    row['is_investment'] = funding_category == 'investment'
+    return row
+
+
 @router.get("/", response_model=List[FundingAnnouncementCardResponse])
 async def get_africa_intelligence_feed(
     skip: int = Query(0, ge=0),
@@ -48,24 +151,10 @@ async def get_africa_intelligence_feed(
     query = db.table('africa_intelligence_feed').select('*, funding_types!fk_africa_intelligence_feed_funding_type_id(*), organizations!africa_intelligence_feed_organization_id_fkey(*), ai_domains!intelligence_item_ai_domains(*)')
 
     # Apply filters
-    if status:
-        query = query.filter('status', 'eq', status)
-    if min_amount:
-        query = query.or_(f'amount_exact.gte.{min_amount},amount_min.gte.{min_amount},total_funding_pool.gte.{min_amount}')
-    if max_amount:
-        query = query.or_(f'amount_exact.lte.{max_amount},amount_max.lte.{max_amount},total_funding_pool.lte.{max_amount}')
-    if deadline_after:
-        query = query.filter('deadline', 'gte', deadline_after.isoformat())
-    if deadline_before:
-        query = query.filter('deadline', 'lte', deadline_before.isoformat())
-    if organization_id:
-        query = query.filter('organization_id', 'eq', organization_id)
-    if funding_type:
-        query = query.filter('funding_types.category', 'eq', funding_type)
-    if requires_equity is not None:
-        query = query.filter('funding_types.requires_equity', 'eq', requires_equity)
-    if ai_domain:
-        query = query.filter('ai_domains.name', 'ilike', f'%{ai_domain}%')
+    query = _apply_feed_filters(
+        query, status, min_amount, max_amount, deadline_after, deadline_before,
+        organization_id, ai_domain, funding_type, requires_equity
+    )
 
     # Execute query with pagination
     response = query.range(skip, skip + limit - 1).execute()
@@ -198,6 +287,71 @@ async def get_africa_intelligence_feed(
     return results
 
 
+@router.get("/feed")
+async def get_africa_intelligence_feed_page(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    view: str = Query('card', pattern='^(card|compact)$', description="Projection: 'card' or 'compact'"),
+    status: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    deadline_after: Optional[datetime] = Query(None),
+    deadline_before: Optional[datetime] = Query(None),
+    organization_id: Optional[int] = Query(None),
+    ai_domain: Optional[str] = Query(None),
+    funding_type: Optional[str] = Query(None, description="Filter by funding type category: 'grant', 'investment', 'prize', or 'other'"),
+    requires_equity: Optional[bool] = Query(None, description="Filter for opportunities requiring equity"),
+    db = Depends(get_db)
+):
+    """
+    Keyset-paginated intelligence feed, newest first
+
+    Pages follow (created_at, id) rather than OFFSET and select only the
+    columns of the requested view. Clients sending
+    Accept: application/x-ndjson get one JSON object per line with the next
+    cursor in the X-Next-Cursor header; JSON pages carry an ETag and answer
+    a matching If-None-Match with 304.
+    """
+    query = db.table('africa_intelligence_feed').select(
+        _feed_columns(view, funding_type, requires_equity, ai_domain)
+    )
+    query = _apply_feed_filters(
+        query, status, min_amount, max_amount, deadline_after, deadline_before,
+        organization_id, ai_domain, funding_type, requires_equity
+    )
+
+    if cursor:
+        try:
+            cursor_created_at, cursor_id = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        query = query.or_(keyset_filter(cursor_created_at, cursor_id))
+
+    # One extra row tells whether another page follows
+    response = query.order('created_at', desc=True, nullsfirst=True).order('id', desc=True).limit(limit + 1).execute()
+    rows, next_cursor = page_of(response.data or [], limit)
+
+    if 'application/x-ndjson' in request.headers.get('accept', ''):
+        headers = {'X-Next-Cursor': next_cursor} if next_cursor else {}
+        return StreamingResponse(
+            (serialize_json(_shape_feed_row(row, view)) + '\n' for row in rows),
+            media_type='application/x-ndjson',
+            headers=headers
+        )
+
+    body = serialize_json({
+        'items': [_shape_feed_row(row, view) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None
+    }).encode('utf-8')
+    etag = compute_etag(body)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
 @router.get("/{opportunity_id}", response_model=AfricaIntelligenceItemResponse)
 async def get_intelligence_item(
     opportunity_id: int,
@@ -304,6 +458,15 @@ async def get_intelligence_item(
     return response
 
 
+async def _register_for_deduplication(rows: List[dict]):
+    """Add created rows to this process's duplicate-detection indexes"""
+    try:
+        from app.services.source_validation.deduplication import register_inserted_opportunities
+        await register_inserted_opportunities(rows)
+    except Exception as e:
+        logger.warning(f"Could not register {len(rows)} opportunities for deduplication: {e}")
+
+
 @router.post("/", response_model=AfricaIntelligenceItemResponse)
 async def create_intelligence_item(
     opportunity: AfricaIntelligenceItemCreate,
@@ -371,6 +534,9 @@ async def create_intelligence_item(
         if item_id is None:
             raise HTTPException(status_code=500, detail="Database did not return an ID for the created item")
 
+        # Later duplicate checks in this process must see the new row
+        await _register_for_deduplication([db_opportunity])
+
         # 🔥 ADD PINECONE VECTOR INDEXING 🔥
         # Index the new opportunity in Pinecone for semantic search
         if vector_db:
@@ -392,7 +558,11 @@ async def create_intelligence_item(
                     'application_url': db_opportunity.get('application_url', ''),
                     'deadline': db_opportunity.get('deadline'),
                     'status': db_opportunity.get('status', 'open'),
-                    'created_at': db_opportunity.get('created_at')
+                    'created_at': db_opportunity.get('created_at'),
+                    # Filterable in the vector store by intelligent search
+                    'overall_relevance_score': db_opportunity.get('overall_relevance_score'),
+                    'validation_status': db_opportunity.get('validation_status'),
+                    'funding_type_id': db_opportunity.get('funding_type_id')
                 }
                 
                 # Index to Pinecone asynchronously
@@ -419,6 +589,9 @@ async def create_intelligence_item(
         if is_investment and opportunity.investment_specific:
             response_data["investment_specific"] = opportunity.investment_specific
 
+        # Cached intelligent search rankings no longer reflect the data
+        await get_search_cache().invalidate()
+
         return AfricaIntelligenceItemResponse(**response_data)
 
     else: # SQLAlchemy session
@@ -448,6 +621,16 @@ async def create_intelligence_item(
         db.commit()
         db.refresh(db_opportunity)
         
+        # Later duplicate checks in this process must see the new row
+        await _register_for_deduplication([{
+            'id': db_opportunity.id,
+            'source_url': db_opportunity.source_url,
+            'title': db_opportunity.title,
+            'description': db_opportunity.description,
+            'organization_name': db_opportunity.organization_name,
+            'discovered_date': db_opportunity.discovered_date
+        }])
+        
         # 🔥 ADD PINECONE VECTOR INDEXING FOR SQLALCHEMY 🔥
         if vector_db:
             try:
@@ -468,7 +651,11 @@ async def create_intelligence_item(
                     'application_url': db_opportunity.application_url or '',
                     'deadline': db_opportunity.deadline,
                     'status': db_opportunity.status or 'open',
-                    'created_at': db_opportunity.created_at
+                    'created_at': db_opportunity.created_at,
+                    # Filterable in the vector store by intelligent search
+                    'overall_relevance_score': db_opportunity.overall_relevance_score,
+                    'validation_status': db_opportunity.validation_status,
+                    'funding_type_id': db_opportunity.funding_type_id
                 }
                 
                 # Index to Pinecone asynchronously
@@ -479,6 +666,9 @@ async def create_intelligence_item(
                 # Don't fail the API call if Pinecone indexing fails
                 logger.error(f"❌ Failed to index opportunity {db_opportunity.id} to Pinecone: {e}")
         
+        # Cached intelligent search rankings no longer reflect the data
+        await get_search_cache().invalidate()
+        
         # Create response with type-specific data
         response = AfricaIntelligenceItemResponse.from_orm(db_opportunity)
         response.is_grant = db_opportunity.is_grant
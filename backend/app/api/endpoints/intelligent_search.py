@@ -4,13 +4,19 @@ Replaces deprecated RFPs endpoint with quality-filtered, vector-enhanced search
 """
 
 from fastapi import APIRouter, Query, HTTPException, Depends
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select
 
 from app.services.funding_intelligence.vector_intelligence import VectorSearchService
+from app.services.search_cache import get_search_cache
+from app.services.search_filters import (
+    ELIGIBILITY_CRITERIA, quality_predicates, text_search_predicate, text_search_query, text_search_rank,
+    vector_metadata_filter
+)
 from app.models.funding import AfricaIntelligenceItem
 from app.core.database import get_db
 from supabase import Client
@@ -19,11 +25,97 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/intelligent-search", tags=["intelligent-search"])
 
+# Per-result ranking fields kept in the result cache alongside the ids
+CACHED_RANKING_FIELDS = ('search_method', 'text_rank', 'vector_similarity_score', 'composite_score')
+
+# Only the columns a search result needs, instead of whole ORM entities.
+# Table columns keep the queries plain Core selects; labels keep the result
+# keys the endpoint has always returned.
+_FEED = AfricaIntelligenceItem.__table__.c
+RESULT_COLUMNS = (
+    _FEED.id,
+    _FEED.title,
+    _FEED.description,
+    _FEED.funding_amount,
+    _FEED.currency,
+    _FEED.deadline.label('application_deadline'),
+    _FEED.application_url,
+    ELIGIBILITY_CRITERIA.label('eligibility_criteria'),
+    _FEED.source_url,
+    _FEED.overall_relevance_score.label('relevance_score'),
+    _FEED.validation_status,
+    _FEED.discovered_date.label('created_at'),
+    _FEED.last_updated.label('updated_at'),
+)
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _epoch(value: Any) -> float:
+    """Epoch seconds of a date/datetime deadline (NaN when there is none)"""
+    if not value:
+        return np.nan
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value.timestamp()
+
+
+class _ResultRows:
+    """Per-request identity map of projected opportunity rows"""
+    
+    def __init__(self):
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.deadlines: Dict[int, float] = {}
+    
+    def add(self, row) -> Dict[str, Any]:
+        """Serialize a projected row once; later hits for the same id reuse it"""
+        if row.id not in self.results:
+            self.results[row.id] = {
+                'id': row.id,
+                'title': row.title,
+                'description': row.description,
+                'funding_amount': row.funding_amount,
+                'currency': row.currency,
+                'application_deadline': _isoformat(row.application_deadline),
+                'application_url': row.application_url,
+                'eligibility_criteria': row.eligibility_criteria,
+                'source_url': row.source_url,
+                'relevance_score': row.relevance_score,
+                'validation_status': row.validation_status,
+                'created_at': _isoformat(row.created_at),
+                'updated_at': _isoformat(row.updated_at)
+            }
+            self.deadlines[row.id] = _epoch(row.application_deadline)
+        return self.results[row.id]
+    
+    def load(self, db: Session, ids: List[int], predicates: Optional[List[Any]] = None):
+        """Fetch every id not yet in the map in one projected query"""
+        missing = [opportunity_id for opportunity_id in dict.fromkeys(ids) if opportunity_id not in self.results]
+        if not missing:
+            return
+        query = select(*RESULT_COLUMNS).where(_FEED.id.in_(missing), *(predicates or []))
+        for row in db.execute(query).all():
+            self.add(row)
+    
+    def get(self, opportunity_id: int) -> Optional[Dict[str, Any]]:
+        result = self.results.get(opportunity_id)
+        return dict(result) if result is not None else None
+
 class IntelligentSearchService:
     """Service for filtered, vector-enhanced search of funding opportunities"""
     
     def __init__(self):
-        self.vector_service = VectorSearchService()
+        self._vector_service: Optional[VectorSearchService] = None
+        self.cache = get_search_cache()
+    
+    @property
+    def vector_service(self) -> VectorSearchService:
+        """Connected on first vector search, so importing the router needs no Pinecone"""
+        if self._vector_service is None:
+            self._vector_service = VectorSearchService()
+        return self._vector_service
     
     async def search_opportunities(
         self,
@@ -48,187 +140,163 @@ class IntelligentSearchService:
             Filtered and ranked search results
         """
         try:
-            # Step 1: Apply database-level quality filters (PRIMARY LAYER)
-            quality_filtered_ids = await self._apply_quality_filters(db, filters, min_relevance_score)
-            
-            if not quality_filtered_ids:
-                return {
-                    "query": query,
-                    "results": [],
-                    "total_count": 0,
-                    "message": "No opportunities meet the quality criteria",
-                    "search_strategy": "quality_filtering_only"
-                }
-            
-            # Step 2: Try traditional text search first (FAST PATH)
-            traditional_results = await self._traditional_text_search(
-                query, quality_filtered_ids, db, max_results
+            # Popular queries are served from the ranked-result cache
+            generation = await self.cache.current_generation()
+            cached = await self.cache.get_results(
+                generation, query, filters, min_relevance_score, max_results, use_vector_enhancement
             )
-            
-            # Step 3: Use vector search as enhancement if needed (ENHANCEMENT LAYER)
-            final_results = traditional_results
-            search_strategy = "traditional_search"
-            
-            if use_vector_enhancement and len(traditional_results) < max_results // 2:
-                # If traditional search yields few results, enhance with vector search
-                vector_results = await self._vector_search_filtered(
-                    query, quality_filtered_ids, max_results
+            if cached is not None:
+                final_results = await self._load_cached_results(cached['ranked'], db)
+                traditional_count = cached['metadata']['traditional_results_count']
+                search_strategy = cached['metadata']['search_strategy']
+            else:
+                final_results, traditional_count, search_strategy = await self._run_search(
+                    query, db, min_relevance_score, max_results, filters, use_vector_enhancement
                 )
-                
-                # Merge and deduplicate results
-                final_results = await self._merge_search_results(
-                    traditional_results, vector_results, max_results
+                await self.cache.set_results(
+                    generation, query, filters, min_relevance_score, max_results, use_vector_enhancement,
+                    {
+                        'ranked': [
+                            {'id': result['id'], **{f: result[f] for f in CACHED_RANKING_FIELDS if f in result}}
+                            for result in final_results
+                        ],
+                        'metadata': {
+                            'traditional_results_count': traditional_count,
+                            'search_strategy': search_strategy
+                        }
+                    }
                 )
-                search_strategy = "hybrid_enhanced"
-            
-            # Step 4: Apply final ranking and formatting
-            final_results = await self._rank_and_format_results(
-                final_results, query
-            )
             
-            return {
+            response = {
                 "query": query,
                 "results": final_results,
                 "total_count": len(final_results),
                 "search_metadata": {
-                    "quality_filtered_count": len(quality_filtered_ids),
-                    "traditional_results_count": len(traditional_results),
+                    "traditional_results_count": traditional_count,
                     "final_count": len(final_results),
                     "search_strategy": search_strategy,
                     "min_relevance_score": min_relevance_score,
                     "vector_enhancement_used": search_strategy == "hybrid_enhanced",
+                    "cache_hit": cached is not None,
                     "search_timestamp": datetime.now().isoformat()
                 }
             }
+            if not final_results:
+                response["message"] = "No opportunities meet the quality criteria"
+            return response
             
         except Exception as e:
             logger.error(f"Intelligent search failed: {e}")
             raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
     
-    async def _apply_quality_filters(
-        self, 
-        db: Session, 
-        filters: Optional[Dict[str, Any]], 
-        min_relevance_score: float
-    ) -> List[int]:
-        """Apply database-level quality filters before vector search"""
-        
-        query = db.query(AfricaIntelligenceItem.id)
-        
-        # Core quality filters
-        query = query.filter(
-            and_(
-                # Use our new relevance scoring system
-                AfricaIntelligenceItem.relevance_score >= min_relevance_score,
-                
-                # Only validated/approved content
-                AfricaIntelligenceItem.validation_status.in_(['approved', 'auto_approved']),
-                
-                # Active opportunities (not expired)
-                or_(
-                    AfricaIntelligenceItem.application_deadline.is_(None),
-                    AfricaIntelligenceItem.application_deadline >= datetime.now()
-                ),
-                
-                # Must have essential fields
-                AfricaIntelligenceItem.title.isnot(None),
-                AfricaIntelligenceItem.description.isnot(None),
-                func.length(AfricaIntelligenceItem.title) >= 10,
-                func.length(AfricaIntelligenceItem.description) >= 50
-            )
+    async def _run_search(
+        self,
+        query: str,
+        db: Session,
+        min_relevance_score: float,
+        max_results: int,
+        filters: Optional[Dict[str, Any]],
+        use_vector_enhancement: bool
+    ) -> Tuple[List[Dict[str, Any]], int, str]:
+        """Run the layered search; returns ranked results, text hit count and strategy"""
+        
+        # Step 1: Quality filters become predicates of each search query (PRIMARY LAYER)
+        predicates = quality_predicates(filters, min_relevance_score)
+        rows = _ResultRows()
+        
+        # Step 2: Try traditional text search first (FAST PATH)
+        traditional_results = await self._traditional_text_search(
+            query, predicates, db, max_results, rows
         )
         
-        # Apply user filters if provided
-        if filters:
-            if filters.get('min_amount'):
-                query = query.filter(
-                    AfricaIntelligenceItem.funding_amount >= filters['min_amount']
-                )
-            
-            if filters.get('max_amount'):
-                query = query.filter(
-                    AfricaIntelligenceItem.funding_amount <= filters['max_amount']
-                )
-            
-            if filters.get('deadline_after'):
-                query = query.filter(
-                    AfricaIntelligenceItem.application_deadline >= filters['deadline_after']
-                )
-            
-            if filters.get('deadline_before'):
-                query = query.filter(
-                    AfricaIntelligenceItem.application_deadline <= filters['deadline_before']
-                )
-            
-            if filters.get('funding_type'):
-                query = query.filter(
-                    AfricaIntelligenceItem.funding_type_id == filters['funding_type']
-                )
+        # Step 3: Use vector search as enhancement if needed (ENHANCEMENT LAYER)
+        final_results = traditional_results
+        search_strategy = "traditional_search"
+        
+        if use_vector_enhancement and len(traditional_results) < max_results // 2:
+            # If traditional search yields few results, enhance with vector search
+            vector_results = await self._vector_search_filtered(
+                query, db, filters, min_relevance_score, predicates, max_results, rows
+            )
             
-            if filters.get('geographic_focus'):
-                # Search in description or metadata for geographic terms
-                geo_term = f"%{filters['geographic_focus']}%"
-                query = query.filter(
-                    or_(
-                        AfricaIntelligenceItem.description.ilike(geo_term),
-                        AfricaIntelligenceItem.eligibility_criteria.ilike(geo_term)
-                    )
-                )
+            # Merge and deduplicate results
+            final_results = await self._merge_search_results(
+                traditional_results, vector_results, max_results
+            )
+            search_strategy = "hybrid_enhanced"
+        
+        # Step 4: Apply final ranking and formatting
+        final_results = await self._rank_and_format_results(
+            final_results, query, rows.deadlines
+        )
         
-        # Return list of IDs that meet quality criteria
-        return [row.id for row in query.all()]
+        return final_results, len(traditional_results), search_strategy
+    
+    async def _load_cached_results(
+        self,
+        ranked: List[Dict[str, Any]],
+        db: Session
+    ) -> List[Dict[str, Any]]:
+        """Rebuild a cached ranking from its ids in one query, keeping the cached order"""
+        
+        if not ranked:
+            return []
+        
+        rows = _ResultRows()
+        rows.load(db, [entry['id'] for entry in ranked])
+        
+        results = []
+        for entry in ranked:
+            result = rows.get(entry['id'])
+            if result is not None:
+                results.append({**result, **entry})
+        return results
     
     async def _traditional_text_search(
         self, 
         query: str, 
-        allowed_ids: List[int], 
+        predicates: List[Any], 
         db: Session, 
-        max_results: int
+        max_results: int,
+        rows: _ResultRows
     ) -> List[Dict[str, Any]]:
         """Perform traditional PostgreSQL text search on quality-filtered opportunities"""
         
-        # Use PostgreSQL's full-text search capabilities
-        search_query = db.query(AfricaIntelligenceItem).filter(
-            AfricaIntelligenceItem.id.in_(allowed_ids)
-        )
-        
-        # Apply text search on title and description
-        search_terms = query.lower().split()
-        for term in search_terms:
-            search_pattern = f"%{term}%"
-            search_query = search_query.filter(
-                or_(
-                    func.lower(AfricaIntelligenceItem.title).like(search_pattern),
-                    func.lower(AfricaIntelligenceItem.description).like(search_pattern),
-                    func.lower(AfricaIntelligenceItem.eligibility_criteria).like(search_pattern)
+        ranked = db.get_bind().dialect.name == 'postgresql'
+        if ranked:
+            # Use PostgreSQL's full-text search: GIN-indexed search_vector, ranked by ts_rank_cd
+            tsquery = text_search_query(query)
+            text_rank = text_search_rank(tsquery).label('text_rank')
+            search_query = select(*RESULT_COLUMNS, text_rank).where(
+                text_search_predicate(tsquery),
+                and_(*predicates)
+            ).order_by(
+                text_rank.desc(),
+                _FEED.overall_relevance_score.desc()
+            )
+        else:
+            # Other databases (local SQLite) fall back to substring matching
+            search_query = select(*RESULT_COLUMNS).where(and_(*predicates))
+            for term in query.lower().split():
+                search_pattern = f"%{term}%"
+                search_query = search_query.where(
+                    or_(
+                        func.lower(_FEED.title).like(search_pattern),
+                        func.lower(_FEED.description).like(search_pattern)
+                    )
                 )
+            search_query = search_query.order_by(
+                _FEED.overall_relevance_score.desc(),
+                _FEED.discovered_date.desc()
             )
         
-        # Order by relevance score and limit results
-        search_query = search_query.order_by(
-            AfricaIntelligenceItem.relevance_score.desc(),
-            AfricaIntelligenceItem.created_at.desc()
-        ).limit(max_results)
-        
         # Convert to dictionary format
         results = []
-        for opportunity in search_query.all():
+        for row in db.execute(search_query.limit(max_results)).all():
             result = {
-                'id': opportunity.id,
-                'title': opportunity.title,
-                'description': opportunity.description,
-                'funding_amount': opportunity.funding_amount,
-                'currency': opportunity.currency,
-                'application_deadline': opportunity.application_deadline.isoformat() if opportunity.application_deadline else None,
-                'application_url': opportunity.application_url,
-                'contact_email': opportunity.contact_email,
-                'eligibility_criteria': opportunity.eligibility_criteria,
-                'source_url': opportunity.source_url,
-                'relevance_score': opportunity.relevance_score,
-                'validation_status': opportunity.validation_status,
+                **rows.add(row),
                 'search_method': 'traditional_text',
-                'created_at': opportunity.created_at.isoformat() if opportunity.created_at else None,
-                'updated_at': opportunity.updated_at.isoformat() if opportunity.updated_at else None
+                'text_rank': float(row.text_rank) if ranked else 0.0
             }
             results.append(result)
         
@@ -237,63 +305,65 @@ class IntelligentSearchService:
     async def _vector_search_filtered(
         self, 
         query: str, 
-        allowed_ids: List[int], 
-        max_results: int
+        db: Session, 
+        filters: Optional[Dict[str, Any]], 
+        min_relevance_score: float, 
+        predicates: List[Any], 
+        max_results: int,
+        rows: _ResultRows
     ) -> List[Dict[str, Any]]:
-        """Perform vector search limited to quality-filtered IDs"""
+        """Perform vector search with the quality filters evaluated by the vector store"""
         
-        # Perform semantic search
-        vector_results = await self.vector_service.intelligent_opportunity_discovery(query)
+        # Popular queries reuse their cached query embedding
+        query_embedding = await self.cache.get_embedding(query)
+        if query_embedding is None:
+            try:
+                query_embedding = await self.vector_service.embed_query(query)
+            except Exception as e:
+                logger.error(f"Query embedding failed: {e}")
+                return []
+            await self.cache.set_embedding(query, query_embedding)
         
-        # Filter results to only include quality-approved IDs
-        filtered_results = []
-        for opportunity in vector_results.get('opportunities', []):
-            opportunity_id = opportunity.get('metadata', {}).get('opportunity_id')
-            if opportunity_id and int(opportunity_id) in allowed_ids:
-                filtered_results.append(opportunity)
+        # Perform semantic search; over-fetch a little for the SQL-only checks below
+        vector_hits = await self.vector_service.filtered_opportunity_search(
+            query,
+            metadata_filter=vector_metadata_filter(filters, min_relevance_score),
+            top_k=max_results * 2,
+            query_embedding=query_embedding
+        )
+        
+        # Geographic focus and field-length checks have no metadata form, so
+        # the SQL predicates are applied while fetching the hits' details
+        filtered_results = await self._enrich_with_database_details(vector_hits, db, rows, predicates)
         
         # Sort by vector similarity score and limit results
-        filtered_results.sort(key=lambda x: x.get('score', 0), reverse=True)
+        filtered_results.sort(key=lambda x: x.get('vector_similarity_score', 0), reverse=True)
         return filtered_results[:max_results]
     
     async def _enrich_with_database_details(
         self, 
         vector_results: List[Dict[str, Any]], 
-        db: Session
+        db: Session,
+        rows: _ResultRows,
+        predicates: Optional[List[Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Enrich vector results with full database details"""
-        
-        enriched_results = []
+        """Enrich vector results with database details in one query (dropping hits that fail predicates)"""
         
+        hits = []
         for result in vector_results:
             opportunity_id = result.get('metadata', {}).get('opportunity_id')
-            if not opportunity_id:
-                continue
-            
-            # Fetch full opportunity details from database
-            opportunity = db.query(AfricaIntelligenceItem).filter(
-                AfricaIntelligenceItem.id == int(opportunity_id)
-            ).first()
-            
-            if opportunity:
-                enriched_result = {
-                    'id': opportunity.id,
-                    'title': opportunity.title,
-                    'description': opportunity.description,
-                    'funding_amount': opportunity.funding_amount,
-                    'currency': opportunity.currency,
-                    'application_deadline': opportunity.application_deadline.isoformat() if opportunity.application_deadline else None,
-                    'application_url': opportunity.application_url,
-                    'contact_email': opportunity.contact_email,
-                    'eligibility_criteria': opportunity.eligibility_criteria,
-                    'source_url': opportunity.source_url,
-                    'relevance_score': opportunity.relevance_score,
-                    'validation_status': opportunity.validation_status,
-                    'vector_similarity_score': result.get('score', 0),
-                    'created_at': opportunity.created_at.isoformat() if opportunity.created_at else None,
-                    'updated_at': opportunity.updated_at.isoformat() if opportunity.updated_at else None
-                }
-                enriched_results.append(enriched_result)
+            if opportunity_id:
+                hits.append((int(opportunity_id), result.get('score', 0)))
+        
+        # Rows already loaded by the text search passed the same predicates
+        rows.load(db, [opportunity_id for opportunity_id, _ in hits], predicates)
+        
+        enriched_results = []
+        for opportunity_id, score in hits:
+            result = rows.get(opportunity_id)
+            if result is not None:
+                result['vector_similarity_score'] = score
+                enriched_results.append(result)
         
         return enriched_results
     
@@ -322,41 +392,47 @@ class IntelligentSearchService:
     async def _rank_and_format_results(
         self, 
         enriched_results: List[Dict[str, Any]], 
-        query: str
+        query: str,
+        deadlines: Optional[Dict[int, float]] = None
     ) -> List[Dict[str, Any]]:
         """Apply final ranking and formatting to results"""
         
-        # Calculate composite score: relevance_score + vector_similarity + urgency
-        for result in enriched_results:
-            relevance_score = result.get('relevance_score', 0)
-            vector_score = result.get('vector_similarity_score', 0)
-            
-            # Urgency boost for near deadlines
-            urgency_boost = 0
-            if result.get('application_deadline'):
-                try:
-                    deadline = datetime.fromisoformat(result['application_deadline'].replace('Z', '+00:00'))
-                    days_until_deadline = (deadline - datetime.now()).days
-                    if 0 <= days_until_deadline <= 30:
-                        urgency_boost = 0.1  # Boost for deadlines within 30 days
-                    elif 0 <= days_until_deadline <= 90:
-                        urgency_boost = 0.05  # Smaller boost for deadlines within 90 days
-                except:
-                    pass
-            
-            # Composite score (weighted combination)
-            composite_score = (
-                relevance_score * 0.4 +  # Our objective relevance scoring
-                vector_score * 0.5 +     # Vector similarity to query
-                urgency_boost * 0.1      # Deadline urgency
+        if not enriched_results:
+            return enriched_results
+        
+        # Calculate composite score: relevance_score + vector_similarity + urgency, for all rows at once
+        relevance_scores = np.array([r.get('relevance_score') or 0 for r in enriched_results], dtype=float)
+        # Text matches carry their ts_rank_cd score in place of vector similarity
+        vector_scores = np.array(
+            [r.get('vector_similarity_score', r.get('text_rank', 0)) or 0 for r in enriched_results], dtype=float
+        )
+        deadline_ts = np.array([(deadlines or {}).get(r['id'], np.nan) for r in enriched_results], dtype=float)
+        
+        # Urgency boost for near deadlines (rows without a deadline compare False)
+        with np.errstate(invalid='ignore'):
+            days_until_deadline = np.floor((deadline_ts - datetime.now().timestamp()) / 86400)
+            urgency_boost = np.select(
+                [(days_until_deadline >= 0) & (days_until_deadline <= 30),
+                 (days_until_deadline >= 0) & (days_until_deadline <= 90)],
+                [0.1, 0.05],  # Boost for deadlines within 30, then 90 days
+                default=0.0
             )
-            
-            result['composite_score'] = composite_score
+        
+        # Composite score (weighted combination)
+        composite_scores = (
+            relevance_scores * 0.4 +  # Our objective relevance scoring
+            vector_scores * 0.5 +     # Vector similarity (or text rank) to query
+            urgency_boost * 0.1       # Deadline urgency
+        )
         
         # Sort by composite score
-        enriched_results.sort(key=lambda x: x.get('composite_score', 0), reverse=True)
+        ranked_results = []
+        for index in np.argsort(-composite_scores, kind='stable'):
+            result = enriched_results[index]
+            result['composite_score'] = float(composite_scores[index])
+            ranked_results.append(result)
         
-        return enriched_results
+        return ranked_results
 
 
 # Initialize service
@@ -417,6 +493,11 @@ async def search_opportunities(
     
     return results
 
+@router.get("/cache-stats")
+async def get_search_cache_stats():
+    """Hit ratios of the query-embedding and ranked-result caches"""
+    return search_service.cache.get_stats()
+
 @router.get("/suggestions")
 async def get_search_suggestions(
     partial_query: str = Query(..., description="Partial search query for suggestions"),
@@ -0,0 +1,201 @@
+"""
+Incremental TF-IDF Content Similarity Index
+===========================================
+
+Long-lived TF-IDF model for content-level duplicate detection. Documents are
+hashed into a fixed feature space (no vocabulary to refit), document
+frequencies are tracked incrementally, and the normalised TF-IDF matrix of the
+corpus is cached. Queries are transformed in batches and scored with a sparse
+dot product against the cached matrix, keeping only the top-k hits per query.
+
+New documents land in a small pending block that is searched alongside the
+main matrix; once it grows past ``refresh_ratio`` of the corpus the blocks are
+merged and the IDF weights refreshed. Removed documents are masked out of
+search results right away and their rows dropped at the next refresh.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+
+class TfidfSimilarityIndex:
+    """Hashing-feature TF-IDF index with cached sparse corpus matrix and top-k search"""
+
+    def __init__(self,
+                 n_features: int = 2 ** 18,
+                 ngram_range: Tuple[int, int] = (1, 2),
+                 refresh_ratio: float = 0.1,
+                 min_pending_for_refresh: int = 256):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            stop_words='english',
+            alternate_sign=False,
+            norm=None
+        )
+        self.refresh_ratio = refresh_ratio
+        self.min_pending_for_refresh = min_pending_for_refresh
+
+        # Raw term counts are kept so the matrix can be re-weighted when IDF changes
+        self._counts: Optional[sparse.csr_matrix] = None
+        self._pending_counts: List[sparse.csr_matrix] = []
+        self._doc_freq = np.zeros(n_features, dtype=np.float64)
+        self._idf: Optional[np.ndarray] = None
+
+        # Weighted corpus rows, cached transposed (features x docs) in CSR so each
+        # query batch is a single sparse product with no format conversion
+        self._matrix_t: Optional[sparse.csr_matrix] = None
+        self._pending_matrix_t: Optional[sparse.csr_matrix] = None
+
+        self.ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._main_size = 0
+        self._removed: Set[int] = set()
+        self._removed_positions: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, doc_id: Any) -> bool:
+        return doc_id is not None and str(doc_id) in self._positions
+
+    def add(self, doc_ids: Sequence[Any], texts: Sequence[str]) -> int:
+        """Add documents; ids already present are skipped. Returns the number added"""
+        new_ids, new_texts = [], []
+        for doc_id, text in zip(doc_ids, texts):
+            if doc_id is None:
+                continue
+            doc_id = str(doc_id)
+            if doc_id in self._positions:
+                continue
+            self._positions[doc_id] = len(self.ids) + len(new_ids)
+            new_ids.append(doc_id)
+            new_texts.append(text or '')
+
+        if not new_ids:
+            return 0
+
+        counts = self.vectorizer.transform(new_texts).tocsr()
+        self._doc_freq += np.bincount(counts.indices, minlength=self._doc_freq.shape[0])
+        self.ids.extend(new_ids)
+        self._pending_counts.append(counts)
+        self._pending_matrix_t = None
+
+        if self._idf is None or self._needs_refresh():
+            self.refresh()
+
+        return len(new_ids)
+
+    def remove(self, doc_ids: Sequence[Any]) -> int:
+        """Drop documents from search results; returns the number removed"""
+        removed = 0
+        for doc_id in doc_ids:
+            position = self._positions.pop(str(doc_id), None) if doc_id is not None else None
+            if position is not None:
+                self._removed.add(position)
+                removed += 1
+
+        if removed:
+            self._removed_positions = np.fromiter(self._removed, dtype=np.int64)
+        return removed
+
+    def refresh(self):
+        """Merge pending documents into the main matrix and recompute IDF weights"""
+        blocks = ([self._counts] if self._counts is not None else []) + self._pending_counts
+        if not blocks:
+            return
+
+        self._counts = sparse.vstack(blocks, format='csr')
+        self._pending_counts = []
+        if self._removed:
+            self._drop_removed_rows()
+        self._main_size = self._counts.shape[0]
+
+        # Smoothed IDF, as in sklearn's TfidfTransformer
+        n_docs = self._main_size
+        self._idf = np.log((1.0 + n_docs) / (1.0 + self._doc_freq)) + 1.0
+
+        self._matrix_t = self._weight(self._counts).T.tocsr()
+        self._pending_matrix_t = None
+        logger.debug(f"TF-IDF index refreshed with {n_docs} documents")
+
+    def transform(self, texts: Sequence[str]) -> sparse.csr_matrix:
+        """L2-normalised TF-IDF rows for query texts under the current IDF weights"""
+        counts = self.vectorizer.transform([text or '' for text in texts]).tocsr()
+        return self._weight(counts)
+
+    def search(self, texts: Sequence[str], top_k: int = 10,
+               min_score: float = 0.0) -> List[List[Tuple[str, float]]]:
+        """Top-k (doc_id, cosine) hits for each query text"""
+        if not texts:
+            return []
+        if not self.ids:
+            return [[] for _ in texts]
+        return self.search_matrix(self.transform(texts), top_k=top_k, min_score=min_score)
+
+    def search_matrix(self, queries: sparse.csr_matrix, top_k: int = 10,
+                      min_score: float = 0.0) -> List[List[Tuple[str, float]]]:
+        """Top-k hits for pre-transformed query rows"""
+        if self._matrix_t is None:
+            return [[] for _ in range(queries.shape[0])]
+
+        # Pending rows are scored separately so adds never copy the main matrix
+        scores = queries @ self._matrix_t
+        pending_t = self._pending_block_t()
+        if pending_t is not None:
+            scores = sparse.hstack([scores, queries @ pending_t])
+        scores = scores.tocsr()
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            columns = scores.indices[start:end]
+            values = scores.data[start:end]
+
+            keep = values >= min_score
+            if self._removed_positions is not None:
+                keep &= ~np.isin(columns, self._removed_positions)
+            columns, values = columns[keep], values[keep]
+            if values.size > top_k:
+                best = np.argpartition(-values, top_k - 1)[:top_k]
+                columns, values = columns[best], values[best]
+
+            order = np.argsort(-values)
+            results.append([(self.ids[columns[i]], float(values[i])) for i in order])
+
+        return results
+
+    def _drop_removed_rows(self):
+        removed = sorted(self._removed)
+        self._doc_freq -= np.bincount(self._counts[removed].indices, minlength=self._doc_freq.shape[0])
+        live = np.setdiff1d(np.arange(self._counts.shape[0]), removed)
+        self._counts = self._counts[live]
+        self.ids = [self.ids[position] for position in live]
+        self._positions = {doc_id: position for position, doc_id in enumerate(self.ids)}
+        self._removed = set()
+        self._removed_positions = None
+
+    def _needs_refresh(self) -> bool:
+        pending = sum(block.shape[0] for block in self._pending_counts)
+        return pending >= max(self.min_pending_for_refresh, self.refresh_ratio * self._main_size)
+
+    def _weight(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        if self._idf is None:
+            return normalize(counts.astype(np.float64), norm='l2', copy=True).tocsr()
+
+        weighted = counts.astype(np.float64).multiply(self._idf).tocsr()
+        return normalize(weighted, norm='l2', copy=False).tocsr()
+
+    def _pending_block_t(self) -> Optional[sparse.csr_matrix]:
+        if not self._pending_counts:
+            return None
+        if self._pending_matrix_t is None:
+            pending = self._weight(sparse.vstack(self._pending_counts, format='csr'))
+            self._pending_matrix_t = pending.T.tocsr()
+        return self._pending_matrix_t
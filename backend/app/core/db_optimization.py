@@ -29,6 +29,7 @@ from app.models.funding import AfricaIntelligenceItem, FundingType
 from app.models.organization import Organization
 from app.models.validation import ValidationResult as ValidationResultModel
 from app.core.data_validation import ValidationResult, ValidationStatus
+from app.services.search_cache import get_search_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -235,15 +236,30 @@ class OptimizedCRUD:
                     inserted_ids.extend(batch_ids)
                     
                     await session.commit()
+                    await self._register_for_deduplication(
+                        [{**opp, 'id': opp_id} for opp, opp_id in zip(batch_data, batch_ids)]
+                    )
                     
                     self.logger.info(f"Bulk inserted batch of {len(batch)} opportunities")
             
+            # Cached intelligent search rankings no longer reflect the data
+            if inserted_ids:
+                await get_search_cache().invalidate()
+            
             return inserted_ids
             
         except Exception as e:
             self.logger.error(f"Bulk insert failed: {e}")
             raise
     
+    async def _register_for_deduplication(self, rows: List[Dict[str, Any]]):
+        """Add committed rows to this process's duplicate-detection indexes"""
+        try:
+            from app.services.source_validation.deduplication import register_inserted_opportunities
+            await register_inserted_opportunities(rows)
+        except Exception as e:
+            self.logger.warning(f"Could not register {len(rows)} opportunities for deduplication: {e}")
+    
     async def bulk_update_validation_results(self, validation_results: List[ValidationResult]) -> int:
         """Bulk update validation results"""
         try:
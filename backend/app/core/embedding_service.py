@@ -0,0 +1,270 @@
+"""
+Shared Sentence Embedding Service
+=================================
+
+One sentence-transformers model per process, loaded lazily on first use and
+shared by every caller (deduplication, semantic duplicate checks, ...).
+
+- ``encode`` embeds a list of texts synchronously in one model call.
+- ``encode_async`` micro-batches concurrent callers: requests arriving within
+  ``max_batch_delay_ms`` are merged into a single model call that runs in a
+  worker thread, so the event loop never blocks on inference.
+- Embeddings are cached by content hash in an in-process LRU and, optionally,
+  in a SQLite file (``EMBEDDING_CACHE_PATH``) shared across restarts.
+
+Use ``get_embedding_service(model_name)`` rather than constructing the class.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+
+class EmbeddingDiskCache:
+    """SQLite-backed embedding cache keyed by content hash"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER, vector BLOB)"
+            )
+            self._connection.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found: Dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, dim, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, items: Sequence[Tuple[str, np.ndarray]]):
+        if not items:
+            return
+
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+                [(key, int(vector.shape[0]), vector.astype(np.float32).tobytes()) for key, vector in items]
+            )
+            self._connection.commit()
+
+
+class EmbeddingService:
+    """Lazily loaded, cached, micro-batching wrapper around a SentenceTransformer"""
+
+    def __init__(self,
+                 model_name: str = DEFAULT_MODEL_NAME,
+                 batch_size: int = 64,
+                 max_batch_delay_ms: float = 5.0,
+                 cache_size: int = 50000,
+                 cache_path: Optional[str] = None):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_batch_delay = max_batch_delay_ms / 1000.0
+        self.cache_size = cache_size
+
+        self._model = None
+        self._load_error: Optional[Exception] = None
+        self._load_lock = threading.Lock()
+
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._disk_cache: Optional[EmbeddingDiskCache] = None
+        if cache_path:
+            try:
+                self._disk_cache = EmbeddingDiskCache(cache_path)
+            except Exception as e:
+                logger.warning(f"Embedding disk cache disabled ({cache_path}): {e}")
+
+        # Micro-batching state, kept per event loop
+        self._pending: Dict[asyncio.AbstractEventLoop, List[Tuple[List[str], asyncio.Future]]] = {}
+        self._flush_handles: Dict[asyncio.AbstractEventLoop, asyncio.TimerHandle] = {}
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'model_calls': 0,
+            'texts_encoded': 0
+        }
+
+    @property
+    def available(self) -> bool:
+        """Whether the model can be used; triggers the lazy load"""
+        try:
+            self._get_model()
+            return True
+        except Exception:
+            return False
+
+    def _get_model(self):
+        if self._model is not None:
+            return self._model
+        if self._load_error is not None:
+            raise self._load_error
+
+        with self._load_lock:
+            if self._model is None and self._load_error is None:
+                try:
+                    from sentence_transformers import SentenceTransformer
+                    logger.info(f"Loading sentence transformer '{self.model_name}'")
+                    self._model = SentenceTransformer(self.model_name)
+                except Exception as e:
+                    logger.warning(f"Could not load sentence transformer '{self.model_name}': {e}")
+                    self._load_error = e
+                    raise
+
+        if self._load_error is not None:
+            raise self._load_error
+        return self._model
+
+    def cache_key(self, text: str) -> str:
+        return hashlib.sha1(f"{self.model_name}|{text}".encode('utf-8')).hexdigest()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, serving repeats from cache and encoding misses in one model call"""
+        texts = [text or '' for text in texts]
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [self.cache_key(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._cache_lock:
+            for key in keys:
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[key] = vector
+        self.stats['memory_hits'] += sum(1 for key in keys if key in vectors)
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self._disk_cache is not None:
+            from_disk = self._disk_cache.get_many(missing)
+            self.stats['disk_hits'] += len(from_disk)
+            vectors.update(from_disk)
+            self._remember(from_disk.items())
+            missing = [key for key in missing if key not in vectors]
+
+        if missing:
+            text_by_key = dict(zip(keys, texts))
+            encoded = self._encode_uncached([text_by_key[key] for key in missing])
+            fresh = list(zip(missing, encoded))
+            self.stats['misses'] += len(missing)
+            vectors.update(fresh)
+            self._remember(fresh)
+            if self._disk_cache is not None:
+                self._disk_cache.put_many(fresh)
+
+        return np.stack([vectors[key] for key in keys])
+
+    async def encode_async(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts without blocking the loop, batching with concurrent callers"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(loop, [])
+        pending.append((list(texts), future))
+
+        if sum(len(request_texts) for request_texts, _ in pending) >= self.batch_size:
+            self._flush(loop)
+        elif loop not in self._flush_handles:
+            self._flush_handles[loop] = loop.call_later(self.max_batch_delay, self._flush, loop)
+
+        return await future
+
+    def _flush(self, loop: asyncio.AbstractEventLoop):
+        handle = self._flush_handles.pop(loop, None)
+        if handle is not None:
+            handle.cancel()
+
+        requests = self._pending.pop(loop, [])
+        if not requests:
+            return
+
+        merged = [text for request_texts, _ in requests for text in request_texts]
+
+        async def run_batch():
+            try:
+                vectors = await loop.run_in_executor(None, self.encode, merged)
+            except Exception as e:
+                for _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            offset = 0
+            for request_texts, future in requests:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+        loop.create_task(run_batch())
+
+    def _encode_uncached(self, texts: List[str]) -> List[np.ndarray]:
+        model = self._get_model()
+        self.stats['model_calls'] += 1
+        self.stats['texts_encoded'] += len(texts)
+        encoded = model.encode(texts, batch_size=self.batch_size, show_progress_bar=False)
+        return [np.asarray(vector, dtype=np.float32) for vector in encoded]
+
+    def _remember(self, items):
+        with self._cache_lock:
+            for key, vector in items:
+                self._cache[key] = vector
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, float]:
+        lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'model_loaded': self._model is not None,
+            'cached_embeddings': len(self._cache),
+            'hit_ratio': (lookups - self.stats['misses']) / lookups if lookups else 0.0
+        }
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: str = DEFAULT_MODEL_NAME) -> EmbeddingService:
+    """Process-wide embedding service for a model (the model itself loads on first encode)"""
+    service = _services.get(model_name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(model_name)
+            if service is None:
+                service = EmbeddingService(
+                    model_name=model_name,
+                    cache_path=os.getenv('EMBEDDING_CACHE_PATH')
+                )
+                _services[model_name] = service
+    return service
@@ -21,10 +21,27 @@ from dataclasses import dataclass, field
 from enum import Enum
 import hashlib
 import json
+import os
 import re
+from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 import uuid
 
+try:
+    from app.core.minhash_lsh import MinHashLSHIndex
+except ImportError:
+    from .minhash_lsh import MinHashLSHIndex
+
+try:
+    from app.core.content_similarity_index import TfidfSimilarityIndex
+except ImportError:
+    from .content_similarity_index import TfidfSimilarityIndex
+
+try:
+    from app.core.semantic_duplicate_engine import SemanticCandidate, SemanticDuplicateEngine
+except ImportError:
+    from .semantic_duplicate_engine import SemanticCandidate, SemanticDuplicateEngine
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -104,6 +121,145 @@ class ContentFingerprint:
         signature = '|'.join(signature_parts)
         return hashlib.md5(signature.encode()).hexdigest()
 
+# =============================================================================
+# PERSISTENT SIGNATURE INDEX
+# =============================================================================
+
+class SignatureIndex:
+    """Hash map from fingerprint signature to content ids, persisted between runs.
+
+    Existing items are fingerprinted once, when first seen; afterwards an exact
+    signature lookup is a single dict access instead of a full corpus scan. A
+    hash of the fingerprinted text is kept per id, so an item whose title or
+    description changed is detected and fingerprinted again.
+    """
+    
+    FORMAT_VERSION = 2
+    SUPPORTED_VERSIONS = (1, 2)
+    
+    def __init__(self, path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path) if path else None
+        self.signature_to_ids: Dict[str, Set[str]] = {}
+        self.id_to_signature: Dict[str, str] = {}
+        self.content_hashes: Dict[str, str] = {}
+        self.dirty = False
+        
+        if self.path:
+            self.load()
+    
+    def __len__(self) -> int:
+        return len(self.id_to_signature)
+    
+    def __contains__(self, content_id: Any) -> bool:
+        return content_id is not None and str(content_id) in self.id_to_signature
+    
+    def add(self, content_id: Any, signature: str, content_hash: Optional[str] = None):
+        """Add or re-point a content id to a signature"""
+        if content_id is None or not signature:
+            return
+        
+        content_id = str(content_id)
+        if content_hash is not None and self.content_hashes.get(content_id) != content_hash:
+            self.content_hashes[content_id] = content_hash
+            self.dirty = True
+        
+        previous = self.id_to_signature.get(content_id)
+        if previous == signature:
+            return
+        if previous is not None:
+            self._discard_from_bucket(content_id, previous)
+        
+        self.id_to_signature[content_id] = signature
+        self.signature_to_ids.setdefault(signature, set()).add(content_id)
+        self.dirty = True
+    
+    def remove(self, content_id: Any):
+        """Remove a content id from the index"""
+        if content_id is None:
+            return
+        
+        signature = self.id_to_signature.pop(str(content_id), None)
+        self.content_hashes.pop(str(content_id), None)
+        if signature is not None:
+            self._discard_from_bucket(str(content_id), signature)
+            self.dirty = True
+    
+    def content_hash(self, content_id: Any) -> Optional[str]:
+        """Hash of the text a content id was fingerprinted from, if recorded"""
+        return self.content_hashes.get(str(content_id))
+    
+    def lookup(self, signature: str) -> Set[str]:
+        """Return the ids registered under a signature"""
+        return set(self.signature_to_ids.get(signature, ()))
+    
+    def load(self) -> bool:
+        """Load the index from disk, starting empty if the file is missing or unreadable"""
+        if not self.path or not self.path.exists():
+            return False
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get('version') not in self.SUPPORTED_VERSIONS:
+                self.logger.warning(f"Ignoring signature index with unsupported version: {data.get('version')}")
+                return False
+            
+            self.signature_to_ids = {}
+            self.id_to_signature = {}
+            for signature, content_ids in data.get('signatures', {}).items():
+                self.signature_to_ids[signature] = set(content_ids)
+                for content_id in content_ids:
+                    self.id_to_signature[content_id] = signature
+            # Version 1 files have no hashes; their ids are re-fingerprinted when next seen
+            self.content_hashes = dict(data.get('content_hashes', {}))
+            
+            self.dirty = False
+            self.logger.info(f"Loaded signature index with {len(self.id_to_signature)} items from {self.path}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to load signature index from {self.path}: {e}")
+            return False
+    
+    def save(self, force: bool = False) -> bool:
+        """Write the index to disk atomically if it has changed"""
+        if not self.path or not (self.dirty or force):
+            return False
+        
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                'version': self.FORMAT_VERSION,
+                'saved_at': datetime.now().isoformat(),
+                'signatures': {
+                    signature: sorted(content_ids)
+                    for signature, content_ids in self.signature_to_ids.items()
+                },
+                'content_hashes': self.content_hashes
+            }
+            
+            tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            
+            self.dirty = False
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save signature index to {self.path}: {e}")
+            return False
+    
+    def _discard_from_bucket(self, content_id: str, signature: str):
+        bucket = self.signature_to_ids.get(signature)
+        if bucket is None:
+            return
+        bucket.discard(content_id)
+        if not bucket:
+            del self.signature_to_ids[signature]
+
 # =============================================================================
 # ENHANCED DUPLICATE DETECTOR
 # =============================================================================
@@ -111,7 +267,8 @@ class ContentFingerprint:
 class EnhancedDuplicateDetector:
     """Enhanced duplicate detection with multiple strategies"""
     
-    def __init__(self):
+    def __init__(self, signature_index_path: Optional[str] = None,
+                 semantic_engine: Optional[SemanticDuplicateEngine] = None):
         self.logger = logging.getLogger(__name__)
         
         # Detection thresholds
@@ -126,6 +283,36 @@ class EnhancedDuplicateDetector:
         self.organization_funding_map = {}
         self.announcement_chains = {}
         
+        # Persistent signature index (exact-match lookups without re-fingerprinting the corpus)
+        self.signature_index = SignatureIndex(
+            signature_index_path or os.getenv('DUPLICATE_SIGNATURE_INDEX_PATH')
+        )
+        
+        # MinHash/LSH candidate indexes for near-duplicate title checks
+        self.title_lsh = MinHashLSHIndex(num_perm=128, bands=32)
+        self.description_lsh = MinHashLSHIndex(num_perm=128, bands=16)
+        self.lsh_items: Dict[str, Dict[str, Any]] = {}
+        
+        # Text hash of every id in the in-memory indexes, to notice updated rows
+        self._indexed_hashes: Dict[str, str] = {}
+        
+        # Items of the batch being checked are matched against later items of the
+        # batch without entering the long-lived indexes: only stored items do
+        self._unstored: Set[int] = set()
+        self._batch_signatures: Dict[int, str] = {}
+        self._batch_title_lsh: Optional[MinHashLSHIndex] = None
+        self._batch_description_lsh: Optional[MinHashLSHIndex] = None
+        self._batch_lsh_items: Dict[str, Dict[str, Any]] = {}
+        
+        # Long-lived TF-IDF index for content similarity (fitted incrementally, never per call)
+        self.content_index = TfidfSimilarityIndex()
+        self.content_top_k = 10
+        self._batch_content_hits: Dict[int, List[Tuple[Any, float]]] = {}
+        
+        # Embedding prefilter + batched LLM adjudication for semantic checks
+        self.semantic_engine = semantic_engine or SemanticDuplicateEngine()
+        self._batch_semantic_hits: Dict[int, List[SemanticCandidate]] = {}
+        
         # Patterns for extracting funding information
         self.funding_amount_patterns = [
             r'\$([0-9,]+(?:\.[0-9]+)?)\s*(million|billion|k|thousand)?',
@@ -147,6 +334,10 @@ class EnhancedDuplicateDetector:
         matches = []
         
         try:
+            # Batch detection invalidates once up front
+            if self._batch_title_lsh is None:
+                self._invalidate_changed_content(existing_content)
+            
             # Generate fingerprint for new content
             new_fingerprint = await self._generate_fingerprint(new_content)
             
@@ -188,6 +379,58 @@ class EnhancedDuplicateDetector:
             self.logger.error(f"Duplicate detection failed: {e}")
             return []
     
+    async def detect_duplicates_batch(self, new_items: List[Dict[str, Any]],
+                                      existing_content: Optional[List[Dict[str, Any]]] = None) -> List[List[DuplicateMatch]]:
+        """Detect duplicates for a whole ingestion batch in one pass
+        
+        Existing content is indexed once up front; each new item is then matched
+        against the indexes and against the batch items that came before it, so
+        two copies of the same story inside one batch are also caught. Batch items
+        are not added to the indexes; callers register the ones they store with
+        register_content. Returns one match list per new item, in input order.
+        """
+        existing_content = list(existing_content or [])
+        results: List[List[DuplicateMatch]] = []
+        
+        try:
+            self._invalidate_changed_content(existing_content)
+            await self._index_existing_content(existing_content)
+            self._index_lsh_content(existing_content)
+            self._index_content_similarity(existing_content)
+            
+            # Content similarity for the whole batch is scored in one sparse product, and
+            # all semantic candidate pairs of the batch share the same LLM prompts
+            self._batch_content_hits = self._score_content_batch(new_items, existing_content)
+            self._batch_semantic_hits = await self._score_semantic_batch(new_items, existing_content)
+            self._batch_title_lsh = MinHashLSHIndex(num_perm=128, bands=32)
+            self._batch_description_lsh = MinHashLSHIndex(num_perm=128, bands=16)
+            
+            for new_content in new_items:
+                matches = await self.detect_duplicates(new_content, existing_content)
+                results.append(matches)
+                self._unstored.add(id(new_content))
+                self._add_to_batch_lsh(new_content)
+                existing_content.append(new_content)
+            
+            self.logger.info(
+                f"Batch duplicate detection: {len(new_items)} items, "
+                f"{sum(1 for matches in results if matches)} with matches"
+            )
+            return results
+            
+        except Exception as e:
+            self.logger.error(f"Batch duplicate detection failed: {e}")
+            return results + [[] for _ in range(len(new_items) - len(results))]
+        
+        finally:
+            self._batch_content_hits = {}
+            self._batch_semantic_hits = {}
+            self._unstored = set()
+            self._batch_signatures = {}
+            self._batch_title_lsh = None
+            self._batch_description_lsh = None
+            self._batch_lsh_items = {}
+    
     async def _generate_fingerprint(self, content: Dict[str, Any]) -> ContentFingerprint:
         """Generate content fingerprint"""
         try:
@@ -250,23 +493,34 @@ class EnhancedDuplicateDetector:
         try:
             new_signature = new_fingerprint.generate_signature()
             
+            # Fingerprint only the existing items the index has not seen yet
+            await self._index_existing_content(existing_content)
+            
+            candidate_ids = self.signature_index.lookup(new_signature)
+            candidate_ids.discard(str(new_fingerprint.content_id))
+            
+            # The index stores ids as strings; report them with their original type where known
+            original_ids = {str(existing.get('id')): existing.get('id') for existing in existing_content}
+            
+            # Items without an id and unstored batch items are not indexed, so they are compared directly
             for existing in existing_content:
-                existing_fingerprint = await self._generate_fingerprint(existing)
-                existing_signature = existing_fingerprint.generate_signature()
-                
-                if new_signature == existing_signature:
-                    matches.append(DuplicateMatch(
-                        original_id=existing.get('id'),
-                        duplicate_id=new_fingerprint.content_id,
-                        duplicate_type=DuplicateType.EXACT_MATCH,
-                        confidence_score=0.95,
-                        similarity_score=1.0,
-                        action=DuplicateAction.REJECT,
-                        details={
-                            'signature': new_signature,
-                            'match_type': 'exact_signature'
-                        }
-                    ))
+                if not self._indexable(existing) and await self._batch_signature(existing) == new_signature:
+                    existing_id = existing.get('id')
+                    candidate_ids.add(None if existing_id is None else str(existing_id))
+            
+            for candidate_id in sorted(candidate_ids, key=str):
+                matches.append(DuplicateMatch(
+                    original_id=original_ids.get(candidate_id, candidate_id),
+                    duplicate_id=new_fingerprint.content_id,
+                    duplicate_type=DuplicateType.EXACT_MATCH,
+                    confidence_score=0.95,
+                    similarity_score=1.0,
+                    action=DuplicateAction.REJECT,
+                    details={
+                        'signature': new_signature,
+                        'match_type': 'exact_signature'
+                    }
+                ))
             
             return matches
             
@@ -274,6 +528,86 @@ class EnhancedDuplicateDetector:
             self.logger.error(f"Signature matching failed: {e}")
             return []
     
+    async def _index_existing_content(self, existing_content: List[Dict[str, Any]]):
+        """Add any existing items missing from the signature index"""
+        for existing in existing_content:
+            if not self._indexable(existing) or existing.get('id') in self.signature_index:
+                continue
+            
+            existing_fingerprint = await self._generate_fingerprint(existing)
+            self.signature_index.add(existing['id'], existing_fingerprint.generate_signature(),
+                                     self._text_hash(existing))
+    
+    async def _batch_signature(self, content: Dict[str, Any]) -> str:
+        """Signature of an item that is compared directly, cached while it is part of the batch"""
+        signature = self._batch_signatures.get(id(content))
+        if signature is None:
+            signature = (await self._generate_fingerprint(content)).generate_signature()
+            if id(content) in self._unstored:
+                self._batch_signatures[id(content)] = signature
+        return signature
+    
+    def _indexable(self, content: Dict[str, Any]) -> bool:
+        """Stored items with an id go into the long-lived indexes; unstored batch items never do"""
+        return content.get('id') is not None and id(content) not in self._unstored
+    
+    def _text_hash(self, content: Dict[str, Any]) -> str:
+        """Hash of the fields every index is built from"""
+        return hashlib.md5(self._content_text(content).encode()).hexdigest()
+    
+    def _invalidate_changed_content(self, existing_content: List[Dict[str, Any]]):
+        """Drop indexed items whose title or description changed since they were indexed"""
+        for existing in existing_content:
+            if not self._indexable(existing):
+                continue
+            content_id = str(existing['id'])
+            text_hash = self._text_hash(existing)
+            if (self._indexed_hashes.get(content_id, text_hash) != text_hash
+                    or (content_id in self.signature_index
+                        and self.signature_index.content_hash(content_id) != text_hash)):
+                self.unregister_content(content_id)
+    
+    async def register_content(self, content: Dict[str, Any]) -> Optional[str]:
+        """Record stored content in the indexes so later items match against it
+        
+        Call this once the item is durably stored, and again after it is updated;
+        a changed title or description replaces the previous index entries.
+        """
+        if content.get('id') is None:
+            return None
+        
+        content_id = str(content['id'])
+        text_hash = self._text_hash(content)
+        if self._indexed_hashes.get(content_id, text_hash) != text_hash:
+            self.unregister_content(content_id)
+        
+        fingerprint = await self._generate_fingerprint(content)
+        signature = fingerprint.generate_signature()
+        self.signature_index.add(content['id'], signature, text_hash)
+        self._add_to_lsh(content)
+        self.content_index.add([content['id']], [self._content_text(content)])
+        await self.semantic_engine.index([content['id']], [self._content_text(content)])
+        self._indexed_hashes[content_id] = text_hash
+        return signature
+    
+    def unregister_content(self, content_id: Any):
+        """Remove deleted (or changed) content from every index"""
+        if content_id is None:
+            return
+        
+        content_id = str(content_id)
+        self.signature_index.remove(content_id)
+        self.title_lsh.remove(content_id)
+        self.description_lsh.remove(content_id)
+        self.lsh_items.pop(content_id, None)
+        self.content_index.remove([content_id])
+        self.semantic_engine.remove([content_id])
+        self._indexed_hashes.pop(content_id, None)
+    
+    def save_signature_index(self) -> bool:
+        """Persist the signature index if it has changed"""
+        return self.signature_index.save()
+    
     async def _check_title_similarity(self, new_content: Dict[str, Any], existing_content: List[Dict[str, Any]]) -> List[DuplicateMatch]:
         """Check title similarity with context awareness"""
         matches = []
@@ -283,7 +617,10 @@ class EnhancedDuplicateDetector:
             
             new_title = new_content.get('title', '').strip().lower()
             
-            for existing in existing_content:
+            # Only LSH bucket hits (plus un-indexable items without an id) are scored exactly
+            candidates = self._get_lsh_candidates(new_content, existing_content)
+            
+            for existing in candidates:
                 existing_title = existing.get('title', '').strip().lower()
                 
                 # Calculate similarity
@@ -309,7 +646,8 @@ class EnhancedDuplicateDetector:
                             details={
                                 'title_similarity': similarity,
                                 'org_match': org_match,
-                                'amount_match': amount_match
+                                'amount_match': amount_match,
+                                'lsh_candidates': len(candidates)
                             }
                         ))
             
@@ -319,61 +657,85 @@ class EnhancedDuplicateDetector:
             self.logger.error(f"Title similarity check failed: {e}")
             return []
     
+    def _index_lsh_content(self, existing_content: List[Dict[str, Any]]):
+        """Add any existing items missing from the MinHash/LSH indexes"""
+        for existing in existing_content:
+            if not self._indexable(existing) or str(existing['id']) in self.lsh_items:
+                continue
+            self._add_to_lsh(existing)
+    
+    def _add_to_lsh(self, content: Dict[str, Any]):
+        content_id = str(content['id'])
+        self.title_lsh.add(content_id, content.get('title', ''))
+        self.description_lsh.add(content_id, content.get('description', ''))
+        self.lsh_items[content_id] = self._lsh_fields(content)
+        self._indexed_hashes[content_id] = self._text_hash(content)
+    
+    def _add_to_batch_lsh(self, content: Dict[str, Any]):
+        """Index a checked batch item for the rest of the batch only (keyed by batch position)"""
+        key = str(len(self._batch_lsh_items))
+        self._batch_title_lsh.add(key, content.get('title', ''))
+        self._batch_description_lsh.add(key, content.get('description', ''))
+        self._batch_lsh_items[key] = self._lsh_fields(content)
+    
+    @staticmethod
+    def _lsh_fields(content: Dict[str, Any]) -> Dict[str, Any]:
+        # Keep only the fields the exact and context scoring need
+        return {
+            'id': content.get('id'),
+            'title': content.get('title', ''),
+            'description': content.get('description', '')
+        }
+    
+    def _get_lsh_candidates(self, new_content: Dict[str, Any], existing_content: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Existing items sharing an LSH bucket with the new item's title or description"""
+        self._index_lsh_content(existing_content)
+        
+        new_id = new_content.get('id')
+        candidate_ids = self.title_lsh.query(new_content.get('title', ''), exclude=new_id)
+        candidate_ids |= self.description_lsh.query(new_content.get('description', ''), exclude=new_id)
+        
+        candidates = [self.lsh_items[candidate_id] for candidate_id in sorted(candidate_ids)]
+        
+        # Earlier items of the current batch, from the batch-local indexes
+        if self._batch_title_lsh is not None:
+            batch_keys = self._batch_title_lsh.query(new_content.get('title', ''))
+            batch_keys |= self._batch_description_lsh.query(new_content.get('description', ''))
+            candidates.extend(self._batch_lsh_items[key] for key in sorted(batch_keys, key=int))
+        
+        candidates.extend(
+            existing for existing in existing_content
+            if existing.get('id') is None and id(existing) not in self._unstored
+        )
+        return candidates
+    
     async def _check_content_similarity(self, new_content: Dict[str, Any], existing_content: List[Dict[str, Any]]) -> List[DuplicateMatch]:
         """Check content similarity using TF-IDF and cosine similarity"""
         matches = []
         
         try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-            import numpy as np
-            
-            new_text = f"{new_content.get('title', '')} {new_content.get('description', '')}"
-            
-            # Prepare text corpus
-            texts = [new_text]
-            existing_texts = []
-            existing_ids = []
-            
-            for existing in existing_content:
-                existing_text = f"{existing.get('title', '')} {existing.get('description', '')}"
-                texts.append(existing_text)
-                existing_texts.append(existing_text)
-                existing_ids.append(existing.get('id'))
-            
-            if not existing_texts:
-                return matches
-            
-            # Calculate TF-IDF
-            vectorizer = TfidfVectorizer(
-                stop_words='english',
-                max_features=1000,
-                ngram_range=(1, 2)
-            )
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            
-            # Calculate cosine similarity
-            similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+            hits = self._batch_content_hits.get(id(new_content))
+            if hits is None:
+                hits = self._score_content_batch([new_content], existing_content).get(id(new_content), [])
             
             # Find matches above threshold
-            for i, similarity in enumerate(similarities):
-                if similarity >= self.content_similarity_threshold:
-                    confidence = similarity * 0.8  # Slight penalty for content-only match
-                    
-                    action = DuplicateAction.REJECT if confidence >= 0.85 else DuplicateAction.MANUAL_REVIEW
-                    
-                    matches.append(DuplicateMatch(
-                        original_id=existing_ids[i],
-                        duplicate_id=new_content.get('id'),
-                        duplicate_type=DuplicateType.CONTENT_SIMILARITY,
-                        confidence_score=confidence,
-                        similarity_score=similarity,
-                        action=action,
-                        details={
-                            'content_similarity': similarity,
-                            'vector_features': len(vectorizer.vocabulary_)
-                        }
-                    ))
+            for original_id, similarity in hits:
+                confidence = similarity * 0.8  # Slight penalty for content-only match
+                
+                action = DuplicateAction.REJECT if confidence >= 0.85 else DuplicateAction.MANUAL_REVIEW
+                
+                matches.append(DuplicateMatch(
+                    original_id=original_id,
+                    duplicate_id=new_content.get('id'),
+                    duplicate_type=DuplicateType.CONTENT_SIMILARITY,
+                    confidence_score=confidence,
+                    similarity_score=similarity,
+                    action=action,
+                    details={
+                        'content_similarity': similarity,
+                        'indexed_documents': len(self.content_index)
+                    }
+                ))
             
             return matches
             
@@ -381,68 +743,104 @@ class EnhancedDuplicateDetector:
             self.logger.error(f"Content similarity check failed: {e}")
             return []
     
+    def _content_text(self, content: Dict[str, Any]) -> str:
+        return f"{content.get('title', '')} {content.get('description', '')}"
+    
+    def _index_content_similarity(self, existing_content: List[Dict[str, Any]]):
+        """Add any existing items missing from the TF-IDF index"""
+        missing = [
+            existing for existing in existing_content
+            if self._indexable(existing) and existing.get('id') not in self.content_index
+        ]
+        if missing:
+            self.content_index.add(
+                [existing.get('id') for existing in missing],
+                [self._content_text(existing) for existing in missing]
+            )
+            for existing in missing:
+                self._indexed_hashes[str(existing['id'])] = self._text_hash(existing)
+    
+    def _score_content_batch(self, new_items: List[Dict[str, Any]],
+                             existing_content: List[Dict[str, Any]]) -> Dict[int, List[Tuple[Any, float]]]:
+        """Top-k content hits above threshold for each new item, keyed by id() of the item
+        
+        New items are scored against the cached corpus matrix, against existing
+        items that have no id (and so cannot be indexed), and against the new
+        items that precede them in the batch.
+        """
+        import numpy as np
+        
+        self._index_content_similarity(existing_content)
+        if not new_items:
+            return {}
+        
+        threshold = self.content_similarity_threshold
+        queries = self.content_index.transform([self._content_text(item) for item in new_items])
+        corpus_hits = self.content_index.search_matrix(queries, top_k=self.content_top_k, min_score=threshold)
+        
+        original_ids = {str(existing.get('id')): existing.get('id') for existing in existing_content}
+        
+        # Items the index cannot hold, plus earlier items of the same batch
+        unindexed = [existing for existing in existing_content if not self._indexable(existing)]
+        unindexed_scores = None
+        if unindexed:
+            unindexed_rows = self.content_index.transform([self._content_text(item) for item in unindexed])
+            unindexed_scores = (queries @ unindexed_rows.T).toarray()
+        batch_scores = (queries @ queries.T).toarray() if len(new_items) > 1 else None
+        
+        hits: Dict[int, List[Tuple[Any, float]]] = {}
+        for row, new_content in enumerate(new_items):
+            own_id = new_content.get('id')
+            item_hits = [
+                (original_ids.get(doc_id, doc_id), score)
+                for doc_id, score in corpus_hits[row]
+                if own_id is None or doc_id != str(own_id)
+            ]
+            
+            if unindexed_scores is not None:
+                for column in np.flatnonzero(unindexed_scores[row] >= threshold):
+                    item_hits.append((None, float(unindexed_scores[row, column])))
+            
+            if batch_scores is not None:
+                for column in np.flatnonzero(batch_scores[row, :row] >= threshold):
+                    earlier_id = new_items[column].get('id')
+                    if own_id is not None and earlier_id == own_id:
+                        continue
+                    item_hits.append((earlier_id, float(batch_scores[row, column])))
+            
+            item_hits.sort(key=lambda hit: hit[1], reverse=True)
+            hits[id(new_content)] = item_hits[:self.content_top_k]
+        
+        return hits
+    
     async def _check_semantic_similarity(self, new_content: Dict[str, Any], existing_content: List[Dict[str, Any]]) -> List[DuplicateMatch]:
-        """Check semantic similarity using AI"""
+        """Check semantic similarity using an embedding prefilter and batched AI adjudication"""
         matches = []
         
         try:
-            import openai
-            
-            client = openai.AsyncOpenAI()
-            
-            new_text = f"{new_content.get('title', '')} {new_content.get('description', '')}"
+            candidates = self._batch_semantic_hits.get(id(new_content))
+            if candidates is None:
+                candidates = (await self._score_semantic_batch([new_content], existing_content)).get(id(new_content), [])
             
-            for existing in existing_content:
-                existing_text = f"{existing.get('title', '')} {existing.get('description', '')}"
-                
-                # Use AI to check semantic similarity
-                prompt = f"""
-                Compare these two funding-related texts and determine if they refer to the same intelligence item:
-                
-                Text 1: {new_text}
-                Text 2: {existing_text}
-                
-                Consider:
-                1. Same organization providing funding
-                2. Same funding program/initiative
-                3. Similar funding amounts
-                4. Similar deadlines or timeframes
-                5. Similar eligibility criteria
+            for candidate in candidates:
+                confidence = candidate.verdict.confidence
                 
-                Return JSON with:
-                {{
-                    "is_same_opportunity": true/false,
-                    "confidence": 0.0-1.0,
-                    "reasoning": "explanation"
-                }}
-                """
+                action = DuplicateAction.REJECT if confidence >= 0.9 else DuplicateAction.MANUAL_REVIEW
                 
-                response = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=200,
-                    temperature=0.1
-                )
-                
-                result = json.loads(response.choices[0].message.content)
-                
-                if result.get('is_same_opportunity') and result.get('confidence', 0) >= self.semantic_similarity_threshold:
-                    confidence = result.get('confidence', 0)
-                    
-                    action = DuplicateAction.REJECT if confidence >= 0.9 else DuplicateAction.MANUAL_REVIEW
-                    
-                    matches.append(DuplicateMatch(
-                        original_id=existing.get('id'),
-                        duplicate_id=new_content.get('id'),
-                        duplicate_type=DuplicateType.SEMANTIC_MATCH,
-                        confidence_score=confidence,
-                        similarity_score=confidence,
-                        action=action,
-                        details={
-                            'ai_reasoning': result.get('reasoning'),
-                            'semantic_confidence': confidence
-                        }
-                    ))
+                matches.append(DuplicateMatch(
+                    original_id=candidate.original_id,
+                    duplicate_id=new_content.get('id'),
+                    duplicate_type=DuplicateType.SEMANTIC_MATCH,
+                    confidence_score=confidence,
+                    similarity_score=confidence,
+                    action=action,
+                    details={
+                        'ai_reasoning': candidate.verdict.reasoning,
+                        'semantic_confidence': confidence,
+                        'embedding_similarity': candidate.prefilter_similarity,
+                        'cached_verdict': candidate.cached
+                    }
+                ))
             
             return matches
             
@@ -450,6 +848,35 @@ class EnhancedDuplicateDetector:
             self.logger.error(f"Semantic similarity check failed: {e}")
             return []
     
+    async def _score_semantic_batch(self, new_items: List[Dict[str, Any]],
+                                    existing_content: List[Dict[str, Any]]) -> Dict[int, List[SemanticCandidate]]:
+        """Adjudicated semantic duplicates for each new item, keyed by id() of the item
+        
+        Only stored existing items with an id are embedded into the prefilter
+        index; items of the batch are compared with each other directly.
+        """
+        try:
+            indexable = [existing for existing in existing_content if self._indexable(existing)]
+            await self.semantic_engine.index(
+                [existing.get('id') for existing in indexable],
+                [self._content_text(existing) for existing in indexable]
+            )
+            for existing in indexable:
+                self._indexed_hashes[str(existing['id'])] = self._text_hash(existing)
+            
+            # New items are also adjudicated against the earlier items of the batch
+            results = await self.semantic_engine.find_duplicates(
+                [self._content_text(item) for item in new_items],
+                exclude_ids=[item.get('id') for item in new_items],
+                min_confidence=self.semantic_similarity_threshold,
+                batch_ids=[item.get('id') for item in new_items]
+            )
+            return {id(item): candidates for item, candidates in zip(new_items, results)}
+            
+        except Exception as e:
+            self.logger.error(f"Semantic batch scoring failed: {e}")
+            return {id(item): [] for item in new_items}
+    
     async def _check_temporal_clustering(self, new_content: Dict[str, Any], existing_content: List[Dict[str, Any]]) -> List[DuplicateMatch]:
         """Check for temporal clustering of similar content"""
         matches = []
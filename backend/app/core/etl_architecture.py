@@ -128,7 +128,20 @@ class ETLConfig:
         'web_scraping': 30,       # requests per minute
         'rss_feeds': 200,         # requests per minute
     }
-    
+
+    # Dequeue fairness: relative share of dequeues each priority gets first
+    # pick at when every priority queue of a stage has work
+    PRIORITY_WEIGHTS = {
+        Priority.CRITICAL: 8,
+        Priority.HIGH: 4,
+        Priority.MEDIUM: 2,
+        Priority.LOW: 1,
+    }
+
+    # Queue entry encoding (see task_codec): "msgpack" or "json"
+    TASK_CODEC = "msgpack"
+    TASK_PAYLOAD_TTL_SECONDS = 7 * 86400  # out-of-line payload blobs
+
     # Monitoring Configuration
     METRICS_RETENTION_DAYS = 30
     ALERT_THRESHOLDS = {
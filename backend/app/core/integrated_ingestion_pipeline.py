@@ -256,16 +256,13 @@ class IntegratedIngestionPipeline:
             
             # Step 3: Check for duplicates
             self.logger.info(f"Checking duplicates for {len(valid_items)} items")
-            for content, classification in valid_items:
-                # Get existing content for duplicate detection
-                existing_content = await self._get_existing_content_for_duplicate_check()
-                
-                # Check for duplicates
-                duplicate_matches = await self.duplicate_detector.detect_duplicates(
-                    new_content=content,
-                    existing_content=existing_content
-                )
-                
+            existing_content = await self._get_existing_content_for_duplicate_check()
+            batch_duplicate_matches = await self.duplicate_detector.detect_duplicates_batch(
+                new_items=[content for content, _ in valid_items],
+                existing_content=existing_content
+            )
+            
+            for (content, classification), duplicate_matches in zip(valid_items, batch_duplicate_matches):
                 # Skip if high-confidence duplicate
                 if self._is_high_confidence_duplicate(duplicate_matches):
                     self.logger.info(f"Skipping duplicate: {content.get('title', 'No title')}")
@@ -784,7 +781,10 @@ class IntegratedIngestionPipeline:
         """Store processed content in database"""
         try:
             # This would store all the processed content with metadata
-            # For now, just log the storage
+            # For now, just log the storage. Once rows are written, pass each
+            # stored item's raw_content (with its row id) to
+            # duplicate_detector.register_content and then call
+            # save_signature_index, so only stored items become candidates
             self.logger.info(f"Storing {len(processed_items)} processed items")
             
         except Exception as e:
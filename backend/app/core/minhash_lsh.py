@@ -0,0 +1,174 @@
+"""
+MinHash / LSH Near-Duplicate Index
+==================================
+
+Candidate generation for near-duplicate detection. Texts are normalised,
+split into character shingles and summarised as MinHash signatures; the
+signatures are cut into bands and each band is hashed into a bucket table
+(locality-sensitive hashing). Two texts share a bucket with high probability
+when their shingle sets have a high Jaccard similarity, so a query only has to
+look at the handful of items in its buckets instead of the whole corpus.
+
+The index is a candidate filter only: callers still run their exact
+similarity and context scoring on the returned candidates.
+"""
+
+import logging
+import re
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime used for the universal hash family (a * x + b) mod p
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_NON_WORD_RE = re.compile(r'[^\w\s]+', re.UNICODE)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    if not text:
+        return ''
+    text = _NON_WORD_RE.sub(' ', str(text).lower())
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def shingle(text: Optional[str], size: int = 5) -> Set[str]:
+    """Character shingles of a normalised text; short texts become a single shingle"""
+    normalized = normalize_text(text)
+    if not normalized:
+        return set()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures with a seeded universal hash family"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        self.num_perm = num_perm
+        generator = np.random.RandomState(seed)
+        # a, b < 2**32 and shingle hashes < 2**32 keep a * x + b inside uint64
+        self.a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> Optional[np.ndarray]:
+        """MinHash signature of a shingle set, or None for an empty set"""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode('utf-8')) for s in shingles),
+            dtype=np.uint64
+        )
+        if hashes.size == 0:
+            return None
+
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+
+class MinHashLSHIndex:
+    """Banded LSH index over MinHash signatures of a single text field"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+
+        self.buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(bands)]
+        self.item_keys: Dict[str, List[bytes]] = {}
+        self.signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.item_keys)
+
+    def __contains__(self, item_id: Any) -> bool:
+        return item_id is not None and str(item_id) in self.item_keys
+
+    @property
+    def threshold(self) -> float:
+        """Approximate Jaccard similarity at which a pair becomes a candidate with 50% probability"""
+        return (1.0 / self.bands) ** (1.0 / self.rows)
+
+    def add(self, item_id: Any, text: Optional[str]) -> bool:
+        """Index a text under an id, replacing any previous entry for that id"""
+        if item_id is None:
+            return False
+
+        item_id = str(item_id)
+        if item_id in self.item_keys:
+            self.remove(item_id)
+
+        signature = self.hasher.signature(shingle(text, self.shingle_size))
+        if signature is None:
+            return False
+
+        keys = self._band_keys(signature)
+        for band, key in enumerate(keys):
+            self.buckets[band].setdefault(key, set()).add(item_id)
+
+        self.item_keys[item_id] = keys
+        self.signatures[item_id] = signature
+        return True
+
+    def remove(self, item_id: Any):
+        """Drop an id from every bucket it occupies"""
+        item_id = str(item_id)
+        keys = self.item_keys.pop(item_id, None)
+        self.signatures.pop(item_id, None)
+        if keys is None:
+            return
+
+        for band, key in enumerate(keys):
+            bucket = self.buckets[band].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(item_id)
+            if not bucket:
+                del self.buckets[band][key]
+
+    def query(self, text: Optional[str], exclude: Optional[Any] = None) -> Set[str]:
+        """Ids sharing at least one band bucket with the text"""
+        signature = self.hasher.signature(shingle(text, self.shingle_size))
+        if signature is None:
+            return set()
+        return self._candidates(signature, exclude)
+
+    def query_with_scores(self, text: Optional[str], exclude: Optional[Any] = None) -> List[Tuple[str, float]]:
+        """Candidates with their estimated Jaccard similarity, highest first"""
+        signature = self.hasher.signature(shingle(text, self.shingle_size))
+        if signature is None:
+            return []
+
+        scored = [
+            (item_id, float(np.mean(self.signatures[item_id] == signature)))
+            for item_id in self._candidates(signature, exclude)
+        ]
+        scored.sort(key=lambda pair: pair[1], reverse=True)
+        return scored
+
+    def _candidates(self, signature: np.ndarray, exclude: Optional[Any]) -> Set[str]:
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band].get(key)
+            if bucket:
+                candidates.update(bucket)
+
+        if exclude is not None:
+            candidates.discard(str(exclude))
+        return candidates
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
@@ -9,7 +9,8 @@ rapid data ingestion and processing at scale.
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import time
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import asdict
 import redis.asyncio as redis
@@ -19,6 +20,7 @@ from celery.exceptions import Retry
 import uuid
 
 from .etl_architecture import ETLTask, PipelineStage, Priority, ETLConfig, ProcessingResult
+from .task_codec import EncodedTask, TaskCodecError, get_task_codec
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -111,18 +113,38 @@ def create_celery_app(config: ETLConfig) -> Celery:
 class RedisQueueManager:
     """High-performance Redis-based queue manager for ETL pipeline"""
     
-    def __init__(self, config: ETLConfig):
+    DELAYED_QUEUE = "taifa_etl:delayed"
+    DEAD_LETTER_QUEUE = "taifa_etl:dead_letter"
+    UNDECODABLE_QUEUE = "taifa_etl:dead_letter:undecodable"
+    PROMOTER_LEASE_KEY = "taifa_etl:delayed:promoter"
+    
+    def __init__(self, config: ETLConfig, codec=None):
         self.config = config
         self.redis_client = None
         self.logger = logging.getLogger(__name__)
         
+        # Queue entries are binary (see task_codec); legacy JSON entries still decode
+        self.codec = codec or get_task_codec(config.TASK_CODEC)
+        
+        # Weighted round-robin state per stage (see _dequeue_order)
+        self._fairness_state: Dict[PipelineStage, Dict[Priority, int]] = {}
+        
+        # Delayed-task promoter (see run_delayed_promoter)
+        self._promoter_token = uuid.uuid4().hex.encode()
+        self.scheduler_stats = {
+            'promoted': 0,
+            'batches': 0,
+            'last_lag_seconds': 0.0,
+            'max_lag_seconds': 0.0
+        }
+        
     async def initialize(self):
         """Initialize Redis connection"""
         try:
             self.redis_client = redis.from_url(
                 self.config.REDIS_URL,
                 encoding='utf-8',
-                decode_responses=True,
+                decode_responses=False,  # queue entries are binary
                 socket_keepalive=True,
                 socket_keepalive_options={},
                 health_check_interval=30
@@ -140,7 +162,7 @@ class RedisQueueManager:
         """Enqueue a task for processing"""
         try:
             # Serialize task
-            task_data = json.dumps(task.to_dict(), default=str)
+            encoded = self.codec.encode(task)
             
             # Determine queue name based on stage and priority
             queue_name = self._get_queue_name(task.stage, task.priority)
@@ -148,16 +170,13 @@ class RedisQueueManager:
             # Add task to queue with priority scoring
             priority_score = self._calculate_priority_score(task.priority)
             
-            await self.redis_client.zadd(
-                queue_name,
-                {task_data: priority_score}
-            )
-            
-            # Track task in processing registry
-            await self._track_task(task)
-            
-            # Update queue metrics
-            await self._update_queue_metrics(queue_name, 'enqueued')
+            # Payload blob, queue entry, tracking registry and metrics in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._store_payload(pipe, encoded)
+            pipe.zadd(queue_name, {encoded.entry: priority_score})
+            self._track_task(pipe, task)
+            self._update_queue_metrics(pipe, queue_name, 'enqueued')
+            await pipe.execute()
             
             self.logger.info(f"Task {task.id} enqueued to {queue_name}")
             return task.id
@@ -167,38 +186,42 @@ class RedisQueueManager:
             raise
     
     async def dequeue_task(self, stage: PipelineStage, timeout: int = 10) -> Optional[ETLTask]:
-        """Dequeue highest priority task from stage queue"""
+        """Dequeue the next task from any priority queue of a stage
+        
+        BZPOPMIN blocks on every priority key of the stage at once and pops
+        from the first non-empty key in the order given. The order starts with
+        the priority picked by weighted round robin (``PRIORITY_WEIGHTS``), so
+        higher priorities are served more often without starving lower ones.
+        Returns None on timeout, and when the popped entry cannot be decoded
+        (it is moved to ``UNDECODABLE_QUEUE`` instead).
+        """
         try:
-            queue_name = self._get_queue_name(stage, Priority.HIGH)
+            queue_names = [
+                self._get_queue_name(stage, priority)
+                for priority in self._dequeue_order(stage)
+            ]
             
-            # Get highest priority task (lowest score)
-            result = await self.redis_client.bzpopmin(queue_name, timeout=timeout)
+            # Get lowest score from the first non-empty queue in fairness order
+            result = await self.redis_client.bzpopmin(queue_names, timeout=timeout)
             
             if not result:
                 return None
             
-            # Parse task data
-            _, task_data, _ = result
-            task_dict = json.loads(task_data)
-            
-            # Convert back to ETLTask
-            task = ETLTask(
-                id=task_dict['id'],
-                stage=PipelineStage(task_dict['stage']),
-                priority=Priority(task_dict['priority']),
-                source_type=task_dict['source_type'],
-                source_id=task_dict['source_id'],
-                payload=task_dict['payload'],
-                created_at=datetime.fromisoformat(task_dict['created_at']),
-                retry_count=task_dict.get('retry_count', 0),
-                max_retries=task_dict.get('max_retries', 3)
-            )
-            
-            # Update processing status
-            await self._update_task_status(task.id, 'processing')
+            # Decode task data (fetching an out-of-line payload if referenced)
+            queue_name, task_data, _ = result
+            queue_name = queue_name.decode()
+            try:
+                task = await self._decode_entry(task_data)
+            except TaskCodecError as e:
+                # The entry is already popped; keep it rather than lose the task
+                await self._move_undecodable_to_dead_letter_queue(queue_name, task_data, e)
+                return None
             
-            # Update queue metrics
-            await self._update_queue_metrics(queue_name, 'dequeued')
+            # Processing status and queue metrics in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._update_task_status(pipe, task.id, 'processing')
+            self._update_queue_metrics(pipe, queue_name, 'dequeued')
+            await pipe.execute()
             
             self.logger.info(f"Task {task.id} dequeued from {queue_name}")
             return task
@@ -234,30 +257,127 @@ class RedisQueueManager:
             self.logger.error(f"Failed to requeue task {task.id}: {e}")
             raise
     
+    async def promote_due_tasks(self, batch_size: int = 500) -> int:
+        """Move up to batch_size due tasks from the delayed set into their live queues
+        
+        The ZREM of the batch and the ZADDs into the target queues run in one
+        MULTI/EXEC, so a task is never in both places. Promoted tasks are scored
+        by their due time, so retries are served ahead of work that arrived
+        after they became due.
+        """
+        now = time.time()
+        entries = await self.redis_client.zrangebyscore(
+            self.DELAYED_QUEUE, '-inf', now, start=0, num=batch_size, withscores=True
+        )
+        if not entries:
+            return 0
+        
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zrem(self.DELAYED_QUEUE, *[member for member, _ in entries])
+        for member, due_at in entries:
+            queue_name, task_data, priority = self._parse_delayed_entry(member)
+            pipe.zadd(queue_name, {task_data: priority.value * 1000 + due_at})
+            self._refresh_payload(pipe, task_data)
+        
+        # Lag: how late the most overdue task in this batch reached its queue
+        lag = max(0.0, now - entries[0][1])
+        metrics_key = f"metrics:{self.DELAYED_QUEUE}"
+        pipe.hincrby(metrics_key, 'promoted', len(entries))
+        pipe.hset(metrics_key, mapping={
+            'last_lag_ms': int(lag * 1000),
+            'last_promoted_at': datetime.now().isoformat()
+        })
+        pipe.expire(metrics_key, 86400)  # 24 hours
+        await pipe.execute()
+        
+        self.scheduler_stats['promoted'] += len(entries)
+        self.scheduler_stats['batches'] += 1
+        self.scheduler_stats['last_lag_seconds'] = lag
+        self.scheduler_stats['max_lag_seconds'] = max(self.scheduler_stats['max_lag_seconds'], lag)
+        
+        self.logger.debug(f"Promoted {len(entries)} delayed tasks (lag {lag:.3f}s)")
+        return len(entries)
+    
+    async def run_delayed_promoter(self, stop_event: Optional[asyncio.Event] = None,
+                                   batch_size: int = 500, max_idle_seconds: float = 1.0,
+                                   lease_seconds: int = 10):
+        """Promote delayed tasks as they fall due until stop_event is set
+        
+        Only the process holding the promoter lease moves tasks, so running
+        this loop in every worker is safe. Full batches are followed by another
+        batch straight away; otherwise the loop sleeps until the next due time
+        (at most max_idle_seconds) instead of polling.
+        """
+        stop_event = stop_event or asyncio.Event()
+        self.logger.info("Delayed-task promoter started")
+        
+        while not stop_event.is_set():
+            try:
+                if not await self._hold_promoter_lease(lease_seconds):
+                    sleep_for = lease_seconds / 2
+                else:
+                    promoted = await self.promote_due_tasks(batch_size)
+                    if promoted >= batch_size:
+                        await asyncio.sleep(0)
+                        continue
+                    sleep_for = await self._seconds_until_next_due(max_idle_seconds)
+                    
+            except Exception as e:
+                self.logger.error(f"Delayed-task promoter error: {e}")
+                sleep_for = max_idle_seconds
+            
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=sleep_for)
+            except asyncio.TimeoutError:
+                pass
+        
+        if await self.redis_client.get(self.PROMOTER_LEASE_KEY) == self._promoter_token:
+            await self.redis_client.delete(self.PROMOTER_LEASE_KEY)
+        self.logger.info("Delayed-task promoter stopped")
+    
     async def get_queue_stats(self) -> Dict[str, Any]:
         """Get comprehensive queue statistics"""
         try:
             stats = {}
-            
-            for stage in PipelineStage:
-                for priority in Priority:
-                    queue_name = self._get_queue_name(stage, priority)
-                    queue_size = await self.redis_client.zcard(queue_name)
-                    
-                    if queue_size > 0:
-                        stats[queue_name] = {
-                            'size': queue_size,
-                            'stage': stage.value,
-                            'priority': priority.value
-                        }
+            queues = [
+                (stage, priority, self._get_queue_name(stage, priority))
+                for stage in PipelineStage
+                for priority in Priority
+            ]
+            
+            # All queue sizes and processing counters in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            for _, _, queue_name in queues:
+                pipe.zcard(queue_name)
+            pipe.hlen('processing_tasks')
+            pipe.hlen('completed_tasks')
+            pipe.hlen('failed_tasks')
+            pipe.zcard(self.DELAYED_QUEUE)
+            pipe.zrange(self.DELAYED_QUEUE, 0, 0, withscores=True)
+            results = await pipe.execute()
+            
+            for (stage, priority, queue_name), queue_size in zip(queues, results):
+                if queue_size > 0:
+                    stats[queue_name] = {
+                        'size': queue_size,
+                        'stage': stage.value,
+                        'priority': priority.value
+                    }
             
             # Get processing stats
-            processing_count = await self.redis_client.hlen('processing_tasks')
-            completed_count = await self.redis_client.hlen('completed_tasks')
-            failed_count = await self.redis_client.hlen('failed_tasks')
+            processing_count, completed_count, failed_count, delayed_count, oldest_delayed = results[len(queues):]
+            
+            # Scheduler lag: how far past due the oldest waiting retry is
+            scheduler_lag = max(0.0, time.time() - oldest_delayed[0][1]) if oldest_delayed else 0.0
+            stats['delayed'] = {
+                'size': delayed_count,
+                'scheduler_lag_seconds': scheduler_lag,
+                **self.scheduler_stats
+            }
             
             stats['summary'] = {
-                'total_queued': sum(q['size'] for q in stats.values() if 'size' in q),
+                'total_queued': sum(q['size'] for name, q in stats.items() if name != 'delayed'),
+                'delayed': delayed_count,
                 'processing': processing_count,
                 'completed': completed_count,
                 'failed': failed_count,
@@ -305,8 +425,25 @@ class RedisQueueManager:
         timestamp_score = datetime.now().timestamp()
         return base_score + timestamp_score
     
-    async def _track_task(self, task: ETLTask):
-        """Track task in processing registry"""
+    def _dequeue_order(self, stage: PipelineStage) -> List[Priority]:
+        """Priorities in the order BZPOPMIN should try them for the next dequeue
+        
+        Smooth weighted round robin picks the priority that goes first; the
+        rest follow in strict priority order so an empty pick falls through to
+        the most urgent queue that has work.
+        """
+        weights = self.config.PRIORITY_WEIGHTS
+        current = self._fairness_state.setdefault(stage, {priority: 0 for priority in Priority})
+        
+        for priority in Priority:
+            current[priority] += weights.get(priority, 1)
+        chosen = max(Priority, key=lambda priority: (current[priority], -priority.value))
+        current[chosen] -= sum(weights.get(priority, 1) for priority in Priority)
+        
+        return [chosen] + [priority for priority in Priority if priority is not chosen]
+    
+    def _track_task(self, pipe, task: ETLTask):
+        """Queue the processing-registry write for a task on a pipeline"""
         task_key = f"task:{task.id}"
         task_data = {
             'id': task.id,
@@ -316,40 +453,107 @@ class RedisQueueManager:
             'retry_count': task.retry_count
         }
         
-        await self.redis_client.hset(task_key, mapping=task_data)
-        await self.redis_client.expire(task_key, 86400)  # 24 hours
+        pipe.hset(task_key, mapping=task_data)
+        pipe.expire(task_key, 86400)  # 24 hours
     
-    async def _update_task_status(self, task_id: str, status: str):
-        """Update task status in registry"""
+    def _update_task_status(self, pipe, task_id: str, status: str):
+        """Queue a task status update on a pipeline"""
         task_key = f"task:{task_id}"
-        await self.redis_client.hset(task_key, 'status', status)
-        await self.redis_client.hset(task_key, 'updated_at', datetime.now().isoformat())
+        pipe.hset(task_key, mapping={'status': status, 'updated_at': datetime.now().isoformat()})
     
-    async def _update_queue_metrics(self, queue_name: str, operation: str):
-        """Update queue metrics for monitoring"""
+    def _update_queue_metrics(self, pipe, queue_name: str, operation: str, count: int = 1):
+        """Queue a queue-metrics update on a pipeline"""
         metrics_key = f"metrics:{queue_name}"
-        await self.redis_client.hincrby(metrics_key, operation, 1)
-        await self.redis_client.expire(metrics_key, 86400)  # 24 hours
+        pipe.hincrby(metrics_key, operation, count)
+        pipe.expire(metrics_key, 86400)  # 24 hours
     
     async def _schedule_delayed_task(self, task: ETLTask, delay_seconds: int):
-        """Schedule task for delayed processing"""
-        execute_at = datetime.now() + timedelta(seconds=delay_seconds)
-        delayed_queue = "taifa_etl:delayed"
+        """Schedule task for delayed processing
         
-        task_data = json.dumps(task.to_dict(), default=str)
-        score = execute_at.timestamp()
+        Delayed members are ``<queue name>|<task entry>`` so the promoter can
+        route them without decoding the task.
+        """
+        execute_at = time.time() + delay_seconds
+        queue_name = self._get_queue_name(task.stage, task.priority)
+        encoded = self.codec.encode(task)
         
-        await self.redis_client.zadd(delayed_queue, {task_data: score})
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._store_payload(pipe, encoded)
+        pipe.zadd(self.DELAYED_QUEUE, {queue_name.encode() + b'|' + encoded.entry: execute_at})
+        self._update_task_status(pipe, task.id, 'delayed')
+        self._update_queue_metrics(pipe, self.DELAYED_QUEUE, 'scheduled')
+        await pipe.execute()
+    
+    def _parse_delayed_entry(self, member: bytes) -> Tuple[str, bytes, Priority]:
+        """Target queue, queue entry and priority of a delayed-set member"""
+        if member.startswith(b'taifa_etl:'):
+            queue_name, task_data = member.split(b'|', 1)
+            queue_name = queue_name.decode()
+            priority = Priority[queue_name.rsplit(':', 1)[1].upper()]
+            return queue_name, task_data, priority
+        
+        # Entries scheduled before queue routing was stored in the member
+        task_dict = json.loads(member)
+        priority = Priority(task_dict['priority'])
+        return self._get_queue_name(PipelineStage(task_dict['stage']), priority), member, priority
+    
+    def _store_payload(self, pipe, encoded: EncodedTask):
+        """Queue the write of an out-of-line payload (stored once per content hash)"""
+        if encoded.payload_key:
+            pipe.set(encoded.payload_key, encoded.payload_blob, nx=True)
+            pipe.expire(encoded.payload_key, self.config.TASK_PAYLOAD_TTL_SECONDS)
+    
+    def _refresh_payload(self, pipe, entry: bytes):
+        """Queue a TTL refresh of the out-of-line payload an entry references"""
+        payload_key = self.codec.payload_key(entry)
+        if payload_key:
+            pipe.expire(payload_key, self.config.TASK_PAYLOAD_TTL_SECONDS)
+    
+    async def _decode_entry(self, entry: bytes) -> ETLTask:
+        payload_key = self.codec.payload_key(entry)
+        payload_blob = await self.redis_client.get(payload_key) if payload_key else None
+        return self.codec.decode(entry, payload_blob)
+    
+    async def _hold_promoter_lease(self, lease_seconds: int) -> bool:
+        """Acquire or renew the single-promoter lease"""
+        if await self.redis_client.set(self.PROMOTER_LEASE_KEY, self._promoter_token,
+                                       ex=lease_seconds, nx=True):
+            return True
+        if await self.redis_client.get(self.PROMOTER_LEASE_KEY) == self._promoter_token:
+            await self.redis_client.expire(self.PROMOTER_LEASE_KEY, lease_seconds)
+            return True
+        return False
+    
+    async def _seconds_until_next_due(self, max_idle_seconds: float) -> float:
+        next_due = await self.redis_client.zrange(self.DELAYED_QUEUE, 0, 0, withscores=True)
+        if not next_due:
+            return max_idle_seconds
+        return min(max_idle_seconds, max(0.0, next_due[0][1] - time.time()))
     
     async def _move_to_dead_letter_queue(self, task: ETLTask):
         """Move failed task to dead letter queue"""
-        dead_letter_queue = "taifa_etl:dead_letter"
-        task_data = json.dumps(task.to_dict(), default=str)
+        # Inline payload: dead letters outlive the shared payload TTL
+        task_data = self.codec.encode(task, inline=True).entry
         
-        await self.redis_client.lpush(dead_letter_queue, task_data)
-        await self._update_task_status(task.id, 'failed')
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lpush(self.DEAD_LETTER_QUEUE, task_data)
+        self._update_task_status(pipe, task.id, 'failed')
+        await pipe.execute()
         
         self.logger.warning(f"Task {task.id} moved to dead letter queue after {task.retry_count} retries")
+    
+    async def _move_undecodable_to_dead_letter_queue(self, queue_name: str, entry: bytes, error: Exception):
+        """Keep a popped entry that cannot be decoded (e.g. its payload expired)
+        
+        Members are ``<queue name>|<raw entry>`` like the delayed set, so the
+        entry can be inspected or requeued once its payload is restored.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lpush(self.UNDECODABLE_QUEUE, queue_name.encode() + b'|' + entry)
+        self._update_queue_metrics(pipe, queue_name, 'undecodable')
+        await pipe.execute()
+        
+        self.logger.error(f"Undecodable entry from {queue_name} moved to {self.UNDECODABLE_QUEUE}: {error}")
 
 # =============================================================================
 # BATCH PROCESSING MANAGER
@@ -371,25 +575,34 @@ class BatchProcessingManager:
             # Group tasks by stage and priority for batch processing
             grouped_tasks = self._group_tasks_by_queue(tasks)
             
+            # Every queue write, tracking entry and metric in one round trip
+            pipe = self.queue_manager.redis_client.pipeline(transaction=False)
+            
             for (stage, priority), task_group in grouped_tasks.items():
                 queue_name = self.queue_manager._get_queue_name(stage, priority)
                 
                 # Prepare batch data
                 batch_data = {}
                 for task in task_group:
-                    task_data = json.dumps(task.to_dict(), default=str)
+                    encoded = self.queue_manager.codec.encode(task)
+                    self.queue_manager._store_payload(pipe, encoded)
                     priority_score = self.queue_manager._calculate_priority_score(priority)
-                    batch_data[task_data] = priority_score
+                    batch_data[encoded.entry] = priority_score
                     task_ids.append(task.id)
+                    self.queue_manager._track_task(pipe, task)
                 
                 # Batch enqueue
                 if batch_data:
-                    await self.queue_manager.redis_client.zadd(queue_name, batch_data)
+                    pipe.zadd(queue_name, batch_data)
                     
                     # Update metrics
-                    await self.queue_manager._update_queue_metrics(queue_name, 'batch_enqueued')
-                    
-                    self.logger.info(f"Batch enqueued {len(task_group)} tasks to {queue_name}")
+                    self.queue_manager._update_queue_metrics(pipe, queue_name, 'batch_enqueued')
+            
+            await pipe.execute()
+            
+            for (stage, priority), task_group in grouped_tasks.items():
+                queue_name = self.queue_manager._get_queue_name(stage, priority)
+                self.logger.info(f"Batch enqueued {len(task_group)} tasks to {queue_name}")
             
             return task_ids
             
@@ -0,0 +1,458 @@
+"""
+Semantic Duplicate Engine
+=========================
+
+Two-stage semantic duplicate check used by EnhancedDuplicateDetector:
+
+1. Prefilter: new items are embedded locally and matched against an in-memory
+   matrix of normalised embeddings; only the top few nearest neighbours above
+   a similarity floor become candidate pairs.
+2. Adjudication: candidate pairs are sent to an LLM several pairs per prompt,
+   with bounded concurrency. Verdicts are cached by the content hashes of the
+   two texts, so the same pair is never adjudicated twice.
+
+Both the embedder and the adjudicator are pluggable. ``HashingEmbedder`` and
+``LocalPairAdjudicator`` run fully offline and stand in for the sentence
+transformer and OpenAI client in tests and local development.
+"""
+
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+import json
+import logging
+import re
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    from app.core.embedding_service import get_embedding_service
+except ImportError:
+    from .embedding_service import get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of whitespace/case-normalised text"""
+    normalized = ' '.join(_TOKEN_RE.findall((text or '').lower()))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# EMBEDDERS
+# =============================================================================
+
+class HashingEmbedder:
+    """Offline bag-of-words embedder using the hashing trick (unigrams + bigrams)"""
+
+    def __init__(self, dimension: int = 512):
+        self.dimension = dimension
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall((text or '').lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                vectors[row, zlib.crc32(feature.encode('utf-8')) % self.dimension] += 1.0
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """Uses the shared embedding service; falls back to HashingEmbedder if the model is unavailable"""
+
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+        self.model_name = model_name
+        self._fallback: Optional[HashingEmbedder] = None
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        if self._fallback is None:
+            service = get_embedding_service(self.model_name)
+            if service.available:
+                return service.encode(texts)
+            logger.warning(f"Sentence transformer '{self.model_name}' unavailable; using hashing embeddings")
+            self._fallback = HashingEmbedder()
+        return self._fallback(texts)
+
+
+# =============================================================================
+# ADJUDICATORS
+# =============================================================================
+
+@dataclass
+class PairVerdict:
+    """LLM (or stand-in) verdict for one candidate pair"""
+    is_same_opportunity: bool
+    confidence: float
+    reasoning: str = ''
+
+
+class PairAdjudicator(ABC):
+    """Decides whether text pairs describe the same opportunity, several pairs per call"""
+
+    @abstractmethod
+    async def adjudicate(self, pairs: Sequence[Tuple[str, str]]) -> List[Optional[PairVerdict]]:
+        """One verdict (or None when undecided) per pair, in order"""
+
+
+class OpenAIPairAdjudicator(PairAdjudicator):
+    """Adjudicates a chunk of pairs with a single chat completion"""
+
+    def __init__(self, client: Any = None, model: str = 'gpt-4o-mini', max_text_chars: int = 1200):
+        self._client = client
+        self.model = model
+        self.max_text_chars = max_text_chars
+
+    @property
+    def client(self):
+        if self._client is None:
+            import openai
+            self._client = openai.AsyncOpenAI()
+        return self._client
+
+    async def adjudicate(self, pairs: Sequence[Tuple[str, str]]) -> List[Optional[PairVerdict]]:
+        pair_blocks = []
+        for number, (text_1, text_2) in enumerate(pairs, start=1):
+            pair_blocks.append(
+                f"Pair {number}:\n"
+                f"Text 1: {text_1[:self.max_text_chars]}\n"
+                f"Text 2: {text_2[:self.max_text_chars]}"
+            )
+
+        prompt = f"""
+        For each pair of funding-related texts below, determine if the two texts refer to the same intelligence item.
+
+        Consider:
+        1. Same organization providing funding
+        2. Same funding program/initiative
+        3. Similar funding amounts
+        4. Similar deadlines or timeframes
+        5. Similar eligibility criteria
+
+        {chr(10).join(pair_blocks)}
+
+        Return JSON with one result per pair, in order:
+        {{
+            "results": [
+                {{"pair": 1, "is_same_opportunity": true/false, "confidence": 0.0-1.0, "reasoning": "explanation"}}
+            ]
+        }}
+        """
+
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=120 * len(pairs) + 50,
+            temperature=0.1,
+            response_format={"type": "json_object"}
+        )
+
+        payload = json.loads(response.choices[0].message.content)
+        verdicts: List[Optional[PairVerdict]] = [None] * len(pairs)
+        for result in payload.get('results', []):
+            index = int(result.get('pair', 0)) - 1
+            if 0 <= index < len(pairs):
+                verdicts[index] = PairVerdict(
+                    is_same_opportunity=bool(result.get('is_same_opportunity')),
+                    confidence=float(result.get('confidence', 0.0)),
+                    reasoning=result.get('reasoning', '')
+                )
+        return verdicts
+
+
+class LocalPairAdjudicator(PairAdjudicator):
+    """Offline stand-in for the LLM: token-set overlap decides the verdict"""
+
+    def __init__(self, same_threshold: float = 0.6):
+        self.same_threshold = same_threshold
+        self.calls = 0
+
+    async def adjudicate(self, pairs: Sequence[Tuple[str, str]]) -> List[Optional[PairVerdict]]:
+        self.calls += 1
+        verdicts = []
+        for text_1, text_2 in pairs:
+            tokens_1 = set(_TOKEN_RE.findall(text_1.lower()))
+            tokens_2 = set(_TOKEN_RE.findall(text_2.lower()))
+            overlap = len(tokens_1 & tokens_2) / max(len(tokens_1 | tokens_2), 1)
+            verdicts.append(PairVerdict(
+                is_same_opportunity=overlap >= self.same_threshold,
+                confidence=overlap,
+                reasoning=f"token overlap {overlap:.2f}"
+            ))
+        return verdicts
+
+
+# =============================================================================
+# ENGINE
+# =============================================================================
+
+@dataclass
+class SemanticCandidate:
+    """Adjudicated candidate pair for one new item"""
+    original_id: Any
+    prefilter_similarity: float
+    verdict: PairVerdict
+    cached: bool = False
+
+
+class SemanticDuplicateEngine:
+    """Embedding nearest-neighbour prefilter followed by batched, cached LLM adjudication"""
+
+    def __init__(self,
+                 embedder: Optional[Callable[[Sequence[str]], np.ndarray]] = None,
+                 adjudicator: Optional[PairAdjudicator] = None,
+                 top_k: int = 3,
+                 min_prefilter_similarity: float = 0.6,
+                 pairs_per_prompt: int = 5,
+                 max_concurrency: int = 4,
+                 cache_size: int = 50000,
+                 max_removed_fraction: float = 0.25):
+        self.embedder = embedder or SentenceTransformerEmbedder()
+        self.adjudicator = adjudicator or OpenAIPairAdjudicator()
+        self.top_k = top_k
+        self.min_prefilter_similarity = min_prefilter_similarity
+        self.pairs_per_prompt = pairs_per_prompt
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self.max_removed_fraction = max_removed_fraction
+
+        # Row-normalised embedding matrix with doubling capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self.ids: List[Any] = []
+        self.texts: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._removed: Set[int] = set()
+
+        self._verdict_cache: "OrderedDict[Tuple[str, str], PairVerdict]" = OrderedDict()
+        self.stats = {
+            'pairs_adjudicated': 0,
+            'cache_hits': 0,
+            'llm_calls': 0,
+            'llm_failures': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item_id: Any) -> bool:
+        return item_id is not None and str(item_id) in self._positions
+
+    async def index(self, item_ids: Sequence[Any], texts: Sequence[str]) -> int:
+        """Embed and add items whose ids are not indexed yet"""
+        new_ids, new_texts = [], []
+        seen = set()
+        for item_id, text in zip(item_ids, texts):
+            if item_id is None or str(item_id) in self._positions or str(item_id) in seen:
+                continue
+            seen.add(str(item_id))
+            new_ids.append(item_id)
+            new_texts.append(text or '')
+
+        if not new_ids:
+            return 0
+
+        vectors = await self._embed(new_texts)
+        self._append(vectors)
+        for item_id, text in zip(new_ids, new_texts):
+            self._positions[str(item_id)] = len(self.ids)
+            self.ids.append(item_id)
+            self.texts.append(text)
+        return len(new_ids)
+
+    def remove(self, item_ids: Sequence[Any]) -> int:
+        """
+        Stop matching against items; their matrix rows are zeroed and skipped
+        until more than max_removed_fraction of the rows are removed, then the
+        matrix is rebuilt without them
+        """
+        removed = 0
+        for item_id in item_ids:
+            position = self._positions.pop(str(item_id), None) if item_id is not None else None
+            if position is not None:
+                self._matrix[position] = 0.0
+                self._removed.add(position)
+                removed += 1
+
+        if len(self._removed) > self.max_removed_fraction * self._size:
+            self._compact()
+        return removed
+
+    async def find_duplicates(self, texts: Sequence[str], exclude_ids: Optional[Sequence[Any]] = None,
+                              min_confidence: float = 0.0,
+                              batch_ids: Optional[Sequence[Any]] = None) -> List[List[SemanticCandidate]]:
+        """
+        Adjudicated duplicates for each query text, most confident first.
+
+        With batch_ids (one id per text, None allowed) the texts are one batch
+        that is not indexed yet: each text is also matched against the texts
+        before it, reported under their batch id.
+        """
+        if not texts:
+            return []
+
+        queries = await self._embed(list(texts))
+        candidates = [
+            [(self.ids[position], self.texts[position], similarity) for position, similarity in row]
+            for row in self._corpus_neighbours(queries, exclude_ids)
+        ]
+        if batch_ids is not None:
+            for row, earlier in enumerate(self._earlier_neighbours(queries, batch_ids)):
+                candidates[row].extend((batch_ids[column], texts[column], similarity)
+                                       for column, similarity in earlier)
+
+        # Resolve cached verdicts; collect unique uncached pairs for the LLM
+        pending: "OrderedDict[Tuple[str, str], Tuple[str, str]]" = OrderedDict()
+        for row, text in enumerate(texts):
+            for _, other_text, _ in candidates[row]:
+                key = self._pair_key(text, other_text)
+                if key in self._verdict_cache:
+                    self.stats['cache_hits'] += 1
+                elif key not in pending:
+                    pending[key] = (text, other_text)
+
+        if pending:
+            await self._adjudicate_pending(pending)
+
+        results: List[List[SemanticCandidate]] = []
+        for row, text in enumerate(texts):
+            row_results = []
+            for original_id, other_text, similarity in candidates[row]:
+                key = self._pair_key(text, other_text)
+                verdict = self._verdict_cache.get(key)
+                if verdict is None:
+                    continue
+                self._verdict_cache.move_to_end(key)
+                if verdict.is_same_opportunity and verdict.confidence >= min_confidence:
+                    row_results.append(SemanticCandidate(
+                        original_id=original_id,
+                        prefilter_similarity=similarity,
+                        verdict=verdict,
+                        cached=key not in pending
+                    ))
+            row_results.sort(key=lambda candidate: candidate.verdict.confidence, reverse=True)
+            results.append(row_results)
+
+        return results
+
+    async def nearest_neighbours(self, texts: Sequence[str],
+                                 exclude_ids: Optional[Sequence[Any]] = None) -> List[List[Tuple[int, float]]]:
+        """Top-k (matrix position, cosine) above the prefilter floor for each text"""
+        if self._size == 0:
+            return [[] for _ in texts]
+        return self._corpus_neighbours(await self._embed(list(texts)), exclude_ids)
+
+    def _earlier_neighbours(self, queries: np.ndarray, batch_ids: Sequence[Any]) -> List[List[Tuple[int, float]]]:
+        """Top-k (batch row, cosine) among the rows before each query row"""
+        similarities = queries @ queries.T
+        results = []
+        for row in range(queries.shape[0]):
+            own_id = batch_ids[row]
+            earlier = [
+                (column, float(similarities[row, column]))
+                for column in np.flatnonzero(similarities[row, :row] >= self.min_prefilter_similarity)
+                if own_id is None or batch_ids[column] != own_id
+            ]
+            earlier.sort(key=lambda hit: hit[1], reverse=True)
+            results.append(earlier[:self.top_k])
+        return results
+
+    def _corpus_neighbours(self, queries: np.ndarray,
+                           exclude_ids: Optional[Sequence[Any]] = None) -> List[List[Tuple[int, float]]]:
+        if self._size == 0:
+            return [[] for _ in range(queries.shape[0])]
+
+        similarities = queries @ self._matrix[:self._size].T
+
+        results = []
+        # one extra in case the item itself is indexed, plus room for removed rows
+        k = min(self.top_k + 1 + len(self._removed), self._size)
+        for row in range(queries.shape[0]):
+            scores = similarities[row]
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+
+            excluded = None
+            if exclude_ids is not None and exclude_ids[row] is not None:
+                excluded = self._positions.get(str(exclude_ids[row]))
+
+            row_hits = [
+                (int(position), float(scores[position]))
+                for position in best
+                if position != excluded and position not in self._removed
+                and scores[position] >= self.min_prefilter_similarity
+            ]
+            results.append(row_hits[:self.top_k])
+        return results
+
+    async def _adjudicate_pending(self, pending: "OrderedDict[Tuple[str, str], Tuple[str, str]]"):
+        keys = list(pending.keys())
+        chunks = [keys[i:i + self.pairs_per_prompt] for i in range(0, len(keys), self.pairs_per_prompt)]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_chunk(chunk_keys: List[Tuple[str, str]]):
+            async with semaphore:
+                try:
+                    self.stats['llm_calls'] += 1
+                    verdicts = await self.adjudicator.adjudicate([pending[key] for key in chunk_keys])
+                except Exception as e:
+                    self.stats['llm_failures'] += 1
+                    logger.error(f"Semantic adjudication failed for {len(chunk_keys)} pairs: {e}")
+                    return
+
+                for key, verdict in zip(chunk_keys, verdicts):
+                    if verdict is not None:
+                        self._cache_verdict(key, verdict)
+                        self.stats['pairs_adjudicated'] += 1
+
+        await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+
+    def _cache_verdict(self, key: Tuple[str, str], verdict: PairVerdict):
+        self._verdict_cache[key] = verdict
+        self._verdict_cache.move_to_end(key)
+        while len(self._verdict_cache) > self.cache_size:
+            self._verdict_cache.popitem(last=False)
+
+    @staticmethod
+    def _pair_key(text_1: str, text_2: str) -> Tuple[str, str]:
+        hash_1, hash_2 = content_hash(text_1), content_hash(text_2)
+        return (hash_1, hash_2) if hash_1 <= hash_2 else (hash_2, hash_1)
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(None, self.embedder, texts)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _append(self, vectors: np.ndarray):
+        needed = self._size + vectors.shape[0]
+        if self._matrix is None:
+            self._matrix = np.zeros((max(needed, 1024), vectors.shape[1]), dtype=np.float32)
+        elif needed > self._matrix.shape[0]:
+            grown = np.zeros((max(needed, 2 * self._matrix.shape[0]), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+        self._matrix[self._size:needed] = vectors
+        self._size = needed
+
+    def _compact(self):
+        """Rewrite the matrix, ids and texts without removed rows"""
+        keep = [position for position in range(self._size) if position not in self._removed]
+        matrix = np.zeros((max(len(keep), 1024), self._matrix.shape[1]), dtype=np.float32)
+        matrix[:len(keep)] = self._matrix[keep]
+
+        self.ids = [self.ids[position] for position in keep]
+        self.texts = [self.texts[position] for position in keep]
+        self._positions = {str(item_id): position for position, item_id in enumerate(self.ids)}
+        self._matrix, self._size = matrix, len(keep)
+        self._removed.clear()
@@ -10,6 +10,9 @@ from supabase import create_client, Client
 import asyncio
 from functools import wraps
 
+from app.services.search_cache import get_search_cache
+from app.services.search_filters import search_filter_fields_changed
+
 logger = logging.getLogger(__name__)
 
 class SupabaseService:
@@ -150,6 +153,9 @@ class SupabaseService:
             
             if response.data:
                 logger.info(f"Successfully updated intelligence item {item_id}")
+                await get_search_cache().invalidate()
+                if search_filter_fields_changed(updates):
+                    await self._sync_search_filter_metadata(response.data[0], updates)
                 return True
             else:
                 logger.warning(f"No intelligence item found with ID {item_id}")
@@ -159,6 +165,25 @@ class SupabaseService:
             logger.error(f"Error updating intelligence item {item_id}: {e}")
             return False
     
+    async def _sync_search_filter_metadata(self, row: Dict[str, Any], updates: Dict[str, Any]):
+        """
+        Keep the vector's search filter metadata in step with the row, so an
+        approval or a new deadline is visible to filtered vector search
+        """
+        try:
+            from app.services.funding_intelligence.vector_intelligence import sync_search_filter_metadata
+            await sync_search_filter_metadata(row, updates)
+        except Exception as e:
+            logger.warning(f"Could not sync search metadata of intelligence item {row.get('id')}: {e}")
+
+    async def _register_for_deduplication(self, rows: List[Dict[str, Any]]):
+        """Add inserted rows to this process's duplicate-detection indexes"""
+        try:
+            from app.services.source_validation.deduplication import register_inserted_opportunities
+            await register_inserted_opportunities(rows)
+        except Exception as e:
+            logger.warning(f"Could not register {len(rows)} intelligence items for deduplication: {e}")
+
     async def insert_intelligence_items(self, items: List[Dict[str, Any]]) -> bool:
         """
         Insert new intelligence items
@@ -172,6 +197,8 @@ class SupabaseService:
             
             if response.data:
                 logger.info(f"Successfully inserted {len(response.data)} intelligence items")
+                await self._register_for_deduplication(response.data)
+                await get_search_cache().invalidate()
                 return True
             else:
                 logger.warning("Failed to insert intelligence items")
@@ -0,0 +1,199 @@
+"""
+Task Codec for the Redis ETL Queues
+===================================
+
+Binary encoding of ETLTask queue entries.
+
+Entry layout (MsgpackTaskCodec):
+
+    byte 0   codec version (CODEC_VERSION)
+    byte 1   flags: FLAG_ZSTD (body is zstd-compressed),
+                    FLAG_PAYLOAD_REF (payload stored under a separate key)
+    rest     msgpack array [id, stage, priority, source_type, source_id,
+                            payload | payload key, created_at, retry_count,
+                            max_retries]
+
+Payloads larger than ``payload_ref_threshold`` bytes are stored once under a
+content-addressed key (``taifa_etl:payload:<sha256>``) and the entry holds only
+the key, so a full article body is not copied into every queue, retry and
+dead-letter entry. Entries written by the previous JSON serializer (which
+always start with ``{``) are still decoded.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .etl_architecture import ETLTask, PipelineStage, Priority
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CODEC_VERSION = 1
+FLAG_ZSTD = 0x01
+FLAG_PAYLOAD_REF = 0x02
+PAYLOAD_KEY_PREFIX = "taifa_etl:payload:"
+
+
+class TaskCodecError(ValueError):
+    """Raised when a queue entry cannot be decoded"""
+
+
+@dataclass
+class EncodedTask:
+    """Queue entry plus the out-of-line payload blob it references, if any"""
+    entry: bytes
+    payload_key: Optional[str] = None
+    payload_blob: Optional[bytes] = None
+
+
+def task_from_dict(task_dict: Dict[str, Any]) -> ETLTask:
+    """Rebuild an ETLTask from ETLTask.to_dict() output"""
+    return ETLTask(
+        id=task_dict['id'],
+        stage=PipelineStage(task_dict['stage']),
+        priority=Priority(task_dict['priority']),
+        source_type=task_dict['source_type'],
+        source_id=task_dict['source_id'],
+        payload=task_dict['payload'],
+        created_at=datetime.fromisoformat(task_dict['created_at']),
+        retry_count=task_dict.get('retry_count', 0),
+        max_retries=task_dict.get('max_retries', 3)
+    )
+
+
+class JSONTaskCodec:
+    """The original ``json.dumps(task.to_dict())`` entry format"""
+
+    def encode(self, task: ETLTask, inline: bool = False) -> EncodedTask:
+        return EncodedTask(entry=json.dumps(task.to_dict(), default=str).encode('utf-8'))
+
+    def payload_key(self, entry: bytes) -> Optional[str]:
+        return None
+
+    def decode(self, entry: bytes, payload_blob: Optional[bytes] = None) -> ETLTask:
+        try:
+            return task_from_dict(json.loads(entry))
+        except (ValueError, KeyError, TypeError) as e:
+            raise TaskCodecError(f"Invalid JSON task entry: {e}") from e
+
+
+class MsgpackTaskCodec:
+    """Versioned msgpack entries with optional zstd and out-of-line payloads"""
+
+    def __init__(self, compress_threshold: int = 1024, compression_level: int = 3,
+                 payload_ref_threshold: int = 16384):
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is required for MsgpackTaskCodec")
+
+        self.compress_threshold = compress_threshold if ZSTD_AVAILABLE else None
+        self.payload_ref_threshold = payload_ref_threshold
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if ZSTD_AVAILABLE else None
+        self._decompressor = zstandard.ZstdDecompressor() if ZSTD_AVAILABLE else None
+        self._legacy = JSONTaskCodec()
+
+    def encode(self, task: ETLTask, inline: bool = False) -> EncodedTask:
+        """Encode a task; ``inline`` keeps the payload in the entry regardless of size"""
+        payload: Any = task.payload
+        payload_key = payload_blob = None
+        flags = 0
+
+        packed_payload = msgpack.packb(task.payload, default=str)
+        if not inline and len(packed_payload) > self.payload_ref_threshold:
+            payload_key = PAYLOAD_KEY_PREFIX + hashlib.sha256(packed_payload).hexdigest()
+            payload_blob = self._frame(packed_payload)
+            payload = payload_key
+            flags |= FLAG_PAYLOAD_REF
+
+        body = msgpack.packb([
+            task.id,
+            task.stage.value,
+            task.priority.value,
+            task.source_type,
+            task.source_id,
+            payload,
+            task.created_at.isoformat(),
+            task.retry_count,
+            task.max_retries
+        ], default=str)
+
+        return EncodedTask(entry=self._frame(body, flags), payload_key=payload_key, payload_blob=payload_blob)
+
+    def payload_key(self, entry: bytes) -> Optional[str]:
+        """Key of the out-of-line payload an entry references, if any"""
+        if not entry or entry[:1] == b'{' or not entry[1] & FLAG_PAYLOAD_REF:
+            return None
+        return self._unpack(entry)[5]
+
+    def decode(self, entry: bytes, payload_blob: Optional[bytes] = None) -> ETLTask:
+        """Decode an entry (or a legacy JSON entry); referenced payloads need payload_blob"""
+        if entry[:1] == b'{':
+            return self._legacy.decode(entry)
+
+        fields = self._unpack(entry)
+        payload = fields[5]
+        if entry[1] & FLAG_PAYLOAD_REF:
+            if payload_blob is None:
+                raise TaskCodecError(f"Payload {payload} for task {fields[0]} is missing")
+            payload = msgpack.unpackb(self._unframe(payload_blob), strict_map_key=False)
+
+        return ETLTask(
+            id=fields[0],
+            stage=PipelineStage(fields[1]),
+            priority=Priority(fields[2]),
+            source_type=fields[3],
+            source_id=fields[4],
+            payload=payload,
+            created_at=datetime.fromisoformat(fields[6]),
+            retry_count=fields[7],
+            max_retries=fields[8]
+        )
+
+    def _frame(self, data: bytes, flags: int = 0) -> bytes:
+        if self.compress_threshold is not None and len(data) > self.compress_threshold:
+            data = self._compressor.compress(data)
+            flags |= FLAG_ZSTD
+        return bytes((CODEC_VERSION, flags)) + data
+
+    def _unframe(self, framed: bytes) -> bytes:
+        if len(framed) < 2 or framed[0] != CODEC_VERSION:
+            raise TaskCodecError(f"Unsupported task codec version {framed[:1]!r}")
+        data = framed[2:]
+        if framed[1] & FLAG_ZSTD:
+            if self._decompressor is None:
+                raise TaskCodecError("zstandard is required to decode this entry")
+            data = self._decompressor.decompress(data)
+        return data
+
+    def _unpack(self, entry: bytes) -> list:
+        try:
+            return msgpack.unpackb(self._unframe(entry), strict_map_key=False)
+        except TaskCodecError:
+            raise
+        except Exception as e:
+            raise TaskCodecError(f"Invalid task entry: {e}") from e
+
+
+def get_task_codec(name: str = "msgpack", **kwargs):
+    """Codec by name, falling back to JSON when msgpack is not installed"""
+    if name == "msgpack":
+        if MSGPACK_AVAILABLE:
+            return MsgpackTaskCodec(**kwargs)
+        logger.warning("msgpack not installed, using JSON task codec")
+    return JSONTaskCodec()
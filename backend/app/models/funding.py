@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, JSON, Date, Numeric, Table
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from app.core.base import Base
@@ -185,6 +185,9 @@ class AfricaIntelligenceItem(Base):
     translation_status = Column(JSONB)
     is_multilingual = Column(Boolean, default=False)
     
+    # Full-text search (maintained by a database trigger, see alembic 005)
+    search_vector = deferred(Column(TSVECTOR))
+    
     # Relationships
     organization = relationship("Organization", foreign_keys=[organization_id], back_populates="africa_intelligence_feed")  # Legacy relationship
     type = relationship("FundingType")
@@ -0,0 +1,178 @@
+"""
+Reusable Headless-Browser Pool
+
+Starting Chromium under Selenium takes seconds, which JS-heavy scraping
+targets used to pay again and again. ``BrowserPool`` keeps a bounded set of
+warm drivers and leases each one to a single caller at a time:
+
+- ``lease()`` is a context manager. It hands out an idle driver, or starts a
+  new one while fewer than ``max_size`` exist, or otherwise waits up to
+  ``acquire_timeout`` for one to be returned.
+- A cheap health check runs on every checkout. Drivers that fail it are quit
+  and replaced instead of being handed out.
+- Drivers are recycled after ``max_uses`` leases or ``max_age_seconds``, which
+  bounds the memory a long-lived Chromium accumulates.
+- If the body of a lease raises and the driver then fails its health check,
+  the driver is discarded rather than returned to the pool.
+
+The pool knows nothing about Selenium itself. Callers pass a ``factory`` that
+starts a driver, and optionally a ``health_check``. By default the check runs
+a trivial script.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolTimeout(Exception):
+    """No driver became available within the acquire timeout"""
+
+
+class _PooledDriver:
+    __slots__ = ('driver', 'created_at', 'uses')
+
+    def __init__(self, driver: Any):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+def default_health_check(driver: Any) -> bool:
+    """A live WebDriver session answers a trivial script"""
+    return driver.execute_script("return 1") == 1
+
+
+class BrowserPool:
+    """Bounded, thread-safe pool of reusable browser drivers"""
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 3, max_uses: int = 100,
+                 max_age_seconds: float = 1800, acquire_timeout: float = 120.0,
+                 health_check: Optional[Callable[[Any], bool]] = None):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+        self.max_age_seconds = max_age_seconds
+        self.acquire_timeout = acquire_timeout
+        self.health_check = health_check or default_health_check
+
+        self._idle: Deque[_PooledDriver] = deque()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._in_use = 0
+
+        self.stats = {
+            'created': 0,
+            'leases': 0,
+            'reused': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'timeouts': 0
+        }
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Borrow a healthy driver for the duration of the block"""
+        pooled = self._checkout()
+        healthy = True
+        try:
+            yield pooled.driver
+        except Exception:
+            healthy = self._is_healthy(pooled)
+            raise
+        finally:
+            self._checkin(pooled, healthy)
+
+    def close(self):
+        """Quit idle drivers; drivers still leased are quit when returned"""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            idle, in_use = len(self._idle), self._in_use
+        return {
+            'max_size': self.max_size,
+            'idle': idle,
+            'in_use': in_use,
+            **self.stats
+        }
+
+    def _checkout(self) -> _PooledDriver:
+        if self._closed:
+            raise RuntimeError("browser pool is closed")
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self.stats['timeouts'] += 1
+            raise BrowserPoolTimeout(f"no browser available within {self.acquire_timeout}s")
+
+        try:
+            while True:
+                with self._lock:
+                    pooled = self._idle.pop() if self._idle else None
+                if pooled is None:
+                    break
+                if self._is_expired(pooled):
+                    self.stats['recycled'] += 1
+                    self._quit(pooled)
+                elif not self._is_healthy(pooled):
+                    self._quit(pooled)
+                else:
+                    self.stats['reused'] += 1
+                    break
+
+            if pooled is None:
+                pooled = _PooledDriver(self.factory())
+                self.stats['created'] += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        pooled.uses += 1
+        with self._lock:
+            self._in_use += 1
+            self.stats['leases'] += 1
+        return pooled
+
+    def _checkin(self, pooled: _PooledDriver, healthy: bool):
+        with self._lock:
+            self._in_use -= 1
+        try:
+            if not healthy or self._closed:
+                self._quit(pooled)
+            elif self._is_expired(pooled):
+                self.stats['recycled'] += 1
+                self._quit(pooled)
+            else:
+                with self._lock:
+                    self._idle.append(pooled)
+        finally:
+            self._slots.release()
+
+    def _is_expired(self, pooled: _PooledDriver) -> bool:
+        return (pooled.uses >= self.max_uses or
+                time.monotonic() - pooled.created_at >= self.max_age_seconds)
+
+    def _is_healthy(self, pooled: _PooledDriver) -> bool:
+        try:
+            if self.health_check(pooled.driver):
+                return True
+        except Exception as e:
+            logger.warning(f"Browser health check failed: {e}")
+        self.stats['health_check_failures'] += 1
+        return False
+
+    def _quit(self, pooled: _PooledDriver):
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser driver: {e}")
@@ -0,0 +1,283 @@
+"""
+Bulk Upsert Writer for the Ingestion Pipeline
+
+Buffers collected rows from every source and writes them to Supabase as
+multi-row upserts (``on_conflict=source_url``) instead of one request per item.
+A batch is flushed when ``batch_size`` rows are buffered or when the oldest
+buffered row has waited ``flush_interval_seconds``.
+
+The Supabase client is synchronous, so each batch runs in a worker thread; the
+buffer is guarded by a thread lock, so the writer can be shared by the async
+pipeline and by the threaded workers (each of which runs its own event loop).
+
+A failed upsert is retried with exponential backoff. If it keeps failing on a
+database error, the batch is bisected so the rows the database rejects are
+isolated and every other row is still written. Rows are never dropped
+silently: ``add(rows, on_complete=...)`` calls back with the rows of that call
+that could not be written once all of them are settled, and the counts show up
+in the stats.
+
+Listeners registered with ``add_listener`` are awaited with the stored rows
+(as returned by the database, ids included) after each batch is written.
+Anything that must only happen once rows are durable hooks in there.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BulkWriteStats:
+    """Throughput and latency of the bulk writer"""
+    batches: int = 0
+    rows_written: int = 0
+    rows_failed: int = 0
+    failed_batches: int = 0
+    retries: int = 0
+    total_write_seconds: float = 0.0
+    last_batch_rows: int = 0
+    last_batch_latency_ms: float = 0.0
+    max_batch_latency_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'rows_written': self.rows_written,
+            'rows_failed': self.rows_failed,
+            'failed_batches': self.failed_batches,
+            'retries': self.retries,
+            'last_batch_rows': self.last_batch_rows,
+            'last_batch_latency_ms': round(self.last_batch_latency_ms, 2),
+            'avg_batch_latency_ms': round(self.total_write_seconds * 1000 / self.batches, 2) if self.batches else 0.0,
+            'max_batch_latency_ms': round(self.max_batch_latency_ms, 2),
+            'rows_per_second': round(self.rows_written / self.total_write_seconds, 1) if self.total_write_seconds else 0.0
+        }
+
+
+# Failures of the connection rather than of the rows; bisecting cannot help
+_TRANSPORT_ERRORS = (httpx.TransportError, OSError)
+
+
+class _Delivery:
+    """Rows of one add() call that are not settled yet, and who to tell"""
+
+    __slots__ = ('pending', 'failed', 'callback')
+
+    def __init__(self, pending: int, callback: Callable[[List[Dict[str, Any]]], Any]):
+        self.pending = pending
+        self.failed: List[Dict[str, Any]] = []
+        self.callback = callback
+
+
+# A buffered row and the delivery it belongs to (None when nobody is waiting)
+_Entry = Tuple[Dict[str, Any], Optional[_Delivery]]
+
+
+class BulkUpsertWriter:
+    """Size- and time-triggered batched upserts into one table"""
+
+    def __init__(self, client, table: str = 'africa_intelligence_feed',
+                 on_conflict: str = 'source_url', batch_size: int = 1000,
+                 flush_interval_seconds: float = 2.0, max_retries: int = 3,
+                 retry_backoff_seconds: float = 0.5):
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.stats = BulkWriteStats()
+
+        self._buffer: List[_Entry] = []
+        self._oldest_buffered_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[List[Dict[str, Any]]], Awaitable[Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    async def add(self, rows: List[Dict[str, Any]],
+                  on_complete: Optional[Callable[[List[Dict[str, Any]]], Any]] = None) -> int:
+        """
+        Buffer rows, writing every full batch; returns the number of rows written.
+
+        on_complete(failed_rows) is called once every one of these rows has been
+        written or given up on, possibly by a later flush from another worker, so
+        it must be a plain function that is safe to call from any thread.
+        """
+        if not rows:
+            if on_complete is not None:
+                on_complete([])
+            return 0
+
+        delivery = _Delivery(len(rows), on_complete) if on_complete is not None else None
+        with self._lock:
+            if not self._buffer:
+                self._oldest_buffered_at = time.monotonic()
+            self._buffer.extend((row, delivery) for row in rows)
+            chunks = self._take(full_only=True)
+
+        return await self._write_chunks(chunks)
+
+    async def flush(self) -> int:
+        """Write everything buffered"""
+        with self._lock:
+            chunks = self._take(full_only=False)
+
+        return await self._write_chunks(chunks)
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], Awaitable[Any]]):
+        """Await callback(stored_rows) after every successfully written batch"""
+        self._listeners.append(callback)
+
+    async def flush_if_due(self) -> int:
+        """Flush when the oldest buffered row has waited flush_interval_seconds"""
+        oldest = self._oldest_buffered_at
+        if oldest is None or time.monotonic() - oldest < self.flush_interval_seconds:
+            return 0
+        return await self.flush()
+
+    async def run_periodic_flush(self, stop_event: threading.Event):
+        """Time-based flushing until stop_event is set, then a final flush"""
+        while not stop_event.is_set():
+            await asyncio.sleep(min(self.flush_interval_seconds / 2, 1.0))
+            try:
+                await self.flush_if_due()
+            except Exception as e:
+                logger.error(f"Bulk writer periodic flush error: {e}")
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats.to_dict(), 'buffered_rows': len(self._buffer)}
+
+    def _take(self, full_only: bool) -> List[List[_Entry]]:
+        """Remove batches from the buffer (caller holds the lock)"""
+        cut = len(self._buffer) - len(self._buffer) % self.batch_size if full_only else len(self._buffer)
+        if cut == 0:
+            return []
+
+        taken, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        self._oldest_buffered_at = time.monotonic() if self._buffer else None
+        return [taken[i:i + self.batch_size] for i in range(0, len(taken), self.batch_size)]
+
+    async def _write_chunks(self, chunks: List[List[_Entry]]) -> int:
+        written = 0
+        for chunk in chunks:
+            stored, settled = await asyncio.to_thread(self._write_chunk, chunk)
+            written += len(stored)
+            if stored:
+                await self._notify(stored)
+            self._settle(settled)
+        return written
+
+    async def _notify(self, stored: List[Dict[str, Any]]):
+        for callback in self._listeners:
+            try:
+                await callback(stored)
+            except Exception as e:
+                logger.error(f"Bulk writer listener {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def _settle(self, settled: List[Tuple[_Entry, bool]]):
+        """Count settled rows against their deliveries and call the completed ones"""
+        completed = []
+        with self._lock:
+            for (row, delivery), ok in settled:
+                if delivery is None:
+                    continue
+                if not ok:
+                    delivery.failed.append(row)
+                delivery.pending -= 1
+                if delivery.pending == 0:
+                    completed.append(delivery)
+
+        for delivery in completed:
+            try:
+                delivery.callback(delivery.failed)
+            except Exception as e:
+                logger.error(f"Bulk writer completion callback failed: {e}")
+
+    def _write_chunk(self, chunk: List[_Entry]) -> Tuple[List[Dict[str, Any]], List[Tuple[_Entry, bool]]]:
+        """
+        Upsert one batch, retrying and bisecting around failures. Returns the
+        stored rows and every entry of the chunk with whether it was written.
+        """
+        # Postgres rejects an upsert that touches the same row twice: the latest
+        # version of a conflict key is written and settles the earlier ones too
+        groups: Dict[Any, List[_Entry]] = {}
+        for entry in chunk:
+            groups.setdefault(entry[0].get(self.on_conflict) or id(entry[0]), []).append(entry)
+
+        stored: List[Dict[str, Any]] = []
+        written: List[List[_Entry]] = []
+        failed: List[List[_Entry]] = []
+
+        start = time.perf_counter()
+        self._write_groups(list(groups.values()), stored, written, failed, attempts=self.max_retries + 1)
+        latency = time.perf_counter() - start
+
+        rows_written = len(written)
+        with self._lock:
+            self.stats.total_write_seconds += latency
+            if written:
+                self.stats.batches += 1
+                self.stats.rows_written += rows_written
+                self.stats.last_batch_rows = rows_written
+                self.stats.last_batch_latency_ms = latency * 1000
+                self.stats.max_batch_latency_ms = max(self.stats.max_batch_latency_ms, latency * 1000)
+            if failed:
+                self.stats.failed_batches += 1
+                self.stats.rows_failed += len(failed)
+
+        if failed:
+            logger.error(f"Bulk upsert into {self.table}: {len(failed)} of {len(groups)} rows could not be written")
+        logger.debug(f"Upserted {rows_written} rows into {self.table} in {latency * 1000:.1f}ms "
+                     f"({rows_written / latency if latency else 0:.0f} rows/s)")
+
+        settled = [(entry, True) for group in written for entry in group]
+        settled += [(entry, False) for group in failed for entry in group]
+        return stored, settled
+
+    def _write_groups(self, groups: List[List[_Entry]], stored: List[Dict[str, Any]],
+                      written: List[List[_Entry]], failed: List[List[_Entry]], attempts: int) -> bool:
+        """
+        Upsert the latest row of each group, retrying with exponential backoff.
+        A database error that persists is narrowed down by bisecting; returns
+        False when the connection itself is failing, so bisecting stops.
+        """
+        rows = [group[-1][0] for group in groups]
+        error: Optional[Exception] = None
+        for attempt in range(attempts):
+            if attempt:
+                with self._lock:
+                    self.stats.retries += 1
+                time.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+            try:
+                response = self.client.table(self.table).upsert(rows, on_conflict=self.on_conflict).execute()
+            except Exception as e:
+                error = e
+                continue
+            stored.extend(getattr(response, 'data', None) or rows)
+            written.extend(groups)
+            return True
+
+        if len(groups) == 1 or isinstance(error, _TRANSPORT_ERRORS):
+            logger.warning(f"Upsert of {len(rows)} rows into {self.table} failed"
+                           f"{'' if len(rows) > 1 else ' for ' + str(rows[0].get(self.on_conflict))}: {error}")
+            failed.extend(groups)
+            return not isinstance(error, _TRANSPORT_ERRORS)
+
+        # Retries ruled out a transient failure, so each half gets one attempt
+        middle = len(groups) // 2
+        if not self._write_groups(groups[:middle], stored, written, failed, attempts=1):
+            failed.extend(groups[middle:])
+            return False
+        return self._write_groups(groups[middle:], stored, written, failed, attempts=1)
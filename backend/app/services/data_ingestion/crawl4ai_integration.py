@@ -19,7 +19,7 @@ Strategy:
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, AsyncIterator, Awaitable, Callable
 from datetime import datetime, timedelta
 import json
 import time
@@ -35,6 +35,7 @@ from app.core.integrated_ingestion_pipeline import IntegratedIngestionPipeline,
 # Import new pipeline components
 from .monitoring_system import ComprehensiveMonitoringSystem, MetricType
 from .batch_processor import BatchTask, DataSource, BatchStatus
+from .streaming_executor import stream_bounded
 
 # Crawl4AI imports
 from crawl4ai import AsyncWebCrawler, LLMExtractionStrategy, CrawlerRunConfig, CacheMode
@@ -66,10 +67,11 @@ class Crawl4AIConfig:
     extraction_temperature: float = 0.1
     
     # Batch processing settings
-    batch_size: int = 50
-    max_workers: int = 10
+    batch_size: int = 50  # progress reporting / write-back granularity
+    max_workers: int = 10  # sliding-window worker pool size
     retry_attempts: int = 3
-    rate_limit_delay: float = 2.0
+    rate_limit_delay: float = 2.0  # minimum spacing between requests to one domain
+    per_domain_concurrency: int = 2
     
     # Content filtering
     min_content_length: int = 100
@@ -453,89 +455,98 @@ class EnhancedCrawl4AIProcessor:
         """
         Process high-volume batch of targets
         New capability for scaling to 10K-100M records
+        
+        Collects every opportunity in memory; callers that write results out
+        should consume stream_high_volume_batch instead.
+        """
+        all_results = []
+        try:
+            async for result in self.stream_high_volume_batch(targets):
+                if result.get('status') == 'success':
+                    all_results.extend(result.get('opportunities', []))
+            return all_results
+            
+        except Exception as e:
+            logger.error(f"High-volume batch processing failed: {e}")
+            return []
+    
+    async def stream_high_volume_batch(self, targets: List[CrawlTarget]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield each target's result as soon as it completes
+        
+        A pool of config.max_workers workers pulls targets continuously, so a
+        slow page only holds its own slot; per-domain concurrency and request
+        spacing replace the old sleep between chunks.
         """
         logger.info(f"Processing high-volume batch of {len(targets)} targets")
         
-        all_results = []
         batch_start_time = time.time()
+        completed = 0
+        items_extracted = 0
         
-        try:
-            # Process in chunks to manage memory and resources
-            chunk_size = self.config.batch_size
+        async for outcome in stream_bounded(
+            targets,
+            self._process_single_target,
+            max_workers=self.config.max_workers,
+            per_domain_concurrency=self.config.per_domain_concurrency,
+            domain_delay=self.config.rate_limit_delay
+        ):
+            completed += 1
+            if outcome.error is not None:
+                logger.error(f"Target processing error: {outcome.error}")
+                self.stats['failed_extractions'] += 1
+                result = {'status': 'error', 'target': outcome.item.url, 'error': str(outcome.error)}
+            else:
+                result = outcome.result
+                if result and result.get('status') == 'success':
+                    items_extracted += len(result.get('opportunities', []))
+                    self.stats['successful_extractions'] += 1
+                    self.stats['content_items_extracted'] += len(result.get('opportunities', []))
             
-            for i in range(0, len(targets), chunk_size):
-                chunk = targets[i:i + chunk_size]
-                
-                # Process chunk concurrently
-                chunk_tasks = [
-                    self._process_single_target(target) 
-                    for target in chunk
-                ]
-                
-                chunk_results = await asyncio.gather(*chunk_tasks, return_exceptions=True)
-                
-                # Filter successful results
-                for result in chunk_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Chunk processing error: {result}")
-                        self.stats['failed_extractions'] += 1
-                        continue
-                    
-                    if result and result.get('status') == 'success':
-                        all_results.extend(result.get('opportunities', []))
-                        self.stats['successful_extractions'] += 1
-                        self.stats['content_items_extracted'] += len(result.get('opportunities', []))
-                
-                # Rate limiting between chunks
-                await asyncio.sleep(self.config.rate_limit_delay)
-                
-                # Record progress
+            # Record progress
+            if completed % self.config.batch_size == 0 or completed == len(targets):
                 self.monitoring_system.record_metric(
                     'crawl4ai_batch_progress',
-                    (i + len(chunk)) / len(targets) * 100,
+                    completed / len(targets) * 100,
                     MetricType.GAUGE,
-                    {'batch_id': f"batch_{int(time.time())}"}
+                    {'batch_type': 'high_volume'}
                 )
             
-            # Calculate batch statistics
-            batch_time = time.time() - batch_start_time
-            self.stats['processing_time_total'] += batch_time
-            self.stats['total_targets_processed'] += len(targets)
-            
-            if self.stats['total_targets_processed'] > 0:
-                self.stats['average_processing_time'] = (
-                    self.stats['processing_time_total'] / self.stats['total_targets_processed']
-                )
-            
-            # Record batch metrics
-            self.monitoring_system.record_metric(
-                'crawl4ai_batch_size',
-                len(targets),
-                MetricType.GAUGE,
-                {'batch_type': 'high_volume'}
-            )
-            
-            self.monitoring_system.record_metric(
-                'crawl4ai_batch_time',
-                batch_time,
-                MetricType.GAUGE,
-                {'batch_type': 'high_volume'}
-            )
-            
-            self.monitoring_system.record_metric(
-                'crawl4ai_items_per_second',
-                len(all_results) / batch_time if batch_time > 0 else 0,
-                MetricType.GAUGE,
-                {'batch_type': 'high_volume'}
+            yield result
+        
+        # Calculate batch statistics
+        batch_time = time.time() - batch_start_time
+        self.stats['processing_time_total'] += batch_time
+        self.stats['total_targets_processed'] += len(targets)
+        
+        if self.stats['total_targets_processed'] > 0:
+            self.stats['average_processing_time'] = (
+                self.stats['processing_time_total'] / self.stats['total_targets_processed']
             )
-            
-            logger.info(f"Batch processing completed: {len(all_results)} items extracted in {batch_time:.2f}s")
-            
-            return all_results
-            
-        except Exception as e:
-            logger.error(f"High-volume batch processing failed: {e}")
-            return []
+        
+        # Record batch metrics
+        self.monitoring_system.record_metric(
+            'crawl4ai_batch_size',
+            len(targets),
+            MetricType.GAUGE,
+            {'batch_type': 'high_volume'}
+        )
+        
+        self.monitoring_system.record_metric(
+            'crawl4ai_batch_time',
+            batch_time,
+            MetricType.GAUGE,
+            {'batch_type': 'high_volume'}
+        )
+        
+        self.monitoring_system.record_metric(
+            'crawl4ai_items_per_second',
+            items_extracted / batch_time if batch_time > 0 else 0,
+            MetricType.GAUGE,
+            {'batch_type': 'high_volume'}
+        )
+        
+        logger.info(f"Batch processing completed: {items_extracted} items extracted in {batch_time:.2f}s")
     
     async def _process_single_target(self, target: CrawlTarget) -> Dict[str, Any]:
         """Process a single crawl target"""
@@ -985,8 +996,47 @@ class Crawl4AIMasterPipelineIntegration:
             priority=1
         )
     
+    async def stream_batch(self, targets: List[CrawlTarget],
+                           sink: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+                           flush_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Crawl targets and hand opportunities to sink in chunks as they arrive
+        
+        Only up to flush_size opportunities (default: crawl4ai batch_size) are
+        held at a time; returns per-batch counts.
+        """
+        flush_size = flush_size or self.crawl4ai_processor.config.batch_size
+        counts = {'targets': 0, 'successful': 0, 'failed': 0, 'opportunities': 0, 'flushes': 0}
+        buffer: List[Dict[str, Any]] = []
+        
+        async for result in self.crawl4ai_processor.stream_high_volume_batch(targets):
+            counts['targets'] += 1
+            if result.get('status') != 'success':
+                counts['failed'] += 1
+                continue
+            
+            counts['successful'] += 1
+            buffer.extend(result.get('opportunities', []))
+            if len(buffer) >= flush_size:
+                counts['opportunities'] += len(buffer)
+                counts['flushes'] += 1
+                await sink(buffer)
+                buffer = []
+        
+        if buffer:
+            counts['opportunities'] += len(buffer)
+            counts['flushes'] += 1
+            await sink(buffer)
+        
+        return counts
+    
     async def _process_crawl4ai_batch(self, batch_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Process Crawl4AI batch for master pipeline"""
+        """
+        Process Crawl4AI batch for master pipeline
+        
+        Opportunities that enrich an RSS item are written back chunk by chunk as
+        they complete; every other opportunity is returned to the caller.
+        """
         try:
             # Extract targets from batch data
             targets = [
@@ -994,10 +1044,21 @@ class Crawl4AIMasterPipelineIntegration:
                 for target_data in batch_data[0].get('targets', [])
             ]
             
-            # Process with Crawl4AI
-            results = await self.crawl4ai_processor.process_high_volume_batch(targets)
+            discovered: List[Dict[str, Any]] = []
+            
+            async def route(opportunities: List[Dict[str, Any]]):
+                enrichments = []
+                for opportunity in opportunities:
+                    if (opportunity.get('metadata') or {}).get('rss_item_id'):
+                        enrichments.append(opportunity)
+                    else:
+                        discovered.append(opportunity)
+                if enrichments:
+                    await self.master_pipeline._apply_crawl4ai_opportunities(enrichments)
+            
+            counts = await self.stream_batch(targets, route)
             
-            return [{'success': True, 'opportunities': results}]
+            return [{'success': True, **counts, 'opportunities': discovered}]
             
         except Exception as e:
             logger.error(f"Crawl4AI batch processing failed: {e}")
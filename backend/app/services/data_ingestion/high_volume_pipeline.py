@@ -27,7 +27,8 @@ import re
 import backoff
 import queue
 import threading
-from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 import psutil
 import os
 
@@ -36,6 +37,12 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.pool import QueuePool
 import asyncpg
 
+from app.services.search_cache import get_search_cache
+
+from .bulk_writer import BulkUpsertWriter
+from .feed_fetcher import ConditionalFeedFetcher
+from .source_scheduler import SourceScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,6 +90,12 @@ class DataSource:
     consecutive_failures: int = 0
     base_check_interval: int = 60  # Original interval for reset calculations
     
+    # HTTP validators for conditional feed fetching
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None  # SHA-256 of the last parsed body
+    pending_fetch: Optional[Any] = None  # Fetch whose validators wait for its items to be stored
+    
     def __lt__(self, other):
         # Prioritize by dynamic score instead of just static priority
         return self.get_dynamic_priority_score() > other.get_dynamic_priority_score()
@@ -168,6 +181,17 @@ class DataSource:
             self.error_count += 1
             self.consecutive_failures += 1
         
+        self._record_check(response_time)
+    
+    def record_unchanged(self, response_time: float = 0.0):
+        """
+        A conditional check found the feed unchanged: the source is healthy, but
+        the check says nothing about its yield, so productivity is left alone
+        """
+        self.consecutive_failures = 0
+        self._record_check(response_time)
+    
+    def _record_check(self, response_time: float):
         # Update response time (moving average)
         if response_time > 0:
             if self.response_time_avg == 0:
@@ -213,19 +237,43 @@ class HighVolumeDataPipeline:
     Designed to handle 10K-100M records
     """
     
-    def __init__(self, max_workers: int = 50, batch_size: int = 1000):
+    def __init__(self, max_workers: int = 50, batch_size: int = 1000,
+                 execution_mode: str = "threaded", max_concurrent_fetches: int = 100,
+                 per_domain_concurrency: int = 4, parser_pool: str = "thread",
+                 parser_workers: Optional[int] = None, flush_interval_seconds: float = 2.0):
+        """
+        Args:
+            execution_mode: "threaded" (worker threads, one event loop per fetch)
+                or "async" (every source on the caller's event loop, sharing one
+                ClientSession)
+            max_concurrent_fetches: global cap on in-flight sources (async mode)
+            per_domain_concurrency: cap on in-flight sources per domain (async mode)
+            parser_pool: "thread" or "process" pool for blocking feed parsing
+            flush_interval_seconds: longest a collected item waits in the bulk
+                writer before its batch is written
+        """
         self.max_workers = max_workers
         self.batch_size = batch_size
+        self.execution_mode = execution_mode
+        self.max_concurrent_fetches = max_concurrent_fetches
+        self.per_domain_concurrency = per_domain_concurrency
+        self.parser_pool = parser_pool
+        self.parser_workers = parser_workers
+        self.flush_interval_seconds = flush_interval_seconds
         self.stats = IngestionStats()
         
         # Data sources configuration
-        self.sources: List[DataSource] = []
+        self._sources: List[DataSource] = []
+        self._sources_version = 0  # bumped by every change to the source set
+        self._scheduler_synced_version: Optional[int] = None
         self.source_queue = queue.PriorityQueue()
+        self.scheduler = SourceScheduler()
         self.processing_queue = queue.Queue(maxsize=10000)
         
         # Database connections
         self.db_pool = None
         self.supabase_client = None
+        self.bulk_writer: Optional[BulkUpsertWriter] = None
         
         # Processing control
         self.is_running = False
@@ -235,6 +283,16 @@ class HighVolumeDataPipeline:
         # Session management
         self.session_connector = None
         self.session_timeout = aiohttp.ClientTimeout(total=30)
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._parser_executor: Optional[Executor] = None
+        self.feed_fetcher = ConditionalFeedFetcher()
+        
+        # Async execution mode state (created in start_pipeline)
+        self._async_source_queue: Optional[asyncio.PriorityQueue] = None
+        self._fetch_semaphore: Optional[asyncio.Semaphore] = None
+        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._async_tasks: Set[asyncio.Task] = set()
         
         # Rate limiting
         self.rate_limiters = {}
@@ -242,6 +300,39 @@ class HighVolumeDataPipeline:
         # Initialize logging
         self._setup_logging()
     
+    @property
+    def sources(self) -> List[DataSource]:
+        return self._sources
+    
+    @sources.setter
+    def sources(self, sources: List[DataSource]):
+        self._sources = sources
+        self._sources_version += 1
+    
+    def add_source(self, source: DataSource):
+        """Add a source; the scheduler picks it up on its next pass"""
+        self._sources.append(source)
+        self._sources_version += 1
+    
+    def remove_source(self, source: DataSource):
+        """Remove a source; a check already running is not interrupted"""
+        if source in self._sources:
+            self._sources.remove(source)
+            self._sources_version += 1
+    
+    def set_source_enabled(self, source: DataSource, enabled: bool):
+        """Enable or disable a source"""
+        if source.enabled != enabled:
+            source.enabled = enabled
+            self._sources_version += 1
+    
+    def set_source_interval(self, source: DataSource, minutes: int):
+        """Change a source's base check interval and reschedule it accordingly"""
+        source.base_check_interval = minutes
+        source.check_interval_minutes = source.calculate_adaptive_interval()
+        self.scheduler.reschedule(source)
+        self._sources_version += 1
+    
     def _setup_logging(self):
         """Setup comprehensive logging"""
         logging.basicConfig(
@@ -261,6 +352,15 @@ class HighVolumeDataPipeline:
         await self._initialize_db_connections()
         
         # Initialize HTTP session
+        await self._initialize_http()
+        
+        # Load data sources
+        await self._load_data_sources()
+        
+        logger.info(f"Pipeline initialized with {len(self.sources)} data sources")
+    
+    async def _initialize_http(self):
+        """Create the pooled connector and the session shared by fetches on this loop"""
         self.session_connector = aiohttp.TCPConnector(
             limit=200,
             limit_per_host=20,
@@ -268,10 +368,13 @@ class HighVolumeDataPipeline:
             enable_cleanup_closed=True
         )
         
-        # Load data sources
-        await self._load_data_sources()
-        
-        logger.info(f"Pipeline initialized with {len(self.sources)} data sources")
+        # Shared session over the connector; used by every fetch that runs on
+        # this event loop (all of them in async mode)
+        self.http_session = aiohttp.ClientSession(
+            connector=self.session_connector,
+            timeout=self.session_timeout
+        )
+        self._session_loop = asyncio.get_running_loop()
     
     async def _initialize_db_connections(self):
         """Initialize database connection pools"""
@@ -282,6 +385,17 @@ class HighVolumeDataPipeline:
             supabase_key = os.getenv('SUPABASE_API_KEY')
             
             self.supabase_client: Client = create_client(supabase_url, supabase_key)
+            self.bulk_writer = BulkUpsertWriter(
+                self.supabase_client,
+                table='africa_intelligence_feed',
+                on_conflict='source_url',
+                batch_size=self.batch_size,
+                flush_interval_seconds=self.flush_interval_seconds
+            )
+            # Stored rows must be visible to later duplicate checks in this process
+            self.bulk_writer.add_listener(self._register_for_deduplication)
+            # ...and to intelligent search, whose cached rankings predate them
+            self.bulk_writer.add_listener(self._invalidate_search_cache)
             logger.info("Supabase client initialized")
         
         except Exception as e:
@@ -537,22 +651,26 @@ class HighVolumeDataPipeline:
             logger.warning("Pipeline is already running")
             return
         
-        logger.info("Starting high-volume data pipeline")
+        logger.info(f"Starting high-volume data pipeline ({self.execution_mode} mode)")
         self.is_running = True
         self.stop_event.clear()
         
+        if self.execution_mode == "async":
+            self._start_async_workers()
+            return
+        
         # Start worker threads
         self.workers = []
         
-        # Source monitoring workers
-        for i in range(min(10, len(self.sources))):
-            worker = threading.Thread(
-                target=self._source_monitor_worker,
-                name=f"SourceMonitor-{i}",
-                daemon=True
-            )
-            worker.start()
-            self.workers.append(worker)
+        # Source monitoring (one thread: the scheduler hands out each due source once)
+        self._sync_scheduler()
+        monitor_worker = threading.Thread(
+            target=self._source_monitor_worker,
+            name="SourceMonitor",
+            daemon=True
+        )
+        monitor_worker.start()
+        self.workers.append(monitor_worker)
         
         # Data processing workers
         for i in range(self.max_workers):
@@ -573,6 +691,16 @@ class HighVolumeDataPipeline:
         stats_worker.start()
         self.workers.append(stats_worker)
         
+        # Time-based bulk writer flushes
+        if self.bulk_writer is not None:
+            writer_worker = threading.Thread(
+                target=lambda: asyncio.run(self.bulk_writer.run_periodic_flush(self.stop_event)),
+                name="BulkWriter",
+                daemon=True
+            )
+            writer_worker.start()
+            self.workers.append(writer_worker)
+        
         # Queue management
         queue_worker = threading.Thread(
             target=self._queue_manager_worker,
@@ -584,6 +712,134 @@ class HighVolumeDataPipeline:
         
         logger.info(f"Pipeline started with {len(self.workers)} workers")
     
+    # =========================================================================
+    # ASYNC EXECUTION MODE
+    # =========================================================================
+    
+    def _start_async_workers(self):
+        """Run scheduling, fetching and stats as tasks on the current event loop"""
+        self._async_source_queue = asyncio.PriorityQueue()
+        self._fetch_semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        self._domain_semaphores = {}
+        self._sync_scheduler()
+        
+        self._spawn(self._async_source_monitor(), "SourceMonitor")
+        self._spawn(self._async_dispatcher(), "Dispatcher")
+        self._spawn(self._async_stats_monitor(), "StatsMonitor")
+        if self.bulk_writer is not None:
+            self._spawn(self.bulk_writer.run_periodic_flush(self.stop_event), "BulkWriter")
+        
+        logger.info(f"Pipeline started on one event loop "
+                    f"(global concurrency {self.max_concurrent_fetches}, "
+                    f"per-domain {self.per_domain_concurrency})")
+    
+    def _spawn(self, coro, name: str) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro, name=name)
+        self._async_tasks.add(task)
+        task.add_done_callback(self._async_tasks.discard)
+        return task
+    
+    async def _async_source_monitor(self):
+        """Schedule due sources onto the async source queue"""
+        last_daily_reset = datetime.now().date()
+        
+        while not self.stop_event.is_set():
+            try:
+                current_time = datetime.now()
+                
+                if current_time.date() > last_daily_reset:
+                    logger.info("Resetting daily metrics for all sources")
+                    for source in self.sources:
+                        source.reset_daily_metrics()
+                    last_daily_reset = current_time.date()
+                
+                self._sync_scheduler()
+                for source in self.scheduler.pop_due():
+                    dynamic_priority = 1.0 - source.get_dynamic_priority_score()
+                    self._async_source_queue.put_nowait((dynamic_priority, current_time, source))
+                
+                await asyncio.sleep(self._scheduler_wait())
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Async source monitor error: {e}")
+                await asyncio.sleep(30)
+    
+    async def _async_dispatcher(self):
+        """Start a fetch task for every queued source; semaphores bound concurrency"""
+        while not self.stop_event.is_set():
+            _, _, source = await self._async_source_queue.get()
+            self._spawn(self._run_source(source), f"Source-{source.name}")
+    
+    async def _run_source(self, source: DataSource):
+        try:
+            await self._process_source(source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Data processor error: {e}")
+        finally:
+            self.scheduler.complete(source)
+            self._async_source_queue.task_done()
+    
+    async def _async_stats_monitor(self):
+        while not self.stop_event.is_set():
+            try:
+                self._update_system_stats()
+            except Exception as e:
+                logger.error(f"Stats monitor error: {e}")
+            await asyncio.sleep(30)
+    
+    @asynccontextmanager
+    async def _http_session(self):
+        """The shared session when running on its loop, else a short-lived one"""
+        if self.http_session is not None and not self.http_session.closed:
+            try:
+                on_session_loop = asyncio.get_running_loop() is self._session_loop
+            except RuntimeError:
+                on_session_loop = False
+            if on_session_loop:
+                yield self.http_session
+                return
+        
+        async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
+            yield session
+    
+    @asynccontextmanager
+    async def _fetch_slot(self, source: DataSource):
+        """Hold a domain and a global fetch slot in async mode; threaded workers need none"""
+        if self._fetch_semaphore is None:
+            yield
+            return
+        
+        domain = urlparse(source.url).netloc
+        domain_semaphore = self._domain_semaphores.get(domain)
+        if domain_semaphore is None:
+            domain_semaphore = self._domain_semaphores[domain] = asyncio.Semaphore(self.per_domain_concurrency)
+        async with domain_semaphore:
+            async with self._fetch_semaphore:
+                yield
+    
+    def _get_parser_executor(self) -> Executor:
+        if self._parser_executor is None:
+            if self.parser_pool == "process":
+                self._parser_executor = ProcessPoolExecutor(max_workers=self.parser_workers)
+            else:
+                self._parser_executor = ThreadPoolExecutor(
+                    max_workers=self.parser_workers, thread_name_prefix="FeedParser"
+                )
+        return self._parser_executor
+    
+    async def _parse_feed(self, body: bytes):
+        """Run feedparser off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_parser_executor(), feedparser.parse, body)
+    
+    # =========================================================================
+    # THREADED EXECUTION MODE
+    # =========================================================================
+    
     def _source_monitor_worker(self):
         """Smart worker thread that monitors sources and schedules collection based on performance"""
         last_daily_reset = datetime.now().date()
@@ -599,31 +855,24 @@ class HighVolumeDataPipeline:
                         source.reset_daily_metrics()
                     last_daily_reset = current_time.date()
                 
-                # Sort sources by dynamic priority score (highest first)
-                active_sources = [s for s in self.sources if s.enabled]
-                active_sources.sort(key=lambda s: s.get_dynamic_priority_score(), reverse=True)
-                
-                sources_scheduled = 0
-                for source in active_sources:
-                    # Use smart scheduling logic
-                    if source.should_check_now():
-                        # Calculate dynamic priority for queue ordering
-                        dynamic_priority = 1.0 - source.get_dynamic_priority_score()  # Lower value = higher priority
-                        
-                        self.source_queue.put((dynamic_priority, current_time, source))
-                        sources_scheduled += 1
-                        
-                        # Log high-priority scheduling
-                        if source.get_dynamic_priority_score() >= 0.7:
-                            logger.info(f"High-priority source scheduled: {source.name} "
-                                       f"(score: {source.get_dynamic_priority_score():.2f}, "
-                                       f"interval: {source.check_interval_minutes}min)")
+                # Only sources whose deadline has passed come off the heap
+                self._sync_scheduler()
+                due_sources = self.scheduler.pop_due()
+                for source in due_sources:
+                    score = source.get_dynamic_priority_score()
+                    self.source_queue.put((1.0 - score, current_time, source))  # Lower value = higher priority
+                    
+                    # Log high-priority scheduling
+                    if score >= 0.7:
+                        logger.info(f"High-priority source scheduled: {source.name} "
+                                   f"(score: {score:.2f}, "
+                                   f"interval: {source.check_interval_minutes}min)")
                 
-                if sources_scheduled > 0:
-                    logger.debug(f"Scheduled {sources_scheduled} sources for collection")
+                if due_sources:
+                    logger.debug(f"Scheduled {len(due_sources)} sources for collection")
                 
-                # Sleep for a bit before checking again (shorter for more responsive scheduling)
-                time.sleep(5)
+                # Sleep until the next deadline (capped so new sources and stop are noticed)
+                self.stop_event.wait(self._scheduler_wait())
                 
             except Exception as e:
                 logger.error(f"Smart source monitor error: {e}")
@@ -639,43 +888,58 @@ class HighVolumeDataPipeline:
                 except queue.Empty:
                     continue
                 
-                # Process the source
-                asyncio.run(self._process_source(source))
-                
-                # Mark task as done
-                self.source_queue.task_done()
+                # Process the source, then hand it back to the scheduler
+                try:
+                    asyncio.run(self._process_source(source))
+                finally:
+                    self.scheduler.complete(source)
+                    self.source_queue.task_done()
                 
             except Exception as e:
                 logger.error(f"Data processor error: {e}")
                 time.sleep(1)
     
+    def _sync_scheduler(self):
+        """Apply source changes made since the last pass (cheap when nothing changed)"""
+        version = self._sources_version
+        if version != self._scheduler_synced_version:
+            self.scheduler.sync(self._sources)
+            self._scheduler_synced_version = version
+    
+    def _scheduler_wait(self, max_wait: float = 5.0) -> float:
+        wait = self.scheduler.seconds_until_next_due()
+        return max_wait if wait is None else min(max(wait, 0.05), max_wait)
+    
     def _stats_monitor_worker(self):
         """Worker thread that monitors and updates statistics"""
         while not self.stop_event.is_set():
             try:
-                # Update system stats
-                self.stats.memory_usage_mb = psutil.Process().memory_info().rss / 1024 / 1024
-                self.stats.cpu_usage_percent = psutil.cpu_percent()
-                self.stats.last_update = datetime.now()
-                
-                # Calculate processing rate
-                elapsed_minutes = (datetime.now() - self.stats.start_time).total_seconds() / 60
-                if elapsed_minutes > 0:
-                    self.stats.processing_rate_per_minute = self.stats.total_items_processed / elapsed_minutes
-                
-                # Log stats periodically
-                if int(time.time()) % 300 == 0:  # Every 5 minutes
-                    logger.info(f"Pipeline Stats: {self.stats.total_items_processed} items processed, "
-                               f"{self.stats.processing_rate_per_minute:.1f} items/min, "
-                               f"{self.stats.memory_usage_mb:.1f}MB memory, "
-                               f"{self.stats.cpu_usage_percent:.1f}% CPU")
-                
+                self._update_system_stats()
                 time.sleep(30)
                 
             except Exception as e:
                 logger.error(f"Stats monitor error: {e}")
                 time.sleep(60)
     
+    def _update_system_stats(self):
+        """Refresh memory/CPU usage and the processing rate"""
+        # Update system stats
+        self.stats.memory_usage_mb = psutil.Process().memory_info().rss / 1024 / 1024
+        self.stats.cpu_usage_percent = psutil.cpu_percent()
+        self.stats.last_update = datetime.now()
+        
+        # Calculate processing rate
+        elapsed_minutes = (datetime.now() - self.stats.start_time).total_seconds() / 60
+        if elapsed_minutes > 0:
+            self.stats.processing_rate_per_minute = self.stats.total_items_processed / elapsed_minutes
+        
+        # Log stats periodically
+        if int(time.time()) % 300 == 0:  # Every 5 minutes
+            logger.info(f"Pipeline Stats: {self.stats.total_items_processed} items processed, "
+                       f"{self.stats.processing_rate_per_minute:.1f} items/min, "
+                       f"{self.stats.memory_usage_mb:.1f}MB memory, "
+                       f"{self.stats.cpu_usage_percent:.1f}% CPU")
+    
     def _queue_manager_worker(self):
         """Worker thread that manages queue health and prevents overload"""
         while not self.stop_event.is_set():
@@ -703,31 +967,34 @@ class HighVolumeDataPipeline:
     async def _process_source(self, source: DataSource):
         """Process a single data source"""
         try:
-            start_time = time.time()
-            
-            # Apply rate limiting
+            # Wait out the rate limit (and, through the decorator, the retry
+            # backoff) before taking a fetch slot, so a waiting source does
+            # not block sources of other domains
             await self._apply_rate_limit(source)
             
-            # Collect data based on source type
-            if source.source_type == SourceType.RSS:
-                items = await self._collect_rss_data(source)
-            elif source.source_type == SourceType.NEWS_API:
-                items = await self._collect_news_api_data(source)
-            elif source.source_type == SourceType.WEB_SCRAPE:
-                items = await self._collect_web_scrape_data(source)
-            elif source.source_type == SourceType.API_INTEGRATION:
-                items = await self._collect_api_data(source)
-            else:
-                logger.warning(f"Unknown source type: {source.source_type}")
-                return
-            
-            # Process and store items
-            if items:
-                await self._store_items(items, source)
-                source.success_count += len(items)
-                self.stats.total_items_processed += len(items)
+            async with self._fetch_slot(source):
+                start_time = time.time()
                 
-                logger.info(f"Processed {len(items)} items from {source.name} in {time.time() - start_time:.2f}s")
+                # Collect data based on source type
+                if source.source_type == SourceType.RSS:
+                    items = await self._collect_rss_data(source)
+                elif source.source_type == SourceType.NEWS_API:
+                    items = await self._collect_news_api_data(source)
+                elif source.source_type == SourceType.WEB_SCRAPE:
+                    items = await self._collect_web_scrape_data(source)
+                elif source.source_type == SourceType.API_INTEGRATION:
+                    items = await self._collect_api_data(source)
+                else:
+                    logger.warning(f"Unknown source type: {source.source_type}")
+                    return
+                
+                # Process and store items
+                if items:
+                    await self._store_items(items, source)
+                    source.success_count += len(items)
+                    self.stats.total_items_processed += len(items)
+                    
+                    logger.info(f"Processed {len(items)} items from {source.name} in {time.time() - start_time:.2f}s")
             
         except Exception as e:
             logger.error(f"Error processing source {source.name}: {e}")
@@ -739,26 +1006,31 @@ class HighVolumeDataPipeline:
         """Apply rate limiting for a source"""
         domain = urlparse(source.url).netloc
         
-        if domain not in self.rate_limiters:
-            self.rate_limiters[domain] = time.time()
-        
-        # Check if we need to wait
-        time_since_last = time.time() - self.rate_limiters[domain]
-        if time_since_last < source.rate_limit_delay:
-            await asyncio.sleep(source.rate_limit_delay - time_since_last)
+        # Reserve the domain's next request slot before sleeping, so sources
+        # of one domain waiting concurrently are spaced out instead of all
+        # waking at once
+        now = time.time()
+        next_request = max(now, self.rate_limiters.get(domain, 0) + source.rate_limit_delay)
+        self.rate_limiters[domain] = next_request
         
-        self.rate_limiters[domain] = time.time()
+        if next_request > now:
+            await asyncio.sleep(next_request - now)
     
     async def _collect_rss_data(self, source: DataSource) -> List[Dict[str, Any]]:
         """Collect data from RSS feed with smart performance tracking"""
         start_time = time.time()
         
         try:
-            # Use feedparser for RSS parsing
-            feed = feedparser.parse(source.url)
+            # Conditional fetch through the shared session, parse off the event loop
+            async with self._http_session() as session:
+                result = await self.feed_fetcher.fetch(session, source)
             
-            if hasattr(feed, 'status') and feed.status >= 400:
-                raise Exception(f"HTTP {feed.status} error")
+            if result.not_modified:
+                source.record_unchanged(response_time=time.time() - start_time)
+                logger.debug(f"RSS feed unchanged: {source.name}")
+                return []
+            
+            feed = await self._parse_feed(result.body)
             
             items = []
             quality_scores = []
@@ -790,6 +1062,13 @@ class HighVolumeDataPipeline:
                     if quality_score >= 0.2:  # Lower threshold for general feeds
                         items.append(item)
             
+            # Validators are kept once the items are durably stored, so a failed
+            # write is re-fetched in full instead of being answered with a 304
+            if items:
+                source.pending_fetch = result
+            else:
+                self.feed_fetcher.remember(source, result)
+            
             # Calculate performance metrics
             response_time = time.time() - start_time
             avg_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0.0
@@ -858,7 +1137,7 @@ class HighVolumeDataPipeline:
     async def _collect_news_api_data(self, source: DataSource) -> List[Dict[str, Any]]:
         """Collect data from News API"""
         try:
-            async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
+            async with self._http_session() as session:
                 async with session.get(source.url) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -891,7 +1170,7 @@ class HighVolumeDataPipeline:
         """Collect data from web scraping"""
         try:
             # Basic web scraping - would need to be enhanced for production
-            async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
+            async with self._http_session() as session:
                 async with session.get(source.url) as response:
                     if response.status == 200:
                         content = await response.text()
@@ -925,7 +1204,7 @@ class HighVolumeDataPipeline:
             if source.auth:
                 headers.update(source.auth)
             
-            async with aiohttp.ClientSession(timeout=self.session_timeout) as session:
+            async with self._http_session() as session:
                 async with session.get(source.url, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -953,12 +1232,12 @@ class HighVolumeDataPipeline:
             return []
     
     async def _store_items(self, items: List[Dict[str, Any]], source: DataSource):
-        """Store collected items in database"""
+        """Queue collected items for the bulk writer (written in multi-row upserts)"""
         try:
-            if self.supabase_client:
-                for item in items:
-                    # Map item to the africa_intelligence_feed schema
-                    insert_data = {
+            if self.bulk_writer is not None:
+                # Map items to the africa_intelligence_feed schema
+                rows = [
+                    {
                         'title': item.get('title'),
                         'description': item.get('content'),
                         'source_url': item.get('url'),
@@ -966,22 +1245,38 @@ class HighVolumeDataPipeline:
                         'collected_at': item.get('collected_at'),
                         'keywords': item.get('keywords')
                     }
-                    data, count = self.supabase_client.table('africa_intelligence_feed').upsert(insert_data).execute()
-                    self.stats.total_items_stored += 1
+                    for item in items
+                ]
+                fetch, source.pending_fetch = source.pending_fetch, None
+                await self.bulk_writer.add(
+                    rows, on_complete=lambda failed: self._on_items_stored(source, fetch, failed)
+                )
             
         except Exception as e:
             logger.error(f"Error storing items: {e}")
             raise
     
-    def _batch_items(self, items: List[Dict[str, Any]], batch_size: int):
-        """Yield batches of items"""
-        for i in range(0, len(items), batch_size):
-            yield items[i:i + batch_size]
+    def _on_items_stored(self, source: DataSource, fetch, failed_rows: List[Dict[str, Any]]):
+        """
+        Bulk writer completion callback: every row of one _store_items call is
+        settled. The feed's validators are only kept when all of them were stored.
+        """
+        if failed_rows:
+            source.error_count += 1
+            self.stats.total_errors += 1
+            logger.error(f"{len(failed_rows)} items from {source.name} could not be stored: "
+                         f"{[row.get('source_url') for row in failed_rows[:5]]}")
+        elif fetch is not None:
+            self.feed_fetcher.remember(source, fetch)
+    
+    async def _register_for_deduplication(self, stored_rows: List[Dict[str, Any]]):
+        """Bulk writer listener: index stored rows for duplicate detection"""
+        from app.services.source_validation.deduplication import register_inserted_opportunities
+        await register_inserted_opportunities(stored_rows)
     
-    async def _batch_insert(self, conn, batch: List[Dict[str, Any]]):
-        """Batch insert items into database"""
-        # This method is no longer used with Supabase client, but kept for reference
-        pass
+    async def _invalidate_search_cache(self, stored_rows: List[Dict[str, Any]]):
+        """Bulk writer listener: drop cached intelligent search rankings"""
+        await get_search_cache().invalidate()
     
     async def stop_pipeline(self):
         """Stop the data pipeline"""
@@ -997,6 +1292,24 @@ class HighVolumeDataPipeline:
         for worker in self.workers:
             worker.join(timeout=30)
         
+        # Write whatever is still buffered
+        if self.bulk_writer is not None:
+            await self.bulk_writer.flush()
+        
+        # Cancel async-mode tasks
+        tasks = list(self._async_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Close the shared HTTP session and parser pool
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        if self._parser_executor is not None:
+            self._parser_executor.shutdown(wait=False)
+            self._parser_executor = None
+        
         # Close database connections
         if self.db_pool:
             await self.db_pool.close()
@@ -1006,6 +1319,8 @@ class HighVolumeDataPipeline:
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive pipeline statistics including smart prioritization metrics"""
         smart_stats = self.get_smart_prioritization_stats()
+        if self.bulk_writer is not None:
+            self.stats.total_items_stored = self.bulk_writer.stats.rows_written
         
         return {
             'total_sources': self.stats.total_sources,
@@ -1018,10 +1333,14 @@ class HighVolumeDataPipeline:
             'cpu_usage_percent': self.stats.cpu_usage_percent,
             'uptime_minutes': (datetime.now() - self.stats.start_time).total_seconds() / 60,
             'queue_sizes': {
-                'source_queue': self.source_queue.qsize(),
+                'source_queue': (self._async_source_queue.qsize() if self._async_source_queue is not None
+                                 else self.source_queue.qsize()),
                 'processing_queue': self.processing_queue.qsize()
             },
-            'smart_prioritization': smart_stats
+            'smart_prioritization': smart_stats,
+            'bulk_writer': self.bulk_writer.get_stats() if self.bulk_writer is not None else None,
+            'feed_fetcher': self.feed_fetcher.get_stats(),
+            'scheduler': self.scheduler.get_stats()
         }
     
     def get_smart_prioritization_stats(self) -> Dict[str, Any]:
@@ -495,8 +495,8 @@ class MasterDataIngestionPipeline:
     async def _process_web_scraping_data(self, batch_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Process web scraping data batch"""
         try:
-            # Run web scraping
-            content = self.web_scraper.scrape_all_targets()
+            # Run web scraping on this loop over the scraper's shared connection pool
+            content = await self.web_scraper.scrape_all_targets_async()
             
             return [{'success': True, 'content_count': len(content)}]
             
@@ -508,7 +508,7 @@ class MasterDataIngestionPipeline:
         """Process news API data batch"""
         try:
             # Run news collection
-            articles = self.news_collector.collect_all_queries()
+            articles = await self.news_collector.collect_all_queries_async()
             
             return [{'success': True, 'articles_count': len(articles)}]
             
@@ -600,55 +600,15 @@ class MasterDataIngestionPipeline:
             if not crawl_targets:
                 return {'enriched_count': 0, 'details': []}
             
-            # Process targets with Crawl4AI
-            enrichment_opportunities = await self.crawl4ai_processor.process_high_volume_batch(crawl_targets)
+            # Process targets with Crawl4AI, writing updates as results stream in
+            async def write_updates(opportunities: List[Dict[str, Any]]):
+                nonlocal enriched_count
+                result = await self._apply_crawl4ai_opportunities(opportunities)
+                enriched_count += result['enriched_count']
+                details.extend(result['details'])
             
-            # Prepare updates for Supabase
-            updates = []
-            for opportunity in enrichment_opportunities:
-                rss_item_id = opportunity.get('metadata', {}).get('rss_item_id')
-                if not rss_item_id:
-                    continue
-                
-                # Prepare update object
-                update_data = {
-                    'id': rss_item_id,
-                    'enrichment_status': 'crawl4ai_enriched',
-                    'updated_at': datetime.utcnow().isoformat()
-                }
-                
-                # Add fields to update if they exist in the opportunity
-                for field in ['funding_amount', 'application_deadline', 'eligibility_criteria', 
-                            'contact_email', 'application_url']:
-                    if field in opportunity and opportunity[field] is not None:
-                        update_data[field] = opportunity[field]
-                
-                # Handle relevance score
-                if 'relevance_score' in opportunity and opportunity['relevance_score'] is not None:
-                    # Get current relevance score to compare
-                    current_item = await supabase_utils.get_item_by_id(rss_item_id)
-                    current_score = current_item.get('relevance_score', 0) if current_item else 0
-                    update_data['relevance_score'] = max(
-                        current_score,
-                        float(opportunity['relevance_score'])
-                    )
-                
-                updates.append(update_data)
-                
-                # Track enrichment details
-                enriched_fields = [k for k in opportunity.keys() 
-                                 if k not in ['metadata', 'relevance_score'] and opportunity[k] is not None]
-                if enriched_fields:
-                    details.append({
-                        'item_id': rss_item_id,
-                        'enrichment_type': 'crawl4ai',
-                        'fields_enriched': enriched_fields
-                    })
-            
-            # Apply updates in bulk
-            if updates:
-                result = await supabase_utils.bulk_update_items(updates)
-                enriched_count = result.get('success', 0)
+            await self.crawl4ai_integration.stream_batch(crawl_targets, write_updates)
+            if enriched_count:
                 logger.info(f"Crawl4AI updated {enriched_count} RSS items via Supabase")
             
             return {
@@ -660,6 +620,60 @@ class MasterDataIngestionPipeline:
             logger.error(f"Error in Crawl4AI enrichment: {e}")
             return {'enriched_count': 0, 'details': [], 'error': str(e)}
     
+    async def _apply_crawl4ai_opportunities(self, opportunities: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Write one chunk of Crawl4AI opportunities back to their RSS items"""
+        details = []
+        
+        # Prepare updates for Supabase
+        updates = []
+        for opportunity in opportunities:
+            rss_item_id = opportunity.get('metadata', {}).get('rss_item_id')
+            if not rss_item_id:
+                continue
+            
+            # Prepare update object
+            update_data = {
+                'id': rss_item_id,
+                'enrichment_status': 'crawl4ai_enriched',
+                'updated_at': datetime.utcnow().isoformat()
+            }
+            
+            # Add fields to update if they exist in the opportunity
+            for field in ['funding_amount', 'application_deadline', 'eligibility_criteria', 
+                        'contact_email', 'application_url']:
+                if field in opportunity and opportunity[field] is not None:
+                    update_data[field] = opportunity[field]
+            
+            # Handle relevance score
+            if 'relevance_score' in opportunity and opportunity['relevance_score'] is not None:
+                # Get current relevance score to compare
+                current_item = await supabase_utils.get_item_by_id(rss_item_id)
+                current_score = current_item.get('relevance_score', 0) if current_item else 0
+                update_data['relevance_score'] = max(
+                    current_score,
+                    float(opportunity['relevance_score'])
+                )
+            
+            updates.append(update_data)
+            
+            # Track enrichment details
+            enriched_fields = [k for k in opportunity.keys() 
+                             if k not in ['metadata', 'relevance_score'] and opportunity[k] is not None]
+            if enriched_fields:
+                details.append({
+                    'item_id': rss_item_id,
+                    'enrichment_type': 'crawl4ai',
+                    'fields_enriched': enriched_fields
+                })
+        
+        # Apply updates in bulk
+        enriched_count = 0
+        if updates:
+            result = await supabase_utils.bulk_update_items(updates)
+            enriched_count = result.get('success', 0)
+        
+        return {'enriched_count': enriched_count, 'details': details}
+    
     async def _serper_enrich_items(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
         """STAGE 3: Use serper-dev to find related opportunities and additional context"""
         try:
@@ -0,0 +1,382 @@
+"""
+Buffered SQLite Metrics Writer for the Monitoring System
+
+``ComprehensiveMonitoringSystem`` used to INSERT and commit every metric on a
+connection shared across threads. ``BufferedMetricsWriter`` moves persistence
+off the hot path:
+
+- ``submit`` never blocks. It puts the metric on a bounded queue. When the
+  queue is full the raw row is dropped, but the value is still folded into an
+  in-memory aggregate, so the 1m/1h rollups stay complete under overload.
+- One writer thread owns the SQLite connection and runs it in WAL mode. It
+  drains the queue in batches and writes each batch in a single transaction:
+  raw rows go in with ``executemany``, and the ``metric_rollups`` rows are
+  upserted from per-batch aggregates.
+- Readers open their own connections. WAL lets them read while the writer
+  commits, and dashboards read the 60-row-per-hour rollups instead of
+  scanning raw rows.
+- Raw rows and 1m rollups older than ``retention_days`` are pruned hourly.
+  The 1h rollups are kept.
+- A failed transaction loses only its raw rows: the batch's rollups and
+  alerts go back to the writer and are retried with the next batch.
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_RESOLUTIONS = (60, 3600)  # seconds
+HEALTH_WINDOW_SECONDS = 300  # dropped metrics make the writer unhealthy this long
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        value REAL NOT NULL,
+        metric_type TEXT NOT NULL,
+        timestamp DATETIME NOT NULL,
+        tags TEXT,
+        description TEXT
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS metric_rollups (
+        name TEXT NOT NULL,
+        resolution INTEGER NOT NULL,
+        bucket_start INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        sum REAL NOT NULL,
+        min REAL NOT NULL,
+        max REAL NOT NULL,
+        last REAL NOT NULL,
+        PRIMARY KEY (name, resolution, bucket_start)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        alert_id TEXT UNIQUE NOT NULL,
+        alert_level TEXT NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        metric_name TEXT NOT NULL,
+        current_value REAL NOT NULL,
+        threshold_value REAL NOT NULL,
+        timestamp DATETIME NOT NULL,
+        resolved BOOLEAN DEFAULT FALSE,
+        resolved_at DATETIME,
+        metadata TEXT
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_metrics_name_timestamp ON metrics(name, timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket ON metric_rollups(resolution, bucket_start)',
+    'CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts(timestamp)',
+)
+
+ROLLUP_UPSERT = '''
+    INSERT INTO metric_rollups (name, resolution, bucket_start, count, sum, min, max, last)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(name, resolution, bucket_start) DO UPDATE SET
+        count = count + excluded.count,
+        sum = sum + excluded.sum,
+        min = MIN(min, excluded.min),
+        max = MAX(max, excluded.max),
+        last = excluded.last
+'''
+
+
+def connect(database_path: str, timeout: float = 30.0, check_same_thread: bool = True) -> sqlite3.Connection:
+    """SQLite connection in WAL mode (readers never wait for the writer)"""
+    conn = sqlite3.connect(database_path, timeout=timeout, check_same_thread=check_same_thread)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
+
+
+class _Rollup:
+    """count/sum/min/max/last of the values in one bucket"""
+
+    __slots__ = ('count', 'sum', 'min', 'max', 'last')
+
+    def __init__(self, value: float):
+        self.count = 1
+        self.sum = self.min = self.max = self.last = value
+
+    def add(self, value: float):
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+
+    def add_earlier(self, other: '_Rollup'):
+        """Fold in the values of a rollup of the same bucket that came before this one"""
+        self.count += other.count
+        self.sum += other.sum
+        if other.min < self.min:
+            self.min = other.min
+        if other.max > self.max:
+            self.max = other.max
+
+
+def _accumulate(rollups: Dict[Tuple[str, int, int], _Rollup], name: str, epoch: float, value: float):
+    for resolution in ROLLUP_RESOLUTIONS:
+        key = (name, resolution, int(epoch // resolution) * resolution)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollups[key] = _Rollup(value)
+        else:
+            rollup.add(value)
+
+
+@dataclass
+class MetricsWriterStats:
+    """Throughput and overload counters of the metrics writer"""
+    submitted: int = 0
+    rows_written: int = 0
+    batches: int = 0
+    aggregated_only: int = 0
+    dropped: int = 0
+    write_errors: int = 0
+    consecutive_write_errors: int = 0
+    total_write_seconds: float = 0.0
+    last_batch_rows: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'submitted': self.submitted,
+            'rows_written': self.rows_written,
+            'batches': self.batches,
+            'aggregated_only': self.aggregated_only,
+            'dropped': self.dropped,
+            'write_errors': self.write_errors,
+            'consecutive_write_errors': self.consecutive_write_errors,
+            'last_batch_rows': self.last_batch_rows,
+            'avg_batch_latency_ms': round(self.total_write_seconds * 1000 / self.batches, 2) if self.batches else 0.0
+        }
+
+
+class BufferedMetricsWriter:
+    """Single writer thread that persists metrics and rollups in batches"""
+
+    def __init__(self, database_path: str, batch_size: int = 1000, flush_interval_seconds: float = 1.0,
+                 max_queue_size: int = 50_000, max_overflow_buckets: int = 10_000, retention_days: int = 30):
+        self.database_path = database_path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_overflow_buckets = max_overflow_buckets
+        self.retention_days = retention_days
+        self.stats = MetricsWriterStats()
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._overflow: Dict[Tuple[str, int, int], _Rollup] = {}
+        self._pending_alerts: List[tuple] = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._last_prune = 0.0
+        self._last_drop: Optional[float] = None
+
+        # Schema is created up front so readers can query before the first flush
+        conn = connect(database_path)
+        try:
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._thread = threading.Thread(target=self._run, name="MetricsWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, name: str, value: float, metric_type: str, timestamp, tags: Dict[str, str],
+               description: str = ""):
+        """Queue one metric; never blocks"""
+        self.stats.submitted += 1
+        try:
+            self._queue.put_nowait((name, value, metric_type, timestamp, tags, description))
+            return
+        except queue.Full:
+            pass
+
+        # Overloaded: keep the value in the rollups, drop the raw row
+        with self._lock:
+            if len(self._overflow) < self.max_overflow_buckets:
+                _accumulate(self._overflow, name, timestamp.timestamp(), value)
+                self.stats.aggregated_only += 1
+            else:
+                self.stats.dropped += 1
+                self._last_drop = time.monotonic()
+
+    def submit_alert(self, row: tuple):
+        """Queue an alert row (alerts are rare and never dropped)"""
+        with self._lock:
+            self._pending_alerts.append(row)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything submitted so far is committed"""
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Flush and stop the writer thread"""
+        self.flush(timeout)
+        self._stop_event.set()
+        self._thread.join(timeout=timeout)
+
+    def is_healthy(self, window_seconds: float = HEALTH_WINDOW_SECONDS) -> bool:
+        """False while writes are failing or if metrics were dropped in the last window_seconds"""
+        if self.stats.consecutive_write_errors:
+            return False
+        return self._last_drop is None or time.monotonic() - self._last_drop >= window_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued': self._queue.qsize(),
+            'overflow_buckets': len(self._overflow),
+            **self.stats.to_dict()
+        }
+
+    # =========================================================================
+    # WRITER THREAD
+    # =========================================================================
+
+    def _run(self):
+        conn = connect(self.database_path)
+        try:
+            while not (self._stop_event.is_set() and self._queue.empty()):
+                batch, waiters = self._next_batch()
+                with self._lock:
+                    overflow, self._overflow = self._overflow, {}
+                    alerts, self._pending_alerts = self._pending_alerts, []
+
+                if batch or overflow or alerts:
+                    self._write(conn, batch, overflow, alerts)
+                for waiter in waiters:
+                    waiter.set()
+
+                if time.monotonic() - self._last_prune >= 3600:
+                    self._prune(conn)
+        finally:
+            conn.close()
+
+    def _next_batch(self) -> Tuple[List[tuple], List[threading.Event]]:
+        """Block up to flush_interval for the first item, then drain up to batch_size"""
+        batch, waiters = [], []
+        try:
+            item = self._queue.get(timeout=self.flush_interval_seconds)
+        except queue.Empty:
+            return batch, waiters
+
+        while True:
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break  # commit now so the flush caller sees its rows
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                break
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, waiters
+
+    def _write(self, conn: sqlite3.Connection, batch: List[tuple],
+               overflow: Dict[Tuple[str, int, int], _Rollup], alerts: List[tuple]):
+        start = time.perf_counter()
+        rollups = overflow
+        rows = []
+        for name, value, metric_type, timestamp, tags, description in batch:
+            rows.append((name, value, metric_type, timestamp.isoformat(sep=' '), json.dumps(tags), description))
+            _accumulate(rollups, name, timestamp.timestamp(), value)
+
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO metrics (name, value, metric_type, timestamp, tags, description) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+                conn.executemany(ROLLUP_UPSERT, [
+                    (name, resolution, bucket, r.count, r.sum, r.min, r.max, r.last)
+                    for (name, resolution, bucket), r in rollups.items()
+                ])
+                if alerts:
+                    conn.executemany('''
+                        INSERT OR IGNORE INTO alerts (alert_id, alert_level, title, description, metric_name,
+                                                      current_value, threshold_value, timestamp, metadata)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', alerts)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing {len(rows)} metrics to database: {e}")
+            self.stats.write_errors += 1
+            self.stats.consecutive_write_errors += 1
+            self._requeue(rollups, alerts)
+            self.stats.aggregated_only += len(rows)
+            return
+
+        self.stats.consecutive_write_errors = 0
+        self.stats.batches += 1
+        self.stats.rows_written += len(rows)
+        self.stats.last_batch_rows = len(rows)
+        self.stats.total_write_seconds += time.perf_counter() - start
+
+    def _requeue(self, rollups: Dict[Tuple[str, int, int], _Rollup], alerts: List[tuple]):
+        """Hand the rollups and alerts of a failed transaction back for the next batch"""
+        with self._lock:
+            for key, rollup in rollups.items():
+                newer = self._overflow.get(key)
+                if newer is not None:
+                    newer.add_earlier(rollup)
+                elif len(self._overflow) < self.max_overflow_buckets:
+                    self._overflow[key] = rollup
+                else:
+                    self.stats.dropped += rollup.count
+                    self._last_drop = time.monotonic()
+            self._pending_alerts[:0] = alerts
+
+    def _prune(self, conn: sqlite3.Connection):
+        self._last_prune = time.monotonic()
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            with conn:
+                conn.execute("DELETE FROM metrics WHERE timestamp < datetime(?, 'unixepoch', 'localtime')", (cutoff,))
+                conn.execute('DELETE FROM metric_rollups WHERE resolution = ? AND bucket_start < ?',
+                             (ROLLUP_RESOLUTIONS[0], cutoff))
+        except sqlite3.Error as e:
+            logger.error(f"Error pruning metrics: {e}")
+
+
+def read_rollups(conn: sqlite3.Connection, since_epoch: float, resolution: int = 60,
+                 names: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """Per-metric count/avg/min/max over rollup buckets starting at or after since_epoch"""
+    query = '''
+        SELECT name, SUM(count), SUM(sum), MIN(min), MAX(max)
+        FROM metric_rollups
+        WHERE resolution = ? AND bucket_start >= ?
+    '''
+    params: List[Any] = [resolution, int(since_epoch // resolution) * resolution]
+    if names:
+        query += f" AND name IN ({','.join('?' * len(names))})"
+        params.extend(names)
+    query += ' GROUP BY name ORDER BY name'
+
+    return {
+        name: {'avg': total / count, 'count': count, 'min': low, 'max': high}
+        for name, count, total, low, high in conn.execute(query, params)
+    }
@@ -42,16 +42,18 @@ import os
 from collections import defaultdict, deque
 import statistics
 from pathlib import Path
-import sqlite3
 from contextlib import contextmanager
 import aiohttp
 import asyncpg
-from prometheus_client import Counter, Gauge, Histogram, Summary, start_http_server
+from prometheus_client import start_http_server
 import numpy as np
 from sklearn.ensemble import IsolationForest
 import pickle
 import traceback
 
+from .metrics_writer import BufferedMetricsWriter, connect as connect_metrics_db, read_rollups
+from .prometheus_registry import BoundedMetric, BoundedMetricRegistry
+
 logger = logging.getLogger(__name__)
 
 
@@ -160,9 +162,13 @@ class MonitoringConfig:
     # Prometheus settings
     prometheus_port: int = 8000
     prometheus_enabled: bool = True
+    prometheus_max_series_per_metric: int = 200  # further label sets go to the 'other' series
     
     # Database settings
     database_path: str = "monitoring.db"
+    metrics_batch_size: int = 1000
+    metrics_flush_interval_seconds: float = 1.0
+    metrics_queue_size: int = 50000  # beyond this, raw rows are dropped but rollups kept
     
     # System resource monitoring
     cpu_threshold: float = 80.0
@@ -374,20 +380,23 @@ class AlertManager:
 class MetricsCollector:
     """Collects and stores metrics from various sources"""
     
-    def __init__(self, config: MonitoringConfig):
+    def __init__(self, config: MonitoringConfig, registry=None, start_server: bool = True):
         self.config = config
         self.metrics_buffer: deque = deque(maxlen=10000)
         self.metrics_by_name: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         
-        # Prometheus metrics
+        # Prometheus metrics, with a fixed label schema and series cap per metric
+        self.prometheus: Optional[BoundedMetricRegistry] = None
         if config.prometheus_enabled:
-            self.prometheus_counters = {}
-            self.prometheus_gauges = {}
-            self.prometheus_histograms = {}
+            self.prometheus = BoundedMetricRegistry(
+                registry=registry,
+                max_series_per_metric=config.prometheus_max_series_per_metric
+            )
             
             # Start Prometheus server
-            start_http_server(config.prometheus_port)
-            logger.info(f"Prometheus metrics server started on port {config.prometheus_port}")
+            if start_server:
+                start_http_server(config.prometheus_port, registry=self.prometheus.registry)
+                logger.info(f"Prometheus metrics server started on port {config.prometheus_port}")
     
     def record_metric(self, metric: Metric):
         """Record a metric"""
@@ -404,45 +413,31 @@ class MetricsCollector:
     def _update_prometheus_metric(self, metric: Metric):
         """Update Prometheus metrics"""
         try:
-            if metric.metric_type == MetricType.COUNTER:
-                if metric.name not in self.prometheus_counters:
-                    self.prometheus_counters[metric.name] = Counter(
-                        metric.name.replace('-', '_'),
-                        metric.description,
-                        list(metric.tags.keys())
-                    )
-                if metric.tags:
-                    self.prometheus_counters[metric.name].labels(**metric.tags).inc(metric.value)
-                else:
-                    self.prometheus_counters[metric.name].inc(metric.value)
-
-            elif metric.metric_type == MetricType.GAUGE:
-                if metric.name not in self.prometheus_gauges:
-                    self.prometheus_gauges[metric.name] = Gauge(
-                        metric.name.replace('-', '_'),
-                        metric.description,
-                        list(metric.tags.keys())
-                    )
-                if metric.tags:
-                    self.prometheus_gauges[metric.name].labels(**metric.tags).set(metric.value)
-                else:
-                    self.prometheus_gauges[metric.name].set(metric.value)
-
-            elif metric.metric_type == MetricType.HISTOGRAM:
-                if metric.name not in self.prometheus_histograms:
-                    self.prometheus_histograms[metric.name] = Histogram(
-                        metric.name.replace('-', '_'),
-                        metric.description,
-                        list(metric.tags.keys())
-                    )
-                if metric.tags:
-                    self.prometheus_histograms[metric.name].labels(**metric.tags).observe(metric.value)
-                else:
-                    self.prometheus_histograms[metric.name].observe(metric.value)
-
+            self.prometheus.record(metric.name, metric.metric_type.value, metric.value,
+                                   metric.tags, metric.description)
         except Exception as e:
             logger.error(f"Error updating Prometheus metric: {e}")
     
+    def declare_prometheus_metric(self, name: str, metric_type: MetricType, description: str = "",
+                                  labels: Optional[List[str]] = None,
+                                  max_series: Optional[int] = None) -> Optional[BoundedMetric]:
+        """Fix a metric's label schema (and optionally its series cap) before first use"""
+        if self.prometheus is None:
+            return None
+        return self.prometheus.declare(name, metric_type.value, description, labels or [], max_series)
+    
+    def bind_prometheus_metric(self, name: str, metric_type: MetricType, description: str = "", **labels):
+        """
+        Pre-bound Prometheus child for a hot path; call inc/set/observe on it
+        directly (Prometheus only: no buffer, database or alerting)
+        """
+        if self.prometheus is None:
+            return None
+        metric = self.prometheus.get(name) or self.declare_prometheus_metric(
+            name, metric_type, description, sorted(labels)
+        )
+        return metric.bind(**labels) if metric else None
+    
     def get_recent_metrics(self, metric_name: str, minutes: int = 5) -> List[Metric]:
         """Get recent metrics for a given name"""
         cutoff_time = datetime.now() - timedelta(minutes=minutes)
@@ -622,8 +617,10 @@ class ComprehensiveMonitoringSystem:
         self.thresholds: Dict[str, Threshold] = {}
         self.slas: Dict[str, SLA] = {}
         
-        # Database connection
+        # Database: a background writer, plus a read connection for dashboards
         self.db_conn = None
+        self.metrics_writer: Optional[BufferedMetricsWriter] = None
+        self._db_lock = threading.Lock()
         
         # Monitoring control
         self.is_running = False
@@ -640,45 +637,17 @@ class ComprehensiveMonitoringSystem:
         self._register_default_health_checks()
     
     def _initialize_database(self):
-        """Initialize SQLite database for storing metrics and alerts"""
+        """Initialize SQLite database (WAL mode) for storing metrics and alerts"""
         try:
-            self.db_conn = sqlite3.connect(self.config.database_path, check_same_thread=False)
-            
-            # Create tables
-            self.db_conn.execute('''
-                CREATE TABLE IF NOT EXISTS metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    value REAL NOT NULL,
-                    metric_type TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    tags TEXT,
-                    description TEXT
-                )
-            ''')
-            
-            self.db_conn.execute('''
-                CREATE TABLE IF NOT EXISTS alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    alert_id TEXT UNIQUE NOT NULL,
-                    alert_level TEXT NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    metric_name TEXT NOT NULL,
-                    current_value REAL NOT NULL,
-                    threshold_value REAL NOT NULL,
-                    timestamp DATETIME NOT NULL,
-                    resolved BOOLEAN DEFAULT FALSE,
-                    resolved_at DATETIME,
-                    metadata TEXT
-                )
-            ''')
-            
-            # Create indexes
-            self.db_conn.execute('CREATE INDEX IF NOT EXISTS idx_metrics_name_timestamp ON metrics(name, timestamp)')
-            self.db_conn.execute('CREATE INDEX IF NOT EXISTS idx_alerts_timestamp ON alerts(timestamp)')
-            
-            self.db_conn.commit()
+            # The writer creates the schema and owns the only write connection
+            self.metrics_writer = BufferedMetricsWriter(
+                self.config.database_path,
+                batch_size=self.config.metrics_batch_size,
+                flush_interval_seconds=self.config.metrics_flush_interval_seconds,
+                max_queue_size=self.config.metrics_queue_size,
+                retention_days=self.config.metrics_retention_days
+            )
+            self.db_conn = connect_metrics_db(self.config.database_path, check_same_thread=False)
             logger.info("Database initialized successfully")
             
         except Exception as e:
@@ -709,7 +678,11 @@ class ComprehensiveMonitoringSystem:
             """Check database connection"""
             try:
                 if self.db_conn:
-                    self.db_conn.execute('SELECT 1')
+                    with self._db_lock:
+                        self.db_conn.execute('SELECT 1')
+                    if not self.metrics_writer.is_healthy():
+                        writer_stats = self.metrics_writer.get_stats()
+                        return {'healthy': False, 'details': f"Metrics writer losing data: {writer_stats}"}
                     return {'healthy': True, 'details': 'Database connection OK'}
                 else:
                     return {'healthy': False, 'details': 'Database connection not initialized'}
@@ -757,24 +730,17 @@ class ComprehensiveMonitoringSystem:
         self._check_thresholds(metric)
     
     def _store_metric_in_db(self, metric: Metric):
-        """Store metric in database"""
-        try:
-            self.db_conn.execute('''
-                INSERT INTO metrics (name, value, metric_type, timestamp, tags, description)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                metric.name,
-                metric.value,
-                metric.metric_type.value,
-                metric.timestamp,
-                json.dumps(metric.tags),
-                metric.description
-            ))
-            
-            self.db_conn.commit()
-            
-        except Exception as e:
-            logger.error(f"Error storing metric in database: {e}")
+        """Queue metric for the background writer (never blocks)"""
+        if self.metrics_writer is None:
+            return
+        self.metrics_writer.submit(
+            metric.name,
+            metric.value,
+            metric.metric_type.value,
+            metric.timestamp,
+            metric.tags,
+            metric.description
+        )
     
     def _check_thresholds(self, metric: Metric):
         """Check if metric violates any thresholds"""
@@ -849,13 +815,11 @@ class ComprehensiveMonitoringSystem:
         self._store_alert_in_db(alert)
     
     def _store_alert_in_db(self, alert: Alert):
-        """Store alert in database"""
+        """Queue alert for the background writer"""
+        if self.metrics_writer is None:
+            return
         try:
-            self.db_conn.execute('''
-                INSERT INTO alerts (alert_id, alert_level, title, description, metric_name, 
-                                  current_value, threshold_value, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            self.metrics_writer.submit_alert((
                 alert.alert_id,
                 alert.alert_level.value,
                 alert.title,
@@ -863,12 +827,10 @@ class ComprehensiveMonitoringSystem:
                 alert.metric_name,
                 alert.current_value,
                 alert.threshold_value,
-                alert.timestamp,
-                json.dumps(alert.metadata)
+                alert.timestamp.isoformat(sep=' '),
+                json.dumps(alert.metadata, default=str)
             ))
             
-            self.db_conn.commit()
-            
         except Exception as e:
             logger.error(f"Error storing alert in database: {e}")
     
@@ -943,35 +905,31 @@ class ComprehensiveMonitoringSystem:
         if self.monitor_thread:
             self.monitor_thread.join(timeout=10)
         
-        # Close database connection
+        # Flush pending metrics, then close database connections
+        if self.metrics_writer:
+            self.metrics_writer.close()
         if self.db_conn:
-            self.db_conn.close()
+            with self._db_lock:
+                self.db_conn.close()
         
         logger.info("Monitoring system stopped")
     
     def get_dashboard_data(self) -> Dict[str, Any]:
         """Get data for monitoring dashboard"""
         try:
-            # Get recent metrics
-            cursor = self.db_conn.execute('''
-                SELECT name, AVG(value) as avg_value, COUNT(*) as count
-                FROM metrics 
-                WHERE timestamp > datetime('now', '-1 hour')
-                GROUP BY name
-                ORDER BY name
-            ''')
-            
-            metrics_summary = {row[0]: {'avg': row[1], 'count': row[2]} for row in cursor.fetchall()}
-            
-            # Get recent alerts
-            cursor = self.db_conn.execute('''
-                SELECT alert_level, COUNT(*) as count
-                FROM alerts 
-                WHERE timestamp > datetime('now', '-24 hours')
-                GROUP BY alert_level
-            ''')
-            
-            alerts_summary = {row[0]: row[1] for row in cursor.fetchall()}
+            with self._db_lock:
+                # Last hour of metrics from the 1-minute rollups (no raw-row scan)
+                metrics_summary = read_rollups(self.db_conn, time.time() - 3600, resolution=60)
+                
+                # Get recent alerts
+                cursor = self.db_conn.execute('''
+                    SELECT alert_level, COUNT(*) as count
+                    FROM alerts 
+                    WHERE timestamp > datetime('now', '-24 hours', 'localtime')
+                    GROUP BY alert_level
+                ''')
+                
+                alerts_summary = {row[0]: row[1] for row in cursor.fetchall()}
             
             # Get health status
             health_status = asyncio.run(self.health_checker.run_health_checks())
@@ -982,7 +940,8 @@ class ComprehensiveMonitoringSystem:
                 'metrics_summary': metrics_summary,
                 'alerts_summary': alerts_summary,
                 'active_alerts': len(self.alert_manager.active_alerts),
-                'total_metrics': len(self.metrics_collector.metrics_buffer)
+                'total_metrics': len(self.metrics_collector.metrics_buffer),
+                'metrics_writer': self.metrics_writer.get_stats() if self.metrics_writer else {}
             }
             
         except Exception as e:
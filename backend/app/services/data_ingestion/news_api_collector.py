@@ -28,7 +28,7 @@ Features:
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import hashlib
@@ -49,6 +49,9 @@ import os
 from collections import defaultdict
 import random
 
+from .seen_filter import create_seen_filter
+from .token_bucket import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 
@@ -147,30 +150,56 @@ class NewsArticle:
 
 @dataclass
 class APIQuota:
-    """API quota tracking"""
+    """API quota tracking: daily request cap plus a per-minute token bucket"""
     api_name: str
     requests_made: int = 0
     requests_limit: int = 1000
     reset_time: datetime = field(default_factory=datetime.now)
-    rate_limit_remaining: int = 60
+    rate_limit_remaining: int = 60  # per-minute rate; refreshed from the bucket
     rate_limit_reset: datetime = field(default_factory=datetime.now)
+    bucket: TokenBucket = field(init=False, repr=False)
+    _lock: threading.Lock = field(init=False, repr=False, default_factory=threading.Lock)
+    
+    def __post_init__(self):
+        self.bucket = TokenBucket.per_minute(max(1, self.rate_limit_remaining))
     
     def is_available(self) -> bool:
         """Check if API quota is available"""
-        now = datetime.now()
+        with self._lock:
+            self._reset_daily()
+            self.rate_limit_remaining = int(self.bucket.tokens)
+            return (self.requests_made < self.requests_limit and 
+                    self.rate_limit_remaining > 0)
+    
+    def record(self, requests_used: int = 1):
+        """Account for requests already made (threaded collection)"""
+        with self._lock:
+            self._reset_daily()
+            self.requests_made += requests_used
+            self.bucket.consume(requests_used)
+            self.rate_limit_remaining = int(self.bucket.tokens)
+    
+    async def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Reserve one request, waiting for the per-minute bucket; False when the daily cap or max_wait is hit"""
+        with self._lock:
+            self._reset_daily()
+            if self.requests_made >= self.requests_limit:
+                return False
+            self.requests_made += 1
         
-        # Check daily limit
+        if await self.bucket.acquire(max_wait=max_wait):
+            return True
+        
+        with self._lock:
+            self.requests_made -= 1
+        return False
+    
+    def _reset_daily(self):
+        """Caller holds the lock"""
+        now = datetime.now()
         if now.date() > self.reset_time.date():
             self.requests_made = 0
             self.reset_time = now
-        
-        # Check rate limit
-        if now > self.rate_limit_reset:
-            self.rate_limit_remaining = 60
-            self.rate_limit_reset = now + timedelta(minutes=1)
-        
-        return (self.requests_made < self.requests_limit and 
-                self.rate_limit_remaining > 0)
 
 
 class HighVolumeNewsAPICollector:
@@ -179,9 +208,26 @@ class HighVolumeNewsAPICollector:
     Supports multiple news APIs with intelligent quota management
     """
     
-    def __init__(self, max_workers: int = 10, batch_size: int = 100):
+    # APIs with an aiohttp implementation (async mode)
+    ASYNC_COLLECTORS = ('newsapi', 'google_news')
+    
+    def __init__(self, max_workers: int = 10, batch_size: int = 100, seen_filter=None,
+                 execution_mode: str = "threaded", max_concurrent_requests: int = 50,
+                 quota_wait_seconds: float = 60.0):
+        """
+        Args:
+            execution_mode: "threaded" (requests in a thread pool) or "async"
+                (every query x API request fanned out on one event loop)
+            max_concurrent_requests: in-flight request cap and connection pool
+                size for async collection
+            quota_wait_seconds: longest an async request waits for its API's
+                rate-limit bucket before being skipped
+        """
         self.max_workers = max_workers
         self.batch_size = batch_size
+        self.execution_mode = execution_mode
+        self.max_concurrent_requests = max_concurrent_requests
+        self.quota_wait_seconds = quota_wait_seconds
         
         # API configurations
         self.api_configs: Dict[str, NewsAPIConfig] = {}
@@ -193,7 +239,8 @@ class HighVolumeNewsAPICollector:
         
         # Content storage
         self.collected_articles: List[NewsArticle] = []
-        self.content_hashes: Set[str] = set()
+        # Bounded, persistent record of content hashes already collected
+        self.seen_filter = seen_filter or create_seen_filter('news_api')
         
         # Session management
         self.session = None
@@ -543,9 +590,7 @@ class HighVolumeNewsAPICollector:
     def _update_quota(self, api_name: str, requests_used: int = 1):
         """Update API quota after request"""
         if api_name in self.api_quotas:
-            quota = self.api_quotas[api_name]
-            quota.requests_made += requests_used
-            quota.rate_limit_remaining -= requests_used
+            self.api_quotas[api_name].record(requests_used)
     
     def _calculate_relevance_score(self, article: NewsArticle, query: str) -> float:
         """Calculate relevance score for an article"""
@@ -580,12 +625,8 @@ class HighVolumeNewsAPICollector:
         return min(score, 1.0)
     
     def _is_duplicate(self, article: NewsArticle) -> bool:
-        """Check if article is a duplicate"""
-        if article.content_hash in self.content_hashes:
-            return True
-        
-        self.content_hashes.add(article.content_hash)
-        return False
+        """Check if article is a duplicate (and remember it)"""
+        return self.seen_filter.check_and_add(article.content_hash)
     
     @backoff.on_exception(backoff.expo, Exception, max_tries=3)
     def _collect_from_newsapi(self, query: NewsQuery) -> List[NewsArticle]:
@@ -594,65 +635,15 @@ class HighVolumeNewsAPICollector:
         if not self._check_api_availability(api_name):
             return []
         
-        config = self.api_configs[api_name]
         articles = []
         
         try:
-            # Build request URL
-            endpoint = config.endpoint_configs[query.query_type.value]['endpoint']
-            url = f"{config.base_url}{endpoint}"
-            
-            params = {
-                'apiKey': config.api_key,
-                'q': query.query,
-                'language': query.language,
-                'sortBy': query.sort_by,
-                'pageSize': min(query.page_size, config.max_results_per_request),
-                'page': 1
-            }
-            
-            if query.from_date:
-                params['from'] = query.from_date.isoformat()
-            if query.to_date:
-                params['to'] = query.to_date.isoformat()
-            
             # Make request
+            url, params = self._newsapi_request(query)
             response = requests.get(url, params=params, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
-            
-            if data.get('status') == 'ok':
-                for article_data in data.get('articles', []):
-                    # Parse published date
-                    published_at = datetime.now()
-                    if article_data.get('publishedAt'):
-                        try:
-                            published_at = date_parser.parse(article_data['publishedAt'])
-                        except:
-                            pass
-                    
-                    # Create article object
-                    article = NewsArticle(
-                        title=article_data.get('title', ''),
-                        description=article_data.get('description', ''),
-                        content=article_data.get('content', ''),
-                        url=article_data.get('url', ''),
-                        source=article_data.get('source', {}).get('name', 'Unknown'),
-                        api_source=api_name,
-                        published_at=published_at,
-                        author=article_data.get('author'),
-                        url_to_image=article_data.get('urlToImage'),
-                        language=query.language,
-                        metadata={'query': query.query, 'api_response': article_data}
-                    )
-                    
-                    # Calculate relevance score
-                    article.relevance_score = self._calculate_relevance_score(article, query.query)
-                    
-                    # Filter by relevance
-                    if article.relevance_score > 0.1:
-                        articles.append(article)
+            articles = self._parse_newsapi_articles(response.json(), query, api_name)
             
             self._update_quota(api_name)
             
@@ -672,48 +663,9 @@ class HighVolumeNewsAPICollector:
         articles = []
         
         try:
-            # Build Google News RSS URL
-            base_url = "https://news.google.com/rss/search"
-            params = {
-                'q': query.query,
-                'hl': query.language,
-                'gl': query.country or 'US',
-                'ceid': f"{query.country or 'US'}:{query.language}"
-            }
-            
-            url = f"{base_url}?{urlencode(params)}"
-            
             # Parse RSS feed
-            feed = feedparser.parse(url)
-            
-            for entry in feed.entries:
-                # Parse published date
-                published_at = datetime.now()
-                if hasattr(entry, 'published'):
-                    try:
-                        published_at = date_parser.parse(entry.published)
-                    except:
-                        pass
-                
-                # Create article object
-                article = NewsArticle(
-                    title=entry.get('title', ''),
-                    description=entry.get('summary', ''),
-                    content=entry.get('summary', ''),
-                    url=entry.get('link', ''),
-                    source=entry.get('source', {}).get('href', 'Google News'),
-                    api_source=api_name,
-                    published_at=published_at,
-                    language=query.language,
-                    metadata={'query': query.query, 'rss_entry': entry}
-                )
-                
-                # Calculate relevance score
-                article.relevance_score = self._calculate_relevance_score(article, query.query)
-                
-                # Filter by relevance
-                if article.relevance_score > 0.1:
-                    articles.append(article)
+            feed = feedparser.parse(self._google_news_url(query))
+            articles = self._parse_google_news_entries(feed, query, api_name)
             
             self._update_quota(api_name)
             
@@ -723,6 +675,114 @@ class HighVolumeNewsAPICollector:
         
         return articles
     
+    def _newsapi_request(self, query: NewsQuery) -> Tuple[str, Dict[str, Any]]:
+        """URL and params for a NewsAPI.org query"""
+        config = self.api_configs['newsapi']
+        
+        # Build request URL
+        endpoint = config.endpoint_configs[query.query_type.value]['endpoint']
+        url = f"{config.base_url}{endpoint}"
+        
+        params = {
+            'apiKey': config.api_key,
+            'q': query.query,
+            'language': query.language,
+            'sortBy': query.sort_by,
+            'pageSize': min(query.page_size, config.max_results_per_request),
+            'page': 1
+        }
+        
+        if query.from_date:
+            params['from'] = query.from_date.isoformat()
+        if query.to_date:
+            params['to'] = query.to_date.isoformat()
+        
+        return url, params
+    
+    def _parse_newsapi_articles(self, data: Dict[str, Any], query: NewsQuery, api_name: str) -> List[NewsArticle]:
+        """Relevant articles from a NewsAPI.org response"""
+        articles = []
+        if data.get('status') != 'ok':
+            return articles
+        
+        for article_data in data.get('articles', []):
+            # Parse published date
+            published_at = datetime.now()
+            if article_data.get('publishedAt'):
+                try:
+                    published_at = date_parser.parse(article_data['publishedAt'])
+                except:
+                    pass
+            
+            # Create article object
+            article = NewsArticle(
+                title=article_data.get('title', ''),
+                description=article_data.get('description', ''),
+                content=article_data.get('content', ''),
+                url=article_data.get('url', ''),
+                source=article_data.get('source', {}).get('name', 'Unknown'),
+                api_source=api_name,
+                published_at=published_at,
+                author=article_data.get('author'),
+                url_to_image=article_data.get('urlToImage'),
+                language=query.language,
+                metadata={'query': query.query, 'api_response': article_data}
+            )
+            
+            # Calculate relevance score
+            article.relevance_score = self._calculate_relevance_score(article, query.query)
+            
+            # Filter by relevance
+            if article.relevance_score > 0.1:
+                articles.append(article)
+        
+        return articles
+    
+    def _google_news_url(self, query: NewsQuery) -> str:
+        """Google News RSS search URL for a query"""
+        config = self.api_configs['google_news']
+        params = {
+            'q': query.query,
+            'hl': query.language,
+            'gl': query.country or 'US',
+            'ceid': f"{query.country or 'US'}:{query.language}"
+        }
+        return f"{config.base_url}{config.endpoint_configs['search']['endpoint']}?{urlencode(params)}"
+    
+    def _parse_google_news_entries(self, feed, query: NewsQuery, api_name: str) -> List[NewsArticle]:
+        """Relevant articles from a parsed Google News feed"""
+        articles = []
+        for entry in feed.entries:
+            # Parse published date
+            published_at = datetime.now()
+            if hasattr(entry, 'published'):
+                try:
+                    published_at = date_parser.parse(entry.published)
+                except:
+                    pass
+            
+            # Create article object
+            article = NewsArticle(
+                title=entry.get('title', ''),
+                description=entry.get('summary', ''),
+                content=entry.get('summary', ''),
+                url=entry.get('link', ''),
+                source=entry.get('source', {}).get('href', 'Google News'),
+                api_source=api_name,
+                published_at=published_at,
+                language=query.language,
+                metadata={'query': query.query, 'rss_entry': entry}
+            )
+            
+            # Calculate relevance score
+            article.relevance_score = self._calculate_relevance_score(article, query.query)
+            
+            # Filter by relevance
+            if article.relevance_score > 0.1:
+                articles.append(article)
+        
+        return articles
+    
     def _collect_from_api(self, api_name: str, query: NewsQuery) -> List[NewsArticle]:
         """Collect articles from a specific API"""
         if api_name == 'newsapi':
@@ -803,6 +863,96 @@ class HighVolumeNewsAPICollector:
         logger.info(f"Completed collection: {len(all_articles)} articles collected")
         return all_articles
     
+    # =========================================================================
+    # ASYNC COLLECTION MODE
+    # =========================================================================
+    
+    async def collect_all_queries_async(self, session: Optional[aiohttp.ClientSession] = None) -> List[NewsArticle]:
+        """
+        Collect every query from every available API concurrently
+        
+        Each query x API request waits on that API's token bucket, so the
+        fan-out never exceeds an API's per-minute rate or daily cap, while
+        max_concurrent_requests bounds the sockets in use.
+        """
+        sorted_queries = sorted(self.queries, key=lambda x: x.priority)
+        sorted_apis = [
+            name for name, config in sorted(self.api_configs.items(), key=lambda x: x[1].priority)
+            if config.enabled and name in self.ASYNC_COLLECTORS
+        ]
+        logger.info(f"Starting async collection for {len(sorted_queries)} queries x {len(sorted_apis)} APIs")
+        
+        own_session = session is None
+        if own_session:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrent_requests, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+                headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+            )
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        all_articles = []
+        try:
+            fetches = [
+                self._collect_async(session, semaphore, api_name, query)
+                for query in sorted_queries
+                for api_name in sorted_apis
+            ]
+            for fetch in asyncio.as_completed(fetches):
+                api_name, query, articles = await fetch
+                
+                # Filter duplicates (the seen filter may block on Redis or disk)
+                duplicates = await asyncio.to_thread(
+                    self.seen_filter.check_and_add_many, [article.content_hash for article in articles]
+                )
+                unique_articles = []
+                for article, duplicate in zip(articles, duplicates):
+                    if not duplicate:
+                        unique_articles.append(article)
+                    else:
+                        self.stats['duplicates_filtered'] += 1
+                
+                all_articles.extend(unique_articles)
+                self.stats['articles_collected'] += len(unique_articles)
+        finally:
+            if own_session:
+                await session.close()
+        
+        self.stats['queries_processed'] += len(sorted_queries)
+        logger.info(f"Completed async collection: {len(all_articles)} articles collected")
+        return all_articles
+    
+    async def _collect_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                             api_name: str, query: NewsQuery) -> Tuple[str, NewsQuery, List[NewsArticle]]:
+        """One query against one API, within the API's quota"""
+        quota = self.api_quotas.get(api_name)
+        if quota is None or not await quota.acquire(max_wait=self.quota_wait_seconds):
+            self.stats['quota_exceeded'] += 1
+            return api_name, query, []
+        
+        try:
+            async with semaphore:
+                if api_name == 'newsapi':
+                    url, params = self._newsapi_request(query)
+                    async with session.get(url, params=params) as response:
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                    articles = self._parse_newsapi_articles(data, query, api_name)
+                else:
+                    async with session.get(self._google_news_url(query)) as response:
+                        response.raise_for_status()
+                        body = await response.read()
+                    feed = await asyncio.to_thread(feedparser.parse, body)
+                    articles = self._parse_google_news_entries(feed, query, api_name)
+            
+            logger.debug(f"Collected {len(articles)} articles from {api_name} for query: {query.query[:50]}...")
+            return api_name, query, articles
+            
+        except Exception as e:
+            logger.error(f"Error collecting from {api_name}: {e}")
+            self.stats['api_errors'] += 1
+            return api_name, query, []
+    
     def start_continuous_collection(self, interval_hours: int = 1):
         """Start continuous news collection with specified interval"""
         logger.info(f"Starting continuous collection with {interval_hours}h interval")
@@ -814,7 +964,10 @@ class HighVolumeNewsAPICollector:
             while not self.stop_event.is_set():
                 try:
                     # Collect all articles
-                    articles = self.collect_all_queries()
+                    if self.execution_mode == "async":
+                        articles = asyncio.run(self.collect_all_queries_async())
+                    else:
+                        articles = self.collect_all_queries()
                     
                     # Store articles (extend with database storage)
                     self.collected_articles.extend(articles)
@@ -840,6 +993,7 @@ class HighVolumeNewsAPICollector:
         logger.info("Stopping news API collection")
         self.is_running = False
         self.stop_event.set()
+        self.seen_filter.close()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get collection statistics"""
@@ -858,7 +1012,7 @@ class HighVolumeNewsAPICollector:
             'success_rate': (self.stats['queries_processed'] / len(self.queries)) * 100 if self.queries else 0,
             'uptime_hours': elapsed_time / 3600,
             'articles_in_memory': len(self.collected_articles),
-            'unique_content_hashes': len(self.content_hashes)
+            'seen_filter': self.seen_filter.get_stats()
         }
     
     def get_collected_articles(self) -> List[NewsArticle]:
@@ -868,7 +1022,6 @@ class HighVolumeNewsAPICollector:
     def clear_collected_articles(self):
         """Clear collected articles from memory"""
         self.collected_articles.clear()
-        self.content_hashes.clear()
         logger.info("Cleared collected articles from memory")
 
 
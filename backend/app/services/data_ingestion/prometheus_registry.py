@@ -0,0 +1,163 @@
+"""
+Bounded-Cardinality Prometheus Registry
+
+``MetricsCollector`` used to create a Prometheus series for every distinct
+tag combination it saw. A tag like ``batch_id`` therefore added a series per
+batch for the life of the process, which made both RSS and scrape time grow
+without limit. ``BoundedMetricRegistry`` puts a schema and a cap in front of
+prometheus_client:
+
+- Each metric has a fixed label schema. It is declared up front with
+  ``declare``, or taken from the tag keys of the first sample. Tags outside
+  the schema are ignored, and missing labels are exported as "".
+- Each metric holds at most ``max_series`` label combinations. A sample with
+  a new combination beyond the cap is recorded under the single overflow
+  series, where every label is "other". ``metric_series_overflow_total``
+  counts these samples per metric.
+- Label children are cached by value tuple, so recording a sample costs one
+  dict lookup. ``bind`` returns a child up front for hot paths.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_LABEL_VALUE = 'other'
+
+_METRIC_CLASSES = {
+    'counter': Counter,
+    'gauge': Gauge,
+    'histogram': Histogram,
+}
+
+_INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def sanitize_metric_name(name: str) -> str:
+    name = _INVALID_NAME_CHARS.sub('_', name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+class BoundedMetric:
+    """One Prometheus metric with a fixed label schema and a series cap"""
+
+    def __init__(self, name: str, metric_type: str, description: str, labels: Tuple[str, ...],
+                 max_series: int, registry: CollectorRegistry, overflow_counter: Optional[Counter] = None):
+        self.name = name
+        self.metric_type = metric_type
+        self.labels = labels
+        self.max_series = max_series
+        self.overflowed = 0
+        self._overflow_counter = overflow_counter
+        self._metric = _METRIC_CLASSES[metric_type](
+            sanitize_metric_name(name), description or name, labelnames=labels, registry=registry
+        )
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._overflow_child = None
+        self._lock = threading.Lock()
+
+    @property
+    def series_count(self) -> int:
+        return len(self._children) + (self._overflow_child is not None)
+
+    def bind(self, **labels):
+        """Pre-resolved child for a hot path (inc/set/observe directly on it)"""
+        return self.child(labels)
+
+    def child(self, tags: Dict[str, Any]):
+        if not self.labels:
+            return self._metric
+
+        key = tuple(str(tags.get(label, '')) for label in self.labels)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                if len(self._children) >= self.max_series:
+                    return self._overflow()
+                child = self._metric.labels(*key)
+                self._children[key] = child
+        return child
+
+    def record(self, value: float, tags: Dict[str, Any]):
+        child = self.child(tags)
+        if self.metric_type == 'counter':
+            child.inc(value)
+        elif self.metric_type == 'gauge':
+            child.set(value)
+        else:
+            child.observe(value)
+
+    def _overflow(self):
+        """Caller holds the lock"""
+        self.overflowed += 1
+        if self._overflow_counter is not None:
+            self._overflow_counter.labels(self.name).inc()
+        if self._overflow_child is None:
+            logger.warning(f"Metric {self.name} reached {self.max_series} label sets; "
+                           f"new label values are recorded as '{OVERFLOW_LABEL_VALUE}'")
+            self._overflow_child = self._metric.labels(*([OVERFLOW_LABEL_VALUE] * len(self.labels)))
+        return self._overflow_child
+
+
+class BoundedMetricRegistry:
+    """Declared, capped metrics on a prometheus_client registry"""
+
+    def __init__(self, registry: Optional[CollectorRegistry] = None, max_series_per_metric: int = 200):
+        self.registry = registry if registry is not None else REGISTRY
+        self.max_series_per_metric = max_series_per_metric
+        self._metrics: Dict[str, BoundedMetric] = {}
+        self._lock = threading.Lock()
+        self._overflow_counter = Counter(
+            'metric_series_overflow_total',
+            'Samples recorded under the overflow label set because a metric hit its series cap',
+            ['metric'],
+            registry=self.registry
+        )
+
+    def declare(self, name: str, metric_type: str, description: str = "",
+                labels: Iterable[str] = (), max_series: Optional[int] = None) -> Optional[BoundedMetric]:
+        """Register a metric with a fixed label schema (idempotent)"""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is not None:
+                if metric.metric_type != metric_type:
+                    logger.warning(f"Metric {name} already declared as {metric.metric_type}, not {metric_type}")
+                    return None
+                return metric
+            if metric_type not in _METRIC_CLASSES:
+                return None
+            metric = BoundedMetric(
+                name, metric_type, description, tuple(labels),
+                max_series or self.max_series_per_metric, self.registry, self._overflow_counter
+            )
+            self._metrics[name] = metric
+            return metric
+
+    def get(self, name: str) -> Optional[BoundedMetric]:
+        return self._metrics.get(name)
+
+    def record(self, name: str, metric_type: str, value: float, tags: Dict[str, Any], description: str = ""):
+        """Record a sample, declaring the metric from this sample's tag keys if it is new"""
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self.declare(name, metric_type, description, sorted(tags))
+        if metric is None or metric.metric_type != metric_type:
+            return
+        metric.record(value, tags)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'metrics': len(self._metrics),
+            'series': sum(metric.series_count for metric in self._metrics.values()),
+            'overflowed_metrics': {name: metric.overflowed for name, metric in self._metrics.items()
+                                   if metric.overflowed}
+        }
@@ -0,0 +1,350 @@
+"""
+Bounded Seen-Content Filter for Collectors
+
+Replaces the ever-growing ``content_hashes`` sets in the scraping and news
+collectors with a generational Bloom filter:
+
+- Each generation is a fixed-size Bloom filter sized for ``capacity`` keys
+  at ``error_rate``.
+- A new generation starts every ``rotation_seconds``, or earlier once the
+  current one holds ``capacity`` keys, which keeps the false-positive rate at
+  its target. Only the newest ``generations`` filters are kept.
+- Memory is therefore fixed at ``generations`` x filter size. A key is
+  remembered for at least ``generations - 1`` full generations: that is
+  ``(generations - 1) x rotation_seconds`` while fewer than ``capacity`` keys
+  arrive per rotation, but only ``(generations - 1) x capacity`` further keys
+  when more arrive. Size ``capacity`` above the expected keys per
+  ``rotation_seconds`` to keep the time guarantee.
+- A key counts as seen if any live generation contains it. False positives
+  occur at about ``error_rate`` per generation, and there are never false
+  negatives inside the retention window.
+
+``RotatingSeenFilter`` lives in process memory and snapshots itself to disk,
+so restarts keep their history. ``RedisSeenFilter`` keeps the same layout in
+Redis bitmaps, so every worker process shares one filter. Its generations are
+aligned to wall-clock rotation windows, so workers need no coordination. It
+never rotates early: the time guarantee always holds, and an overfull window
+raises the false-positive rate instead.
+
+Both filters block (Redis round trips, disk snapshots). Async callers check
+a whole batch with ``check_and_add_many`` in ``asyncio.to_thread``.
+``create_seen_filter`` picks Redis when a URL is configured and falls back to
+the local filter otherwise.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"TAIFA-SEEN\x01"
+SEEN_KEY_PREFIX = "taifa:seen:"
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """Bits and hash count for ``capacity`` keys at ``error_rate``"""
+    num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+    num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+    return num_bits, num_hashes
+
+
+def bloom_positions(key: str, num_bits: int, num_hashes: int) -> List[int]:
+    """Bit positions of a key (double hashing over one 128-bit digest)"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1, h2 = struct.unpack('<QQ', digest)
+    h2 |= 1  # odd step, so positions do not collapse
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class _Generation:
+    """One fixed-size Bloom filter"""
+
+    __slots__ = ('bits', 'count', 'created_at')
+
+    def __init__(self, num_bits: int, created_at: float, bits: Optional[bytearray] = None, count: int = 0):
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.count = count
+        self.created_at = created_at
+
+    def contains(self, positions: List[int]) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def add(self, positions: List[int]):
+        bits = self.bits
+        for p in positions:
+            bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+
+# =============================================================================
+# IN-PROCESS FILTER WITH DISK SNAPSHOTS
+# =============================================================================
+
+class RotatingSeenFilter:
+    """Generational Bloom filter in process memory, snapshotted to disk"""
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001,
+                 rotation_seconds: float = 7 * 86400, generations: int = 4,
+                 snapshot_path: Optional[str] = None, snapshot_interval_seconds: float = 300):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rotation_seconds = rotation_seconds
+        self.max_generations = max(2, generations)
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.num_bits, self.num_hashes = bloom_parameters(capacity, error_rate)
+
+        self._generations: Deque[_Generation] = deque()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_snapshot = time.monotonic()
+        self.rotations = 0
+
+        if not (snapshot_path and self._load_snapshot(snapshot_path)):
+            self._generations.append(_Generation(self.num_bits, time.time()))
+
+    def check_and_add(self, key: str) -> bool:
+        """True if the key was (probably) seen before; records it either way"""
+        positions = bloom_positions(key, self.num_bits, self.num_hashes)
+        with self._lock:
+            self._maybe_rotate()
+            current = self._generations[-1]
+            if current.contains(positions):
+                return True
+            # Keys still arriving are copied forward so they outlive rotation
+            seen = any(generation.contains(positions) for generation in list(self._generations)[:-1])
+            current.add(positions)
+            self._dirty = True
+            snapshot_due = (self.snapshot_path is not None and
+                            time.monotonic() - self._last_snapshot >= self.snapshot_interval_seconds)
+        if snapshot_due:
+            self.snapshot()
+        return seen
+
+    def check_and_add_many(self, keys: List[str]) -> List[bool]:
+        """check_and_add for each key in order"""
+        return [self.check_and_add(key) for key in keys]
+
+    def __contains__(self, key: str) -> bool:
+        positions = bloom_positions(key, self.num_bits, self.num_hashes)
+        with self._lock:
+            return any(generation.contains(positions) for generation in self._generations)
+
+    def snapshot(self, path: Optional[str] = None) -> bool:
+        """Atomically write all generations to disk"""
+        path = path or self.snapshot_path
+        if not path:
+            return False
+
+        with self._lock:
+            header = json.dumps({
+                'capacity': self.capacity,
+                'error_rate': self.error_rate,
+                'num_bits': self.num_bits,
+                'num_hashes': self.num_hashes,
+                'generations': [{'created_at': g.created_at, 'count': g.count} for g in self._generations]
+            }).encode('utf-8')
+            blobs = [bytes(g.bits) for g in self._generations]
+            self._dirty = False
+            self._last_snapshot = time.monotonic()
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(SNAPSHOT_MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.error(f"Seen-filter snapshot to {path} failed: {e}")
+            return False
+
+    def close(self):
+        """Snapshot pending changes"""
+        if self._dirty:
+            self.snapshot()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = [g.count for g in self._generations]
+            oldest = self._generations[0].created_at
+        return {
+            'backend': 'memory',
+            'generations': len(counts),
+            'items_per_generation': counts,
+            'capacity_per_generation': self.capacity,
+            'memory_bytes': len(counts) * ((self.num_bits + 7) // 8),
+            'estimated_false_positive_rate': round(self._estimated_fp_rate(counts), 6),
+            'retention_seconds': round(time.time() - oldest, 1),
+            'rotations': self.rotations
+        }
+
+    def _maybe_rotate(self):
+        """Start a new generation when the current one is old or full (caller holds the lock)"""
+        current = self._generations[-1]
+        now = time.time()
+        if now - current.created_at < self.rotation_seconds and current.count < self.capacity:
+            return
+        self._generations.append(_Generation(self.num_bits, now))
+        while len(self._generations) > self.max_generations:
+            self._generations.popleft()
+        self.rotations += 1
+        self._dirty = True
+
+    def _estimated_fp_rate(self, counts: List[int]) -> float:
+        """P(a new key hits any live generation)"""
+        miss = 1.0
+        for count in counts:
+            fill = 1 - math.exp(-self.num_hashes * count / self.num_bits)
+            miss *= 1 - fill ** self.num_hashes
+        return 1 - miss
+
+    def _load_snapshot(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                    raise ValueError("not a seen-filter snapshot")
+                header_len, = struct.unpack('<I', f.read(4))
+                header = json.loads(f.read(header_len))
+                if header['num_bits'] != self.num_bits or header['num_hashes'] != self.num_hashes:
+                    logger.warning(f"Seen-filter snapshot {path} has different sizing, starting fresh")
+                    return False
+
+                size = (self.num_bits + 7) // 8
+                generations = []
+                for meta in header['generations'][-self.max_generations:]:
+                    bits = bytearray(f.read(size))
+                    if len(bits) != size:
+                        raise ValueError("truncated snapshot")
+                    generations.append(_Generation(self.num_bits, meta['created_at'], bits, meta['count']))
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Could not load seen-filter snapshot {path}: {e}")
+            return False
+
+        self._generations.extend(generations)
+        logger.info(f"Loaded seen-filter snapshot {path} ({sum(g.count for g in generations)} items)")
+        return bool(generations)
+
+
+# =============================================================================
+# REDIS-BACKED FILTER (SHARED ACROSS WORKERS)
+# =============================================================================
+
+class RedisSeenFilter:
+    """Generational Bloom filter in Redis bitmaps, one key per rotation window"""
+
+    def __init__(self, client, namespace: str, capacity: int = 1_000_000, error_rate: float = 0.001,
+                 rotation_seconds: float = 7 * 86400, generations: int = 4):
+        self.client = client
+        self.namespace = namespace
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rotation_seconds = rotation_seconds
+        self.max_generations = max(2, generations)
+        self.num_bits, self.num_hashes = bloom_parameters(capacity, error_rate)
+
+    def check_and_add(self, key: str) -> bool:
+        """True if the key was (probably) seen before; records it either way"""
+        return self.check_and_add_many([key])[0]
+
+    def check_and_add_many(self, keys: List[str]) -> List[bool]:
+        """SETBIT on the current window (its old bits say 'seen here'), GETBIT on older ones, one round trip"""
+        generation_keys = self._generation_keys()
+        k = self.num_hashes
+
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            positions = bloom_positions(key, self.num_bits, k)
+            for position in positions:
+                pipe.setbit(generation_keys[-1], position, 1)
+            for older in generation_keys[:-1]:
+                for position in positions:
+                    pipe.getbit(older, position)
+        pipe.expire(generation_keys[-1], int(self.rotation_seconds * self.max_generations))
+        replies = pipe.execute()
+
+        seen = []
+        per_key = k * len(generation_keys)
+        for start in range(0, per_key * len(keys), per_key):
+            bits = replies[start:start + per_key]
+            seen.append(any(all(bits[i:i + k]) for i in range(0, per_key, k)))
+        return seen
+
+    def __contains__(self, key: str) -> bool:
+        positions = bloom_positions(key, self.num_bits, self.num_hashes)
+        pipe = self.client.pipeline(transaction=False)
+        for generation_key in self._generation_keys():
+            for position in positions:
+                pipe.getbit(generation_key, position)
+        bits = pipe.execute()
+        k = self.num_hashes
+        return any(all(bits[i:i + k]) for i in range(0, len(bits), k))
+
+    def snapshot(self, path: Optional[str] = None) -> bool:
+        return False  # Redis persistence covers it
+
+    def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'backend': 'redis',
+            'namespace': self.namespace,
+            'generations': self.max_generations,
+            'capacity_per_generation': self.capacity,
+            'memory_bytes': self.max_generations * ((self.num_bits + 7) // 8),
+            'rotation_seconds': self.rotation_seconds
+        }
+
+    def _generation_keys(self) -> List[str]:
+        current = int(time.time() // self.rotation_seconds)
+        return [f"{SEEN_KEY_PREFIX}{self.namespace}:{window}"
+                for window in range(current - self.max_generations + 1, current + 1)]
+
+
+def create_seen_filter(namespace: str, capacity: int = 1_000_000, error_rate: float = 0.001,
+                       rotation_seconds: float = 7 * 86400, generations: int = 4,
+                       redis_url: Optional[str] = None, snapshot_dir: Optional[str] = None):
+    """
+    Shared Redis filter when SEEN_FILTER_REDIS_URL (or redis_url) is set and
+    reachable, else an in-process filter snapshotted under SEEN_FILTER_DIR
+    """
+    redis_url = redis_url or os.getenv('SEEN_FILTER_REDIS_URL')
+    if redis_url and REDIS_AVAILABLE:
+        try:
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            return RedisSeenFilter(client, namespace, capacity, error_rate, rotation_seconds, generations)
+        except Exception as e:
+            logger.warning(f"Redis seen-filter unavailable ({e}), using local filter for {namespace}")
+
+    snapshot_dir = snapshot_dir or os.getenv('SEEN_FILTER_DIR', 'data/seen_filters')
+    return RotatingSeenFilter(
+        capacity=capacity,
+        error_rate=error_rate,
+        rotation_seconds=rotation_seconds,
+        generations=generations,
+        snapshot_path=os.path.join(snapshot_dir, f"{namespace}.bloom")
+    )
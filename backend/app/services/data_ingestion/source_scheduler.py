@@ -0,0 +1,176 @@
+"""
+Deadline Scheduler for Data Source Checks
+
+Keeps every enabled DataSource in a min-heap keyed by when it is next due, so
+the monitor only looks at sources that are actually due instead of re-sorting
+and re-scanning the whole list every few seconds.
+
+- A source is either waiting in the heap or checked out (in flight), never
+  both, so it cannot be queued again before its previous check finishes.
+- ``complete`` reschedules a source at ``calculate_adaptive_interval()``
+  minutes from now: one heap push, O(log n).
+- Sources due at the same moment are handed out by dynamic priority score,
+  computed once per reschedule.
+- Removed or rescheduled entries are invalidated lazily (their heap slot is
+  skipped when popped) rather than searched for.
+
+The scheduler is thread-safe, so the threaded workers can complete sources
+while the monitor thread pops due ones.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+
+class SourceScheduler:
+    """Min-heap of (next due, -priority) with at most one live entry per source"""
+
+    def __init__(self):
+        self._heap: List[list] = []
+        self._entries: Dict[int, list] = {}  # id(source) -> live heap entry
+        self._in_flight: Set[int] = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.dispatched = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    def __contains__(self, source) -> bool:
+        key = id(source)
+        return key in self._entries or key in self._in_flight
+
+    # =========================================================================
+    # SCHEDULING
+    # =========================================================================
+
+    def add(self, source, delay_seconds: Optional[float] = None, now: Optional[float] = None):
+        """Schedule a source that is not yet known; due now if never checked"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            key = id(source)
+            if key in self._entries or key in self._in_flight:
+                return
+            if delay_seconds is None:
+                delay_seconds = self._initial_delay(source)
+            self._push(source, now + max(0.0, delay_seconds))
+
+    def sync(self, sources: List[Any]) -> int:
+        """
+        Match the schedule to the source list: add enabled sources that are
+        missing, drop disabled ones and ones no longer listed. Returns how many
+        were added.
+        """
+        now = time.monotonic()  # one base time, so never-checked sources tie on priority
+        added = 0
+        listed = set()
+        for source in sources:
+            listed.add(id(source))
+            if not source.enabled:
+                self.remove(source)
+            elif source not in self:
+                self.add(source, now=now)
+                added += 1
+
+        with self._lock:
+            dropped = [entry[-1] for key, entry in self._entries.items() if key not in listed]
+            self._in_flight &= listed
+        for source in dropped:
+            self.remove(source)
+        return added
+
+    def reschedule(self, source, now: Optional[float] = None):
+        """Move a waiting source to its current interval after its last check"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.pop(id(source), None)
+            if entry is None:
+                return  # in flight (complete() uses the new interval) or unscheduled
+            entry[-1] = None
+            if source.enabled:
+                self._push(source, now + max(0.0, self._initial_delay(source)))
+
+    def remove(self, source):
+        """Drop a source from the schedule (a running check is not interrupted)"""
+        with self._lock:
+            entry = self._entries.pop(id(source), None)
+            if entry is not None:
+                entry[-1] = None
+            self._in_flight.discard(id(source))
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[Any]:
+        """Check out every source due by ``now``, highest priority first among ties"""
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+                entry = heapq.heappop(self._heap)
+                source = entry[-1]
+                if source is None:
+                    continue  # removed or rescheduled
+                del self._entries[id(source)]
+                if not source.enabled:
+                    continue
+                self._in_flight.add(id(source))
+                due.append(source)
+            self.dispatched += len(due)
+        return due
+
+    def complete(self, source):
+        """Return a checked-out source to the heap at its adaptive interval"""
+        with self._lock:
+            key = id(source)
+            if key not in self._in_flight:
+                return
+            self._in_flight.discard(key)
+            if source.enabled:
+                self._push(source, time.monotonic() + source.calculate_adaptive_interval() * 60)
+
+    def seconds_until_next_due(self, now: Optional[float] = None) -> Optional[float]:
+        """Time until the earliest live entry is due, None when nothing is scheduled"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            while self._heap and self._heap[0][-1] is None:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - now)
+
+    def get_stats(self) -> Dict[str, Any]:
+        wait = self.seconds_until_next_due()
+        return {
+            'scheduled': len(self._entries),
+            'in_flight': len(self._in_flight),
+            'heap_size': len(self._heap),
+            'dispatched': self.dispatched,
+            'next_due_seconds': round(wait, 1) if wait is not None else None
+        }
+
+    # =========================================================================
+    # HELPERS
+    # =========================================================================
+
+    def _push(self, source, due_at: float):
+        """Caller holds the lock"""
+        entry = [due_at, -source.get_dynamic_priority_score(), next(self._counter), source]
+        self._entries[id(source)] = entry
+        heapq.heappush(self._heap, entry)
+        # Compact when lazily-deleted entries dominate the heap
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [e for e in self._heap if e[-1] is not None]
+            heapq.heapify(self._heap)
+
+    @staticmethod
+    def _initial_delay(source) -> float:
+        if source.last_check is None:
+            return 0.0
+        elapsed = (datetime.now() - source.last_check).total_seconds()
+        return source.check_interval_minutes * 60 - elapsed
@@ -0,0 +1,171 @@
+"""
+Sliding-Window Executor for High-Volume Crawling
+
+Runs an async worker function over a stream of items with a fixed-size worker
+pool and yields each result as soon as it completes. A slow item only occupies
+its own worker, unlike chunked ``asyncio.gather`` where the whole chunk waits
+for its slowest member.
+
+Per-domain politeness:
+- at most ``per_domain_concurrency`` items of one domain are in flight; further
+  items of that domain are parked while workers move on to other domains
+- request starts for one domain are spaced ``domain_delay`` seconds apart
+
+Results go through a bounded queue. A consumer that falls behind therefore
+pauses the workers instead of letting results pile up in memory. Closing the
+generator early (``break`` / ``aclose()``) cancels the remaining work.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class StreamedResult:
+    """One completed item; ``error`` is set when the worker raised"""
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    elapsed: float = 0.0
+
+
+def url_domain(item: Any) -> str:
+    """Domain of an item with a ``url`` attribute (or a URL string)"""
+    url = getattr(item, 'url', item)
+    return urlparse(url).netloc.lower() if isinstance(url, str) else ''
+
+
+class _DomainPoliteness:
+    """
+    Hands out the next item whose domain has a free slot
+
+    Items of a domain that is already at its cap are parked instead of holding
+    a worker, so one busy domain cannot occupy the whole pool.
+    """
+
+    def __init__(self, items: Iterable[Any], domain_of: Callable[[Any], str],
+                 per_domain_concurrency: int, domain_delay: float):
+        self._source = iter(items)
+        self._source_done = False
+        self.domain_of = domain_of
+        self.per_domain_concurrency = per_domain_concurrency
+        self.domain_delay = domain_delay
+        self._parked: Dict[str, Deque[Any]] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._slot_freed = asyncio.Condition()
+
+    async def acquire(self) -> Optional[Tuple[str, Any]]:
+        """Next (domain, item), waiting for a domain slot if needed; None when drained"""
+        while True:
+            taken = self._take()
+            if taken is not None:
+                break
+            if self._source_done and not any(self._parked.values()):
+                return None
+            async with self._slot_freed:
+                await self._slot_freed.wait()
+
+        domain, item = taken
+        self._in_flight[domain] = self._in_flight.get(domain, 0) + 1
+        if self.domain_delay > 0:
+            # Reserve the next start slot for this domain, then wait for it
+            now = time.monotonic()
+            start_at = max(now, self._next_start.get(domain, 0.0))
+            self._next_start[domain] = start_at + self.domain_delay
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+        return taken
+
+    async def release(self, domain: str):
+        self._in_flight[domain] -= 1
+        async with self._slot_freed:
+            self._slot_freed.notify_all()
+
+    def _take(self) -> Optional[Tuple[str, Any]]:
+        for domain, parked in self._parked.items():
+            if parked and self._has_room(domain):
+                return domain, parked.popleft()
+        while not self._source_done:
+            try:
+                item = next(self._source)
+            except StopIteration:
+                self._source_done = True
+                break
+            domain = self.domain_of(item)
+            if self._has_room(domain):
+                return domain, item
+            self._parked.setdefault(domain, deque()).append(item)
+        return None
+
+    def _has_room(self, domain: str) -> bool:
+        return self._in_flight.get(domain, 0) < self.per_domain_concurrency
+
+
+async def stream_bounded(items: Iterable[Any],
+                         worker: Callable[[Any], Awaitable[Any]],
+                         max_workers: int = 10,
+                         per_domain_concurrency: int = 2,
+                         domain_delay: float = 0.0,
+                         domain_of: Callable[[Any], str] = url_domain,
+                         result_buffer: Optional[int] = None) -> AsyncIterator[StreamedResult]:
+    """
+    Yield a StreamedResult for every item, in completion order
+
+    Args:
+        items: work items (consumed lazily by the workers)
+        worker: coroutine function run once per item
+        max_workers: size of the worker pool
+        per_domain_concurrency: in-flight cap per domain
+        domain_delay: minimum seconds between request starts on one domain
+        domain_of: maps an item to its politeness key
+        result_buffer: completed results held before workers pause
+            (defaults to 2 * max_workers)
+    """
+    results: asyncio.Queue = asyncio.Queue(maxsize=result_buffer or 2 * max_workers)
+    politeness = _DomainPoliteness(items, domain_of, per_domain_concurrency, domain_delay)
+
+    async def run_worker():
+        try:
+            while True:
+                taken = await politeness.acquire()
+                if taken is None:
+                    break
+                domain, item = taken
+                start = time.monotonic()
+                try:
+                    outcome = StreamedResult(item=item, result=await worker(item))
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    outcome = StreamedResult(item=item, error=e)
+                finally:
+                    await politeness.release(domain)
+                outcome.elapsed = time.monotonic() - start
+                await results.put(outcome)
+        except Exception as e:
+            logger.error(f"Streaming worker stopped: {e}")
+        await results.put(_DONE)
+
+    workers = [asyncio.create_task(run_worker()) for _ in range(max(1, max_workers))]
+    running = len(workers)
+    try:
+        while running:
+            outcome = await results.get()
+            if outcome is _DONE:
+                running -= 1
+                continue
+            yield outcome
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,81 @@
+"""
+Token Bucket Rate Limiter
+
+A bucket holds up to ``capacity`` tokens and refills at ``rate`` tokens per
+second. Each request takes one token. This allows bursts up to ``capacity``
+while holding the long-run rate at ``rate``, unlike a counter that resets
+once a minute.
+
+The bucket is guarded by a thread lock, so the threaded collectors and
+coroutines on an event loop can share it. ``acquire`` is the async form: it
+sleeps until a token is due rather than failing straight away.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket with sync and async acquisition"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: float, burst: Optional[float] = None) -> "TokenBucket":
+        return cls(requests_per_minute / 60.0, burst if burst is not None else requests_per_minute)
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if they are available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def consume(self, tokens: float = 1.0):
+        """Take tokens unconditionally (for requests already made); may go into debt"""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+
+    async def acquire(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> bool:
+        """Wait for tokens; False if that would take longer than max_wait"""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                wait = (tokens - self._tokens) / self.rate
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def _refill(self):
+        """Caller holds the lock"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
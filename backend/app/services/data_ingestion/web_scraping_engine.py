@@ -22,7 +22,7 @@ Features:
 import asyncio
 import aiohttp
 import logging
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import hashlib
@@ -47,11 +47,18 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-import random
 import os
+from collections import deque
+
+from .browser_pool import BrowserPool
+from .seen_filter import create_seen_filter
+from .token_bucket import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# Responses worth retrying (sync sessions via urllib3 Retry, async by hand)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
 
 class ScrapingStrategy(Enum):
     """Different scraping strategies for various site types"""
@@ -129,27 +136,48 @@ class HighVolumeWebScrapingEngine:
     Designed to handle hundreds of sites with robust error handling
     """
     
-    def __init__(self, max_workers: int = 20, batch_size: int = 100):
+    # Attempts per page in async mode before giving up on a retryable status
+    ASYNC_FETCH_RETRIES = 3
+    
+    def __init__(self, max_workers: int = 20, batch_size: int = 100, seen_filter=None,
+                 execution_mode: str = "threaded", max_concurrent_requests: int = 50,
+                 page_prefetch: int = 3, max_selenium_drivers: int = 3):
+        """
+        Args:
+            execution_mode: "threaded" (targets in a thread pool) or "async"
+                (targets and pages on one event loop over a shared connection pool)
+            max_concurrent_requests: in-flight request cap and connection pool
+                size for async scraping
+            page_prefetch: pages of a paginated target requested ahead in async
+                mode; every request still waits for its domain's rate limit
+            max_selenium_drivers: size of the shared headless-browser pool
+        """
         self.max_workers = max_workers
         self.batch_size = batch_size
+        self.execution_mode = execution_mode
+        self.max_concurrent_requests = max_concurrent_requests
+        self.page_prefetch = max(1, page_prefetch)
         
         # Scraping targets
         self.targets: List[ScrapingTarget] = []
         
-        # Session management
-        self.session_pools = {}
+        # Session management: one pooled session per domain, reused across runs
+        self.session_pools: Dict[str, requests.Session] = {}
+        self._cloudscraper = None
+        self._session_lock = threading.Lock()
         self.user_agents = UserAgent()
         
-        # Selenium drivers for JS-heavy sites
-        self.selenium_drivers = []
-        self.max_selenium_drivers = 3
+        # Warm Selenium drivers shared by JS-heavy sites
+        self.max_selenium_drivers = max_selenium_drivers
+        self.driver_pool = BrowserPool(self._create_selenium_driver, max_size=max_selenium_drivers)
         
         # Content storage
         self.scraped_content: List[ScrapedContent] = []
-        self.content_hashes: Set[str] = set()
+        # Bounded, persistent record of content hashes already collected
+        self.seen_filter = seen_filter or create_seen_filter('web_scraping')
         
-        # Rate limiting
-        self.rate_limiters = {}
+        # Rate limiting: one token bucket per domain, shared by both modes
+        self.rate_limiters: Dict[str, TokenBucket] = {}
         
         # Statistics
         self.stats = {
@@ -453,40 +481,63 @@ class HighVolumeWebScrapingEngine:
             keywords=['AI', 'artificial intelligence', 'Africa', 'funding', 'investment']
         ))
     
-    def _create_session(self, target: ScrapingTarget) -> requests.Session:
-        """Create a configured session for a target"""
+    def _default_headers(self) -> Dict[str, str]:
+        """Browser-like headers shared by every session"""
+        return {
+            'User-Agent': self.user_agents.random,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate',
+            'Upgrade-Insecure-Requests': '1',
+        }
+    
+    def _create_session(self) -> requests.Session:
+        """Create a session with retries and a connection pool sized for the workers"""
         session = requests.Session()
         
         # Configure retry strategy
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=list(RETRY_STATUS_CODES),
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.max_workers)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
-        
-        # Set headers
-        session.headers.update({
-            'User-Agent': self.user_agents.random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-        })
-        
-        # Add custom headers
-        session.headers.update(target.headers)
-        
-        # Add cookies
-        for name, value in target.cookies.items():
-            session.cookies.set(name, value)
+        session.headers.update(self._default_headers())
         
         return session
     
+    def _get_session(self, target: ScrapingTarget) -> requests.Session:
+        """Pooled session for the target's domain, so keep-alive connections are reused"""
+        domain = urlparse(target.base_url).netloc
+        with self._session_lock:
+            session = self.session_pools.get(domain)
+            if session is None:
+                session = self._create_session()
+                self.session_pools[domain] = session
+        return session
+    
+    def _get_cloudscraper(self):
+        """Shared cloudscraper session (its Cloudflare clearance cookies carry over)"""
+        with self._session_lock:
+            if self._cloudscraper is None:
+                self._cloudscraper = cloudscraper.create_scraper()
+            return self._cloudscraper
+    
+    def _create_async_session(self) -> aiohttp.ClientSession:
+        """One connection pool for every async request"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=self.max_concurrent_requests,
+                limit_per_host=max(2, self.page_prefetch),
+                ttl_dns_cache=300
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+            headers=self._default_headers()
+        )
+    
     def _create_selenium_driver(self) -> webdriver.Chrome:
         """Create a Selenium WebDriver instance"""
         options = Options()
@@ -507,30 +558,34 @@ class HighVolumeWebScrapingEngine:
         
         return driver
     
-    def _get_selenium_driver(self) -> webdriver.Chrome:
-        """Get or create a Selenium driver"""
-        if len(self.selenium_drivers) < self.max_selenium_drivers:
-            driver = self._create_selenium_driver()
-            self.selenium_drivers.append(driver)
-            return driver
-        else:
-            # Reuse existing driver
-            return random.choice(self.selenium_drivers)
+    def _domain_limiter(self, target: ScrapingTarget) -> TokenBucket:
+        """Token bucket spacing requests to the target's domain"""
+        domain = urlparse(target.base_url).netloc
+        with self._session_lock:
+            limiter = self.rate_limiters.get(domain)
+            if limiter is None:
+                limiter = TokenBucket(1.0 / max(target.rate_limit_seconds, 0.001), capacity=1)
+                self.rate_limiters[domain] = limiter
+        return limiter
     
     def _apply_rate_limit(self, target: ScrapingTarget):
-        """Apply rate limiting for a target"""
-        domain = urlparse(target.base_url).netloc
-        
-        if domain not in self.rate_limiters:
-            self.rate_limiters[domain] = time.time()
-        
-        # Check if we need to wait
-        time_since_last = time.time() - self.rate_limiters[domain]
-        if time_since_last < target.rate_limit_seconds:
-            wait_time = target.rate_limit_seconds - time_since_last
-            time.sleep(wait_time)
-        
-        self.rate_limiters[domain] = time.time()
+        """Block until the target's domain may be requested again"""
+        limiter = self._domain_limiter(target)
+        while not limiter.try_acquire():
+            time.sleep(limiter.time_until_available())
+    
+    def _page_numbers(self, target: ScrapingTarget) -> range:
+        """Pages to request for a paginated target"""
+        if not target.pagination_config:
+            return range(1, 2)
+        start = target.pagination_config.get('start_page', 1)
+        return range(start, start + target.max_pages)
+    
+    def _page_url(self, target: ScrapingTarget, page: int) -> str:
+        if not target.pagination_config:
+            return target.base_url
+        separator = '&' if '?' in target.base_url else '?'
+        return f"{target.base_url}{separator}{urlencode({target.pagination_config['param_name']: page})}"
     
     def _extract_content_simple(self, html: str, target: ScrapingTarget) -> List[ScrapedContent]:
         """Extract content using simple HTML parsing"""
@@ -573,8 +628,11 @@ class HighVolumeWebScrapingEngine:
         return content_items
     
     def _extract_content_javascript(self, target: ScrapingTarget) -> List[ScrapedContent]:
-        """Extract content from JavaScript-heavy sites using Selenium"""
-        driver = self._get_selenium_driver()
+        """Extract content from JavaScript-heavy sites using a pooled Selenium driver"""
+        with self.driver_pool.lease() as driver:
+            return self._extract_with_driver(driver, target)
+    
+    def _extract_with_driver(self, driver: webdriver.Chrome, target: ScrapingTarget) -> List[ScrapedContent]:
         content_items = []
         
         try:
@@ -627,12 +685,37 @@ class HighVolumeWebScrapingEngine:
         return any(keyword.lower() in text for keyword in keywords)
     
     def _is_duplicate(self, content: ScrapedContent) -> bool:
-        """Check if content is a duplicate"""
-        if content.content_hash in self.content_hashes:
-            return True
+        """Check if content is a duplicate (and remember it)"""
+        return self.seen_filter.check_and_add(content.content_hash)
+    
+    def _scrape_cloudflare(self, target: ScrapingTarget) -> List[ScrapedContent]:
+        """Fetch a Cloudflare-protected page through the shared cloudscraper session"""
+        response = self._get_cloudscraper().get(
+            target.base_url, headers=target.headers, cookies=target.cookies, timeout=30
+        )
+        return self._extract_content_simple(response.text, target)
+    
+    def _finish_target(self, target: ScrapingTarget, content_items: List[ScrapedContent],
+                       start_time: float, duplicates: Optional[List[bool]] = None) -> List[ScrapedContent]:
+        """Filter duplicates (unless already checked) and record statistics for a scraped target"""
+        if duplicates is None:
+            duplicates = [self._is_duplicate(content) for content in content_items]
+        
+        unique_content = []
+        for content, duplicate in zip(content_items, duplicates):
+            if not duplicate:
+                unique_content.append(content)
+            else:
+                self.stats['duplicates_filtered'] += 1
+        
+        # Update statistics
+        target.success_count += len(unique_content)
+        target.last_scraped = datetime.now()
+        self.stats['content_extracted'] += len(unique_content)
+        
+        logger.info(f"Scraped {len(unique_content)} items from {target.name} in {time.time() - start_time:.2f}s")
         
-        self.content_hashes.add(content.content_hash)
-        return False
+        return unique_content
     
     @backoff.on_exception(backoff.expo, Exception, max_tries=3)
     def _scrape_target(self, target: ScrapingTarget) -> List[ScrapedContent]:
@@ -654,24 +737,20 @@ class HighVolumeWebScrapingEngine:
             
             elif target.strategy == ScrapingStrategy.CLOUDFLARE_PROTECTED:
                 # Use cloudscraper for Cloudflare protection
-                scraper = cloudscraper.create_scraper()
-                response = scraper.get(target.base_url)
-                content_items = self._extract_content_simple(response.text, target)
+                content_items = self._scrape_cloudflare(target)
             
             else:
-                # Use simple HTML parsing
-                session = self._create_session(target)
+                # Use simple HTML parsing over the domain's pooled session
+                session = self._get_session(target)
                 
                 if target.strategy == ScrapingStrategy.PAGINATED:
-                    # Handle pagination
-                    page = 1
-                    while page <= target.max_pages:
-                        if target.pagination_config:
-                            url = f"{target.base_url}?{target.pagination_config['param_name']}={page}"
-                        else:
-                            url = target.base_url
+                    # Handle pagination; each page after the first waits for the domain's rate limit
+                    for index, page in enumerate(self._page_numbers(target)):
+                        if index:
+                            self._apply_rate_limit(target)
                         
-                        response = session.get(url, timeout=30)
+                        response = session.get(self._page_url(target, page), headers=target.headers,
+                                               cookies=target.cookies, timeout=30)
                         if response.status_code == 200:
                             page_content = self._extract_content_simple(response.text, target)
                             content_items.extend(page_content)
@@ -682,34 +761,17 @@ class HighVolumeWebScrapingEngine:
                         else:
                             logger.warning(f"Failed to fetch page {page} for {target.name}: {response.status_code}")
                             break
-                        
-                        page += 1
-                        time.sleep(1)  # Additional delay between pages
                 
                 else:
                     # Simple single-page scraping
-                    response = session.get(target.base_url, timeout=30)
+                    response = session.get(target.base_url, headers=target.headers,
+                                           cookies=target.cookies, timeout=30)
                     if response.status_code == 200:
                         content_items = self._extract_content_simple(response.text, target)
                     else:
                         logger.warning(f"Failed to fetch {target.name}: {response.status_code}")
             
-            # Filter duplicates
-            unique_content = []
-            for content in content_items:
-                if not self._is_duplicate(content):
-                    unique_content.append(content)
-                else:
-                    self.stats['duplicates_filtered'] += 1
-            
-            # Update statistics
-            target.success_count += len(unique_content)
-            target.last_scraped = datetime.now()
-            self.stats['content_extracted'] += len(unique_content)
-            
-            logger.info(f"Scraped {len(unique_content)} items from {target.name} in {time.time() - start_time:.2f}s")
-            
-            return unique_content
+            return self._finish_target(target, content_items, start_time)
             
         except Exception as e:
             logger.error(f"Error scraping {target.name}: {e}")
@@ -746,6 +808,131 @@ class HighVolumeWebScrapingEngine:
         logger.info(f"Completed scraping: {len(all_content)} items extracted")
         return all_content
     
+    # =========================================================================
+    # ASYNC SCRAPING MODE
+    # =========================================================================
+    
+    async def scrape_all_targets_async(self, session: Optional[aiohttp.ClientSession] = None) -> List[ScrapedContent]:
+        """
+        Scrape every enabled target concurrently on one event loop
+        
+        HTTP targets share one aiohttp connection pool and paginated targets
+        request up to page_prefetch pages ahead. Every request waits on its
+        domain's token bucket, so concurrency never beats a site's rate limit.
+        JS-heavy and Cloudflare targets run in worker threads on the pooled
+        browsers and the shared cloudscraper session.
+        """
+        targets = [target for target in self.targets if target.enabled]
+        logger.info(f"Starting async scraping of {len(targets)} targets")
+        
+        own_session = session is None
+        if own_session:
+            session = self._create_async_session()
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        all_content = []
+        try:
+            scrapes = [self._scrape_target_async(session, semaphore, target) for target in targets]
+            for scrape in asyncio.as_completed(scrapes):
+                all_content.extend(await scrape)
+                self.stats['targets_processed'] += 1
+        finally:
+            if own_session:
+                await session.close()
+        
+        logger.info(f"Completed async scraping: {len(all_content)} items extracted")
+        return all_content
+    
+    async def _scrape_target_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                   target: ScrapingTarget) -> List[ScrapedContent]:
+        """Scrape a single target without blocking the event loop"""
+        logger.info(f"Scraping {target.name}")
+        start_time = time.time()
+        
+        try:
+            if target.strategy == ScrapingStrategy.JAVASCRIPT_HEAVY:
+                await self._domain_limiter(target).acquire()
+                content_items = await asyncio.to_thread(self._extract_content_javascript, target)
+            
+            elif target.strategy == ScrapingStrategy.CLOUDFLARE_PROTECTED:
+                await self._domain_limiter(target).acquire()
+                content_items = await asyncio.to_thread(self._scrape_cloudflare, target)
+            
+            elif target.strategy == ScrapingStrategy.PAGINATED:
+                content_items = await self._scrape_pages_async(session, semaphore, target)
+            
+            else:
+                html = await self._fetch_page_async(session, semaphore, target, target.base_url)
+                content_items = await asyncio.to_thread(self._extract_content_simple, html, target) if html else []
+            
+            # The seen filter may block on Redis or disk
+            duplicates = await asyncio.to_thread(
+                self.seen_filter.check_and_add_many, [content.content_hash for content in content_items]
+            )
+            return self._finish_target(target, content_items, start_time, duplicates)
+            
+        except Exception as e:
+            logger.error(f"Error scraping {target.name}: {e}")
+            target.error_count += 1
+            self.stats['errors'] += 1
+            return []
+    
+    async def _scrape_pages_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                  target: ScrapingTarget) -> List[ScrapedContent]:
+        """
+        Walk a paginated target with up to page_prefetch requests in flight
+        
+        Pages are consumed in order and the walk stops at the first failed or
+        empty page, so at most page_prefetch - 1 requests go past the end.
+        """
+        pages = iter(self._page_numbers(target))
+        pending = deque()
+        
+        def prefetch_next():
+            page = next(pages, None)
+            if page is not None:
+                url = self._page_url(target, page)
+                pending.append(asyncio.ensure_future(self._fetch_page_async(session, semaphore, target, url)))
+        
+        for _ in range(self.page_prefetch):
+            prefetch_next()
+        
+        content_items = []
+        try:
+            while pending:
+                html = await pending.popleft()
+                if html is None:
+                    break
+                page_content = await asyncio.to_thread(self._extract_content_simple, html, target)
+                if not page_content:
+                    break
+                content_items.extend(page_content)
+                prefetch_next()
+        finally:
+            for fetch in pending:
+                fetch.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        return content_items
+    
+    async def _fetch_page_async(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                                target: ScrapingTarget, url: str) -> Optional[str]:
+        """GET one page within the domain's rate limit; None unless it answers 200"""
+        limiter = self._domain_limiter(target)
+        for attempt in range(self.ASYNC_FETCH_RETRIES):
+            await limiter.acquire()
+            async with semaphore:
+                async with session.get(url, headers=target.headers, cookies=target.cookies) as response:
+                    if response.status == 200:
+                        return await response.text()
+                    status = response.status
+            
+            if status not in RETRY_STATUS_CODES or attempt == self.ASYNC_FETCH_RETRIES - 1:
+                logger.warning(f"Failed to fetch {url} for {target.name}: {status}")
+                return None
+            await asyncio.sleep(2 ** attempt)
+        return None
+    
     def start_continuous_scraping(self, interval_hours: int = 6):
         """Start continuous scraping with specified interval"""
         logger.info(f"Starting continuous scraping with {interval_hours}h interval")
@@ -757,7 +944,10 @@ class HighVolumeWebScrapingEngine:
             while not self.stop_event.is_set():
                 try:
                     # Scrape all targets
-                    content = self.scrape_all_targets()
+                    if self.execution_mode == "async":
+                        content = asyncio.run(self.scrape_all_targets_async())
+                    else:
+                        content = self.scrape_all_targets()
                     
                     # Store content (extend with database storage)
                     self.scraped_content.extend(content)
@@ -783,15 +973,19 @@ class HighVolumeWebScrapingEngine:
         logger.info("Stopping web scraping engine")
         self.is_running = False
         self.stop_event.set()
+        self.seen_filter.close()
         
-        # Close Selenium drivers
-        for driver in self.selenium_drivers:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.warning(f"Error closing Selenium driver: {e}")
+        # Close Selenium drivers and pooled sessions
+        self.driver_pool.close()
         
-        self.selenium_drivers.clear()
+        with self._session_lock:
+            sessions = list(self.session_pools.values())
+            if self._cloudscraper is not None:
+                sessions.append(self._cloudscraper)
+            self.session_pools.clear()
+            self._cloudscraper = None
+        for session in sessions:
+            session.close()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get scraping statistics"""
@@ -807,9 +1001,10 @@ class HighVolumeWebScrapingEngine:
             'content_per_hour': self.stats['content_extracted'] / (elapsed_time / 3600) if elapsed_time > 0 else 0,
             'success_rate': (self.stats['targets_processed'] / len(self.targets)) * 100 if self.targets else 0,
             'uptime_hours': elapsed_time / 3600,
-            'selenium_drivers': len(self.selenium_drivers),
+            'selenium_drivers': self.driver_pool.get_stats(),
+            'pooled_sessions': len(self.session_pools),
             'content_in_memory': len(self.scraped_content),
-            'unique_content_hashes': len(self.content_hashes)
+            'seen_filter': self.seen_filter.get_stats()
         }
     
     def get_scraped_content(self) -> List[ScrapedContent]:
@@ -819,7 +1014,6 @@ class HighVolumeWebScrapingEngine:
     def clear_scraped_content(self):
         """Clear scraped content from memory"""
         self.scraped_content.clear()
-        self.content_hashes.clear()
         logger.info("Cleared scraped content from memory")
 
 
@@ -20,6 +20,7 @@ from openai import OpenAI
 
 # Local imports
 from app.core.pinecone_client import get_pinecone_client
+from app.services.search_filters import search_filter_fields_cleared, search_filter_metadata
 from .content_analyzer import FundingIntelligence, FundingEventType
 from .entity_extraction import Entity, Relationship
 
@@ -376,6 +377,9 @@ class FundingIntelligenceVectorDB:
                 "prediction_source": opportunity.get('prediction_source', 'ai_analysis')
             }
             
+            # Fields the intelligent search filters on inside the vector store
+            metadata.update(search_filter_metadata(opportunity))
+            
             # Create vector document
             vector_doc = VectorDocument(
                 id=doc_id,
@@ -397,19 +401,81 @@ class FundingIntelligenceVectorDB:
             logger.error(f"Failed to upsert intelligence item: {e}")
             return False
     
+    async def update_search_filter_metadata(self, opportunity: Dict[str, Any],
+                                            updates: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Refresh the search filter metadata of an indexed opportunity in place,
+        without re-embedding it
+
+        opportunity is the full row after the update. When the update nulls a
+        filter field, the vector is re-upserted instead, since a metadata
+        update cannot remove the stale key.
+        """
+        if updates is not None and search_filter_fields_cleared(updates):
+            return await self.upsert_intelligence_item(opportunity)
+        try:
+            self.index.update(
+                id=f"opportunity_{opportunity['id']}",
+                set_metadata=search_filter_metadata(opportunity),
+                namespace=self.namespace
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update search metadata of opportunity {opportunity.get('id')}: {e}")
+            return False
+    
+    async def reindex_search_filter_metadata(self, opportunities: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Backfill search filter metadata for a page of africa_intelligence_feed rows
+
+        Rows that already have a vector get their metadata set in place; rows
+        that were never indexed are embedded and upserted.
+        """
+        counts = {'updated': 0, 'upserted': 0, 'failed': 0}
+        if not opportunities:
+            return counts
+        
+        ids = [f"opportunity_{opportunity['id']}" for opportunity in opportunities]
+        try:
+            existing = set(self.index.fetch(ids=ids, namespace=self.namespace).vectors)
+        except Exception as e:
+            logger.error(f"Failed to fetch vectors for search metadata backfill: {e}")
+            counts['failed'] = len(opportunities)
+            return counts
+        
+        for doc_id, opportunity in zip(ids, opportunities):
+            if doc_id in existing:
+                ok = await self.update_search_filter_metadata(opportunity)
+                key = 'updated'
+            else:
+                ok = await self.upsert_intelligence_item(opportunity)
+                key = 'upserted'
+            counts[key if ok else 'failed'] += 1
+        
+        return counts
+    
     async def semantic_search(self, query: str, document_type: str = None, 
-                            top_k: int = 10, min_score: float = 0.7) -> List[Dict[str, Any]]:
+                            top_k: int = 10, min_score: float = 0.7,
+                            metadata_filter: Optional[Dict[str, Any]] = None,
+                            query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
         """
         Perform semantic search across funding intelligence documents
+        
+        metadata_filter is a Pinecone filter expression evaluated by the index,
+        so top_k counts only matching documents. Callers that cache query
+        embeddings pass query_embedding to skip re-embedding the query.
         """
         try:
             # Generate query embedding
-            query_embedding = await self.generate_embedding(query)
+            if query_embedding is None:
+                query_embedding = await self.generate_embedding(query)
             
             # Prepare filter
             filter_dict = {}
             if document_type:
                 filter_dict["type"] = document_type
+            if metadata_filter:
+                filter_dict = {"$and": [filter_dict, metadata_filter]} if filter_dict else metadata_filter
             
             # Search Pinecone using updated SDK
             search_response = self.index.query(
@@ -621,6 +687,30 @@ class FundingIntelligenceVectorDB:
             return 0
 
 
+_intelligence_vector_db: Optional[FundingIntelligenceVectorDB] = None
+_intelligence_vector_db_failed = False
+
+
+def get_intelligence_vector_db() -> Optional[FundingIntelligenceVectorDB]:
+    """Process-wide vector DB, or None when Pinecone is not configured"""
+    global _intelligence_vector_db, _intelligence_vector_db_failed
+    if _intelligence_vector_db is None and not _intelligence_vector_db_failed:
+        try:
+            _intelligence_vector_db = FundingIntelligenceVectorDB()
+        except Exception as e:
+            _intelligence_vector_db_failed = True
+            logger.warning(f"Vector DB unavailable, search metadata will not be synced: {e}")
+    return _intelligence_vector_db
+
+
+async def sync_search_filter_metadata(opportunity: Dict[str, Any], updates: Dict[str, Any]) -> bool:
+    """Push changed validation status, relevance, deadline or amounts of a row to its vector"""
+    vector_db = get_intelligence_vector_db()
+    if vector_db is None:
+        return False
+    return await vector_db.update_search_filter_metadata(opportunity, updates)
+
+
 class VectorSearchService:
     """
     High-level service for vector search operations
@@ -663,6 +753,23 @@ class VectorSearchService:
             logger.error(f"Intelligent opportunity discovery failed: {e}")
             return {"error": str(e)}
     
+    async def filtered_opportunity_search(self, search_query: str, metadata_filter: Dict[str, Any],
+                                          top_k: int = 20, min_score: float = 0.5,
+                                          query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
+        """Semantic search over intelligence items matching a metadata filter"""
+        return await self.vector_db.semantic_search(
+            query=search_query,
+            document_type='intelligence_item',
+            top_k=top_k,
+            min_score=min_score,
+            metadata_filter=metadata_filter,
+            query_embedding=query_embedding
+        )
+    
+    async def embed_query(self, search_query: str) -> List[float]:
+        """Query embedding, for callers that cache it between searches"""
+        return await self.vector_db.generate_embedding(search_query)
+    
     async def _generate_search_insights(self, results: List[Dict[str, Any]], 
                                       query: str) -> Dict[str, Any]:
         """Generate insights from search results"""
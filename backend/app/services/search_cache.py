@@ -0,0 +1,277 @@
+"""
+Intelligent Search Cache - Query Embeddings and Ranked Results
+
+Two cache levels sit in front of the intelligent search:
+
+- Level 1 maps normalized query text to its query embedding, so popular
+  queries are not re-embedded. Embeddings do not depend on the data and live
+  for ``embedding_ttl_seconds``.
+- Level 2 maps (normalized query, filters, min score, result limit) to the
+  ranked result ids and their scores, for ``result_ttl_seconds``. The key
+  includes a generation counter. Ingesting new or updated opportunities bumps
+  the counter through ``invalidate``, which orphans every cached ranking at
+  once. Orphaned entries simply age out.
+
+``LocalSearchCacheBackend`` is an in-process LRU, so its invalidation only
+reaches the current process. ``RedisSearchCacheBackend`` shares both levels
+and the generation counter between every API and ingestion process.
+``get_search_cache`` picks Redis when SEARCH_CACHE_REDIS_URL (or REDIS_URL)
+is set, and the local LRU otherwise. ``SearchCache.get_stats``
+reports hits, misses and hit ratio per level.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_KEY_PREFIX = "taifa:search:"
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query"""
+    return ' '.join((query or '').lower().split())
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class LocalSearchCacheBackend:
+    """In-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def bump_generation(self) -> int:
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisSearchCacheBackend:
+    """Redis-backed cache shared by every process"""
+
+    def __init__(self, client, prefix: str = SEARCH_CACHE_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+        self._generation_key = f"{prefix}generation"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float):
+        await self.client.set(self.prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def generation(self) -> int:
+        value = await self.client.get(self._generation_key)
+        return int(value) if value is not None else 0
+
+    async def bump_generation(self) -> int:
+        return int(await self.client.incr(self._generation_key))
+
+
+# =============================================================================
+# TWO-LEVEL CACHE
+# =============================================================================
+
+class SearchCache:
+    """Query-embedding and ranked-result cache over a backend"""
+
+    def __init__(self, backend, result_ttl_seconds: float = 60.0,
+                 embedding_ttl_seconds: float = 24 * 3600.0):
+        self.backend = backend
+        self.result_ttl_seconds = result_ttl_seconds
+        self.embedding_ttl_seconds = embedding_ttl_seconds
+        self.stats = {
+            'embedding_hits': 0,
+            'embedding_misses': 0,
+            'result_hits': 0,
+            'result_misses': 0,
+            'invalidations': 0,
+            'errors': 0
+        }
+
+    # Level 1: query embeddings ---------------------------------------------
+
+    async def get_embedding(self, query: str) -> Optional[List[float]]:
+        try:
+            value = await self.backend.get(f"emb:{_digest(normalize_query(query))}")
+        except Exception as e:
+            self._error('embedding lookup', e)
+            return None
+
+        if value is None:
+            self.stats['embedding_misses'] += 1
+            return None
+        self.stats['embedding_hits'] += 1
+        return np.frombuffer(value, dtype=np.float32).tolist()
+
+    async def set_embedding(self, query: str, embedding: List[float]):
+        if not embedding:
+            return
+        try:
+            await self.backend.set(
+                f"emb:{_digest(normalize_query(query))}",
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                self.embedding_ttl_seconds
+            )
+        except Exception as e:
+            self._error('embedding store', e)
+
+    # Level 2: ranked results -----------------------------------------------
+
+    def result_key(self, generation: int, query: str, filters: Optional[Dict[str, Any]],
+                   min_relevance_score: float, max_results: int, use_vector_enhancement: bool) -> str:
+        spec = json.dumps({
+            'q': normalize_query(query),
+            'filters': filters or {},
+            'min_score': min_relevance_score,
+            'limit': max_results,
+            'vector': use_vector_enhancement
+        }, sort_keys=True, default=str)
+        return f"res:{generation}:{_digest(spec)}"
+
+    async def current_generation(self) -> Optional[int]:
+        """Generation to read and write rankings under (None when the backend is down)"""
+        try:
+            return await self.backend.generation()
+        except Exception as e:
+            self._error('generation lookup', e)
+            return None
+
+    async def get_results(self, generation: Optional[int], query: str, filters: Optional[Dict[str, Any]],
+                          min_relevance_score: float, max_results: int,
+                          use_vector_enhancement: bool) -> Optional[Dict[str, Any]]:
+        """Cached ranking ({'ranked': [...], 'metadata': {...}}) stored under a generation"""
+        if generation is None:
+            return None
+        try:
+            value = await self.backend.get(self.result_key(
+                generation, query, filters, min_relevance_score, max_results, use_vector_enhancement
+            ))
+        except Exception as e:
+            self._error('result lookup', e)
+            return None
+
+        if value is None:
+            self.stats['result_misses'] += 1
+            return None
+        self.stats['result_hits'] += 1
+        return json.loads(value)
+
+    async def set_results(self, generation: Optional[int], query: str, filters: Optional[Dict[str, Any]],
+                          min_relevance_score: float, max_results: int, use_vector_enhancement: bool,
+                          entry: Dict[str, Any]):
+        """
+        Store a ranking under the generation read before the search ran, so a
+        ranking computed across an invalidation is never served afterwards
+        """
+        if generation is None:
+            return
+        try:
+            await self.backend.set(
+                self.result_key(generation, query, filters, min_relevance_score, max_results, use_vector_enhancement),
+                json.dumps(entry, default=str).encode('utf-8'),
+                self.result_ttl_seconds
+            )
+        except Exception as e:
+            self._error('result store', e)
+
+    async def invalidate(self):
+        """Drop every cached ranking (called when opportunities are ingested or updated)"""
+        try:
+            await self.backend.bump_generation()
+            self.stats['invalidations'] += 1
+        except Exception as e:
+            self._error('invalidation', e)
+
+    def _error(self, operation: str, error: Exception):
+        self.stats['errors'] += 1
+        logger.warning(f"Search cache {operation} failed: {error}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        def ratio(hits: int, misses: int) -> float:
+            return hits / (hits + misses) if hits + misses else 0.0
+
+        return {
+            **self.stats,
+            'backend': type(self.backend).__name__,
+            'embedding_hit_ratio': ratio(self.stats['embedding_hits'], self.stats['embedding_misses']),
+            'result_hit_ratio': ratio(self.stats['result_hits'], self.stats['result_misses'])
+        }
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache:
+    """
+    Process-wide search cache: Redis when SEARCH_CACHE_REDIS_URL (or
+    REDIS_URL) is set, else an in-process LRU
+    """
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                backend = None
+                redis_url = os.getenv('SEARCH_CACHE_REDIS_URL') or os.getenv('REDIS_URL')
+                if redis_url and REDIS_AVAILABLE:
+                    try:
+                        backend = RedisSearchCacheBackend(redis.Redis.from_url(redis_url))
+                    except Exception as e:
+                        logger.warning(f"Redis search cache unavailable ({e}), using local cache")
+                _search_cache = SearchCache(
+                    backend or LocalSearchCacheBackend(),
+                    result_ttl_seconds=float(os.getenv('SEARCH_CACHE_RESULT_TTL', '60'))
+                )
+    return _search_cache
+
@@ -0,0 +1,248 @@
+"""
+Intelligent Search Filters - One Filter Spec, Two Renderings
+
+The quality and user filters for intelligent search (overall relevance,
+validation status, live deadline, amount range, deadline window, funding
+type) are rendered two ways:
+
+- ``quality_predicates`` returns SQLAlchemy predicates, which are applied
+  inside the text-search query itself.
+- ``vector_metadata_filter`` returns a Pinecone metadata filter, which is
+  applied by the vector store during the similarity search.
+
+Neither rendering materializes the set of qualifying ids, so search cost does
+not grow with the number of approved opportunities. Vectors must carry the
+fields produced by ``search_filter_metadata``. They are written at upsert
+time, refreshed in place when a row's ``SEARCH_FILTER_FIELDS`` change, and
+backfilled by ``scripts/reindex_search_metadata.py``. Checks that the
+vector store cannot express (geographic text match, minimum title and
+description length) are applied by SQL when vector hits are enriched.
+
+The text side of the search matches against the trigger-maintained
+``search_vector`` column (alembic 005) with ``text_search_query``, which ORs
+``websearch_to_tsquery`` over the en/fr/pt/ar configs so a query matches
+documents stemmed in any of those languages, and ranks with
+``text_search_rank``.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.funding import AfricaIntelligenceItem
+
+APPROVED_VALIDATION_STATUSES = ('approved', 'auto_approved')
+
+# africa_intelligence_feed columns that search_filter_metadata is derived from
+SEARCH_FILTER_FIELDS = frozenset({
+    'overall_relevance_score', 'relevance_score', 'validation_status', 'deadline',
+    'amount_exact', 'amount_min', 'amount_max', 'funding_type_id'
+})
+
+# detected_language codes with a text search config (see intelligence_search_config)
+SEARCH_LANGUAGES = ('en', 'fr', 'pt', 'ar')
+
+# ts_rank_cd normalization: rank / (rank + 1), keeping ranks within 0..1
+RANK_NORMALIZATION = 32
+
+
+def _epoch(value: Any) -> Optional[int]:
+    """Epoch seconds of a date, datetime or ISO string (None if unparseable)"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day).timestamp())
+    return None
+
+
+def _as_date(value: Any) -> Optional[date]:
+    """Date part of a date, datetime or ISO string (deadline is a DATE column)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+# Upper and lower end of the amount an opportunity offers; exact amounts win
+# over ranges, and a one-sided range stands in for the missing end
+AMOUNT_HIGH = func.coalesce(
+    AfricaIntelligenceItem.amount_exact, AfricaIntelligenceItem.amount_max, AfricaIntelligenceItem.amount_min
+)
+AMOUNT_LOW = func.coalesce(
+    AfricaIntelligenceItem.amount_exact, AfricaIntelligenceItem.amount_min, AfricaIntelligenceItem.amount_max
+)
+
+# Eligibility criteria have no column of their own; they live in raw_data.
+# Built on the table column so it can sit in a Core select list.
+ELIGIBILITY_CRITERIA = AfricaIntelligenceItem.__table__.c.raw_data['eligibility_criteria'].astext
+
+
+def quality_predicates(filters: Optional[Dict[str, Any]], min_relevance_score: float,
+                       today: Optional[date] = None) -> List[Any]:
+    """SQL predicates for the quality criteria and user filters"""
+    predicates = [
+        # Use our new relevance scoring system
+        AfricaIntelligenceItem.overall_relevance_score >= min_relevance_score,
+
+        # Only validated/approved content
+        AfricaIntelligenceItem.validation_status.in_(APPROVED_VALIDATION_STATUSES),
+
+        # Active opportunities (not expired)
+        or_(
+            AfricaIntelligenceItem.deadline.is_(None),
+            AfricaIntelligenceItem.deadline >= (today or date.today())
+        ),
+
+        # Must have essential fields
+        AfricaIntelligenceItem.title.isnot(None),
+        AfricaIntelligenceItem.description.isnot(None),
+        func.length(AfricaIntelligenceItem.title) >= 10,
+        func.length(AfricaIntelligenceItem.description) >= 50
+    ]
+
+    if filters:
+        if filters.get('min_amount'):
+            predicates.append(AMOUNT_HIGH >= filters['min_amount'])
+
+        if filters.get('max_amount'):
+            predicates.append(AMOUNT_LOW <= filters['max_amount'])
+
+        if filters.get('deadline_after'):
+            predicates.append(AfricaIntelligenceItem.deadline >= _as_date(filters['deadline_after']))
+
+        if filters.get('deadline_before'):
+            predicates.append(AfricaIntelligenceItem.deadline <= _as_date(filters['deadline_before']))
+
+        if filters.get('funding_type'):
+            predicates.append(AfricaIntelligenceItem.funding_type_id == filters['funding_type'])
+
+        if filters.get('geographic_focus'):
+            # Search in description or eligibility criteria for geographic terms
+            geo_term = f"%{filters['geographic_focus']}%"
+            predicates.append(or_(
+                AfricaIntelligenceItem.description.ilike(geo_term),
+                ELIGIBILITY_CRITERIA.ilike(geo_term)
+            ))
+
+    return predicates
+
+
+def vector_metadata_filter(filters: Optional[Dict[str, Any]], min_relevance_score: float,
+                           now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Pinecone metadata filter for the same criteria
+
+    A missing metadata field fails every comparison, just as NULL does in
+    SQL, so open-ended deadlines are matched through ``has_deadline``.
+    """
+    today_ts = _epoch((now or datetime.now()).date())
+    clauses: List[Dict[str, Any]] = [
+        {'relevance_score': {'$gte': min_relevance_score}},
+        {'validation_status': {'$in': list(APPROVED_VALIDATION_STATUSES)}},
+        {'$or': [{'has_deadline': {'$eq': False}}, {'deadline_ts': {'$gte': today_ts}}]},
+    ]
+
+    if filters:
+        if filters.get('min_amount'):
+            clauses.append({'amount_high': {'$gte': float(filters['min_amount'])}})
+        if filters.get('max_amount'):
+            clauses.append({'amount_low': {'$lte': float(filters['max_amount'])}})
+        if filters.get('deadline_after') or filters.get('deadline_before'):
+            # deadline_ts is left behind when a deadline is cleared in place
+            clauses.append({'has_deadline': {'$eq': True}})
+        if filters.get('deadline_after'):
+            clauses.append({'deadline_ts': {'$gte': _epoch(_as_date(filters['deadline_after']))}})
+        if filters.get('deadline_before'):
+            clauses.append({'deadline_ts': {'$lte': _epoch(_as_date(filters['deadline_before']))}})
+        if filters.get('funding_type'):
+            clauses.append({'funding_type_id': {'$eq': int(filters['funding_type'])}})
+
+    return {'$and': clauses}
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def search_filter_metadata(opportunity: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Vector metadata that vector_metadata_filter matches on
+
+    Accepts an africa_intelligence_feed row (or the dict indexed from one).
+    Values that are unknown are left out, because Pinecone cannot store nulls.
+    """
+    metadata: Dict[str, Any] = {}
+
+    try:
+        metadata['opportunity_id'] = int(opportunity['id'])
+    except (KeyError, TypeError, ValueError):
+        pass
+
+    relevance = _float(opportunity.get('overall_relevance_score', opportunity.get('relevance_score')))
+    if relevance is not None:
+        metadata['relevance_score'] = relevance
+    if opportunity.get('validation_status'):
+        metadata['validation_status'] = opportunity['validation_status']
+
+    deadline_ts = _epoch(opportunity.get('deadline') or opportunity.get('application_deadline'))
+    metadata['has_deadline'] = deadline_ts is not None
+    if deadline_ts is not None:
+        metadata['deadline_ts'] = deadline_ts
+
+    exact, low, high = (_float(opportunity.get(key)) for key in ('amount_exact', 'amount_min', 'amount_max'))
+    amount_high = next((v for v in (exact, high, low) if v is not None), None)
+    amount_low = next((v for v in (exact, low, high) if v is not None), None)
+    if amount_high is not None:
+        metadata['amount_high'] = amount_high
+    if amount_low is not None:
+        metadata['amount_low'] = amount_low
+
+    if opportunity.get('funding_type_id') is not None:
+        metadata['funding_type_id'] = int(opportunity['funding_type_id'])
+
+    return metadata
+
+
+def search_filter_fields_changed(updates: Dict[str, Any]) -> bool:
+    """Whether a row update changes the vector metadata the search filters on"""
+    return not SEARCH_FILTER_FIELDS.isdisjoint(updates)
+
+
+def search_filter_fields_cleared(updates: Dict[str, Any]) -> bool:
+    """
+    Whether a row update nulls a field that search_filter_metadata would then
+    omit. Metadata updates only merge keys, so such rows must be re-upserted.
+    """
+    return any(updates[key] is None for key in SEARCH_FILTER_FIELDS.intersection(updates) if key != 'deadline')
+
+
+def text_search_query(query: str, languages: Sequence[str] = SEARCH_LANGUAGES) -> ColumnElement:
+    """tsquery matching the web-style query in any of the search languages"""
+    tsquery = None
+    for language in languages:
+        part = func.websearch_to_tsquery(func.intelligence_search_config(language), query)
+        tsquery = part if tsquery is None else tsquery.op('||')(part)
+    return tsquery
+
+
+def text_search_predicate(tsquery: ColumnElement) -> ColumnElement:
+    """Index-served match of search_vector against a tsquery"""
+    return AfricaIntelligenceItem.__table__.c.search_vector.op('@@')(tsquery)
+
+
+def text_search_rank(tsquery: ColumnElement) -> ColumnElement:
+    """Cover-density rank of search_vector for a tsquery, in 0..1"""
+    return func.ts_rank_cd(AfricaIntelligenceItem.__table__.c.search_vector, tsquery, RANK_NORMALIZATION)
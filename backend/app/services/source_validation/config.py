@@ -124,6 +124,12 @@ class DeduplicationSettings:
     enable_semantic_similarity: bool = True
     embedding_model: str = "all-MiniLM-L6-v2"
     
+    # In-memory embedding index (bounded by time window and item cap)
+    semantic_index_window_days: int = 90
+    semantic_index_max_items: int = 200000
+    semantic_index_backend: str = "exact"  # exact, hnsw (requires hnswlib)
+    semantic_index_top_k: int = 5
+    
     # Metadata comparison settings
     amount_tolerance_percent: float = 0.1  # 10% tolerance
     deadline_tolerance_days: int = 7
@@ -312,6 +318,20 @@ class SourceValidationConfig:
             self._monitoring_settings.user_agent
         )
         
+        # Deduplication settings
+        self._deduplication_settings.semantic_index_window_days = int(
+            os.getenv('SV_SEMANTIC_INDEX_WINDOW_DAYS', 
+                     self._deduplication_settings.semantic_index_window_days)
+        )
+        self._deduplication_settings.semantic_index_max_items = int(
+            os.getenv('SV_SEMANTIC_INDEX_MAX_ITEMS', 
+                     self._deduplication_settings.semantic_index_max_items)
+        )
+        self._deduplication_settings.semantic_index_backend = os.getenv(
+            'SV_SEMANTIC_INDEX_BACKEND', 
+            self._deduplication_settings.semantic_index_backend
+        )
+        
         # Notification settings
         self._notification_settings.smtp_server = os.getenv('SV_SMTP_SERVER', '')
         self._notification_settings.smtp_username = os.getenv('SV_SMTP_USERNAME', '')
@@ -12,14 +12,21 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+from urllib.parse import urlparse
 
 import asyncpg
 from fuzzywuzzy import fuzz
-from sentence_transformers import SentenceTransformer
 
 from app.core.database import get_database
-from app.utils.url_utils import normalize_url
+from app.core.embedding_service import get_embedding_service
+from app.utils.url_utils import normalize_url, urls_same_domain
+
+from .config import get_config
+from .embedding_index import EmbeddingIndex
+from .url_index import URLPathTrie, split_url
+
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -49,41 +56,18 @@ class DuplicateMatch:
 class URLNormalizer:
     """Normalizes URLs for consistent comparison"""
     
-    def __init__(self):
-        self.params_to_remove = {
-            'utm_source', 'utm_medium', 'utm_campaign', 'utm_content', 'utm_term',
-            'fbclid', 'gclid', 'ref', 'source', 'campaign_id', '_ga', 'mc_cid'
-        }
-    
     def normalize(self, url: str) -> str:
-        """Normalize URL by removing tracking parameters and standardizing format"""
-        try:
-            parsed = urlparse(url.lower().strip())
-            
-            # Remove tracking parameters
-            query_params = parse_qs(parsed.query)
-            cleaned_params = {
-                k: v for k, v in query_params.items() 
-                if k not in self.params_to_remove
-            }
-            
-            # Rebuild query string
-            cleaned_query = urlencode(cleaned_params, doseq=True) if cleaned_params else ''
-            
-            # Remove fragment and rebuild URL
-            normalized = urlunparse((
-                parsed.scheme or 'https',
-                parsed.netloc,
-                parsed.path.rstrip('/') if parsed.path != '/' else '/',
-                parsed.params,
-                cleaned_query,
-                ''  # Remove fragment
-            ))
-            
-            return normalized
-            
-        except Exception:
-            return url.lower().strip()
+        """Normalize URL by removing tracking parameters and standardizing format
+        
+        Delegates to ``url_utils.normalize_url`` so the value matches the
+        ``normalized_url`` column and the in-memory URL index.
+        """
+        return normalize_url(url)
+    
+    def columns(self, url: str) -> Tuple[str, str, str]:
+        """(normalized_url, url_host, url_path) as stored on africa_intelligence_feed"""
+        normalized = self.normalize(url)
+        return normalized, split_url(normalized)[0], urlparse(normalized).path or '/'
 
 
 class ContentHasher:
@@ -104,9 +88,15 @@ class ContentHasher:
 class URLDeduplicator:
     """Handles URL-based deduplication"""
     
-    def __init__(self):
+    def __init__(self, similarity_threshold: float = 0.8, max_candidates: int = 200):
         self.url_normalizer = URLNormalizer()
         self.logger = logging.getLogger(__name__)
+        self.similarity_threshold = similarity_threshold
+        self.max_candidates = max_candidates
+        
+        # Process-local host -> path trie, loaded from the table on first use
+        self.url_index = URLPathTrie()
+        self._index_lock = asyncio.Lock()
     
     async def check_url_duplicate(self, opportunity_url: str) -> DuplicateMatch:
         """Check for URL-based duplicates"""
@@ -115,52 +105,51 @@ class URLDeduplicator:
             normalized_url = self.url_normalizer.normalize(opportunity_url)
             
             db = await get_database()
+            await self._ensure_index_loaded(db)
+            
+            # Exact match: in-memory first, then the unique normalized_url index
+            # for rows inserted by other processes since the index was loaded
+            existing_id = self.url_index.get(normalized_url)
+            if existing_id is not None:
+                return self._exact_match(existing_id, normalized_url)
             
-            # Check for exact URL match
             exact_match = await db.fetch_one(
                 """
                 SELECT id, url FROM africa_intelligence_feed 
-                WHERE url = $1 OR url = $2
+                WHERE normalized_url = $1 OR url = $2
+                LIMIT 1
                 """,
-                opportunity_url, normalized_url
+                normalized_url, opportunity_url
             )
             
             if exact_match:
-                return DuplicateMatch(
-                    is_duplicate=True,
-                    match_type="exact_url",
-                    existing_opportunity_id=exact_match["id"],
-                    existing_url=exact_match["url"],
-                    reason="Exact URL match found"
-                )
+                self.url_index.add(exact_match["id"], normalized_url)
+                return self._exact_match(exact_match["id"], exact_match["url"])
             
-            # Check for similar URLs (same domain + similar path)
-            parsed_url = urlparse(normalized_url)
-            domain = parsed_url.netloc
-            path_parts = [part for part in parsed_url.path.split('/') if part]
+            # Check for similar URLs (same host + shared path prefix)
+            path_parts = [part for part in urlparse(normalized_url).path.split('/') if part]
             
             if len(path_parts) >= 2:
-                # Look for URLs with same domain and similar path structure
-                similar_urls = await db.fetch_all(
-                    """
-                    SELECT id, url FROM africa_intelligence_feed 
-                    WHERE url ILIKE $1 AND url != $2
-                    LIMIT 10
-                    """,
-                    f"%{domain}%", normalized_url
-                )
+                if self.url_index.loaded:
+                    candidates = self.url_index.candidates(normalized_url, self.max_candidates)
+                else:
+                    candidates = await self._fetch_prefix_candidates(db, normalized_url)
+                
+                best_id, best_url, best_similarity = None, None, 0.0
+                for candidate_id, candidate_url in candidates:
+                    similarity = self._calculate_url_similarity(normalized_url, candidate_url)
+                    if similarity > best_similarity:
+                        best_id, best_url, best_similarity = candidate_id, candidate_url, similarity
                 
-                for similar in similar_urls:
-                    similarity = self._calculate_url_similarity(normalized_url, similar["url"])
-                    if similarity > 0.8:
-                        return DuplicateMatch(
-                            is_duplicate=True,
-                            match_type="similar_url",
-                            similarity_score=similarity,
-                            existing_opportunity_id=similar["id"],
-                            existing_url=similar["url"],
-                            reason=f"Similar URL found (similarity: {similarity:.2f})"
-                        )
+                if best_similarity > self.similarity_threshold:
+                    return DuplicateMatch(
+                        is_duplicate=True,
+                        match_type="similar_url",
+                        similarity_score=best_similarity,
+                        existing_opportunity_id=best_id,
+                        existing_url=best_url,
+                        reason=f"Similar URL found (similarity: {best_similarity:.2f})"
+                    )
             
             return DuplicateMatch(is_duplicate=False, match_type="no_url_match")
             
@@ -168,18 +157,102 @@ class URLDeduplicator:
             self.logger.error(f"Error in URL deduplication: {e}")
             return DuplicateMatch(is_duplicate=False, match_type="error", reason=str(e))
     
+    def _exact_match(self, existing_id: int, existing_url: str) -> DuplicateMatch:
+        return DuplicateMatch(
+            is_duplicate=True,
+            match_type="exact_url",
+            existing_opportunity_id=existing_id,
+            existing_url=existing_url,
+            reason="Exact URL match found"
+        )
+    
+    async def _fetch_prefix_candidates(self, db, normalized_url: str) -> List[Tuple[int, str]]:
+        """Database fallback: same host and first path segment, ranked by trigram similarity"""
+        _, host, path = self.url_normalizer.columns(normalized_url)
+        first_segment = '/' + path.strip('/').split('/')[0]
+        rows = await db.fetch_all(
+            """
+            SELECT id, normalized_url FROM africa_intelligence_feed
+            WHERE url_host = $1 AND url_path LIKE $2 AND normalized_url != $3
+            ORDER BY similarity(url_path, $4) DESC
+            LIMIT $5
+            """,
+            host, first_segment + '%', normalized_url, path, self.max_candidates
+        )
+        return [(row["id"], row["normalized_url"]) for row in rows]
+    
+    async def register_opportunity(self, opportunity_id: int, opportunity_url: str) -> bool:
+        """Add a newly inserted opportunity's URL to the index and its normalized columns"""
+        try:
+            self.url_index.add(opportunity_id, self.url_normalizer.normalize(opportunity_url))
+            await self.store_url_columns([(opportunity_id, opportunity_url)])
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error registering URL for opportunity {opportunity_id}: {e}")
+            return False
+    
+    async def store_url_columns(self, opportunities: List[Tuple[int, str]]) -> None:
+        """
+        Write normalized_url / url_host / url_path for freshly inserted rows in
+        one statement
+        
+        A row whose normalized URL already belongs to another row (or to an
+        earlier row of the same batch) keeps NULL columns, like the duplicates
+        set aside by scripts/backfill_normalized_urls.py, so the statement
+        never trips the unique index.
+        """
+        if not opportunities:
+            return
+        
+        ids, urls, hosts, paths = [], [], [], []
+        for opportunity_id, opportunity_url in opportunities:
+            if not opportunity_url:
+                continue
+            normalized_url, host, path = self.url_normalizer.columns(opportunity_url)
+            ids.append(opportunity_id)
+            urls.append(normalized_url)
+            hosts.append(host)
+            paths.append(path)
+        if not ids:
+            return
+        
+        db = await get_database()
+        await db.execute(
+            """
+            UPDATE africa_intelligence_feed f
+            SET normalized_url = v.normalized_url, url_host = v.url_host, url_path = v.url_path
+            FROM (
+                SELECT DISTINCT ON (normalized_url) *
+                FROM unnest($1::int[], $2::text[], $3::text[], $4::text[])
+                    AS t(id, normalized_url, url_host, url_path)
+                ORDER BY normalized_url, id
+            ) v
+            WHERE f.id = v.id AND f.normalized_url IS NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM africa_intelligence_feed e WHERE e.normalized_url = v.normalized_url
+            )
+            """,
+            ids, urls, hosts, paths
+        )
+    
+    async def _ensure_index_loaded(self, db):
+        """Load every URL from the database once per process"""
+        if self.url_index.loaded:
+            return
+        
+        async with self._index_lock:
+            if not self.url_index.loaded:
+                await self.url_index.load_from_database(db)
+    
     def _calculate_url_similarity(self, url1: str, url2: str) -> float:
         """Calculate similarity between two URLs"""
-        parsed1 = urlparse(url1)
-        parsed2 = urlparse(url2)
-        
-        # Domain must match
-        if parsed1.netloc != parsed2.netloc:
+        # Host must match (ignoring www)
+        if not urls_same_domain(url1, url2):
             return 0.0
         
-        # Calculate path similarity
-        path1_parts = [part for part in parsed1.path.split('/') if part]
-        path2_parts = [part for part in parsed2.path.split('/') if part]
+        path1_parts = [part for part in urlparse(url1).path.split('/') if part]
+        path2_parts = [part for part in urlparse(url2).path.split('/') if part]
         
         if not path1_parts and not path2_parts:
             return 1.0
@@ -199,12 +272,20 @@ class ContentDeduplicator:
     def __init__(self):
         self.content_hasher = ContentHasher()
         self.logger = logging.getLogger(__name__)
-        # Initialize sentence transformer for semantic similarity
-        try:
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            self.logger.warning(f"Could not load sentence transformer: {e}")
-            self.embedding_model = None
+        self.settings = get_config().deduplication_settings
+        # Shared, lazily loaded sentence transformer (one model per process)
+        self.embedding_model = (
+            get_embedding_service(self.settings.embedding_model)
+            if self.settings.enable_semantic_similarity else None
+        )
+        
+        # Process-local embedding index, loaded from the table on first use
+        self.embedding_index = EmbeddingIndex(
+            window_days=self.settings.semantic_index_window_days,
+            max_items=self.settings.semantic_index_max_items,
+            backend=self.settings.semantic_index_backend
+        )
+        self._index_lock = asyncio.Lock()
     
     async def check_content_duplicate(self, opportunity: OpportunityContent) -> DuplicateMatch:
         """Check for content-based duplicates using hash and semantic similarity"""
@@ -237,7 +318,7 @@ class ContentDeduplicator:
                 )
             
             # Semantic similarity check if model is available
-            if self.embedding_model:
+            if self.embedding_model and self.embedding_model.available:
                 semantic_match = await self._check_semantic_similarity(opportunity)
                 if semantic_match.is_duplicate:
                     return semantic_match
@@ -250,71 +331,80 @@ class ContentDeduplicator:
     
     async def _check_semantic_similarity(self, opportunity: OpportunityContent) -> DuplicateMatch:
         """Check for semantically similar content"""
+        results = await self.check_semantic_duplicates_batch([opportunity])
+        return results[0]
+    
+    async def check_semantic_duplicates_batch(self, opportunities: List[OpportunityContent]) -> List[DuplicateMatch]:
+        """Check a batch of opportunities against the embedding index in one matrix multiply"""
         try:
-            # Create embedding for the new opportunity
-            content_text = f"{opportunity.title} {opportunity.description}"
-            new_embedding = self.embedding_model.encode([content_text])[0]
+            if not opportunities:
+                return []
+            if not (self.embedding_model and self.embedding_model.available):
+                return [DuplicateMatch(is_duplicate=False, match_type="no_semantic_match") for _ in opportunities]
             
-            db = await get_database()
+            await self._ensure_index_loaded()
             
-            # Get recent opportunities from same organization for comparison
-            recent_opportunities = await db.fetch_all(
-                """
-                SELECT id, title, description, url, embedding
-                FROM africa_intelligence_feed 
-                WHERE organization_name ILIKE $1 
-                AND created_at > $2
-                AND embedding IS NOT NULL
-                ORDER BY created_at DESC
-                LIMIT 20
-                """,
-                f"%{opportunity.organization}%",
-                datetime.now() - timedelta(days=90)
+            content_texts = [f"{opportunity.title} {opportunity.description}" for opportunity in opportunities]
+            new_embeddings = await self.embedding_model.encode_async(content_texts)
+            
+            hits = self.embedding_index.search(
+                new_embeddings,
+                top_k=self.settings.semantic_index_top_k,
+                min_similarity=self.settings.semantic_similarity_threshold
             )
             
-            for opp in recent_opportunities:
-                if opp["embedding"]:
-                    # Calculate cosine similarity
-                    existing_embedding = opp["embedding"]
-                    similarity = self._cosine_similarity(new_embedding, existing_embedding)
-                    
-                    if similarity > 0.9:  # High similarity threshold
-                        return DuplicateMatch(
-                            is_duplicate=True,
-                            match_type="semantic_similarity",
-                            similarity_score=similarity,
-                            existing_opportunity_id=opp["id"],
-                            existing_url=opp["url"],
-                            reason=f"High semantic similarity (score: {similarity:.3f})"
-                        )
-            
-            return DuplicateMatch(is_duplicate=False, match_type="no_semantic_match")
+            results = []
+            for row_hits in hits:
+                if row_hits:
+                    best = row_hits[0]
+                    results.append(DuplicateMatch(
+                        is_duplicate=True,
+                        match_type="semantic_similarity",
+                        similarity_score=best.similarity,
+                        existing_opportunity_id=best.opportunity_id,
+                        existing_url=best.url,
+                        reason=f"High semantic similarity (score: {best.similarity:.3f})"
+                    ))
+                else:
+                    results.append(DuplicateMatch(is_duplicate=False, match_type="no_semantic_match"))
+            
+            return results
             
         except Exception as e:
             self.logger.error(f"Error in semantic similarity check: {e}")
-            return DuplicateMatch(is_duplicate=False, match_type="error", reason=str(e))
+            return [DuplicateMatch(is_duplicate=False, match_type="error", reason=str(e)) for _ in opportunities]
     
-    def _cosine_similarity(self, vec1, vec2) -> float:
-        """Calculate cosine similarity between two vectors"""
-        import numpy as np
+    async def register_opportunity(self, opportunity_id: int, opportunity: OpportunityContent,
+                                   created_at: Optional[datetime] = None,
+                                   embedding: Optional[List[float]] = None) -> Optional[List[float]]:
+        """Add a newly inserted opportunity to the embedding index
         
-        # Convert to numpy arrays if needed
-        if not isinstance(vec1, np.ndarray):
-            vec1 = np.array(vec1)
-        if not isinstance(vec2, np.ndarray):
-            vec2 = np.array(vec2)
-        
-        # Calculate cosine similarity
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Returns the embedding so callers can persist it alongside the row.
+        """
+        try:
+            if embedding is None:
+                if not (self.embedding_model and self.embedding_model.available):
+                    return None
+                embedding = (await self.embedding_model.encode_async([f"{opportunity.title} {opportunity.description}"]))[0]
+            
+            self.embedding_index.add(opportunity_id, embedding, url=opportunity.url, created_at=created_at)
+            return [float(value) for value in embedding]
+            
+        except Exception as e:
+            self.logger.error(f"Error registering opportunity {opportunity_id} in embedding index: {e}")
+            return None
+    
+    async def _ensure_index_loaded(self):
+        """Load the embedding window from the database once per process, then evict expired rows"""
+        if self.embedding_index.loaded:
+            self.embedding_index.evict_expired()
+            return
         
-        return dot_product / (norm1 * norm2)
-
-
+        async with self._index_lock:
+            if not self.embedding_index.loaded:
+                db = await get_database()
+                await self.embedding_index.load_from_database(db)
+    
 class MetadataDeduplicator:
     """Handles metadata-based deduplication (organization + amount + deadline)"""
     
@@ -482,6 +572,15 @@ class DeduplicationPipeline:
                 "checked_at": datetime.now().isoformat()
             }
     
+    async def register_opportunity(self, opportunity_id: int, opportunity: OpportunityContent,
+                                   created_at: Optional[datetime] = None,
+                                   embedding: Optional[List[float]] = None) -> Optional[List[float]]:
+        """Make a newly inserted opportunity visible to subsequent URL and semantic checks"""
+        await self.url_dedup.register_opportunity(opportunity_id, opportunity.url)
+        return await self.content_dedup.register_opportunity(
+            opportunity_id, opportunity, created_at=created_at, embedding=embedding
+        )
+    
     def _duplicate_match_to_dict(self, match: DuplicateMatch) -> Dict[str, Any]:
         """Convert DuplicateMatch object to dictionary"""
         return {
@@ -591,6 +690,80 @@ class DeduplicationPipeline:
             return {"error": str(e)}
 
 
+# Global pipeline instance
+_pipeline_instance: Optional[DeduplicationPipeline] = None
+
+
+def get_deduplication_pipeline() -> DeduplicationPipeline:
+    """
+    Process-wide deduplication pipeline, so the URL trie and the embedding
+    index are loaded once per process and then kept current by
+    register_inserted_opportunities
+    """
+    global _pipeline_instance
+    if _pipeline_instance is None:
+        _pipeline_instance = DeduplicationPipeline()
+    return _pipeline_instance
+
+
+def _row_created_at(row: Dict[str, Any]) -> Optional[datetime]:
+    value = row.get('created_at') or row.get('discovered_date')
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return value
+
+
+def _content_from_row(row: Dict[str, Any]) -> OpportunityContent:
+    return OpportunityContent(
+        url=row.get('url') or row.get('source_url') or '',
+        title=row.get('title') or '',
+        description=row.get('description') or '',
+        organization=row.get('organization_name') or row.get('organization') or ''
+    )
+
+
+async def register_inserted_opportunities(rows: List[Dict[str, Any]]) -> int:
+    """
+    Record rows just written to africa_intelligence_feed for URL and
+    semantic duplicate detection
+
+    Called by every insert path with the rows as returned by the database.
+    The normalized URL columns are always written, so the database-side
+    checks see the rows from any process. The process-wide pipeline's
+    in-memory indexes are updated only if the pipeline exists, because its
+    first use loads the table anyway.
+    """
+    pipeline = _pipeline_instance
+    opportunities = [
+        (row['id'], _content_from_row(row))
+        for row in rows
+        if row.get('id') is not None
+    ]
+    opportunities = [(opportunity_id, content) for opportunity_id, content in opportunities if content.url]
+    if not opportunities:
+        return 0
+
+    url_dedup = pipeline.url_dedup if pipeline is not None else URLDeduplicator()
+    try:
+        await url_dedup.store_url_columns([(opportunity_id, content.url) for opportunity_id, content in opportunities])
+    except Exception as e:
+        logger.error(f"Error writing normalized URL columns for {len(opportunities)} opportunities: {e}")
+
+    if pipeline is None:
+        return len(opportunities)
+
+    by_id = {row.get('id'): row for row in rows}
+    for opportunity_id, content in opportunities:
+        pipeline.url_dedup.url_index.add(opportunity_id, pipeline.url_dedup.url_normalizer.normalize(content.url))
+        await pipeline.content_dedup.register_opportunity(
+            opportunity_id, content, created_at=_row_created_at(by_id[opportunity_id])
+        )
+    return len(opportunities)
+
+
 async def test_deduplication_pipeline():
     """Test function for the deduplication pipeline"""
     # Create test opportunity
@@ -0,0 +1,274 @@
+"""
+In-Memory Embedding Index
+
+Process-local nearest-neighbour index over opportunity embeddings used by the
+content deduplicator. Embeddings are stored L2-normalised in a float32 matrix,
+so cosine similarity for a batch of queries is a single matrix multiply
+followed by a top-k selection. An HNSW graph (hnswlib) can be enabled for large
+windows; without it the exact matrix search is used.
+
+Memory is bounded by a time window: entries older than ``window_days`` are
+evicted, and the index is capped at ``max_items`` entries (oldest first).
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    hnswlib = None
+    HNSWLIB_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class EmbeddingHit:
+    """Nearest-neighbour result"""
+    opportunity_id: Any
+    similarity: float
+    url: Optional[str] = None
+
+
+class EmbeddingIndex:
+    """Normalised float32 embedding matrix with optional HNSW acceleration"""
+
+    def __init__(self, window_days: int = 90, max_items: int = 200000,
+                 backend: str = "exact", hnsw_m: int = 16, hnsw_ef: int = 64):
+        self.window_days = window_days
+        self.max_items = max_items
+        self.backend = backend
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef = hnsw_ef
+
+        if backend == "hnsw" and not HNSWLIB_AVAILABLE:
+            logger.warning("hnswlib not installed, falling back to exact embedding search")
+            self.backend = "exact"
+
+        self.dimension: Optional[int] = None
+        self._vectors: Optional[np.ndarray] = None
+        self._timestamps = np.zeros(0, dtype=np.float64)
+        self._active = np.zeros(0, dtype=bool)
+        self._ids: List[Any] = []
+        self._urls: List[Optional[str]] = []
+        self._positions: Dict[Any, int] = {}
+        self._size = 0
+        self._hnsw = None
+
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, opportunity_id: Any) -> bool:
+        return opportunity_id in self._positions
+
+    async def load_from_database(self, db) -> int:
+        """Load embeddings created inside the time window from africa_intelligence_feed"""
+        rows = await db.fetch_all(
+            """
+            SELECT id, url, embedding, created_at
+            FROM africa_intelligence_feed
+            WHERE embedding IS NOT NULL
+            AND created_at > $1
+            ORDER BY created_at DESC
+            LIMIT $2
+            """,
+            datetime.now() - timedelta(days=self.window_days),
+            self.max_items
+        )
+
+        # Oldest first so eviction order matches insertion order
+        loaded = 0
+        for row in reversed(rows):
+            if self.add(row["id"], row["embedding"], url=row["url"], created_at=row["created_at"]):
+                loaded += 1
+
+        self.loaded = True
+        logger.info(f"Embedding index loaded {loaded} embeddings ({self.window_days}-day window)")
+        return loaded
+
+    def add(self, opportunity_id: Any, embedding: Sequence[float], url: Optional[str] = None,
+            created_at: Optional[datetime] = None) -> bool:
+        """Add or replace one embedding; returns False if it cannot be indexed"""
+        if embedding is None:
+            return False
+
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if self.dimension is None:
+            self.dimension = vector.shape[0]
+        if vector.shape[0] != self.dimension:
+            logger.warning(f"Skipping embedding for {opportunity_id}: dimension {vector.shape[0]} != {self.dimension}")
+            return False
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return False
+        vector = vector / norm
+
+        timestamp = (created_at or datetime.now()).timestamp()
+        if timestamp < time.time() - self.window_days * 86400:
+            return False
+
+        if opportunity_id in self._positions:
+            self._deactivate(self._positions.pop(opportunity_id))
+
+        position = self._append(vector, timestamp)
+        self._ids.append(opportunity_id)
+        self._urls.append(url)
+        self._positions[opportunity_id] = position
+
+        if len(self._positions) > self.max_items:
+            self._evict_oldest(len(self._positions) - self.max_items)
+        return True
+
+    def search(self, queries: np.ndarray, top_k: int = 5,
+               min_similarity: float = 0.0) -> List[List[EmbeddingHit]]:
+        """Top-k most similar indexed embeddings for each query row"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not self._positions:
+            return [[] for _ in range(queries.shape[0])]
+
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        queries = queries / norms
+
+        if self._hnsw is not None:
+            return self._search_hnsw(queries, top_k, min_similarity)
+
+        similarities = queries @ self._vectors[:self._size].T
+        similarities[:, ~self._active[:self._size]] = -np.inf
+
+        k = min(top_k, len(self._positions))
+        results = []
+        for row in similarities:
+            best = np.argpartition(-row, k - 1)[:k]
+            best = best[np.argsort(-row[best])]
+            results.append([
+                EmbeddingHit(self._ids[position], float(row[position]), self._urls[position])
+                for position in best
+                if row[position] >= min_similarity
+            ])
+        return results
+
+    def evict_expired(self) -> int:
+        """Drop entries older than the time window and compact storage"""
+        if self._size == 0:
+            return 0
+
+        cutoff = time.time() - self.window_days * 86400
+        expired = np.flatnonzero(self._active[:self._size] & (self._timestamps[:self._size] < cutoff))
+        for position in expired:
+            self._positions.pop(self._ids[position], None)
+            self._deactivate(position)
+
+        if len(expired) and self._size > 2 * max(len(self._positions), 1):
+            self._compact()
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Size and memory footprint of the index"""
+        return {
+            "items": len(self._positions),
+            "capacity": 0 if self._vectors is None else self._vectors.shape[0],
+            "dimension": self.dimension,
+            "backend": self.backend,
+            "window_days": self.window_days,
+            "memory_bytes": 0 if self._vectors is None else int(self._vectors.nbytes)
+        }
+
+    def _append(self, vector: np.ndarray, timestamp: float) -> int:
+        if self._vectors is None:
+            capacity = 1024
+            self._vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+            self._timestamps = np.zeros(capacity, dtype=np.float64)
+            self._active = np.zeros(capacity, dtype=bool)
+            if self.backend == "hnsw":
+                self._init_hnsw(capacity)
+        elif self._size >= self._vectors.shape[0]:
+            if self._size > 2 * len(self._positions):
+                self._compact()
+            if self._size >= self._vectors.shape[0]:
+                self._grow(2 * self._vectors.shape[0])
+
+        position = self._size
+        self._vectors[position] = vector
+        self._timestamps[position] = timestamp
+        self._active[position] = True
+        self._size += 1
+
+        if self._hnsw is not None:
+            self._hnsw.add_items(vector.reshape(1, -1), np.array([position]))
+        return position
+
+    def _grow(self, capacity: int):
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        self._timestamps = np.resize(self._timestamps, capacity)
+        active = np.zeros(capacity, dtype=bool)
+        active[:self._size] = self._active[:self._size]
+        self._active = active
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _compact(self):
+        """Rewrite storage without inactive rows"""
+        keep = np.flatnonzero(self._active[:self._size])
+        capacity = max(1024, self._vectors.shape[0])
+
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:len(keep)] = self._vectors[keep]
+        timestamps = np.zeros(capacity, dtype=np.float64)
+        timestamps[:len(keep)] = self._timestamps[keep]
+        active = np.zeros(capacity, dtype=bool)
+        active[:len(keep)] = True
+
+        self._ids = [self._ids[position] for position in keep]
+        self._urls = [self._urls[position] for position in keep]
+        self._positions = {opportunity_id: position for position, opportunity_id in enumerate(self._ids)}
+        self._vectors, self._timestamps, self._active = vectors, timestamps, active
+        self._size = len(keep)
+
+        if self.backend == "hnsw":
+            self._init_hnsw(capacity)
+            if self._size:
+                self._hnsw.add_items(self._vectors[:self._size], np.arange(self._size))
+
+    def _deactivate(self, position: int):
+        self._active[position] = False
+        if self._hnsw is not None:
+            self._hnsw.mark_deleted(position)
+
+    def _evict_oldest(self, count: int):
+        active_positions = np.flatnonzero(self._active[:self._size])
+        oldest = active_positions[np.argsort(self._timestamps[active_positions])[:count]]
+        for position in oldest:
+            self._positions.pop(self._ids[position], None)
+            self._deactivate(position)
+
+    def _init_hnsw(self, capacity: int):
+        self._hnsw = hnswlib.Index(space="ip", dim=self.dimension)
+        self._hnsw.init_index(max_elements=capacity, ef_construction=200, M=self.hnsw_m)
+        self._hnsw.set_ef(self.hnsw_ef)
+
+    def _search_hnsw(self, queries: np.ndarray, top_k: int, min_similarity: float) -> List[List[EmbeddingHit]]:
+        k = min(top_k, len(self._positions))
+        labels, distances = self._hnsw.knn_query(queries, k=k)
+        results = []
+        for row_labels, row_distances in zip(labels, distances):
+            hits = []
+            for position, distance in zip(row_labels, row_distances):
+                similarity = 1.0 - float(distance)  # hnswlib "ip" distance is 1 - dot
+                if self._active[position] and similarity >= min_similarity:
+                    hits.append(EmbeddingHit(self._ids[position], similarity, self._urls[position]))
+            results.append(hits)
+        return results
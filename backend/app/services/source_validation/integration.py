@@ -11,7 +11,7 @@ from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
 
 from .orchestrator import SourceValidationOrchestrator, SourceSubmission
-from .deduplication import DeduplicationPipeline, OpportunityContent
+from .deduplication import OpportunityContent, get_deduplication_pipeline
 from .config import get_config
 from app.core.database import get_database
 
@@ -23,7 +23,7 @@ class CrewAIIntegration:
     """Integration helpers for CrewAI ETL pipeline"""
     
     def __init__(self):
-        self.deduplication = DeduplicationPipeline()
+        self.deduplication = get_deduplication_pipeline()
         self.config = get_config()
     
     async def preprocess_opportunity(self, raw_opportunity: Dict[str, Any]) -> Dict[str, Any]:
@@ -588,8 +588,8 @@ async def quick_duplicate_check(url: str, title: str, organization: str) -> bool
             organization=organization
         )
         
-        pipeline = DeduplicationPipeline()
-        result = await pipeline.check_for_duplicates(content)
+        # Shared pipeline: its URL and embedding indexes load once per process
+        result = await get_deduplication_pipeline().check_for_duplicates(content)
         
         return result['is_duplicate']
         
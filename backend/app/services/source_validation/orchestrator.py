@@ -14,7 +14,7 @@ from enum import Enum
 
 from .source_validator import SourceValidator, SourceSubmission, ValidationResult
 from .source_classifier import SourceClassifier, SourceClassification
-from .deduplication import DeduplicationPipeline, OpportunityContent
+from .deduplication import OpportunityContent, get_deduplication_pipeline
 from .performance_tracker import PerformanceTracker, SourceMetrics, PerformanceStatus
 
 from app.core.database import get_database
@@ -56,7 +56,7 @@ class SourceValidationOrchestrator:
         self.logger = logging.getLogger(__name__)
         self.validator = None
         self.classifier = None
-        self.deduplication = DeduplicationPipeline()
+        self.deduplication = get_deduplication_pipeline()
         self.performance_tracker = PerformanceTracker()
     
     async def __aenter__(self):
@@ -272,6 +272,34 @@ BEGIN
     END IF;
 END $$;
 
+-- Normalized URL columns for URL deduplication. New rows are written by
+-- URLDeduplicator.store_url_columns; existing rows by scripts/backfill_normalized_urls.py
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'africa_intelligence_feed'
+        AND column_name = 'normalized_url'
+    ) THEN
+        ALTER TABLE africa_intelligence_feed ADD COLUMN normalized_url TEXT;
+        ALTER TABLE africa_intelligence_feed ADD COLUMN url_host VARCHAR(255);
+        ALTER TABLE africa_intelligence_feed ADD COLUMN url_path TEXT;
+    END IF;
+END $$;
+
+-- Exact URL checks use the unique index idx_africa_intelligence_feed_normalized_url.
+-- It is created by scripts/backfill_normalized_urls.py once existing rows are
+-- backfilled and their duplicates set aside; creating it here would fail on
+-- (or, before the backfill, silently ignore) the duplicates already stored.
+
+-- Similar URL checks: same host + path prefix (LIKE 'prefix%'), ranked by trigram similarity
+CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_url_host_path
+    ON africa_intelligence_feed(url_host, url_path text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_url_path_trgm
+    ON africa_intelligence_feed USING GIN (url_path gin_trgm_ops);
+
 -- Add embedding column for semantic similarity (if using vector embeddings)
 DO $$ 
 BEGIN
@@ -17,7 +17,10 @@ from app.services.source_validation import (
     PerformanceTracker
 )
 from app.services.source_validation.config import SourceValidationConfig
+from app.services.source_validation.deduplication import URLDeduplicator
+from app.services.source_validation.embedding_index import EmbeddingIndex
 from app.services.source_validation.integration import crewai_integration
+from app.services.source_validation.url_index import URLPathTrie
 from app.utils.url_utils import normalize_url, calculate_url_similarity
 
 
@@ -270,6 +273,82 @@ class TestDeduplicationPipeline:
             assert result["is_duplicate"] == False
 
 
+class TestEmbeddingIndex:
+    """Test the in-memory embedding index used for semantic deduplication"""
+    
+    def test_batched_top_k_search(self):
+        """Nearest neighbours are found across organisations in one batched search"""
+        index = EmbeddingIndex(window_days=90)
+        index.add(1, [1.0, 0.0, 0.0], url="https://a.org/1")
+        index.add(2, [0.0, 1.0, 0.0], url="https://b.org/2")
+        index.add(3, [0.9, 0.1, 0.0], url="https://c.org/3")
+        
+        hits = index.search([[1.0, 0.0, 0.0], [0.0, 0.0, 1.0]], top_k=2, min_similarity=0.9)
+        
+        assert [hit.opportunity_id for hit in hits[0]] == [1, 3]
+        assert hits[1] == []
+    
+    def test_time_window_bounds_memory(self):
+        """Entries outside the window are rejected or evicted"""
+        index = EmbeddingIndex(window_days=30, max_items=2)
+        
+        assert not index.add(1, [1.0, 0.0], created_at=datetime.now() - timedelta(days=45))
+        index.add(2, [1.0, 0.0], created_at=datetime.now() - timedelta(days=2))
+        index.add(3, [0.0, 1.0], created_at=datetime.now() - timedelta(days=1))
+        index.add(4, [0.7, 0.7])
+        
+        assert len(index) == 2
+        assert 2 not in index
+
+
+class TestURLPathTrie:
+    """Test the host -> path trie used for URL deduplication"""
+    
+    def test_exact_and_prefix_candidates(self):
+        """Candidates sharing the longest path prefix come first; other hosts never appear"""
+        trie = URLPathTrie()
+        trie.add(1, normalize_url("https://example.org/grants/ai-research-2025"))
+        trie.add(2, normalize_url("https://example.org/grants/climate-fund"))
+        trie.add(3, normalize_url("https://example.org/news/launch"))
+        trie.add(4, normalize_url("https://other.org/grants/ai-research-2025"))
+        
+        assert trie.get(normalize_url("https://www.example.org/grants/ai-research-2025/?utm_source=x")) is None
+        assert trie.get(normalize_url("https://example.org/grants/ai-research-2025/?utm_source=x")) == 1
+        
+        candidates = trie.candidates(normalize_url("https://example.org/grants/ai-research-2026"))
+        assert [opportunity_id for opportunity_id, _ in candidates] == [1, 2, 3]
+        
+        assert trie.remove(1)
+        assert [i for i, _ in trie.candidates("https://example.org/grants/x", max_candidates=1)] == [2]
+
+
+@pytest.mark.asyncio
+class TestURLColumns:
+    """Test the normalized URL columns written for inserted opportunities"""
+
+    async def test_store_url_columns_is_one_batched_update(self):
+        """Every inserted row is normalized and written in a single statement"""
+        url_dedup = URLDeduplicator()
+        mock_db_instance = AsyncMock()
+
+        with patch('app.services.source_validation.deduplication.get_database',
+                   AsyncMock(return_value=mock_db_instance)):
+            await url_dedup.store_url_columns([
+                (1, "https://Example.org/grants/ai-research/?utm_source=x"),
+                (2, "https://example.org/news/launch"),
+                (3, ""),
+            ])
+
+        mock_db_instance.execute.assert_awaited_once()
+        sql, ids, urls, hosts, paths = mock_db_instance.execute.await_args.args
+        assert "DISTINCT ON (normalized_url)" in sql and "NOT EXISTS" in sql
+        assert ids == [1, 2]
+        assert urls == [normalize_url("https://example.org/grants/ai-research"),
+                        normalize_url("https://example.org/news/launch")]
+        assert hosts == ["example.org", "example.org"]
+        assert paths == ["/grants/ai-research", "/news/launch"]
+
+
 @pytest.mark.asyncio
 class TestSourceClassifier:
     """Test source classification"""
@@ -419,10 +498,10 @@ class TestIntegrationHelpers:
         from app.services.source_validation.integration import quick_duplicate_check
         
         # Mock deduplication pipeline
-        with patch('app.services.source_validation.integration.DeduplicationPipeline') as mock_pipeline_class:
+        with patch('app.services.source_validation.integration.get_deduplication_pipeline') as mock_get_pipeline:
             mock_pipeline = AsyncMock()
             mock_pipeline.check_for_duplicates.return_value = {'is_duplicate': False}
-            mock_pipeline_class.return_value = mock_pipeline
+            mock_get_pipeline.return_value = mock_pipeline
             
             result = await quick_duplicate_check(
                 'https://example.org/grant',
@@ -0,0 +1,167 @@
+"""
+URL Path Index
+
+Process-local index of opportunity URLs used by the URL deduplicator. URLs are
+stored normalised (``URLNormalizer.normalize``) in a dict for exact lookups and
+in a per-host trie of path segments for near-match candidates: a query walks
+its own path down the host's trie and collects URLs from the deepest shared
+prefix outwards, so the candidates scored are the ones that share the longest
+path prefix rather than an arbitrary sample of the host.
+
+The database mirror of this index is the ``normalized_url`` / ``url_host`` /
+``url_path`` columns on ``africa_intelligence_feed`` (see schema.sql).
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from app.utils.url_utils import extract_domain, normalize_url
+
+
+logger = logging.getLogger(__name__)
+
+
+def split_url(normalized_url: str) -> Tuple[str, List[str]]:
+    """Host key (without www) and path segments of a normalised URL"""
+    parsed = urlparse(normalized_url)
+    host = extract_domain(normalized_url)
+    segments = [part for part in parsed.path.split('/') if part]
+    if parsed.query:
+        segments.append(f"?{parsed.query}")
+    return host, segments
+
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    urls: Dict[str, Any] = field(default_factory=dict)  # normalized url -> opportunity id
+    count: int = 0  # URLs stored in this subtree
+
+
+class URLPathTrie:
+    """Exact and shared-path-prefix lookups over normalised URLs"""
+
+    def __init__(self):
+        self._hosts: Dict[str, _TrieNode] = {}
+        self._by_url: Dict[str, Any] = {}
+        self._by_id: Dict[Any, str] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._by_url)
+
+    def __contains__(self, normalized_url: str) -> bool:
+        return normalized_url in self._by_url
+
+    async def load_from_database(self, db) -> int:
+        """Load every opportunity URL from africa_intelligence_feed"""
+        rows = await db.fetch_all(
+            """
+            SELECT id, url, normalized_url
+            FROM africa_intelligence_feed
+            WHERE url IS NOT NULL
+            ORDER BY id
+            """
+        )
+
+        for row in rows:
+            self.add(row["id"], row["normalized_url"] or normalize_url(row["url"]))
+
+        self.loaded = True
+        logger.info(f"URL index loaded {len(self)} URLs across {len(self._hosts)} hosts")
+        return len(self)
+
+    def add(self, opportunity_id: Any, normalized_url: str) -> bool:
+        """Index a normalised URL; the first id seen for a URL is kept"""
+        if not normalized_url or normalized_url in self._by_url:
+            return False
+
+        host, segments = split_url(normalized_url)
+        if not host:
+            return False
+
+        if opportunity_id in self._by_id:
+            self.remove(opportunity_id)
+
+        node = self._hosts.setdefault(host, _TrieNode())
+        node.count += 1
+        for segment in segments:
+            node = node.children.setdefault(segment, _TrieNode())
+            node.count += 1
+        node.urls[normalized_url] = opportunity_id
+
+        self._by_url[normalized_url] = opportunity_id
+        self._by_id[opportunity_id] = normalized_url
+        return True
+
+    def remove(self, opportunity_id: Any) -> bool:
+        normalized_url = self._by_id.pop(opportunity_id, None)
+        if normalized_url is None:
+            return False
+        del self._by_url[normalized_url]
+
+        host, segments = split_url(normalized_url)
+        path = [self._hosts[host]]
+        for segment in segments:
+            path.append(path[-1].children[segment])
+        del path[-1].urls[normalized_url]
+
+        for depth in range(len(path) - 1, -1, -1):
+            path[depth].count -= 1
+            if depth and path[depth].count == 0:
+                del path[depth - 1].children[segments[depth - 1]]
+        if path[0].count == 0:
+            del self._hosts[host]
+        return True
+
+    def get(self, normalized_url: str) -> Optional[Any]:
+        """Opportunity id stored for exactly this normalised URL"""
+        return self._by_url.get(normalized_url)
+
+    def candidates(self, normalized_url: str, max_candidates: int = 200) -> List[Tuple[Any, str]]:
+        """URLs on the same host, longest shared path prefix first
+
+        Walks down the query's path as far as the trie matches, then widens one
+        level at a time until ``max_candidates`` URLs have been collected.
+        """
+        host, segments = split_url(normalized_url)
+        root = self._hosts.get(host)
+        if root is None:
+            return []
+
+        path = [root]
+        for segment in segments:
+            child = path[-1].children.get(segment)
+            if child is None:
+                break
+            path.append(child)
+
+        results: List[Tuple[Any, str]] = []
+        seen = {normalized_url}
+        skip: Optional[_TrieNode] = None
+        for node in reversed(path):
+            self._collect(node, skip, seen, results, max_candidates)
+            if len(results) >= max_candidates:
+                break
+            skip = node
+        return results
+
+    def _collect(self, node: _TrieNode, skip: Optional[_TrieNode], seen: set,
+                 results: List[Tuple[Any, str]], limit: int):
+        """Breadth-first gather of URLs under node, skipping an already-visited subtree"""
+        queue = deque([node])
+        while queue and len(results) < limit:
+            current = queue.popleft()
+            for url, opportunity_id in current.urls.items():
+                if url not in seen:
+                    seen.add(url)
+                    results.append((opportunity_id, url))
+                    if len(results) >= limit:
+                        return
+            queue.extend(child for child in current.children.values() if child is not skip)
+
+    def stats(self) -> Dict[str, int]:
+        return {"urls": len(self._by_url), "hosts": len(self._hosts)}
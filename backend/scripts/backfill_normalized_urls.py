@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Backfill normalized_url / url_host / url_path on africa_intelligence_feed and
+create the unique normalized_url index.
+
+The columns (schema.sql) are only written for rows inserted since URL
+deduplication started storing them, so existing rows are invisible to the
+database-side exact and prefix URL checks. Existing rows also contain
+duplicates, which would make the unique index fail. This script:
+
+1. normalizes every row without a normalized_url in Python (the same
+   url_utils.normalize_url the deduplicator uses) into a temporary table;
+2. keeps one row per normalized URL: a row that already carries it, else the
+   lowest id. Only those rows get the columns. The others keep NULLs and are
+   marked validation_status = 'duplicate';
+3. resolves any duplicate that slipped in between stored rows the same way;
+4. creates the unique index CONCURRENTLY, dropping an invalid leftover first.
+
+    python scripts/backfill_normalized_urls.py --dsn postgresql://... --batch-size 5000
+    python scripts/backfill_normalized_urls.py --dry-run
+
+Safe to re-run.
+"""
+
+import argparse
+import os
+import sys
+
+import psycopg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.source_validation.deduplication import URLNormalizer  # noqa: E402
+
+TABLE = "africa_intelligence_feed"
+INDEX = "idx_africa_intelligence_feed_normalized_url"
+
+STAGE = """
+CREATE TEMP TABLE url_backfill (
+    id BIGINT PRIMARY KEY,
+    normalized_url TEXT NOT NULL,
+    url_host VARCHAR(255),
+    url_path TEXT
+) ON COMMIT PRESERVE ROWS
+"""
+
+# One row per normalized URL; rows already carrying the URL win over staged ones
+APPLY_CANONICAL = f"""
+UPDATE {TABLE} f
+SET normalized_url = v.normalized_url, url_host = v.url_host, url_path = v.url_path
+FROM (
+    SELECT DISTINCT ON (normalized_url) * FROM url_backfill ORDER BY normalized_url, id
+) v
+WHERE f.id = v.id
+AND NOT EXISTS (SELECT 1 FROM {TABLE} e WHERE e.normalized_url = v.normalized_url)
+"""
+
+MARK_STAGED_DUPLICATES = f"""
+UPDATE {TABLE} f
+SET validation_status = 'duplicate'
+FROM url_backfill b
+WHERE f.id = b.id AND f.normalized_url IS NULL
+"""
+
+# Rows that got the same normalized_url before the unique index existed
+RESOLVE_STORED_DUPLICATES = f"""
+WITH ranked AS (
+    SELECT id, row_number() OVER (PARTITION BY normalized_url ORDER BY id) AS position
+    FROM {TABLE} WHERE normalized_url IS NOT NULL
+)
+UPDATE {TABLE} f
+SET normalized_url = NULL, url_host = NULL, url_path = NULL, validation_status = 'duplicate'
+FROM ranked r
+WHERE f.id = r.id AND r.position > 1
+"""
+
+
+def stage(conn, batch_size: int) -> int:
+    normalizer = URLNormalizer()
+    staged, after_id = 0, 0
+    with conn.cursor() as read, conn.cursor() as write:
+        write.execute(STAGE)
+        while True:
+            read.execute(
+                f"SELECT id, url FROM {TABLE} WHERE normalized_url IS NULL AND url IS NOT NULL "
+                f"AND id > %s ORDER BY id LIMIT %s",
+                (after_id, batch_size)
+            )
+            rows = read.fetchall()
+            if not rows:
+                break
+            with write.copy("COPY url_backfill (id, normalized_url, url_host, url_path) FROM STDIN") as copy:
+                for row_id, url in rows:
+                    normalized_url, host, path = normalizer.columns(url)
+                    if normalized_url:
+                        copy.write_row((row_id, normalized_url, host, path))
+                        staged += 1
+            after_id = rows[-1][0]
+            print(f"staged through id {after_id} ({staged:,} rows)")
+    return staged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/postgres"))
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--dry-run", action="store_true", help="report counts and roll back")
+    args = parser.parse_args()
+
+    with psycopg.connect(args.dsn) as conn:
+        staged = stage(conn, args.batch_size)
+        with conn.cursor() as cur:
+            cur.execute(APPLY_CANONICAL)
+            canonical = cur.rowcount
+            cur.execute(MARK_STAGED_DUPLICATES)
+            duplicates = cur.rowcount
+            cur.execute(RESOLVE_STORED_DUPLICATES)
+            resolved = cur.rowcount
+        print(f"staged {staged:,}, backfilled {canonical:,}, duplicates set aside {duplicates + resolved:,}")
+
+        if args.dry_run:
+            conn.rollback()
+            print("dry run: rolled back")
+            return
+        conn.commit()
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        conn.autocommit = True
+        invalid = conn.execute(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = %s AND NOT i.indisvalid",
+            (INDEX,)
+        ).fetchone()
+        if invalid:
+            conn.execute(f"DROP INDEX CONCURRENTLY {INDEX}")
+        conn.execute(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX} "
+            f"ON {TABLE}(normalized_url) WHERE normalized_url IS NOT NULL"
+        )
+        print(f"unique index {INDEX} ready")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-item upserts against BulkUpsertWriter batches.
+
+By default the writer talks to an in-process PostgREST stand-in that charges a
+fixed round-trip cost per request plus a small per-row cost (tune with
+--rtt-ms / --row-us). With --supabase the real project from SUPABASE_URL /
+SUPABASE_API_KEY is used (rows are upserted into --table, so point it at a
+scratch table).
+
+    python scripts/benchmark_bulk_writer.py --rows 5000 --batch-size 500
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.data_ingestion.bulk_writer import BulkUpsertWriter
+
+
+class PostgRESTStandIn:
+    """Sleeps like a remote PostgREST: rtt per request + per-row cost"""
+
+    def __init__(self, rtt_ms: float, row_us: float):
+        self.rtt = rtt_ms / 1000
+        self.row_cost = row_us / 1_000_000
+        self.requests = 0
+
+    def table(self, name):
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self._rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self):
+        self.requests += 1
+        time.sleep(self.rtt + self.row_cost * len(self._rows))
+        return self._rows
+
+
+def make_rows(count: int):
+    return [
+        {
+            'title': f"AI funding call {i}",
+            'description': "Grant programme for AI startups in Africa. " * 5,
+            'source_url': f"https://example.org/benchmark/{i}",
+            'source_type': 'rss',
+            'collected_at': '2025-01-01T00:00:00',
+            'keywords': ['AI', 'Africa']
+        }
+        for i in range(count)
+    ]
+
+
+async def run(args):
+    if args.supabase:
+        from supabase import create_client
+        client = create_client(os.environ['SUPABASE_URL'], os.environ['SUPABASE_API_KEY'])
+    else:
+        client = PostgRESTStandIn(args.rtt_ms, args.row_us)
+
+    rows = make_rows(args.rows)
+
+    # Before: one upsert per item (the old _store_items loop)
+    per_item = rows[:args.per_item_rows]
+    start = time.perf_counter()
+    for row in per_item:
+        client.table(args.table).upsert(row).execute()
+    elapsed = time.perf_counter() - start
+    print(f"per-item upserts : {len(per_item) / elapsed:>10,.0f} rows/sec  ({len(per_item)} rows, {elapsed:.2f}s)")
+
+    # After: buffered multi-row upserts
+    writer = BulkUpsertWriter(client, table=args.table, batch_size=args.batch_size)
+    start = time.perf_counter()
+    for offset in range(0, len(rows), 50):  # sources deliver ~50 items at a time
+        await writer.add(rows[offset:offset + 50])
+    await writer.flush()
+    elapsed = time.perf_counter() - start
+    stats = writer.get_stats()
+    print(f"bulk upserts     : {len(rows) / elapsed:>10,.0f} rows/sec  ({len(rows)} rows, {elapsed:.2f}s)")
+    print(f"  batches={stats['batches']} avg_latency={stats['avg_batch_latency_ms']}ms "
+          f"max_latency={stats['max_batch_latency_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--per-item-rows", type=int, default=200, help="rows for the slow per-item baseline")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--row-us", type=float, default=50.0)
+    parser.add_argument("--table", default="africa_intelligence_feed")
+    parser.add_argument("--supabase", action="store_true", help="use the real Supabase project")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
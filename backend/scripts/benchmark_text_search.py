@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark LIKE-based text search against the ranked full-text search path.
+
+Seeds a scratch table on a local Postgres (default DSN from DATABASE_URL) with
+the same search_vector trigger as alembic revision 005, then times the old
+per-term ``lower(col) LIKE '%term%'`` query and the ``websearch_to_tsquery`` /
+``ts_rank_cd`` query at each row count, reporting p50/p99 latency.
+
+    python scripts/benchmark_text_search.py --rows 100000 1000000 --queries 200
+
+The scratch table is dropped at the end unless --keep is given.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import psycopg
+from psycopg.types.json import Jsonb
+
+TABLE = "bench_intelligence_feed"
+LANGUAGES = ("en", "fr", "pt", "ar")
+
+SCHEMA = f"""
+DROP TABLE IF EXISTS {TABLE};
+CREATE TABLE {TABLE} (
+    id BIGSERIAL PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT,
+    raw_data JSONB,
+    detected_language VARCHAR(5) DEFAULT 'en',
+    relevance_score FLOAT,
+    search_vector TSVECTOR
+);
+
+CREATE OR REPLACE FUNCTION intelligence_search_config(lang TEXT)
+RETURNS regconfig LANGUAGE sql STABLE AS $$
+    SELECT COALESCE(
+        (SELECT cfgname::regconfig FROM pg_ts_config
+          WHERE cfgname = CASE lower(left(COALESCE(lang, 'en'), 2))
+              WHEN 'en' THEN 'english' WHEN 'fr' THEN 'french'
+              WHEN 'pt' THEN 'portuguese' WHEN 'ar' THEN 'arabic' END),
+        'simple'::regconfig)
+$$;
+
+CREATE OR REPLACE FUNCTION {TABLE}_search_vector_update()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    cfg regconfig := intelligence_search_config(NEW.detected_language);
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector(cfg, COALESCE(NEW.title, '')), 'A') ||
+        setweight(to_tsvector(cfg, COALESCE(NEW.description, '')), 'B') ||
+        setweight(to_tsvector(cfg, COALESCE(NEW.raw_data->>'eligibility_criteria', '')), 'C');
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER trg_{TABLE}_search_vector
+BEFORE INSERT OR UPDATE ON {TABLE}
+FOR EACH ROW EXECUTE FUNCTION {TABLE}_search_vector_update();
+"""
+
+VOCABULARY = {
+    "en": "artificial intelligence grant funding research startup innovation health agriculture "
+          "climate education fellowship accelerator data science machine learning africa".split(),
+    "fr": "intelligence artificielle subvention financement recherche innovation santé agriculture "
+          "climat éducation bourse accélérateur données apprentissage afrique".split(),
+    "pt": "inteligência artificial financiamento pesquisa inovação saúde agricultura clima "
+          "educação bolsa acelerador dados aprendizagem áfrica".split(),
+    "ar": "الذكاء الاصطناعي منحة تمويل بحث ابتكار صحة زراعة مناخ تعليم زمالة بيانات أفريقيا".split(),
+}
+
+QUERIES = [
+    "machine learning grant",
+    "climate agriculture funding",
+    "\"data science\" fellowship",
+    "startup accelerator -health",
+    "financement recherche",
+    "bolsa inovação",
+    "تمويل الابتكار",
+]
+
+LIKE_SQL = f"""
+SELECT id FROM {TABLE}
+WHERE {{conditions}}
+ORDER BY relevance_score DESC
+LIMIT %(limit)s
+"""
+
+FTS_SQL = f"""
+WITH q AS (
+    SELECT {' || '.join(f"websearch_to_tsquery(intelligence_search_config('{lang}'), %(query)s)" for lang in LANGUAGES)} AS tsq
+)
+SELECT id, ts_rank_cd(search_vector, q.tsq, 32) AS text_rank
+FROM {TABLE}, q
+WHERE search_vector @@ q.tsq
+ORDER BY text_rank DESC, relevance_score DESC
+LIMIT %(limit)s
+"""
+
+
+def make_rows(count: int, rng: random.Random):
+    for _ in range(count):
+        language = rng.choices(LANGUAGES, weights=(6, 3, 1, 1))[0]
+        words = VOCABULARY[language]
+        yield (
+            " ".join(rng.choices(words, k=8)),
+            " ".join(rng.choices(words, k=60)),
+            Jsonb({"eligibility_criteria": " ".join(rng.choices(words, k=20))}),
+            language,
+            rng.random(),
+        )
+
+
+def seed(conn, rows: int, rng: random.Random):
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT count(*) FROM {TABLE}")
+        existing = cur.fetchone()[0]
+        with cur.copy(
+            f"COPY {TABLE} (title, description, raw_data, detected_language, relevance_score) FROM STDIN"
+        ) as copy:
+            for row in make_rows(rows - existing, rng):
+                copy.write_row(row)
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {TABLE}_search_idx ON {TABLE} USING gin(search_vector)")
+        cur.execute(f"ANALYZE {TABLE}")
+    conn.commit()
+    print(f"seeded {rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+
+def like_query(query: str):
+    conditions, params = [], {}
+    for i, term in enumerate(query.lower().replace('"', '').replace('-', '').split()):
+        params[f"t{i}"] = f"%{term}%"
+        conditions.append(
+            f"(lower(title) LIKE %(t{i})s OR lower(description) LIKE %(t{i})s "
+            f"OR lower(raw_data->>'eligibility_criteria') LIKE %(t{i})s)"
+        )
+    return LIKE_SQL.format(conditions=" AND ".join(conditions)), params
+
+
+def time_queries(conn, runs: int, build, limit: int):
+    latencies = []
+    with conn.cursor() as cur:
+        for i in range(runs):
+            sql, params = build(QUERIES[i % len(QUERIES)])
+            start = time.perf_counter()
+            cur.execute(sql, {**params, "limit": limit})
+            cur.fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL", "postgresql://localhost/postgres"))
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200, help="full-text queries per row count")
+    parser.add_argument("--like-queries", type=int, default=20, help="queries for the slow LIKE baseline")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the scratch table")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with psycopg.connect(args.dsn) as conn:
+        conn.execute(SCHEMA)
+        conn.commit()
+        try:
+            for rows in sorted(args.rows):
+                seed(conn, rows, rng)
+                like_p50, like_p99 = time_queries(conn, args.like_queries, like_query, args.limit)
+                fts_p50, fts_p99 = time_queries(conn, args.queries, lambda q: (FTS_SQL, {"query": q}), args.limit)
+                print(f"  LIKE      : p50={like_p50:8.2f}ms p99={like_p99:8.2f}ms ({args.like_queries} queries)")
+                print(f"  full-text : p50={fts_p50:8.2f}ms p99={fts_p99:8.2f}ms ({args.queries} queries)")
+        finally:
+            if not args.keep:
+                conn.execute(f"DROP TABLE IF EXISTS {TABLE}")
+                conn.execute(f"DROP FUNCTION IF EXISTS {TABLE}_search_vector_update()")
+                conn.commit()
+
+
+if __name__ == "__main__":
+    main()
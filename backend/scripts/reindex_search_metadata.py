@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Backfill the intelligent search filter metadata on funding opportunity vectors.
+
+Vectors upserted before the search filters were pushed into Pinecone carry no
+relevance_score / validation_status / deadline / amount metadata, so the
+filtered vector search excludes them. This walks africa_intelligence_feed in
+id order and, per page, sets the metadata in place on vectors that exist and
+embeds and upserts rows that were never indexed.
+
+    python scripts/reindex_search_metadata.py --batch-size 100
+    python scripts/reindex_search_metadata.py --after-id 5000 --dry-run
+
+Safe to re-run: every step overwrites the metadata with the row's current values.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.supabase_service import get_supabase_service  # noqa: E402
+from app.services.funding_intelligence.vector_intelligence import get_intelligence_vector_db  # noqa: E402
+
+
+async def reindex(batch_size: int, after_id: int, dry_run: bool):
+    client = get_supabase_service().client
+    vector_db = None if dry_run else get_intelligence_vector_db()
+    if vector_db is None and not dry_run:
+        raise SystemExit("Pinecone is not configured")
+
+    totals = {'rows': 0, 'updated': 0, 'upserted': 0, 'failed': 0}
+    while True:
+        rows = (
+            client.table('africa_intelligence_feed')
+            .select('*')
+            .gt('id', after_id)
+            .order('id')
+            .limit(batch_size)
+            .execute()
+        ).data or []
+        if not rows:
+            break
+
+        totals['rows'] += len(rows)
+        if not dry_run:
+            for key, count in (await vector_db.reindex_search_filter_metadata(rows)).items():
+                totals[key] += count
+        after_id = rows[-1]['id']
+        print(f"through id {after_id}: {totals}")
+
+    print(f"done: {totals}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--after-id", type=int, default=0, help="resume after this opportunity id")
+    parser.add_argument("--dry-run", action="store_true", help="only count the rows that would be reindexed")
+    args = parser.parse_args()
+
+    load_dotenv()
+    asyncio.run(reindex(args.batch_size, args.after_id, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Tests for the reusable headless-browser pool
+"""
+
+import threading
+
+import pytest
+
+from app.services.data_ingestion.browser_pool import BrowserPool, BrowserPoolTimeout
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_drivers_are_reused_and_bounded():
+    created = []
+
+    def factory():
+        created.append(FakeDriver())
+        return created[-1]
+
+    pool = BrowserPool(factory, max_size=2)
+    barrier = threading.Barrier(4)
+
+    def work():
+        barrier.wait()
+        for _ in range(10):
+            with pool.lease() as driver:
+                assert driver.alive
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = pool.get_stats()
+    assert len(created) <= 2
+    assert stats['leases'] == 40
+    assert stats['in_use'] == 0
+    assert stats['idle'] == len(created)
+
+    pool.close()
+    assert all(driver.quit_called for driver in created)
+
+
+def test_unhealthy_and_worn_out_drivers_are_replaced():
+    pool = BrowserPool(FakeDriver, max_size=1, max_uses=3)
+
+    with pool.lease() as first:
+        pass
+    first.alive = False  # the browser crashed while idle
+    with pool.lease() as second:
+        assert second is not first
+    assert first.quit_called
+    assert pool.get_stats()['health_check_failures'] == 1
+
+    # A driver that breaks inside a lease is discarded, not returned
+    with pytest.raises(ValueError):
+        with pool.lease() as driver:
+            driver.alive = False
+            raise ValueError("page crashed")
+    assert driver.quit_called and pool.get_stats()['idle'] == 0
+
+    # Recycled after max_uses leases
+    with pool.lease() as driver:
+        pass
+    for _ in range(2):
+        with pool.lease() as same:
+            assert same is driver
+    assert driver.quit_called
+    assert pool.get_stats()['recycled'] == 1
+
+
+def test_lease_times_out_when_pool_is_exhausted():
+    pool = BrowserPool(FakeDriver, max_size=1, acquire_timeout=0.05)
+    with pool.lease():
+        with pytest.raises(BrowserPoolTimeout):
+            with pool.lease():
+                pass
+    assert pool.get_stats()['timeouts'] == 1
@@ -0,0 +1,147 @@
+"""
+Tests for the ingestion pipeline's bulk upsert writer
+"""
+
+import asyncio
+import threading
+
+from app.services.data_ingestion.bulk_writer import BulkUpsertWriter
+
+
+class RecordingTable:
+    """PostgREST-style table stand-in that records each upsert request"""
+
+    def __init__(self, requests):
+        self.requests = requests
+        self._pending = None
+
+    def upsert(self, rows, on_conflict=None):
+        self._pending = (list(rows), on_conflict)
+        return self
+
+    def execute(self):
+        self.requests.append(self._pending)
+        return self._pending
+
+
+class RecordingClient:
+    def __init__(self):
+        self.requests = []
+
+    def table(self, name):
+        return RecordingTable(self.requests)
+
+
+def _rows(start, count):
+    return [{"source_url": f"https://example.org/{i}", "title": f"Item {i}"} for i in range(start, start + count)]
+
+
+async def test_full_batches_are_written_as_one_upsert_each():
+    client = RecordingClient()
+    writer = BulkUpsertWriter(client, batch_size=100)
+
+    await writer.add(_rows(0, 150))
+    await writer.add(_rows(150, 120))
+
+    assert [len(rows) for rows, _ in client.requests] == [100, 100]
+    assert all(on_conflict == "source_url" for _, on_conflict in client.requests)
+    assert len(writer) == 70
+
+    await writer.flush()
+    assert writer.get_stats()["rows_written"] == 270
+    assert writer.get_stats()["batches"] == 3
+
+
+async def test_partial_batch_is_flushed_after_interval_and_deduplicated():
+    client = RecordingClient()
+    writer = BulkUpsertWriter(client, batch_size=100, flush_interval_seconds=0.05)
+    stop = threading.Event()
+    flusher = asyncio.create_task(writer.run_periodic_flush(stop))
+
+    await writer.add(_rows(0, 3) + [{"source_url": "https://example.org/0", "title": "Item 0 (updated)"}])
+    await asyncio.sleep(0.2)
+
+    assert len(client.requests) == 1
+    rows, _ = client.requests[0]
+    assert len(rows) == 3
+    assert {"source_url": "https://example.org/0", "title": "Item 0 (updated)"} in rows
+
+    stop.set()
+    await flusher
+
+
+async def test_listeners_receive_each_stored_batch():
+    client = RecordingClient()
+    writer = BulkUpsertWriter(client, batch_size=2)
+    stored = []
+
+    async def on_written(rows):
+        stored.append([row["source_url"] for row in rows])
+
+    writer.add_listener(on_written)
+    await writer.add(_rows(0, 3))
+    assert stored == [["https://example.org/0", "https://example.org/1"]]
+
+    await writer.flush()
+    assert stored[-1] == ["https://example.org/2"]
+
+
+class RejectingTable(RecordingTable):
+    """Fails every upsert that contains a rejected source_url, or the first few calls"""
+
+    def __init__(self, requests, rejected, flaky):
+        super().__init__(requests)
+        self.rejected = rejected
+        self.flaky = flaky
+
+    def execute(self):
+        self.requests.append(self._pending)
+        if self.flaky:
+            self.flaky.pop()
+            raise RuntimeError("temporarily unavailable")
+        if any(row["source_url"] in self.rejected for row in self._pending[0]):
+            raise RuntimeError("invalid input syntax")
+        return self._pending
+
+
+class RejectingClient(RecordingClient):
+    def __init__(self, rejected=(), flaky=0):
+        super().__init__()
+        self.rejected = set(rejected)
+        self.flaky = [None] * flaky
+
+    def table(self, name):
+        return RejectingTable(self.requests, self.rejected, self.flaky)
+
+
+async def test_transient_failures_are_retried_with_backoff():
+    client = RejectingClient(flaky=2)
+    writer = BulkUpsertWriter(client, batch_size=10, retry_backoff_seconds=0.001)
+    outcomes = []
+
+    await writer.add(_rows(0, 4), on_complete=outcomes.append)
+    await writer.flush()
+
+    assert [len(rows) for rows, _ in client.requests] == [4, 4, 4]
+    assert outcomes == [[]]
+    stats = writer.get_stats()
+    assert stats["rows_written"] == 4 and stats["retries"] == 2 and stats["rows_failed"] == 0
+
+
+async def test_bad_rows_are_isolated_and_reported_to_their_caller():
+    client = RejectingClient(rejected={"https://example.org/5"})
+    writer = BulkUpsertWriter(client, batch_size=8, max_retries=1, retry_backoff_seconds=0.001)
+    stored, first, second = [], [], []
+
+    async def on_written(rows):
+        stored.extend(row["source_url"] for row in rows)
+
+    writer.add_listener(on_written)
+    await writer.add(_rows(0, 4), on_complete=first.append)
+    await writer.add(_rows(4, 4), on_complete=second.append)
+
+    assert first == [[]]
+    assert second == [[{"source_url": "https://example.org/5", "title": "Item 5"}]]
+    assert sorted(stored) == sorted(f"https://example.org/{i}" for i in range(8) if i != 5)
+    stats = writer.get_stats()
+    assert stats["rows_written"] == 7 and stats["rows_failed"] == 1 and stats["failed_batches"] == 1
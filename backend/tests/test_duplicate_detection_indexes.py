@@ -0,0 +1,239 @@
+"""
+Tests for the candidate indexes behind EnhancedDuplicateDetector
+"""
+
+import pytest
+
+from app.core.enhanced_duplicate_detection import (
+    DuplicateType,
+    EnhancedDuplicateDetector,
+    SignatureIndex,
+)
+from app.core.content_similarity_index import TfidfSimilarityIndex
+from app.core.minhash_lsh import MinHashLSHIndex
+from app.core.semantic_duplicate_engine import (
+    HashingEmbedder,
+    LocalPairAdjudicator,
+    PairAdjudicator,
+    SemanticDuplicateEngine,
+)
+
+
+def _offline_detector():
+    return EnhancedDuplicateDetector(
+        semantic_engine=SemanticDuplicateEngine(
+            embedder=HashingEmbedder(),
+            adjudicator=LocalPairAdjudicator(),
+        )
+    )
+
+
+def test_signature_index_round_trip(tmp_path):
+    """Signature index survives a save/load cycle"""
+    path = tmp_path / "signatures.json"
+
+    index = SignatureIndex(str(path))
+    index.add("a", "sig-1")
+    index.add("b", "sig-1")
+    index.add("c", "sig-2")
+    assert index.save()
+
+    reloaded = SignatureIndex(str(path))
+    assert len(reloaded) == 3
+    assert reloaded.lookup("sig-1") == {"a", "b"}
+
+    reloaded.add("a", "sig-2")
+    assert reloaded.lookup("sig-1") == {"b"}
+    assert reloaded.lookup("sig-2") == {"a", "c"}
+
+
+def test_minhash_lsh_finds_near_duplicates_only():
+    """LSH buckets return the reworded title but not unrelated ones"""
+    index = MinHashLSHIndex(num_perm=128, bands=32)
+    index.add("1", "Microsoft announces $100M AI for Good initiative")
+    index.add("2", "Rwanda opens applications for agritech accelerator")
+    index.add("3", "Gates Foundation funds malaria diagnostics research in Kenya")
+
+    candidates = index.query("Microsoft announces $100M AI for Good initiative!")
+    assert "1" in candidates
+    assert "3" not in candidates
+
+    index.remove("1")
+    assert "1" not in index.query("Microsoft announces $100M AI for Good initiative")
+
+
+def test_tfidf_index_incremental_top_k():
+    """Documents added after the first fit are searchable without a refit"""
+    index = TfidfSimilarityIndex(min_pending_for_refresh=1000)
+    index.add(["1", "2"], [
+        "African Development Bank funds AI customer systems in Ghana and Zambia",
+        "Google invests in AI research centre in Accra",
+    ])
+    index.add(["3"], ["Kenya climate fund backs solar startups"])
+
+    hits = index.search(["Kenya climate fund backs solar startups in Nairobi"], top_k=1)[0]
+    assert hits[0][0] == "3"
+    assert hits[0][1] > 0.8
+
+    assert index.search(["Kenya climate fund"], top_k=5, min_score=0.99) == [[]]
+
+
+async def test_detect_duplicates_batch_matches_within_batch():
+    """Batch detection reports exact matches against the corpus and earlier batch items"""
+    detector = _offline_detector()
+    existing = [
+        {"id": 1, "title": "Microsoft announces $100M AI for Good initiative", "description": "AI startups"},
+        {"id": 2, "title": "Rwanda opens applications for agritech accelerator", "description": "Kigali"},
+    ]
+    new_items = [
+        {"id": "n1", "title": "Microsoft announces $100M AI for Good initiative", "description": "AI startups"},
+        {"id": "n2", "title": "Nigeria launches fintech sandbox", "description": "Lagos"},
+        {"id": "n3", "title": "Nigeria launches fintech sandbox", "description": "Lagos"},
+    ]
+
+    results = await detector.detect_duplicates_batch(new_items, existing)
+
+    assert len(results) == 3
+    assert any(m.original_id == 1 and m.duplicate_type == DuplicateType.EXACT_MATCH for m in results[0])
+    assert any(m.original_id == "n2" for m in results[2])
+
+
+async def test_semantic_engine_batches_and_caches_adjudication():
+    """Only prefiltered pairs reach the adjudicator, several per call, and verdicts are cached"""
+    adjudicator = LocalPairAdjudicator(same_threshold=0.5)
+    engine = SemanticDuplicateEngine(
+        embedder=HashingEmbedder(),
+        adjudicator=adjudicator,
+        top_k=2,
+        min_prefilter_similarity=0.3,
+        pairs_per_prompt=4,
+    )
+    await engine.index(
+        [1, 2, 3],
+        [
+            "Microsoft announces $100M AI for Good initiative for African startups",
+            "Rwanda opens applications for agritech accelerator",
+            "Gates Foundation funds malaria diagnostics research",
+        ],
+    )
+
+    queries = [
+        "Microsoft launches $100M AI for Good initiative for African startups",
+        "Rwanda opens applications for its agritech accelerator programme",
+    ]
+    results = await engine.find_duplicates(queries, min_confidence=0.5)
+
+    assert [c.original_id for c in results[0]] == [1]
+    assert [c.original_id for c in results[1]] == [2]
+    assert adjudicator.calls == 1
+
+    again = await engine.find_duplicates(queries, min_confidence=0.5)
+    assert adjudicator.calls == 1
+    assert again[0][0].cached
+
+
+async def test_batch_items_are_not_indexed_until_registered(tmp_path):
+    """Checked batch items (duplicates included) stay out of the long-lived indexes"""
+    detector = EnhancedDuplicateDetector(
+        signature_index_path=str(tmp_path / "signatures.json"),
+        semantic_engine=SemanticDuplicateEngine(embedder=HashingEmbedder(), adjudicator=LocalPairAdjudicator()),
+    )
+    existing = [{"id": 1, "title": "Rwanda opens applications for agritech accelerator", "description": "Kigali"}]
+    new_items = [
+        {"id": "n1", "title": "Kenya climate fund backs solar startups in Nairobi", "description": "Solar"},
+        {"id": "n2", "title": "Kenya climate fund backs solar start-ups in Nairobi", "description": "Solar"},
+    ]
+
+    results = await detector.detect_duplicates_batch(new_items, existing)
+
+    assert any(m.original_id == "n1" and m.duplicate_type == DuplicateType.TITLE_SIMILARITY for m in results[1])
+    assert len(detector.signature_index) == 1 and "n1" not in detector.signature_index
+    assert set(detector.lsh_items) == {"1"}
+    assert "n1" not in detector.content_index and "n1" not in detector.semantic_engine
+
+    await detector.register_content(new_items[0])
+    assert "n1" in detector.signature_index and "n1" in detector.lsh_items
+
+
+async def test_updated_and_deleted_content_is_invalidated():
+    """A changed title replaces the old index entries; unregistering removes them everywhere"""
+    detector = _offline_detector()
+    original = {"id": 7, "title": "Microsoft announces $100M AI for Good initiative", "description": "AI startups"}
+    old_signature = await detector.register_content(original)
+
+    # An existing row that changed since it was indexed no longer matches its old text
+    updated = {**original, "title": "Gates Foundation funds malaria diagnostics research"}
+    copy_of_original = {"id": "n1", "title": original["title"], "description": original["description"]}
+    results = await detector.detect_duplicates_batch([copy_of_original], [updated])
+    assert not any(m.original_id == 7 for m in results[0])
+    assert detector.signature_index.lookup(old_signature) == set()
+
+    new_signature = await detector.register_content(updated)
+    assert detector.signature_index.lookup(new_signature) == {"7"}
+
+    detector.unregister_content(7)
+    assert 7 not in detector.signature_index and "7" not in detector.lsh_items
+    assert 7 not in detector.content_index and 7 not in detector.semantic_engine
+    assert detector.title_lsh.query(updated["title"]) == set()
+
+
+def test_tfidf_index_removed_documents_leave_results():
+    """Removed documents are masked at once and dropped from the matrix on refresh"""
+    index = TfidfSimilarityIndex(min_pending_for_refresh=1000)
+    index.add(["1", "2"], ["Kenya climate fund backs solar startups", "Google invests in AI research in Accra"])
+
+    assert index.remove(["1", "missing"]) == 1
+    assert index.search(["Kenya climate fund backs solar startups"], top_k=2, min_score=0.1) == [[]]
+
+    index.add(["1"], ["Kenya climate fund backs solar startups"])
+    index.refresh()
+    assert len(index) == 2 and index.ids == ["2", "1"]
+    assert index.search(["Kenya climate fund backs solar startups"], top_k=1)[0][0][0] == "1"
+
+
+def test_pair_adjudicator_requires_adjudicate():
+    """PairAdjudicator is abstract; subclasses must implement adjudicate"""
+    class Incomplete(PairAdjudicator):
+        pass
+
+    with pytest.raises(TypeError):
+        PairAdjudicator()
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+async def test_semantic_engine_compares_items_within_a_batch():
+    """Texts of one batch are adjudicated against the earlier texts of the batch"""
+    adjudicator = LocalPairAdjudicator(same_threshold=0.5)
+    engine = SemanticDuplicateEngine(embedder=HashingEmbedder(), adjudicator=adjudicator,
+                                     min_prefilter_similarity=0.3)
+    texts = [
+        "Microsoft announces $100M AI for Good initiative for African startups",
+        "Rwanda opens applications for agritech accelerator",
+        "Microsoft launches $100M AI for Good initiative for African startups",
+    ]
+
+    results = await engine.find_duplicates(texts, min_confidence=0.5, batch_ids=["n1", "n2", "n3"])
+
+    assert results[0] == [] and results[1] == []
+    assert [candidate.original_id for candidate in results[2]] == ["n1"]
+    assert len(engine) == 0
+    assert await engine.find_duplicates(texts, min_confidence=0.5) == [[], [], []]
+
+
+async def test_semantic_engine_compacts_removed_rows():
+    """Removed rows are dropped from the matrix once they pass max_removed_fraction"""
+    engine = SemanticDuplicateEngine(embedder=HashingEmbedder(), adjudicator=LocalPairAdjudicator(same_threshold=0.5),
+                                     min_prefilter_similarity=0.3)
+    texts = [f"Call {n}: grants for AI research on topic {n} across Africa" for n in range(8)]
+    await engine.index(list(range(8)), texts)
+
+    assert engine.remove([0]) == 1
+    assert engine._size == 8 and engine._removed == {0}
+
+    assert engine.remove([1, 2]) == 2
+    assert engine._size == 5 and not engine._removed
+    assert engine.ids == [3, 4, 5, 6, 7] and 0 not in engine
+
+    results = await engine.find_duplicates([texts[5]], min_confidence=0.5)
+    assert [candidate.original_id for candidate in results[0]][:1] == [5]
@@ -0,0 +1,63 @@
+"""
+Tests for the shared embedding service (caching and micro-batching)
+"""
+
+import asyncio
+
+import numpy as np
+
+from app.core.embedding_service import EmbeddingService, get_embedding_service
+
+
+class CountingModel:
+    """Tiny stand-in for a SentenceTransformer that records encode calls"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=None, show_progress_bar=None):
+        self.calls.append(list(texts))
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def _service_with_model(**kwargs):
+    service = EmbeddingService(**kwargs)
+    service._model = CountingModel()
+    return service
+
+
+def test_get_embedding_service_is_shared():
+    assert get_embedding_service("model-a") is get_embedding_service("model-a")
+    assert get_embedding_service("model-a") is not get_embedding_service("model-b")
+
+
+def test_encode_serves_repeats_from_cache():
+    service = _service_with_model()
+
+    first = service.encode(["grant", "fund", "grant"])
+    second = service.encode(["fund"])
+
+    assert first.shape == (3, 2)
+    assert np.array_equal(second[0], first[1])
+    assert service._model.calls == [["grant", "fund"]]
+
+
+def test_disk_cache_survives_new_service(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    _service_with_model(cache_path=path).encode(["accelerator"])
+
+    restarted = _service_with_model(cache_path=path)
+    restarted.encode(["accelerator"])
+
+    assert restarted._model.calls == []
+    assert restarted.get_stats()["disk_hits"] == 1
+
+
+async def test_concurrent_encode_async_is_micro_batched():
+    service = _service_with_model(max_batch_delay_ms=20)
+
+    results = await asyncio.gather(*(service.encode_async([f"text {i}"]) for i in range(8)))
+
+    assert len(results) == 8
+    assert all(result.shape == (1, 2) for result in results)
+    assert len(service._model.calls) == 1
@@ -0,0 +1,101 @@
+"""
+Tests for the keyset-paginated /funding-opportunities/feed endpoint
+"""
+
+import copy
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.endpoints.funding_opportunities import router
+from app.core.database import get_db
+
+FEED_ROWS = [
+    {'id': 3, 'title': 'AI grant', 'created_at': '2025-03-03T00:00:00+00:00',
+     'funding_types': {'name': 'Grant', 'category': 'grant', 'requires_equity': False},
+     'organizations': {'name': 'Fund A'}, 'ai_domains': [{'name': 'Health AI'}]},
+    {'id': 2, 'title': 'Seed round', 'created_at': '2025-03-02T00:00:00+00:00',
+     'funding_types': {'name': 'Seed', 'category': 'investment', 'requires_equity': True},
+     'organizations': {'name': 'Fund B'}, 'ai_domains': [{'name': 'Agritech'}]},
+    {'id': 1, 'title': 'Research grant', 'created_at': '2025-03-01T00:00:00+00:00',
+     'funding_types': {'name': 'Grant', 'category': 'grant', 'requires_equity': False},
+     'organizations': {'name': 'Fund C'}, 'ai_domains': [{'name': 'Agritech'}]},
+]
+
+
+def _matches(value, operator, expected):
+    if operator == 'ilike':
+        return expected.strip('%').lower() in str(value).lower()
+    return value == expected
+
+
+class _FeedQuery:
+    """
+    PostgREST stand-in for the feed table: a filter on an embedded relation
+    drops parent rows only when the relation is embedded with !inner
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.row_limit = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def filter(self, column, operator, value):
+        self.filters.append((column, operator, value))
+        return self
+
+    def order(self, *args, **kwargs):
+        return self
+
+    def limit(self, row_limit):
+        self.row_limit = row_limit
+        return self
+
+    def execute(self):
+        rows = []
+        for row in copy.deepcopy(self.rows):
+            keep = True
+            for column, operator, value in self.filters:
+                relation, field = column.split('.')
+                embed = re.search(rf'{relation}![^(]*\(', self.columns)
+                assert embed, f"{relation} is filtered but not embedded"
+                embedded = row[relation] if isinstance(row[relation], list) else [row[relation]]
+                matching = [item for item in embedded if _matches(item[field], operator, value)]
+                if embed.group().endswith('!inner('):
+                    keep = keep and bool(matching)
+                row[relation] = matching if isinstance(row[relation], list) else (matching or [None])[0]
+            if keep:
+                rows.append(row)
+        return type('Response', (), {'data': rows[:self.row_limit]})()
+
+
+class _FeedClient:
+    def table(self, name):
+        assert name == 'africa_intelligence_feed'
+        return _FeedQuery(FEED_ROWS)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router, prefix='/funding-opportunities')
+    app.dependency_overrides[get_db] = lambda: _FeedClient()
+    return TestClient(app)
+
+
+@pytest.mark.parametrize('params, expected_ids', [
+    ({'funding_type': 'grant'}, [3, 1]),
+    ({'requires_equity': 'true'}, [2]),
+    ({'ai_domain': 'agri'}, [2, 1]),
+])
+def test_relation_filters_select_the_same_rows_in_every_view(client, params, expected_ids):
+    for view in ('card', 'compact'):
+        response = client.get('/funding-opportunities/feed', params={**params, 'view': view})
+        assert response.status_code == 200
+        assert [item['id'] for item in response.json()['items']] == expected_ids, view
@@ -0,0 +1,263 @@
+"""
+Tests for HighVolumeDataPipeline's single-event-loop execution mode
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.data_ingestion.bulk_writer import BulkUpsertWriter
+from app.services.data_ingestion.high_volume_pipeline import (
+    DataSource,
+    HighVolumeDataPipeline,
+    SourceType,
+)
+from app.services.search_cache import get_search_cache
+
+RSS_BODY = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+<item><title>AI funding for African startups</title>
+<link>https://example.org/{n}</link>
+<description>A new grant programme funds AI research and startups across Africa.</description></item>
+</channel></rss>"""
+
+
+class _Table:
+    def __init__(self, fail):
+        self.fail = fail
+
+    def upsert(self, rows, on_conflict=None):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if self.fail:
+            raise RuntimeError("insert failed")
+        return self
+
+
+class _Client:
+    """Supabase stand-in whose upserts succeed or fail"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def table(self, name):
+        return _Table(self.fail)
+
+
+async def _collect_and_store(pipeline, source):
+    items = await pipeline._collect_rss_data(source)
+    if items:
+        await pipeline._store_items(items, source)
+        await pipeline.bulk_writer.flush()
+    return items
+
+
+async def _feed_server():
+    requests = []
+
+    async def feed(request):
+        requests.append(request.match_info["n"])
+        return web.Response(text=RSS_BODY.format(n=request.match_info["n"]), content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/feed/{n}", feed)
+    server = TestServer(app)
+    await server.start_server()
+    return server, requests
+
+
+async def test_async_mode_processes_sources_on_one_loop(tmp_path, monkeypatch):
+    """Hundreds of RSS sources are fetched over the shared session well above 500/min"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    server, requests = await _feed_server()
+    pipeline = HighVolumeDataPipeline(execution_mode="async", per_domain_concurrency=50)
+    await pipeline._initialize_http()
+
+    pipeline.sources = [
+        DataSource(
+            name=f"feed-{n}",
+            url=str(server.make_url(f"/feed/{n}")),
+            source_type=SourceType.RSS,
+            keywords=["AI", "Africa"],
+            rate_limit_delay=0.0,
+        )
+        for n in range(300)
+    ]
+
+    try:
+        started = time.monotonic()
+        await pipeline.start_pipeline()
+        while any(source.last_check is None for source in pipeline.sources):
+            assert time.monotonic() - started < 30
+            await asyncio.sleep(0.05)
+        elapsed = time.monotonic() - started
+    finally:
+        await pipeline.stop_pipeline()
+        await server.close()
+
+    assert len(requests) == 300
+    assert all(source.items_collected_total == 1 for source in pipeline.sources)
+    assert 300 / elapsed * 60 > 500
+    assert pipeline.http_session.closed
+
+
+async def test_conditional_fetch_short_circuits_unchanged_feeds(tmp_path, monkeypatch):
+    """ETag feeds answer 304 and validator-less feeds are matched by body hash; neither is re-parsed"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    conditional_hits = []
+
+    async def etag_feed(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            conditional_hits.append(request.path)
+            return web.Response(status=304)
+        return web.Response(text=RSS_BODY.format(n="etag"), headers={"ETag": '"v1"'},
+                            content_type="application/rss+xml")
+
+    async def plain_feed(request):
+        return web.Response(text=RSS_BODY.format(n="plain"), content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/etag", etag_feed)
+    app.router.add_get("/plain", plain_feed)
+    server = TestServer(app)
+    await server.start_server()
+
+    pipeline = HighVolumeDataPipeline(execution_mode="async")
+    pipeline.bulk_writer = BulkUpsertWriter(_Client(), max_retries=0)
+    await pipeline._initialize_http()
+
+    parsed = []
+    parse_feed = pipeline._parse_feed
+
+    async def counting_parse(body):
+        parsed.append(body)
+        return await parse_feed(body)
+
+    pipeline._parse_feed = counting_parse
+    sources = [
+        DataSource(name=name, url=str(server.make_url(f"/{name}")), source_type=SourceType.RSS,
+                   keywords=["AI", "Africa"])
+        for name in ("etag", "plain")
+    ]
+
+    try:
+        first = [await _collect_and_store(pipeline, source) for source in sources]
+        productivity = [source.get_productivity_score() for source in sources]
+        second = [await _collect_and_store(pipeline, source) for source in sources]
+    finally:
+        await pipeline.http_session.close()
+        await server.close()
+
+    assert [len(items) for items in first] == [1, 1]
+    assert second == [[], []]
+    assert len(parsed) == 2
+    assert conditional_hits == ["/etag"]
+    assert sources[0].etag == '"v1"'
+    # Unchanged checks are not zero-yield runs
+    assert [source.get_productivity_score() for source in sources] == productivity == [1.0, 1.0]
+
+    stats = pipeline.feed_fetcher.get_stats()
+    assert stats["not_modified"] == 1 and stats["unchanged_bodies"] == 1
+    assert stats["parse_skip_ratio"] == 0.5
+
+
+async def test_validators_are_kept_only_once_items_are_stored(tmp_path, monkeypatch):
+    """A feed whose items failed to store is fetched in full again, not answered with a 304"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    conditional_hits = []
+
+    async def etag_feed(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            conditional_hits.append(request.path)
+            return web.Response(status=304)
+        return web.Response(text=RSS_BODY.format(n="etag"), headers={"ETag": '"v1"'},
+                            content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/etag", etag_feed)
+    server = TestServer(app)
+    await server.start_server()
+
+    pipeline = HighVolumeDataPipeline(execution_mode="async")
+    pipeline.bulk_writer = BulkUpsertWriter(_Client(fail=True), max_retries=0)
+    await pipeline._initialize_http()
+    source = DataSource(name="etag", url=str(server.make_url("/etag")), source_type=SourceType.RSS,
+                        keywords=["AI", "Africa"])
+
+    try:
+        items = await pipeline._collect_rss_data(source)
+        assert source.etag is None and source.pending_fetch is not None
+
+        await pipeline._store_items(items, source)
+        await pipeline.bulk_writer.flush()
+        assert source.etag is None and source.pending_fetch is None
+        assert pipeline.stats.total_errors == 1
+
+        pipeline.bulk_writer.client.fail = False
+        assert len(await _collect_and_store(pipeline, source)) == 1
+        assert source.etag == '"v1"'
+        assert await _collect_and_store(pipeline, source) == []
+    finally:
+        await pipeline.http_session.close()
+        await server.close()
+
+    assert conditional_hits == ["/etag"]
+
+
+async def test_stored_batches_invalidate_cached_search_rankings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    pipeline = HighVolumeDataPipeline(execution_mode="async")
+    pipeline.bulk_writer = BulkUpsertWriter(_Client(), max_retries=0)
+    pipeline.bulk_writer.add_listener(pipeline._invalidate_search_cache)
+    cache = get_search_cache()
+    generation = await cache.current_generation()
+
+    await pipeline.bulk_writer.add([{"source_url": "https://example.org/1", "title": "AI grant"}])
+    assert await cache.current_generation() == generation
+
+    await pipeline.bulk_writer.flush()
+    assert await cache.current_generation() != generation
+
+
+async def test_rate_limited_source_does_not_hold_a_fetch_slot(tmp_path, monkeypatch):
+    """With one fetch slot, a source waiting on its domain's rate limit lets another domain's source run"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    server, requests = await _feed_server()
+    pipeline = HighVolumeDataPipeline(execution_mode="async", max_concurrent_fetches=1)
+    pipeline.bulk_writer = BulkUpsertWriter(_Client(), max_retries=0)
+    pipeline._fetch_semaphore = asyncio.Semaphore(1)
+    pipeline._async_source_queue = asyncio.PriorityQueue()
+    await pipeline._initialize_http()
+
+    waiting, ready = (
+        DataSource(name=name, url=str(server.make_url(f"/feed/{name}")).replace("127.0.0.1", host),
+                   source_type=SourceType.RSS, keywords=["AI", "Africa"], rate_limit_delay=delay)
+        for name, host, delay in (("waiting", "127.0.0.1", 2.0), ("ready", "localhost", 0.0))
+    )
+    await pipeline._apply_rate_limit(waiting)
+    for source in (waiting, ready):
+        pipeline._async_source_queue.put_nowait((0, 0, source))
+
+    try:
+        waiting_task = asyncio.create_task(pipeline._run_source(waiting))
+        await asyncio.sleep(0.05)
+        await asyncio.wait_for(pipeline._run_source(ready), timeout=1.0)
+        assert requests == ["ready"] and not waiting_task.done()
+        waiting_task.cancel()
+    finally:
+        await pipeline.http_session.close()
+        await server.close()
@@ -0,0 +1,73 @@
+"""
+Tests for the projected result loading and ranking of intelligent search
+"""
+
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.endpoints.intelligent_search import RESULT_COLUMNS, IntelligentSearchService, _ResultRows
+from app.services.search_filters import quality_predicates
+
+ResultRow = namedtuple('ResultRow', [column.key for column in RESULT_COLUMNS])
+
+
+class _RecordingSession:
+    """Records the SQL of executed statements and answers with canned rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def _row(opportunity_id, deadline=None, relevance=0.8):
+    return ResultRow(
+        id=opportunity_id, title=f"Grant {opportunity_id}", description='AI research funding',
+        funding_amount='$50,000', currency='USD', application_deadline=deadline,
+        application_url='https://example.org/apply', eligibility_criteria='African startups',
+        source_url='https://example.org', relevance_score=relevance, validation_status='approved',
+        created_at=datetime(2025, 1, 1), updated_at=None
+    )
+
+
+def test_result_rows_load_projects_real_columns_once_per_id():
+    db = _RecordingSession([_row(1, date(2025, 7, 1)), _row(2)])
+    rows = _ResultRows()
+
+    rows.load(db, [1, 2, 1], quality_predicates(None, 0.6))
+    rows.load(db, [2, 1], quality_predicates(None, 0.6))
+
+    assert len(db.statements) == 1
+    sql = db.statements[0]
+    assert 'africa_intelligence_feed.deadline AS application_deadline' in sql
+    assert 'africa_intelligence_feed.overall_relevance_score AS relevance_score' in sql
+    assert 'africa_intelligence_feed.raw_data ->> %(raw_data_1)s::TEXT AS eligibility_criteria' in sql
+    assert 'search_vector' not in sql
+
+    first = rows.get(1)
+    assert first['application_deadline'] == '2025-07-01' and first['created_at'] == '2025-01-01T00:00:00'
+    assert rows.deadlines[1] == datetime(2025, 7, 1).timestamp()
+    assert rows.get(3) is None
+
+
+async def test_rank_and_format_results_combines_relevance_similarity_and_urgency():
+    rows = _ResultRows()
+    soon = (datetime.now() + timedelta(days=10)).date()
+    results = [
+        {**rows.add(_row(1, relevance=0.5)), 'vector_similarity_score': 0.6},
+        {**rows.add(_row(2, deadline=soon, relevance=0.5)), 'vector_similarity_score': 0.6},
+        {**rows.add(_row(3, relevance=0.9)), 'text_rank': 0.9},
+    ]
+
+    ranked = await IntelligentSearchService()._rank_and_format_results(results, 'ai', rows.deadlines)
+
+    assert [result['id'] for result in ranked] == [3, 2, 1]
+    assert abs(ranked[1]['composite_score'] - ranked[2]['composite_score'] - 0.01) < 1e-9
@@ -0,0 +1,97 @@
+"""
+Tests for the buffered SQLite metrics writer and its rollups
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from app.services.data_ingestion.metrics_writer import BufferedMetricsWriter, read_rollups
+from app.services.data_ingestion.monitoring_system import (
+    ComprehensiveMonitoringSystem, MetricType, MonitoringConfig
+)
+
+
+def test_batches_raw_rows_and_rollups(tmp_path):
+    path = str(tmp_path / "metrics.db")
+    writer = BufferedMetricsWriter(path, batch_size=100, flush_interval_seconds=0.05)
+    base = datetime(2025, 1, 1, 12, 0, 0)
+    for i in range(250):
+        writer.submit('latency', float(i), 'gauge', base + timedelta(seconds=i), {'stage': 'rss'})
+    assert writer.flush()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('SELECT COUNT(*) FROM metrics').fetchone()[0] == 250
+
+    # 250 seconds span five 1-minute buckets and one hour bucket
+    minute = read_rollups(conn, base.timestamp(), resolution=60)['latency']
+    hour = read_rollups(conn, base.timestamp(), resolution=3600)['latency']
+    for summary in (minute, hour):
+        assert summary == {'avg': 124.5, 'count': 250, 'min': 0.0, 'max': 249.0}
+    assert conn.execute('SELECT COUNT(*) FROM metric_rollups WHERE resolution = 60').fetchone()[0] == 5
+
+    stats = writer.get_stats()
+    assert stats['rows_written'] == 250 and stats['batches'] >= 3
+    writer.close()
+
+
+def test_overload_keeps_rollups_complete(tmp_path):
+    path = str(tmp_path / "metrics.db")
+    writer = BufferedMetricsWriter(path, max_queue_size=10, flush_interval_seconds=0.05)
+    now = datetime.now()
+    for i in range(5000):
+        writer.submit('items', 1.0, 'counter', now, {})
+    writer.close()
+
+    stats = writer.get_stats()
+    assert stats['aggregated_only'] > 0 and stats['dropped'] == 0
+    assert stats['rows_written'] + stats['aggregated_only'] == 5000
+
+    conn = sqlite3.connect(path)
+    assert read_rollups(conn, now.timestamp() - 60)['items']['count'] == 5000
+
+
+def test_failed_write_keeps_rollups_and_alerts_for_the_next_batch(tmp_path):
+    path = str(tmp_path / "metrics.db")
+    writer = BufferedMetricsWriter(path, flush_interval_seconds=0.05)
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE fail_writes (x INTEGER);
+        INSERT INTO fail_writes VALUES (1);
+        CREATE TRIGGER fail_metrics BEFORE INSERT ON metrics WHEN EXISTS (SELECT 1 FROM fail_writes)
+        BEGIN SELECT RAISE(ABORT, 'disk I/O error'); END;
+    ''')
+
+    now = datetime.now()
+    writer.submit('latency', 5.0, 'gauge', now, {})
+    writer.submit_alert(('alert-1', 'critical', 'Latency', '', 'latency', 5.0, 1.0, now.isoformat(), '{}'))
+    assert writer.flush()
+    assert conn.execute('SELECT COUNT(*) FROM alerts').fetchone()[0] == 0
+    assert not writer.is_healthy() and writer.get_stats()['write_errors'] >= 1
+
+    conn.execute('DELETE FROM fail_writes')
+    conn.commit()
+    assert writer.flush()
+
+    assert conn.execute('SELECT alert_id FROM alerts').fetchall() == [('alert-1',)]
+    assert read_rollups(conn, now.timestamp() - 60)['latency']['count'] == 1
+    assert writer.is_healthy()
+    stats = writer.get_stats()
+    assert stats['aggregated_only'] == 1 and stats['dropped'] == 0 and stats['write_errors'] >= 1
+    writer.close()
+
+
+def test_dashboard_reads_rollups(tmp_path):
+    config = MonitoringConfig(database_path=str(tmp_path / "monitoring.db"), prometheus_enabled=False,
+                              enable_anomaly_detection=False, metrics_flush_interval_seconds=0.05)
+    monitor = ComprehensiveMonitoringSystem(config)
+    for value in (10.0, 20.0, 30.0):
+        monitor.record_metric('pipeline_items_processed', value, MetricType.GAUGE)
+    assert monitor.metrics_writer.flush()
+
+    dashboard = monitor.get_dashboard_data()
+    assert dashboard['metrics_summary']['pipeline_items_processed'] == {
+        'avg': 20.0, 'count': 3, 'min': 10.0, 'max': 30.0
+    }
+    assert dashboard['metrics_writer']['rows_written'] == 3
+    monitor.metrics_writer.close()
@@ -0,0 +1,105 @@
+"""
+Tests for HighVolumeNewsAPICollector's async collection mode and quotas
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.data_ingestion.news_api_collector import APIQuota, HighVolumeNewsAPICollector, NewsQuery
+from app.services.data_ingestion.seen_filter import RotatingSeenFilter
+
+RSS = """<?xml version="1.0"?><rss version="2.0"><channel><title>News</title>
+<item><title>AI funding round for {q} startup in Africa</title><link>https://news.example/{q}</link>
+<description>Investment in artificial intelligence across Africa.</description></item>
+</channel></rss>"""
+
+
+async def _mock_news_server(latency: float):
+    hits = {"newsapi": 0, "google_news": 0}
+
+    async def everything(request):
+        hits["newsapi"] += 1
+        await asyncio.sleep(latency)
+        q = request.query["q"]
+        return web.json_response({"status": "ok", "articles": [{
+            "title": f"AI funding for {q} in Africa",
+            "description": "Grant funding for African AI startups",
+            "url": f"https://newsapi.example/{q}",
+            "source": {"name": "Example"},
+            "publishedAt": "2025-01-01T00:00:00Z",
+        }]})
+
+    async def rss(request):
+        hits["google_news"] += 1
+        await asyncio.sleep(latency)
+        return web.Response(text=RSS.format(q=request.query["q"]), content_type="application/rss+xml")
+
+    app = web.Application()
+    app.router.add_get("/v2/everything", everything)
+    app.router.add_get("/rss/search", rss)
+    server = TestServer(app)
+    await server.start_server()
+    return server, hits
+
+
+def _collector(server, monkeypatch, tmp_path, **kwargs) -> HighVolumeNewsAPICollector:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir(exist_ok=True)
+    monkeypatch.setenv("NEWS_API_KEY", "test-key")
+    for name in ("GNEWS_API_KEY", "BING_NEWS_API_KEY", "MEDIASTACK_API_KEY", "TAVILY_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+
+    collector = HighVolumeNewsAPICollector(execution_mode="async", seen_filter=RotatingSeenFilter(capacity=1000),
+                                           **kwargs)
+    collector.initialize_apis()
+    collector.api_configs["newsapi"].base_url = str(server.make_url("/v2"))
+    collector.api_configs["google_news"].base_url = str(server.make_url("/rss"))
+    collector.queries = [NewsQuery(query=f"q{i}") for i in range(30)]
+    return collector
+
+
+async def test_async_mode_fans_out_queries_and_apis(monkeypatch, tmp_path):
+    server, hits = await _mock_news_server(latency=0.2)
+    collector = _collector(server, monkeypatch, tmp_path)
+    try:
+        started = time.monotonic()
+        articles = await collector.collect_all_queries_async()
+        elapsed = time.monotonic() - started
+    finally:
+        await server.close()
+
+    assert hits == {"newsapi": 30, "google_news": 30}
+    assert len(articles) == 60
+    # 60 requests at 200ms each: concurrent, not serial (12s)
+    assert elapsed < 2.0
+
+    # A second pass finds only duplicates
+    server, hits = await _mock_news_server(latency=0)
+    collector.api_configs["newsapi"].base_url = str(server.make_url("/v2"))
+    collector.api_configs["google_news"].base_url = str(server.make_url("/rss"))
+    try:
+        assert await collector.collect_all_queries_async() == []
+    finally:
+        await server.close()
+    assert collector.stats["duplicates_filtered"] == 60
+
+
+async def test_token_bucket_quota_is_exact_under_concurrency(monkeypatch, tmp_path):
+    server, hits = await _mock_news_server(latency=0)
+    collector = _collector(server, monkeypatch, tmp_path, quota_wait_seconds=0.5)
+    # 10 requests of burst, then one every 6s: only the burst fits in the wait window
+    collector.api_quotas["newsapi"] = APIQuota(api_name="newsapi", requests_limit=1000, rate_limit_remaining=10)
+    # Daily cap of 7 for Google News
+    collector.api_quotas["google_news"] = APIQuota(api_name="google_news", requests_limit=7, rate_limit_remaining=600)
+    try:
+        await collector.collect_all_queries_async()
+    finally:
+        await server.close()
+
+    assert hits == {"newsapi": 10, "google_news": 7}
+    assert collector.api_quotas["newsapi"].requests_made == 10
+    assert collector.api_quotas["google_news"].requests_made == 7
+    assert collector.stats["quota_exceeded"] == 20 + 23
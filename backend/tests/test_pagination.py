@@ -0,0 +1,49 @@
+"""
+Tests for keyset pagination cursors, filters and ETags
+"""
+
+import pytest
+
+from app.utils.pagination import (
+    InvalidCursorError, compute_etag, decode_cursor, encode_cursor, etag_matches, keyset_filter, page_of
+)
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    cursor = encode_cursor('2025-03-01T10:00:00+00:00', 42)
+    assert '=' not in cursor and '+' not in cursor
+    assert decode_cursor(cursor) == ('2025-03-01T10:00:00+00:00', 42)
+    assert decode_cursor(encode_cursor(None, 7)) == (None, 7)
+
+    with pytest.raises(InvalidCursorError):
+        decode_cursor('not-a-cursor')
+
+
+def test_keyset_filter_continues_after_the_cursor_row():
+    assert keyset_filter('2025-03-01T10:00:00+00:00', 42) == (
+        'created_at.lt."2025-03-01T10:00:00+00:00",'
+        'and(created_at.eq."2025-03-01T10:00:00+00:00",id.lt.42)'
+    )
+    # Undated rows sort first, so every dated row still follows
+    assert keyset_filter(None, 7) == 'and(created_at.is.null,id.lt.7),created_at.not.is.null'
+
+
+def test_page_of_uses_the_extra_row_to_detect_more_pages():
+    rows = [{'id': i, 'created_at': f'2025-01-{30 - i:02d}'} for i in range(1, 5)]
+
+    page, next_cursor = page_of(rows, 3)
+    assert [row['id'] for row in page] == [1, 2, 3]
+    assert decode_cursor(next_cursor) == ('2025-01-27', 3)
+
+    assert page_of(rows, 4) == (rows, None)
+    assert page_of([], 10) == ([], None)
+
+
+def test_etag_matching_accepts_weak_strong_and_wildcard_forms():
+    etag = compute_etag(b'{"items": []}')
+    assert etag.startswith('W/"')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag[2:]}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(compute_etag(b'{}'), etag)
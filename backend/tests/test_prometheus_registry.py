@@ -0,0 +1,58 @@
+"""
+Tests for the bounded-cardinality Prometheus registry
+"""
+
+from datetime import datetime
+
+from prometheus_client import CollectorRegistry, generate_latest
+
+from app.services.data_ingestion.monitoring_system import Metric, MetricsCollector, MetricType, MonitoringConfig
+from app.services.data_ingestion.prometheus_registry import BoundedMetricRegistry
+
+
+def test_series_are_capped_with_overflow_label():
+    registry = CollectorRegistry()
+    metrics = BoundedMetricRegistry(registry=registry, max_series_per_metric=50)
+
+    for i in range(1000):
+        metrics.record('crawl_batch_items', 'counter', 1, {'batch_id': f"batch_{i}"})
+
+    metric = metrics.get('crawl_batch_items')
+    assert metric.series_count == 51
+    assert registry.get_sample_value('crawl_batch_items_total', {'batch_id': 'other'}) == 950
+    assert registry.get_sample_value('metric_series_overflow_total', {'metric': 'crawl_batch_items'}) == 950
+
+    # Existing series keep recording after the cap is reached
+    metrics.record('crawl_batch_items', 'counter', 2, {'batch_id': 'batch_3'})
+    assert registry.get_sample_value('crawl_batch_items_total', {'batch_id': 'batch_3'}) == 3
+
+    # Exposition size stays proportional to the cap, not to the batches seen
+    for i in range(1000, 5000):
+        metrics.record('crawl_batch_items', 'counter', 1, {'batch_id': f"batch_{i}"})
+    assert metric.series_count == 51
+    assert generate_latest(registry).count(b'crawl_batch_items_total{') == 51
+
+
+def test_declared_schema_and_bound_children():
+    registry = CollectorRegistry()
+    collector = MetricsCollector(MonitoringConfig(prometheus_max_series_per_metric=10),
+                                 registry=registry, start_server=False)
+    collector.declare_prometheus_metric('items_processed', MetricType.COUNTER, labels=['component'])
+
+    # Undeclared tags are ignored, missing ones are exported as ""
+    collector.record_metric(Metric('items_processed', 5, MetricType.COUNTER, datetime.now(),
+                                   tags={'component': 'rss', 'batch_id': 'batch_1'}))
+    collector.record_metric(Metric('items_processed', 2, MetricType.COUNTER, datetime.now()))
+    assert registry.get_sample_value('items_processed_total', {'component': 'rss'}) == 5
+    assert registry.get_sample_value('items_processed_total', {'component': ''}) == 2
+
+    hot = collector.bind_prometheus_metric('items_processed', MetricType.COUNTER, component='news')
+    assert hot is collector.bind_prometheus_metric('items_processed', MetricType.COUNTER, component='news')
+    for _ in range(100):
+        hot.inc()
+    assert registry.get_sample_value('items_processed_total', {'component': 'news'}) == 100
+
+    # Metrics first seen through record_metric take their schema from the first sample
+    collector.record_metric(Metric('queue-depth', 7, MetricType.GAUGE, datetime.now(), tags={'queue': 'high'}))
+    assert registry.get_sample_value('queue_depth', {'queue': 'high'}) == 7
+    assert collector.prometheus.get_stats()['series'] == 4
@@ -0,0 +1,159 @@
+"""
+Tests for RedisQueueManager multi-priority dequeue and pipelined writes
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+
+import json
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.core.etl_architecture import ETLConfig, ETLTask, PipelineStage, Priority
+from app.core.queue_manager import BatchProcessingManager, RedisQueueManager
+
+
+def _task(priority: Priority, payload=None) -> ETLTask:
+    return ETLTask(
+        id=str(uuid.uuid4()),
+        stage=PipelineStage.INGESTION,
+        priority=priority,
+        source_type="rss",
+        source_id="feed",
+        payload=payload or {"url": "https://example.com/feed"},
+        created_at=datetime.now()
+    )
+
+
+def _manager() -> RedisQueueManager:
+    manager = RedisQueueManager(ETLConfig())
+    manager.redis_client = fakeredis.aioredis.FakeRedis(decode_responses=False)
+    return manager
+
+
+async def test_dequeue_serves_every_priority_by_weight():
+    """MEDIUM and LOW tasks are dequeued even while higher priorities are backlogged"""
+    manager = _manager()
+    for priority in Priority:
+        for _ in range(20):
+            await manager.enqueue_task(_task(priority))
+
+    served = {priority: 0 for priority in Priority}
+    for _ in range(15):
+        task = await manager.dequeue_task(PipelineStage.INGESTION, timeout=1)
+        served[task.priority] += 1
+
+    assert served == {Priority.CRITICAL: 8, Priority.HIGH: 4, Priority.MEDIUM: 2, Priority.LOW: 1}
+
+
+async def test_dequeue_falls_through_to_non_empty_queue():
+    """A LOW task is dequeued immediately when it is the only work"""
+    manager = _manager()
+    task = _task(Priority.LOW)
+    await manager.enqueue_task(task)
+
+    dequeued = await manager.dequeue_task(PipelineStage.INGESTION, timeout=1)
+
+    assert dequeued.id == task.id
+    assert await manager.redis_client.hget(f"task:{task.id}", "status") == b"processing"
+    metrics_key = f"metrics:{manager._get_queue_name(PipelineStage.INGESTION, Priority.LOW)}"
+    assert await manager.redis_client.hgetall(metrics_key) == {b"enqueued": b"1", b"dequeued": b"1"}
+
+
+async def test_batch_enqueue_tracks_tasks():
+    manager = _manager()
+    tasks = [_task(Priority.HIGH), _task(Priority.MEDIUM)]
+
+    task_ids = await BatchProcessingManager(manager, ETLConfig()).enqueue_batch(tasks)
+
+    stats = await manager.get_queue_stats()
+    assert task_ids == [task.id for task in tasks]
+    assert stats["summary"]["total_queued"] == 2
+    assert await manager.redis_client.hget(f"task:{tasks[0].id}", "status") == b"queued"
+
+
+async def test_delayed_tasks_are_promoted_when_due():
+    """Retries wait in the delayed set and land in their priority queue once due"""
+    manager = _manager()
+    due, later = _task(Priority.MEDIUM), _task(Priority.LOW)
+    await manager._schedule_delayed_task(due, 0)
+    await manager._schedule_delayed_task(later, 3600)
+
+    assert await manager.promote_due_tasks(batch_size=10) == 1
+
+    dequeued = await manager.dequeue_task(PipelineStage.INGESTION, timeout=1)
+    stats = await manager.get_queue_stats()
+    assert dequeued.id == due.id
+    assert stats["delayed"]["size"] == 1
+    assert stats["delayed"]["promoted"] == 1
+    assert stats["delayed"]["scheduler_lag_seconds"] == 0.0
+
+
+async def test_promoter_loop_stops_and_releases_lease():
+    manager = _manager()
+    await manager._schedule_delayed_task(_task(Priority.HIGH), 0)
+    stop = asyncio.Event()
+
+    promoter = asyncio.create_task(manager.run_delayed_promoter(stop, max_idle_seconds=0.05))
+    await asyncio.sleep(0.2)
+    stop.set()
+    await promoter
+
+    assert manager.scheduler_stats["promoted"] == 1
+    assert await manager.redis_client.get(RedisQueueManager.PROMOTER_LEASE_KEY) is None
+
+
+async def test_large_payloads_are_stored_once_and_legacy_json_still_reads():
+    """Big payloads move out of line (shared by content hash); old JSON entries decode"""
+    manager = _manager()
+    body = {"url": "https://example.com/a", "content": "Funding call for AI startups. " * 2000}
+    first, second = _task(Priority.HIGH, body), _task(Priority.HIGH, body)
+    await manager.enqueue_task(first)
+    await manager.enqueue_task(second)
+
+    legacy = _task(Priority.LOW)
+    await manager.redis_client.zadd(
+        manager._get_queue_name(PipelineStage.INGESTION, Priority.LOW),
+        {json.dumps(legacy.to_dict(), default=str): 0}
+    )
+
+    payload_keys = await manager.redis_client.keys("taifa_etl:payload:*")
+    queued = await manager.redis_client.zrange(
+        manager._get_queue_name(PipelineStage.INGESTION, Priority.HIGH), 0, -1
+    )
+    assert len(payload_keys) == 1
+    assert all(len(entry) < 200 for entry in queued)
+
+    dequeued = [await manager.dequeue_task(PipelineStage.INGESTION, timeout=1) for _ in range(3)]
+    by_id = {task.id: task for task in dequeued}
+    assert by_id[first.id].payload == body
+    assert by_id[first.id].created_at == first.created_at
+    assert by_id[legacy.id].payload == legacy.payload
+
+
+async def test_entry_with_expired_payload_is_dead_lettered_not_lost():
+    manager = _manager()
+    task = _task(Priority.HIGH, {"content": "Funding call for AI startups. " * 2000})
+    await manager.enqueue_task(task)
+    await manager.redis_client.delete(*await manager.redis_client.keys("taifa_etl:payload:*"))
+
+    assert await manager.dequeue_task(PipelineStage.INGESTION, timeout=1) is None
+
+    queue_name = manager._get_queue_name(PipelineStage.INGESTION, Priority.HIGH)
+    undecodable = await manager.redis_client.lrange(RedisQueueManager.UNDECODABLE_QUEUE, 0, -1)
+    assert len(undecodable) == 1 and undecodable[0].startswith(queue_name.encode() + b"|")
+    assert await manager.redis_client.zcard(queue_name) == 0
+
+
+async def test_promotion_refreshes_the_payload_ttl():
+    manager = _manager()
+    await manager._schedule_delayed_task(_task(Priority.HIGH, {"content": "AI grants. " * 5000}), 0)
+    payload_key = (await manager.redis_client.keys("taifa_etl:payload:*"))[0]
+    await manager.redis_client.expire(payload_key, 5)
+
+    assert await manager.promote_due_tasks() == 1
+    assert await manager.redis_client.ttl(payload_key) > 5
+    assert (await manager.dequeue_task(PipelineStage.INGESTION, timeout=1)).payload["content"].startswith("AI grants")
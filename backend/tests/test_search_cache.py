@@ -0,0 +1,55 @@
+"""
+Tests for the intelligent search cache (embeddings, rankings, invalidation)
+"""
+
+from app.services.search_cache import LocalSearchCacheBackend, SearchCache, normalize_query
+
+
+async def test_query_embedding_is_cached_by_normalized_text():
+    cache = SearchCache(LocalSearchCacheBackend())
+
+    assert await cache.get_embedding("AI  Grants") is None
+    await cache.set_embedding("AI  Grants", [0.5, -1.0, 2.0])
+
+    assert await cache.get_embedding("  ai grants ") == [0.5, -1.0, 2.0]
+    assert normalize_query("  AI\tGrants ") == "ai grants"
+
+    stats = cache.get_stats()
+    assert stats['embedding_hits'] == 1 and stats['embedding_misses'] == 1
+    assert stats['embedding_hit_ratio'] == 0.5
+
+
+async def test_rankings_are_keyed_by_filters_and_dropped_on_invalidation():
+    cache = SearchCache(LocalSearchCacheBackend(), result_ttl_seconds=60)
+    entry = {'ranked': [{'id': 3, 'composite_score': 0.9}], 'metadata': {'search_strategy': 'traditional_search'}}
+
+    generation = await cache.current_generation()
+    await cache.set_results(generation, "AI grants", {'min_amount': 1000}, 0.6, 20, True, entry)
+
+    assert await cache.get_results(generation, "ai grants", {'min_amount': 1000}, 0.6, 20, True) == entry
+    assert await cache.get_results(generation, "ai grants", {'min_amount': 5000}, 0.6, 20, True) is None
+    assert await cache.get_results(generation, "ai grants", {'min_amount': 1000}, 0.7, 20, True) is None
+
+    await cache.invalidate()
+    assert await cache.get_results(await cache.current_generation(), "ai grants",
+                                   {'min_amount': 1000}, 0.6, 20, True) is None
+
+    # A ranking computed before the invalidation is stored under the old generation
+    await cache.set_results(generation, "ai grants", {'min_amount': 1000}, 0.6, 20, True, entry)
+    assert await cache.get_results(await cache.current_generation(), "ai grants",
+                                   {'min_amount': 1000}, 0.6, 20, True) is None
+
+
+async def test_local_backend_expires_and_evicts_entries():
+    backend = LocalSearchCacheBackend(max_entries=2)
+
+    await backend.set("stale", b"x", ttl_seconds=0)
+    assert await backend.get("stale") is None
+
+    await backend.set("a", b"1", ttl_seconds=60)
+    await backend.set("b", b"2", ttl_seconds=60)
+    await backend.get("a")
+    await backend.set("c", b"3", ttl_seconds=60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1" and await backend.get("c") == b"3"
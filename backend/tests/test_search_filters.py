@@ -0,0 +1,112 @@
+"""
+Tests for the vector-store rendering of the intelligent search filters
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_
+from sqlalchemy.dialects import postgresql
+
+from app.services.search_filters import (
+    quality_predicates, search_filter_fields_changed, search_filter_fields_cleared, search_filter_metadata,
+    text_search_predicate, text_search_query, text_search_rank,
+    vector_metadata_filter
+)
+
+OPS = {
+    '$eq': lambda a, b: a == b,
+    '$gte': lambda a, b: a >= b,
+    '$lte': lambda a, b: a <= b,
+    '$in': lambda a, b: a in b,
+}
+
+
+def _matches(metadata, expression) -> bool:
+    """Pinecone filter semantics: a missing field fails every comparison"""
+    for key, condition in expression.items():
+        if key == '$and':
+            if not all(_matches(metadata, clause) for clause in condition):
+                return False
+        elif key == '$or':
+            if not any(_matches(metadata, clause) for clause in condition):
+                return False
+        elif key not in metadata:
+            return False
+        elif not all(OPS[op](metadata[key], value) for op, value in condition.items()):
+            return False
+    return True
+
+
+def test_metadata_filter_matches_like_sql_predicates():
+    now = datetime(2025, 6, 1)
+    base = {'id': '7', 'overall_relevance_score': 0.8, 'validation_status': 'approved',
+            'amount_min': '20000', 'amount_max': 50000}
+    open_ended = search_filter_metadata(base)
+    upcoming = search_filter_metadata({**base, 'deadline': (now + timedelta(days=10)).date().isoformat()})
+    expired = search_filter_metadata({**base, 'deadline': (now - timedelta(days=1)).date()})
+    pending = search_filter_metadata({**base, 'validation_status': 'pending'})
+    weak = search_filter_metadata({**base, 'overall_relevance_score': 0.3})
+    no_amount = search_filter_metadata({k: v for k, v in base.items() if not k.startswith('amount')})
+
+    assert open_ended['opportunity_id'] == 7 and open_ended['has_deadline'] is False
+    assert (open_ended['amount_low'], open_ended['amount_high']) == (20000.0, 50000.0)
+
+    quality = vector_metadata_filter(None, 0.6, now=now)
+    assert [_matches(m, quality) for m in (open_ended, upcoming, expired, pending, weak)] == [
+        True, True, False, False, False
+    ]
+
+    # Range filters exclude unknown values, as SQL comparisons with NULL do
+    amount = vector_metadata_filter({'min_amount': 10000, 'max_amount': 100000}, 0.6, now=now)
+    assert _matches(open_ended, amount) and not _matches(no_amount, amount)
+    assert not _matches(open_ended, vector_metadata_filter({'min_amount': 60000}, 0.6, now=now))
+
+    window = vector_metadata_filter({'deadline_before': now + timedelta(days=30)}, 0.6, now=now)
+    assert _matches(upcoming, window) and not _matches(open_ended, window)
+
+
+def test_text_search_query_covers_every_language_config():
+    tsquery = text_search_query('"machine learning" grant -loan')
+    sql = str(text_search_predicate(tsquery).compile(dialect=postgresql.dialect()))
+    assert 'search_vector @@' in sql
+    assert sql.count('websearch_to_tsquery(intelligence_search_config(') == 4
+
+    rank_sql = str(text_search_rank(tsquery).compile(dialect=postgresql.dialect()))
+    assert rank_sql.startswith('ts_rank_cd(africa_intelligence_feed.search_vector')
+
+
+def test_quality_predicates_compile_against_model_columns():
+    filters = {
+        'min_amount': 1000, 'max_amount': 50000, 'deadline_after': datetime(2025, 6, 1, 12, 30),
+        'funding_type': 3, 'geographic_focus': 'Kenya'
+    }
+    predicates = quality_predicates(filters, 0.6, today=date(2025, 6, 1))
+    sql = str(and_(*predicates).compile(
+        dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True}
+    ))
+
+    assert 'africa_intelligence_feed.overall_relevance_score >= 0.6' in sql
+    assert "africa_intelligence_feed.deadline >= '2025-06-01'" in sql
+    assert 'coalesce(africa_intelligence_feed.amount_exact, africa_intelligence_feed.amount_max' in sql
+    assert "(africa_intelligence_feed.raw_data ->> 'eligibility_criteria') ILIKE" in sql
+    assert quality_predicates(None, 0.6)
+
+
+def test_row_updates_that_touch_filter_fields_are_detected():
+    assert search_filter_fields_changed({'validation_status': 'approved'})
+    assert search_filter_fields_changed({'deadline': None, 'title': 'x'})
+    assert not search_filter_fields_changed({'title': 'x', 'enrichment_status': 'completed'})
+
+    # A cleared deadline is covered by has_deadline; a cleared amount needs a re-upsert
+    assert not search_filter_fields_cleared({'deadline': None, 'validation_status': 'approved'})
+    assert search_filter_fields_cleared({'amount_max': None})
+
+
+def test_cleared_deadline_does_not_match_a_deadline_window():
+    now = datetime(2025, 6, 1)
+    stale = {**search_filter_metadata({'id': 1, 'overall_relevance_score': 0.9, 'validation_status': 'approved',
+                                       'deadline': '2025-07-01'}), 'has_deadline': False}
+    window = vector_metadata_filter({'deadline_before': date(2025, 8, 1)}, 0.5, now=now)
+
+    assert _matches(stale, vector_metadata_filter(None, 0.5, now=now))
+    assert not _matches(stale, window)
@@ -0,0 +1,90 @@
+"""
+Tests for the generational seen-content filter used by the collectors
+"""
+
+import hashlib
+
+import pytest
+
+from app.services.data_ingestion.seen_filter import RedisSeenFilter, RotatingSeenFilter
+
+
+def _hashes(start: int, stop: int):
+    return [hashlib.md5(str(i).encode()).hexdigest() for i in range(start, stop)]
+
+
+def test_rotation_keeps_memory_flat_and_false_positives_low():
+    seen = RotatingSeenFilter(capacity=2000, error_rate=0.01, generations=3)
+    memory = seen.get_stats()['memory_bytes']
+
+    keys = _hashes(0, 20_000)
+    assert sum(seen.check_and_add(key) for key in keys[:2000]) < 20
+    assert all(seen.check_and_add(key) for key in keys[:2000])
+
+    # Ten generations' worth of keys: capacity-driven rotation caps memory
+    false_positives = sum(seen.check_and_add(key) for key in keys[2000:])
+    stats = seen.get_stats()
+    assert stats['generations'] == 3
+    assert stats['memory_bytes'] == 3 * memory
+    assert false_positives / 18_000 < 0.03
+
+    # Recent keys are still remembered, the oldest have aged out
+    assert keys[-1] in seen
+    assert sum(key in seen for key in keys[:1000]) < 50
+
+
+def test_recurring_keys_survive_rotation():
+    seen = RotatingSeenFilter(capacity=100, error_rate=0.01, generations=2)
+    seen.check_and_add("recurring")
+    for batch in range(5):
+        for key in _hashes(batch * 100, batch * 100 + 100):
+            seen.check_and_add(key)
+        assert seen.check_and_add("recurring")
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "seen" / "news.bloom")
+    seen = RotatingSeenFilter(capacity=1000, error_rate=0.01, snapshot_path=path)
+    for key in _hashes(0, 500):
+        seen.check_and_add(key)
+    seen.close()
+
+    restored = RotatingSeenFilter(capacity=1000, error_rate=0.01, snapshot_path=path)
+    assert all(restored.check_and_add(key) for key in _hashes(0, 500))
+    assert restored.get_stats()['items_per_generation'] == [500]
+
+    # A differently sized filter ignores the snapshot instead of misreading it
+    resized = RotatingSeenFilter(capacity=5000, error_rate=0.01, snapshot_path=path)
+    assert not resized.check_and_add(_hashes(0, 1)[0])
+
+
+def test_redis_filter_is_shared_between_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    worker_a = RedisSeenFilter(fakeredis.FakeRedis(server=server), "news_api", capacity=1000, error_rate=0.01)
+    worker_b = RedisSeenFilter(fakeredis.FakeRedis(server=server), "news_api", capacity=1000, error_rate=0.01)
+
+    keys = _hashes(0, 200)
+    assert not any(worker_a.check_and_add(key) for key in keys)
+    assert all(worker_b.check_and_add(key) for key in keys)
+    assert keys[0] in worker_b
+    assert "never-added" not in worker_a
+
+
+def test_redis_filter_checks_a_batch_in_one_round_trip():
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    seen = RedisSeenFilter(client, "web_scraping", capacity=1000, error_rate=0.01)
+    keys = _hashes(0, 100)
+
+    executed = []
+    pipeline = client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        executed.append(1)
+        return pipeline(*args, **kwargs)
+
+    client.pipeline = counting_pipeline
+    assert seen.check_and_add_many(keys[:50] + keys[:1]) == [False] * 50 + [True]
+    assert seen.check_and_add_many(keys[40:60]) == [True] * 10 + [False] * 10
+    assert len(executed) == 2
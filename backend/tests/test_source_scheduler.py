@@ -0,0 +1,102 @@
+"""
+Tests for the heap-based DataSource deadline scheduler
+"""
+
+import time
+from datetime import datetime, timedelta
+
+from app.services.data_ingestion.high_volume_pipeline import (
+    DataSource,
+    HighVolumeDataPipeline,
+    Priority,
+    SourceType,
+)
+from app.services.data_ingestion.source_scheduler import SourceScheduler
+
+
+def _source(name: str, **kwargs) -> DataSource:
+    return DataSource(name=name, url=f"https://example.org/{name}", source_type=SourceType.RSS, **kwargs)
+
+
+def test_each_source_has_at_most_one_entry_until_completed():
+    scheduler = SourceScheduler()
+    source = _source("a")
+    scheduler.add(source)
+    scheduler.add(source)
+
+    assert scheduler.pop_due() == [source]
+    # Checked out: neither re-adding nor a later pass yields it again
+    scheduler.sync([source])
+    assert scheduler.pop_due(now=time.monotonic() + 86400) == []
+    assert scheduler.in_flight == 1
+
+    source.update_performance_metrics(success=True, items_collected=3, quality_score=0.9)
+    scheduler.complete(source)
+    assert scheduler.in_flight == 0 and len(scheduler) == 1
+
+    interval = source.calculate_adaptive_interval() * 60
+    assert scheduler.pop_due(now=time.monotonic() + interval - 5) == []
+    assert scheduler.pop_due(now=time.monotonic() + interval + 5) == [source]
+
+
+def test_due_order_and_last_check_are_respected():
+    scheduler = SourceScheduler()
+    fresh = _source("fresh", last_check=datetime.now(), check_interval_minutes=60)
+    low = _source("low", priority=Priority.LOW)
+    high = _source("high", priority=Priority.CRITICAL)
+    disabled = _source("disabled", enabled=False)
+    scheduler.sync([fresh, low, high, disabled])
+
+    assert scheduler.pop_due() == [high, low]
+    assert scheduler.seconds_until_next_due() > 3500
+
+    scheduler.remove(fresh)
+    assert scheduler.seconds_until_next_due() is None
+
+
+def test_ten_thousand_sources_cost_only_due_work():
+    scheduler = SourceScheduler()
+    sources = [_source(f"s{i}", last_check=datetime.now() - timedelta(minutes=i % 120))
+               for i in range(10_000)]
+    scheduler.sync(sources)
+
+    due = scheduler.pop_due()
+    assert len(due) == len({id(s) for s in due}) == 4980
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        assert scheduler.pop_due() == []  # nothing newly due: a heap peek per pass
+    assert time.perf_counter() - started < 0.5
+
+    for source in due:
+        scheduler.complete(source)
+    assert len(scheduler) == 10_000
+
+
+def test_pipeline_source_edits_reach_the_scheduler(tmp_path, monkeypatch):
+    """Enable/disable, removal and interval edits resync even when the list length is unchanged"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir()
+
+    pipeline = HighVolumeDataPipeline()
+    fresh = _source("fresh", last_check=datetime.now(), check_interval_minutes=60)
+    other = _source("other", last_check=datetime.now(), check_interval_minutes=60)
+    pipeline.sources = [fresh, other]
+    pipeline._sync_scheduler()
+    assert len(pipeline.scheduler) == 2
+
+    pipeline.set_source_enabled(other, False)
+    pipeline._sync_scheduler()
+    assert other not in pipeline.scheduler and len(pipeline.scheduler) == 1
+
+    pipeline.set_source_enabled(other, True)
+    pipeline._sync_scheduler()
+    assert other in pipeline.scheduler
+
+    pipeline.remove_source(other)
+    pipeline._sync_scheduler()
+    assert other not in pipeline.scheduler and len(pipeline.scheduler) == 1
+
+    assert pipeline.scheduler.seconds_until_next_due() > 3000
+    pipeline.set_source_interval(fresh, 5)
+    assert pipeline.scheduler.seconds_until_next_due() < 700
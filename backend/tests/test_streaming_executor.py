@@ -0,0 +1,69 @@
+"""
+Tests for the sliding-window streaming executor used by Crawl4AI batches
+"""
+
+import asyncio
+import time
+
+from app.services.data_ingestion.streaming_executor import stream_bounded
+
+
+async def test_slow_item_does_not_stall_the_window():
+    """Fast items keep flowing past a slow one; results arrive in completion order"""
+    delays = {"https://slow.example/0": 0.5}
+    items = ["https://slow.example/0"] + [f"https://site{i}.example/page" for i in range(40)]
+
+    async def fetch(url):
+        await asyncio.sleep(delays.get(url, 0.02))
+        return url
+
+    started = time.monotonic()
+    order = [outcome.result async for outcome in stream_bounded(items, fetch, max_workers=4)]
+
+    # 40 fast items over the 3 free workers take ~0.3s, well inside the slow item's 0.5s
+    assert order[-1] == "https://slow.example/0"
+    assert sorted(order) == sorted(items)
+    assert time.monotonic() - started < 0.9
+
+
+async def test_per_domain_cap_parks_items_without_holding_workers():
+    in_flight = {}
+    peak = {}
+
+    async def fetch(url):
+        domain = url.split("/")[2]
+        in_flight[domain] = in_flight.get(domain, 0) + 1
+        peak[domain] = max(peak.get(domain, 0), in_flight[domain])
+        await asyncio.sleep(0.05 if domain == "busy.example" else 0.01)
+        in_flight[domain] -= 1
+        if url.endswith("/boom"):
+            raise ValueError("boom")
+        return url
+
+    items = [f"https://busy.example/{i}" for i in range(10)] + [f"https://other{i}.example/boom" for i in range(5)]
+    outcomes = [outcome async for outcome in stream_bounded(items, fetch, max_workers=6, per_domain_concurrency=2)]
+
+    assert peak["busy.example"] == 2
+    assert len(outcomes) == 15
+    assert sum(isinstance(outcome.error, ValueError) for outcome in outcomes) == 5
+    # Other domains are not queued behind the busy one
+    first_five = [outcome.item for outcome in outcomes[:5]]
+    assert sum("other" in url for url in first_five) >= 3
+
+
+async def test_closing_the_stream_cancels_remaining_work():
+    started = []
+
+    async def fetch(url):
+        started.append(url)
+        await asyncio.sleep(0.01)
+        return url
+
+    items = [f"https://site{i}.example/" for i in range(1000)]
+    stream = stream_bounded(items, fetch, max_workers=5, result_buffer=5)
+    async for _ in stream:
+        break
+    await stream.aclose()
+    await asyncio.sleep(0.05)
+
+    assert len(started) < 50
@@ -0,0 +1,103 @@
+"""
+Tests for HighVolumeWebScrapingEngine's async scraping mode
+"""
+
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.data_ingestion.seen_filter import RotatingSeenFilter
+from app.services.data_ingestion.web_scraping_engine import (
+    ContentType, HighVolumeWebScrapingEngine, ScrapingStrategy, ScrapingTarget
+)
+
+PAGE = """<html><body>{items}</body></html>"""
+ITEM = """<div class="item"><h2 class="title">AI grant {n} for Africa</h2>
+<p class="description">Funding call {n}</p><a class="link">/calls/{n}</a></div>"""
+
+
+def _engine(monkeypatch, tmp_path, **kwargs) -> HighVolumeWebScrapingEngine:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "logs").mkdir(exist_ok=True)
+    return HighVolumeWebScrapingEngine(execution_mode="async", seen_filter=RotatingSeenFilter(capacity=1000),
+                                       **kwargs)
+
+
+def _target(url: str, rate_limit_seconds: float) -> ScrapingTarget:
+    return ScrapingTarget(
+        name="Mock Funding Portal",
+        base_url=url,
+        strategy=ScrapingStrategy.PAGINATED,
+        content_type=ContentType.FUNDING_OPPORTUNITY,
+        selectors={'title': '.title', 'description': '.description', 'link': '.link'},
+        pagination_config={'type': 'url_param', 'param_name': 'page', 'start_page': 1},
+        rate_limit_seconds=rate_limit_seconds,
+        max_pages=50,
+        keywords=['Africa']
+    )
+
+
+async def test_paginated_target_prefetches_within_domain_rate_limit(monkeypatch, tmp_path):
+    requested = []
+
+    async def listing(request):
+        page = int(request.query["page"])
+        requested.append((page, time.monotonic()))
+        items = "".join(ITEM.format(n=f"{page}-{i}") for i in range(3)) if page <= 5 else ""
+        return web.Response(text=PAGE.format(items=items), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/calls", listing)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        engine = _engine(monkeypatch, tmp_path, page_prefetch=3)
+        engine.targets = [_target(str(server.make_url("/calls")), rate_limit_seconds=0.05)]
+
+        content = await engine.scrape_all_targets_async()
+    finally:
+        await server.close()
+
+    assert len(content) == 15
+    assert {item.url.rsplit("/", 1)[-1] for item in content} == {f"{p}-{i}" for p in range(1, 6) for i in range(3)}
+
+    # Stops at the first empty page, with at most page_prefetch - 1 requests beyond it
+    pages = sorted(page for page, _ in requested)
+    assert pages[:6] == [1, 2, 3, 4, 5, 6] and len(pages) <= 8
+
+    # Requests to the domain are spaced by its rate limit even with prefetch
+    times = sorted(at for _, at in requested)
+    assert all(later - earlier >= 0.04 for earlier, later in zip(times, times[1:]))
+
+    stats = engine.get_stats()
+    assert stats['content_extracted'] == 15 and stats['errors'] == 0
+    engine.stop_scraping()
+
+
+async def test_async_fetch_retries_transient_errors(monkeypatch, tmp_path):
+    attempts = []
+
+    async def flaky(request):
+        attempts.append(request.query["page"])
+        if len(attempts) == 1:
+            return web.Response(status=503)
+        return web.Response(text=PAGE.format(items=ITEM.format(n=1)), content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/calls", flaky)
+    server = TestServer(app)
+    await server.start_server()
+    try:
+        engine = _engine(monkeypatch, tmp_path, page_prefetch=1)
+        target = _target(str(server.make_url("/calls")), rate_limit_seconds=0.01)
+        target.max_pages = 1
+        engine.targets = [target]
+
+        content = await engine.scrape_all_targets_async()
+    finally:
+        await server.close()
+
+    assert attempts == ["1", "1"]
+    assert [item.title for item in content] == ["AI grant 1 for Africa"]
+    engine.stop_scraping()
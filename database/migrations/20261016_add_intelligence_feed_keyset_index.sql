@@ -0,0 +1,8 @@
+-- Keyset pagination index for /funding-opportunities/feed
+-- Matches its (created_at DESC NULLS FIRST, id DESC) order, so each page is
+-- an index range scan instead of a sort of the whole feed.
+-- CONCURRENTLY keeps the feed writable while the index builds; run this
+-- statement on its own, outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_africa_intelligence_feed_created_at_id
+ON africa_intelligence_feed (created_at DESC NULLS FIRST, id DESC);
@@ -116,3 +116,5 @@ CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_funding_type ON africa_i
 CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_women_focus ON africa_intelligence_feed(women_focus);
 CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_underserved_focus ON africa_intelligence_feed(underserved_focus);
 CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_youth_focus ON africa_intelligence_feed(youth_focus);
+-- Keyset pagination order of /funding-opportunities/feed
+CREATE INDEX IF NOT EXISTS idx_africa_intelligence_feed_created_at_id ON africa_intelligence_feed(created_at DESC NULLS FIRST, id DESC);